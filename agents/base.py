@@ -22,6 +22,8 @@ from dataclasses import dataclass, field
 from typing import Optional
 from enum import Enum
 
+from core.llm import PromptSegment
+
 
 class AgentType(Enum):
     FOUNDER = "founder"
@@ -103,6 +105,11 @@ class AgentConfig:
         """Backward-compatible prompt accessor used across the codebase."""
         return self.get_system_prompt()
 
+    @property
+    def system_segments(self) -> list[PromptSegment]:
+        """The role prompt as one cacheable segment (it never changes per call)."""
+        return [PromptSegment(self.get_system_prompt(), cache=True)]
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -147,6 +154,14 @@ class BaseAgent:
 
     def get_system_prompt(self) -> str:
         """Build the system prompt for this agent's API calls."""
+        return "\n".join(segment.text for segment in self.get_system_segments())
+
+    def get_system_segments(self) -> list[PromptSegment]:
+        """
+        System prompt split for prompt caching: the static role block
+        (identity, mandate, constraints) is cacheable; knowledge depth
+        changes as the agent learns and follows uncached.
+        """
         parts = [
             f"You are {self.config.name}, a {self.config.role} in Project Atlantis.",
             f"\nYour mandate: {self.config.mandate}",
@@ -163,15 +178,6 @@ class BaseAgent:
             for c in self.config.constraints:
                 parts.append(f"  - {c}")
 
-        if self.knowledge:
-            parts.append("\nYour current knowledge depth:")
-            for domain, ka in self.knowledge.items():
-                tier_names = {
-                    0: "Empty", 1: "Vocabulary", 2: "Frameworks",
-                    3: "Application", 4: "Cross-Domain Synthesis", 5: "Novel Insight"
-                }
-                parts.append(f"  - {domain}: Tier {ka.tier} ({tier_names.get(ka.tier, 'Unknown')})")
-
         if self.config.prefer_concise:
             parts.append(
                 "\nEfficiency mandate: Be concise. Every token costs resources. "
@@ -179,7 +185,19 @@ class BaseAgent:
                 "If you can make your point in 3 sentences, don't use 10."
             )
 
-        return "\n".join(parts)
+        segments = [PromptSegment("\n".join(parts), cache=True)]
+
+        if self.knowledge:
+            knowledge = ["\nYour current knowledge depth:"]
+            for domain, ka in self.knowledge.items():
+                tier_names = {
+                    0: "Empty", 1: "Vocabulary", 2: "Frameworks",
+                    3: "Application", 4: "Cross-Domain Synthesis", 5: "Novel Insight"
+                }
+                knowledge.append(f"  - {domain}: Tier {ka.tier} ({tier_names.get(ka.tier, 'Unknown')})")
+            segments.append(PromptSegment("\n".join(knowledge)))
+
+        return segments
 
     def update_knowledge(self, domain: str, tier: int = None,
                          concepts: list = None, frameworks: list = None,
@@ -6,6 +6,8 @@ Knowledge enters the Archive only if it survives adversarial challenge.
 Full text of every exchange is preserved. States can and should die.
 """
 
+import os
+
 # ═══════════════════════════════════════
 # SYSTEM IDENTITY
 # ═══════════════════════════════════════
@@ -123,6 +125,20 @@ MODEL_ALLOCATION = {
     "takeoff_judge": "sonnet",          # Constitutional ruling
 }
 
+# Fallback tier per task type while the primary tier's circuit breaker is open.
+# Only task types listed here are rerouted; their results carry fallback_from
+# so degraded answers are labelled. Everything else gets the [LLM ERROR]
+# placeholder immediately, without the retry sleeps.
+MODEL_FALLBACK_ALLOCATION = {
+    "critic_challenges": "haiku",
+    "researcher_rebuttals": "haiku",
+    "founder_panels": "haiku",
+    "federal_lab": "haiku",
+    "supreme_court": "sonnet",
+    "sydyn_critic": "haiku",
+    "sydyn_judge": "haiku",
+}
+
 MODEL_IDS = {
     "haiku": "claude-haiku-4-5-20251001",
     "sonnet": "claude-sonnet-4-5-20250929",
@@ -306,14 +322,69 @@ DEBATE_MATCHUPS = {
 # API CONFIGURATION
 # ═══════════════════════════════════════
 API_CONFIG = {
+    # Alternate Messages API endpoint, e.g. the mock server (python -m core.mockserver).
+    # None = SDK default (which also honours ANTHROPIC_BASE_URL).
+    "base_url": os.getenv("LLM_BASE_URL") or None,
+
     # Generic defaults (used as fallbacks in core/llm.py)
     "model": "claude-sonnet-4-5-20250929",
     "max_tokens": 4096,
     "temperature": 0.7,
 
-    # Rate limiting
-    "rate_limit_seconds": 0.1,
+    # Rate limiting (core/ratelimit.py) — token buckets per model tier, shared process-wide.
+    # Set these to your Anthropic account tier; 0 disables that bucket.
     "rate_limit_enabled": True,
+    "rate_limits": {
+        "haiku": {"requests_per_minute": 1000, "tokens_per_minute": 400000},
+        "sonnet": {"requests_per_minute": 1000, "tokens_per_minute": 400000},
+        "opus": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+        "default": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+    },
+
+    # Response cache (core/cache.py)
+    "cache_backend": "memory",           # "memory" | "sqlite" (persistent, shared) | "none"
+    "cache_path": "output/llm_cache.db",  # Only used by the sqlite backend
+    "cache_max_entries": 10000,          # 0 = unlimited
+    "cache_max_bytes": 256 * 1024 * 1024,  # 0 = unlimited
+    "cache_ttl_seconds": 0,              # 0 = entries never expire
+
+    # Prompt caching: PromptSegment(cache=True) blocks are sent with cache_control
+    "prompt_caching": True,
+    "prompt_cache_write_multiplier": 1.25,  # 5-minute cache write = 1.25x input price
+    "prompt_cache_read_multiplier": 0.1,    # Cache hit = 0.1x input price
+
+    # Message Batches (opt-in via ModelRouter(batch_mode=True) / --batch)
+    "batch_poll_interval_seconds": 30.0,
+    "batch_timeout_seconds": 24 * 3600,
+    "batch_discount": 0.5,               # Batch API bills at 50% of standard rates
+
+    # Hedged requests: duplicate a call still running after the task's p95 latency
+    "hedge_requests": False,             # Opt-in via ModelRouter(hedge=True); costs extra tokens
+    "hedge_percentile": 95,
+    "hedge_min_samples": 20,             # Observed calls per task type before hedging starts
+    "hedge_min_delay_seconds": 2.0,      # Never hedge sooner than this
+
+    # Circuit breakers per model tier (core/circuit.py); fallbacks in MODEL_FALLBACK_ALLOCATION
+    "circuit_breaker_enabled": True,
+    "circuit_error_rate": 0.5,           # Trip when >= 50% of recent attempts are overload/timeout errors
+    "circuit_min_requests": 10,          # ... out of at least this many attempts
+    "circuit_window_seconds": 60.0,
+    "circuit_open_seconds": 30.0,        # Refuse calls this long, then probe (half-open)
+
+    # Record / replay cassettes (core/cassette.py; --record-cassette / --replay-cassette)
+    "cassette_path": "output/llm_cassette.jsonl.gz",
+    "cassette_replay_latency_scale": 1.0,  # 0 = replay instantly, 1 = recorded latency
+
+    # Adaptive max_tokens per task type (core/budget.py), learned from observed output lengths
+    "adaptive_max_tokens": True,
+    "max_tokens_percentile": 99,
+    "max_tokens_headroom": 0.25,         # Budget = p99 output tokens * 1.25
+    "max_tokens_min_samples": 20,        # Observed calls per task type before the caller's value is replaced
+    "max_tokens_floor": 128,
+    "max_tokens_ceiling": 8192,
+    "max_tokens_window": 500,            # Most recent output lengths kept per task type
+    "max_tokens_truncation_retries": 1,  # Re-runs (at double the budget) when stop_reason == "max_tokens"
+    "token_budget_path": "output/token_budgets.json",  # Persisted samples (API mode only)
 
     # Task-specific temperatures
     "temperature_research": 0.7,
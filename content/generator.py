@@ -53,13 +53,35 @@ class ContentGenerator:
         Determine which formats to generate and produce them.
         Returns list of output file paths.
         """
-        formats_to_gen = self._select_formats(exchange_data)
+        return self.evaluate_and_generate_batch([exchange_data])[0]
 
-        outputs = []
-        for fmt in formats_to_gen:
-            path = self._generate(fmt, exchange_data)
+    def evaluate_and_generate_batch(self, exchanges: List[dict]) -> List[List[str]]:
+        """
+        evaluate_and_generate() for independent events at once: every selected
+        format's call goes out together via complete_batch(). Blog posts in one
+        batch share the rolling context as it stood before the batch.
+        Returns one list of output file paths per event.
+        """
+        pending = []
+        for i, data in enumerate(exchanges):
+            for fmt in self._select_formats(data):
+                call = self._build_call(fmt, data)
+                if call is not None:
+                    pending.append((i, fmt, call))
+
+        outputs: List[List[str]] = [[] for _ in exchanges]
+        if not pending:
+            return outputs
+        try:
+            responses = self.models.complete_batch([call for _, _, call in pending])
+        except Exception as e:
+            print(f"  [ContentGenerator:evaluate_and_generate_batch] Error generating {len(pending)} content item(s) - {type(e).__name__}: {e} - returning no outputs")
+            return outputs
+
+        for (i, fmt, _), response in zip(pending, responses):
+            path = self._save(fmt, exchanges[i], response.content or "(no content generated)")
             if path:
-                outputs.append(path)
+                outputs[i].append(path)
         return outputs
 
     def _select_formats(self, exchange_data: dict) -> List[str]:
@@ -96,26 +118,41 @@ class ContentGenerator:
 
     # ─── FORMAT DISPATCH ──────────────────────────────────────────
 
-    def _generate(self, fmt: str, data: dict) -> Optional[str]:
-        generators = {
-            "blog": self._generate_blog,
-            "newsroom": self._generate_newsroom,
-            "debate": self._generate_debate,
-            "explorer": self._generate_explorer,
+    def _build_call(self, fmt: str, data: dict) -> Optional[dict]:
+        """complete() arguments for one format, or None if it cannot be generated."""
+        builders = {
+            "blog": self._blog_call,
+            "newsroom": self._newsroom_call,
+            "debate": self._debate_call,
+            "explorer": self._explorer_call,
         }
-        fn = generators.get(fmt)
+        fn = builders.get(fmt)
         if not fn:
-            print(f"  [ContentGenerator:_generate] Invalid format '{fmt}' requested - must be one of: {list(generators.keys())} - returning None")
+            print(f"  [ContentGenerator:_build_call] Invalid format '{fmt}' requested - must be one of: {list(builders.keys())} - returning None")
             return None
         try:
             return fn(data)
         except Exception as e:
-            print(f"  [ContentGenerator:_generate] Error generating content for format '{fmt}' - {type(e).__name__}: {e} - returning None")
+            print(f"  [ContentGenerator:_build_call] Error building content prompt for format '{fmt}' - {type(e).__name__}: {e} - returning None")
+            return None
+
+    def _save(self, fmt: str, data: dict, content: str) -> Optional[str]:
+        """Write one generated item; returns its path, or None on failure."""
+        writers = {
+            "blog": self._save_blog,
+            "newsroom": self._save_newsroom,
+            "debate": self._save_debate,
+            "explorer": self._save_explorer,
+        }
+        try:
+            return writers[fmt](data, content)
+        except Exception as e:
+            print(f"  [ContentGenerator:_save] Error saving content for format '{fmt}' - {type(e).__name__}: {e} - returning None")
             return None
 
     # ─── BLOG ─────────────────────────────────────────────────────
 
-    def _generate_blog(self, data: dict) -> str:
+    def _blog_call(self, data: dict) -> dict:
         """
         500-1000 words. Science journalist voice.
         Rolling context (max 20 prior entries × 200 words each).
@@ -129,7 +166,7 @@ class ContentGenerator:
         drama = data.get("drama_score", 0)
         event_type = data.get("event_type", "claim_exchange")
 
-        response = self.models.complete(
+        return dict(
             task_type="content_generation",
             system_prompt=(
                 "You are a science journalist covering the Atlantis adversarial knowledge engine. "
@@ -151,12 +188,10 @@ class ContentGenerator:
             max_tokens=1200,
         )
 
-        content = response.content or "(no content generated)"
-
-        # Save
+    def _save_blog(self, data: dict, content: str) -> str:
+        event_type = data.get("event_type", "claim_exchange")
         stamp = _now_stamp()
-        filename = f"blog_{stamp}.md"
-        path = self.output_dir / "blog" / filename
+        path = self._output_path("blog", stamp)
         path.write_text(
             f"# Atlantis Blog — {event_type.replace('_', ' ').title()}\n\n{content}\n",
             encoding="utf-8",
@@ -175,7 +210,7 @@ class ContentGenerator:
 
     # ─── NEWSROOM ─────────────────────────────────────────────────
 
-    def _generate_newsroom(self, data: dict) -> str:
+    def _newsroom_call(self, data: dict) -> dict:
         """
         150-200 words. Breaking news anchor. Hook-driven, urgent.
         """
@@ -183,7 +218,7 @@ class ContentGenerator:
         drama = data.get("drama_score", 0)
         event_type = data.get("event_type", "claim_exchange")
 
-        response = self.models.complete(
+        return dict(
             task_type="content_generation",
             system_prompt=(
                 "You are a breaking news anchor for Atlantis Intelligence Daily. "
@@ -201,11 +236,9 @@ class ContentGenerator:
             max_tokens=400,
         )
 
-        content = response.content or "(no content generated)"
-
+    def _save_newsroom(self, data: dict, content: str) -> str:
         stamp = _now_stamp()
-        filename = f"newsroom_{stamp}.md"
-        path = self.output_dir / "newsroom" / filename
+        path = self._output_path("newsroom", stamp)
         path.write_text(
             f"# Atlantis Newsroom — {stamp}\n\n{content}\n",
             encoding="utf-8",
@@ -214,7 +247,7 @@ class ContentGenerator:
 
     # ─── DEBATE (TikTok) ──────────────────────────────────────────
 
-    def _generate_debate(self, data: dict) -> str:
+    def _debate_call(self, data: dict) -> dict:
         """
         60-90 second TikTok script. Sports commentary style.
         Play-by-play of the exchange.
@@ -223,7 +256,7 @@ class ContentGenerator:
         drama = data.get("drama_score", 0)
         event_type = data.get("event_type", "claim_exchange")
 
-        response = self.models.complete(
+        return dict(
             task_type="content_generation",
             system_prompt=(
                 "You are a hyped-up sports commentator covering AI knowledge battles. "
@@ -245,11 +278,9 @@ class ContentGenerator:
             max_tokens=500,
         )
 
-        content = response.content or "(no content generated)"
-
+    def _save_debate(self, data: dict, content: str) -> str:
         stamp = _now_stamp()
-        filename = f"debate_{stamp}.md"
-        path = self.output_dir / "debate" / filename
+        path = self._output_path("debate", stamp)
         path.write_text(
             f"# Atlantis Debate — {stamp}\n\n{content}\n",
             encoding="utf-8",
@@ -258,7 +289,7 @@ class ContentGenerator:
 
     # ─── EXPLORER ─────────────────────────────────────────────────
 
-    def _generate_explorer(self, data: dict) -> str:
+    def _explorer_call(self, data: dict) -> dict:
         """
         200-300 words. First-person travel blog.
         Visits new cities/towns when formed, ruins when a State dissolves.
@@ -300,7 +331,7 @@ class ContentGenerator:
             mood = "curious"
             action = f"Event: {event_type.replace('_', ' ')}"
 
-        response = self.models.complete(
+        return dict(
             task_type="content_generation",
             system_prompt=(
                 "You are a travel blogger visiting the living landscape of the Atlantis knowledge engine. "
@@ -317,11 +348,10 @@ class ContentGenerator:
             max_tokens=500,
         )
 
-        content = response.content or "(no content generated)"
-
+    def _save_explorer(self, data: dict, content: str) -> str:
+        event_type = data.get("event_type", "new_city")
         stamp = _now_stamp()
-        filename = f"explorer_{stamp}.md"
-        path = self.output_dir / "explorer" / filename
+        path = self._output_path("explorer", stamp)
         path.write_text(
             f"# Atlantis Explorer — {event_type.replace('_', ' ').title()} ({stamp})\n\n"
             f"{content}\n",
@@ -329,6 +359,15 @@ class ContentGenerator:
         )
         return str(path)
 
+    def _output_path(self, fmt: str, stamp: str) -> Path:
+        """<fmt>/<fmt>_<stamp>.md, suffixed when a batch saves several items in the same second."""
+        path = self.output_dir / fmt / f"{fmt}_{stamp}.md"
+        n = 2
+        while path.exists():
+            path = self.output_dir / fmt / f"{fmt}_{stamp}_{n}.md"
+            n += 1
+        return path
+
     # ─── BLOG CONTEXT PERSISTENCE ─────────────────────────────────
 
     def _load_blog_context(self) -> List[dict]:
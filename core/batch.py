@@ -0,0 +1,154 @@
+"""
+Atlantis Message Batches
+=========================
+Offline execution of independent LLM calls through the Anthropic
+Message Batches API (50% cheaper, results within 24h).
+
+- BatchRequest: one queued call (custom_id + resolved model params)
+- run_batch(): submit, poll until the batch has ended, collect results
+- LocalBatchServer: in-process stand-in for client.messages.batches,
+  used in local / dry-run mode and in tests
+
+LLMProvider.complete_batch() and ModelRouter.complete_batch() are the
+entry points; agents never talk to this module directly.
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Optional, Union
+
+
+@dataclass
+class BatchRequest:
+    """One call queued for batch submission."""
+    custom_id: str
+    system_prompt: Union[str, list]  # Plain text or API text blocks (cache_control)
+    user_prompt: str
+    max_tokens: int
+    temperature: float
+    model: str
+    task_type: str = "unknown"
+
+    def to_api(self) -> dict:
+        return {
+            "custom_id": self.custom_id,
+            "params": {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                "system": self.system_prompt,
+                "messages": [{"role": "user", "content": self.user_prompt}],
+            },
+        }
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batched call: either a message or an error string."""
+    custom_id: str
+    message: Optional[object] = None
+    error: Optional[str] = None
+
+
+def run_batch(
+    batches_api,
+    requests: list[BatchRequest],
+    poll_interval_s: float = 30.0,
+    timeout_s: float = 24 * 3600,
+    on_poll: Optional[Callable[[object], None]] = None,
+) -> dict[str, BatchResult]:
+    """
+    Submit requests as one Message Batch and block until it has ended.
+
+    Args:
+        batches_api: client.messages.batches (or a LocalBatchServer)
+        requests: calls to submit; custom_ids must be unique
+        poll_interval_s: delay between status polls
+        timeout_s: give up (and cancel) after this long
+        on_poll: optional callback receiving each status object
+
+    Returns:
+        custom_id -> BatchResult. Requests missing from the results are
+        reported as errors rather than silently dropped.
+    """
+    batch = batches_api.create(requests=[r.to_api() for r in requests])
+    deadline = time.time() + timeout_s
+    while getattr(batch, "processing_status", "ended") != "ended":
+        if time.time() > deadline:
+            try:
+                batches_api.cancel(batch.id)
+            except Exception:
+                pass
+            raise TimeoutError(f"Message batch {batch.id} did not finish within {timeout_s:.0f}s")
+        time.sleep(poll_interval_s)
+        batch = batches_api.retrieve(batch.id)
+        if on_poll:
+            on_poll(batch)
+
+    results: dict[str, BatchResult] = {}
+    for item in batches_api.results(batch.id):
+        outcome = item.result
+        if outcome.type == "succeeded":
+            results[item.custom_id] = BatchResult(item.custom_id, message=outcome.message)
+        else:
+            detail = getattr(outcome, "error", None)
+            results[item.custom_id] = BatchResult(item.custom_id, error=f"{outcome.type}: {detail or ''}".strip())
+
+    for r in requests:
+        results.setdefault(r.custom_id, BatchResult(r.custom_id, error="missing from batch results"))
+    return results
+
+
+class LocalBatchServer:
+    """
+    In-process stand-in for client.messages.batches.
+
+    `responder(params) -> (text, input_tokens, output_tokens)` produces each
+    result; raising marks that request as errored. Batches report
+    "in_progress" for `polls_until_ended` retrieve() calls so callers
+    exercise the same polling path as the real API.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, responder: Callable[[dict], tuple[str, int, int]], polls_until_ended: int = 0):
+        self.responder = responder
+        self.polls_until_ended = polls_until_ended
+        self._batches: dict[str, dict] = {}
+
+    def create(self, requests: list[dict]):
+        batch_id = f"msgbatch_local_{next(self._ids)}"
+        results = []
+        for req in requests:
+            try:
+                text, input_tokens, output_tokens = self.responder(req["params"])
+                message = SimpleNamespace(
+                    content=[SimpleNamespace(type="text", text=text)],
+                    usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+                    model=req["params"].get("model", ""),
+                )
+                result = SimpleNamespace(type="succeeded", message=message)
+            except Exception as e:
+                result = SimpleNamespace(type="errored", error=str(e))
+            results.append(SimpleNamespace(custom_id=req["custom_id"], result=result))
+        self._batches[batch_id] = {"results": results, "polls_left": self.polls_until_ended}
+        return self._status(batch_id)
+
+    def retrieve(self, batch_id: str):
+        entry = self._batches[batch_id]
+        entry["polls_left"] = max(entry["polls_left"] - 1, 0)
+        return self._status(batch_id)
+
+    def results(self, batch_id: str):
+        return iter(self._batches[batch_id]["results"])
+
+    def cancel(self, batch_id: str):
+        self._batches[batch_id]["polls_left"] = 0
+        return self._status(batch_id)
+
+    def _status(self, batch_id: str):
+        entry = self._batches[batch_id]
+        status = "in_progress" if entry["polls_left"] > 0 else "ended"
+        return SimpleNamespace(id=batch_id, processing_status=status)
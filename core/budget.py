@@ -0,0 +1,164 @@
+"""
+Atlantis Token Budgets
+=======================
+Adaptive max_tokens per task type, learned from observed output lengths.
+
+Call sites hard-code output budgets (2000 for the sydyn researcher, 1000
+as the router default). Budgets that are too large hold back TPM
+capacity the rate limiter reserves up front. Budgets that are too small
+truncate JSON and force re-runs. TokenBudgets keeps a window of recent
+output-token counts per task type and, once enough calls have been seen,
+sets max_tokens to a high percentile plus headroom:
+
+    max_tokens = clamp(percentile(q) * (1 + headroom), floor, ceiling)
+
+Responses that stopped on max_tokens are counted per task type. ModelRouter
+retries them with a larger budget (retry_budget). Samples can be persisted
+as JSON so the next run starts from what this one learned. One exit hook
+saves every live instance to the same file, so save() merges its new
+samples into what is on disk rather than overwriting it with its own
+snapshot.
+
+Settings live in API_CONFIG["adaptive_max_tokens"] and
+API_CONFIG["max_tokens_*"] (config/settings.py).
+"""
+
+import atexit
+import json
+import math
+import os
+import threading
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from config.settings import API_CONFIG
+
+TRUNCATED = "max_tokens"
+
+# Serializes read-merge-write of budget files between instances in this process
+_file_lock = threading.Lock()
+# Instances with a path; held weakly so the exit hook does not keep routers alive
+_persisted = weakref.WeakSet()
+
+
+@atexit.register
+def _save_all():
+    for budgets in list(_persisted):
+        budgets.save()
+
+
+class TokenBudgets:
+    """Per-task output-token samples, the budgets derived from them, and truncation counts."""
+
+    def __init__(self, path: Optional[str] = None, enabled: Optional[bool] = None,
+                 percentile: Optional[float] = None, headroom: Optional[float] = None,
+                 min_samples: Optional[int] = None, floor: Optional[int] = None,
+                 ceiling: Optional[int] = None, window: Optional[int] = None):
+        cfg = API_CONFIG
+        self.enabled = cfg.get("adaptive_max_tokens", True) if enabled is None else enabled
+        self.percentile = cfg.get("max_tokens_percentile", 99) if percentile is None else percentile
+        self.headroom = cfg.get("max_tokens_headroom", 0.25) if headroom is None else headroom
+        self.min_samples = cfg.get("max_tokens_min_samples", 20) if min_samples is None else min_samples
+        self.floor = cfg.get("max_tokens_floor", 128) if floor is None else floor
+        self.ceiling = cfg.get("max_tokens_ceiling", 8192) if ceiling is None else ceiling
+        self.window = cfg.get("max_tokens_window", 500) if window is None else window
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._unsaved: dict[str, list] = {}  # Samples recorded since the last save()
+        self._counts: dict[str, dict] = {}
+
+        if self.path is not None:
+            self._load()
+            _persisted.add(self)
+
+    def _read(self) -> dict:
+        """Samples per task type currently on disk ({} if missing or corrupt)."""
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}  # A corrupt file only costs us the warm start
+        return {task: [int(s) for s in samples] for task, samples in data.get("samples", {}).items()}
+
+    def _load(self):
+        for task_type, samples in self._read().items():
+            self._samples[task_type] = deque(samples, maxlen=self.window)
+
+    def save(self):
+        """Merge the samples recorded since the last save into `path` (atomic replace)."""
+        if self.path is None:
+            return
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        if not unsaved:
+            return
+        with _file_lock:
+            merged = self._read()
+            for task_type, samples in unsaved.items():
+                window = deque(merged.get(task_type, ()), maxlen=self.window)
+                window.extend(samples)
+                merged[task_type] = list(window)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps({"samples": merged}, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def _count(self, task_type: str) -> dict:
+        return self._counts.setdefault(task_type, {"calls": 0, "truncated": 0, "retried": 0})
+
+    def _learned(self, task_type: str) -> Optional[int]:
+        """Learned budget for task_type, or None until min_samples calls have been seen."""
+        samples = self._samples.get(task_type)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(math.ceil(self.percentile / 100 * len(ordered)) - 1, 0)
+        budget = math.ceil(ordered[rank] * (1 + self.headroom))
+        return min(max(budget, self.floor), self.ceiling)
+
+    def max_tokens(self, task_type: str, requested: int) -> int:
+        """Budget to send for task_type: the learned one once available, else the caller's."""
+        if not self.enabled:
+            return requested
+        with self._lock:
+            learned = self._learned(task_type)
+        return requested if learned is None else learned
+
+    def retry_budget(self, max_tokens: int) -> Optional[int]:
+        """Larger budget for re-running a truncated call, or None at the ceiling."""
+        larger = min(max_tokens * 2, max(self.ceiling, max_tokens))
+        return larger if larger > max_tokens else None
+
+    def record(self, task_type: str, output_tokens: int, stop_reason: str = ""):
+        """Add one fresh response. A truncated one is still a (censored) sample at its budget."""
+        with self._lock:
+            if output_tokens > 0:
+                self._samples.setdefault(task_type, deque(maxlen=self.window)).append(output_tokens)
+                self._unsaved.setdefault(task_type, []).append(output_tokens)
+            counts = self._count(task_type)
+            counts["calls"] += 1
+            counts["truncated"] += stop_reason == TRUNCATED
+
+    def record_retry(self, task_type: str):
+        with self._lock:
+            self._count(task_type)["retried"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            tasks = set(self._samples) | set(self._counts)
+            return {
+                task_type: {
+                    "samples": len(self._samples.get(task_type, ())),
+                    "max_tokens": self._learned(task_type),
+                    **self._counts.get(task_type, {"calls": 0, "truncated": 0, "retried": 0}),
+                    "truncation_rate": round(
+                        self._counts.get(task_type, {}).get("truncated", 0)
+                        / max(self._counts.get(task_type, {}).get("calls", 0), 1), 3
+                    ),
+                }
+                for task_type in sorted(tasks)
+            }
@@ -0,0 +1,321 @@
+"""
+Atlantis LLM Response Cache
+============================
+Pluggable response cache backends for core/llm.py:
+- MemoryResponseCache: in-process LRU (default)
+- SQLiteResponseCache: persistent, shared across processes (WAL mode)
+
+Both backends enforce an entry-count limit and a byte-size limit with
+least-recently-used eviction, plus an optional TTL. Hit / miss / eviction
+counters are surfaced through stats() and merged into LLMProvider.get_stats().
+
+Backend selection lives in API_CONFIG (config/settings.py):
+    cache_backend       "memory" | "sqlite" | "none"
+    cache_path          SQLite file for the persistent backend
+    cache_max_entries   max cached responses (0 = unlimited)
+    cache_max_bytes     max total content bytes (0 = unlimited)
+    cache_ttl_seconds   entry lifetime in seconds (0 = never expires)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class ResponseCache:
+    """
+    Base class / null backend. Stores nothing, counts misses.
+    Subclasses implement _get / _set / _clear / _size.
+    """
+
+    backend = "none"
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0, ttl_seconds: float = 0.0):
+        self.max_entries = max(int(max_entries or 0), 0)
+        self.max_bytes = max(int(max_bytes or 0), 0)
+        self.ttl_seconds = max(float(ttl_seconds or 0.0), 0.0)
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ─── Public API ──────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached payload for key, or None on miss/expiry."""
+        payload = self._get(key)
+        with self._stats_lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload
+
+    def set(self, key: str, payload: dict):
+        """Store payload (a JSON-serializable dict) under key."""
+        self._set(key, payload)
+
+    def clear(self):
+        self._clear()
+
+    def __len__(self) -> int:
+        return self._size()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self._get(key, touch=False) is not None
+
+    def stats(self) -> dict:
+        entries, size_bytes = self._size()
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "entries": entries,
+                "size_bytes": size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / max(lookups, 1), 2),
+            }
+
+    # ─── Backend hooks ───────────────────────────────────────────
+
+    def _get(self, key: str, touch: bool = True) -> Optional[dict]:
+        return None
+
+    def _set(self, key: str, payload: dict):
+        return None
+
+    def _clear(self):
+        return None
+
+    def _size(self) -> tuple[int, int]:
+        return 0, 0
+
+    # ─── Helpers ─────────────────────────────────────────────────
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and (now - created_at) > self.ttl_seconds
+
+    def _over_limits(self, entries: int, size_bytes: int) -> bool:
+        if self.max_entries and entries > self.max_entries:
+            return True
+        if self.max_bytes and size_bytes > self.max_bytes:
+            return True
+        return False
+
+    def _count_eviction(self, n: int = 1, expired: bool = False):
+        with self._stats_lock:
+            if expired:
+                self.expirations += n
+            else:
+                self.evictions += n
+
+    @staticmethod
+    def _encode(payload: dict) -> str:
+        return json.dumps(payload, separators=(",", ":"))
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU cache bounded by entry count and content bytes."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0, ttl_seconds: float = 0.0):
+        super().__init__(max_entries, max_bytes, ttl_seconds)
+        self._lock = threading.Lock()
+        # key -> (payload, size_bytes, created_at)
+        self._entries: "OrderedDict[str, tuple[dict, int, float]]" = OrderedDict()
+        self._bytes = 0
+
+    def _get(self, key: str, touch: bool = True) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, size, created_at = entry
+            if self._is_expired(created_at, time.time()):
+                del self._entries[key]
+                self._bytes -= size
+                self._count_eviction(expired=True)
+                return None
+            if touch:
+                self._entries.move_to_end(key)
+            return payload
+
+    def _set(self, key: str, payload: dict):
+        size = len(self._encode(payload).encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return  # Would evict everything and still not fit
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (payload, size, time.time())
+            self._bytes += size
+            while self._entries and self._over_limits(len(self._entries), self._bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._count_eviction()
+
+    def _clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _size(self) -> tuple[int, int]:
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Persistent LRU cache in a single SQLite file.
+    Safe to share between processes (perpetual runs, sydyn workers, meta optimizer):
+    every operation opens a short-lived WAL connection, like PersistenceLayer.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = "output/llm_cache.db", max_entries: int = 0,
+                 max_bytes: int = 0, ttl_seconds: float = 0.0):
+        super().__init__(max_entries, max_bytes, ttl_seconds)
+        self.path = path
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._get_conn() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload_json TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access
+                    ON llm_cache(last_access);
+            """)
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _get(self, key: str, touch: bool = True) -> Optional[dict]:
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT payload_json, created_at FROM llm_cache WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                payload_json, created_at = row
+                if self._is_expired(created_at, now):
+                    conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                    self._count_eviction(expired=True)
+                    return None
+                if touch:
+                    conn.execute(
+                        "UPDATE llm_cache SET last_access = ? WHERE cache_key = ?",
+                        (now, key),
+                    )
+        finally:
+            conn.close()
+        try:
+            return json.loads(payload_json)
+        except json.JSONDecodeError:
+            return None
+
+    def _set(self, key: str, payload: dict):
+        payload_json = self._encode(payload)
+        size = len(payload_json.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache "
+                    "(cache_key, payload_json, size_bytes, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload_json, size, now, now),
+                )
+                if self.ttl_seconds:
+                    expired = conn.execute(
+                        "DELETE FROM llm_cache WHERE created_at < ?",
+                        (now - self.ttl_seconds,),
+                    ).rowcount
+                    if expired:
+                        self._count_eviction(expired, expired=True)
+                self._evict_lru(conn)
+        finally:
+            conn.close()
+
+    def _evict_lru(self, conn: sqlite3.Connection):
+        entries, size_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+        ).fetchone()
+        if not self._over_limits(entries, size_bytes):
+            return
+        evicted = 0
+        for cache_key, row_size in conn.execute(
+            "SELECT cache_key, size_bytes FROM llm_cache ORDER BY last_access ASC"
+        ).fetchall():
+            if not self._over_limits(entries, size_bytes):
+                break
+            conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (cache_key,))
+            entries -= 1
+            size_bytes -= row_size
+            evicted += 1
+        if evicted:
+            self._count_eviction(evicted)
+
+    def _clear(self):
+        conn = self._get_conn()
+        try:
+            with conn:
+                conn.execute("DELETE FROM llm_cache")
+        finally:
+            conn.close()
+
+    def _size(self) -> tuple[int, int]:
+        conn = self._get_conn()
+        try:
+            entries, size_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+            ).fetchone()
+        finally:
+            conn.close()
+        return int(entries), int(size_bytes)
+
+
+def create_response_cache(config: Optional[dict] = None) -> ResponseCache:
+    """Build the cache backend described by config (defaults to API_CONFIG)."""
+    if config is None:
+        from config.settings import API_CONFIG
+        config = API_CONFIG
+
+    backend = str(config.get("cache_backend", "memory")).lower()
+    limits = {
+        "max_entries": config.get("cache_max_entries", 0),
+        "max_bytes": config.get("cache_max_bytes", 0),
+        "ttl_seconds": config.get("cache_ttl_seconds", 0),
+    }
+    if backend == "sqlite":
+        return SQLiteResponseCache(path=config.get("cache_path", "output/llm_cache.db"), **limits)
+    if backend == "memory":
+        return MemoryResponseCache(**limits)
+    if backend == "none":
+        return ResponseCache()
+    raise ValueError(f"Unknown cache_backend '{backend}'. Must be 'memory', 'sqlite', or 'none'.")
@@ -0,0 +1,127 @@
+"""
+Atlantis LLM Cassettes
+=======================
+Record / replay of real LLM traffic for offline benchmarking.
+
+`local` and `dry-run` modes return canned text, so they cannot reproduce
+the payload sizes or timing of a real sydyn query or perpetual cycle.
+A cassette can do that:
+
+- record: LLMProvider talks to the API as usual and appends every fresh
+  response (content, usage, latency) to the cassette,
+  keyed by the same cache key the response cache uses
+- replay: LLMProvider serves responses from the cassette by cache key,
+  optionally sleeping for the recorded latency (latency_scale), and
+  never touches the network
+
+Cassettes are gzip-compressed JSON lines when the path ends in ".gz",
+plain JSON lines otherwise. A key recorded several times replays its
+responses in order, then keeps returning the last one.
+"""
+
+import atexit
+import gzip
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+class Cassette:
+    """One cassette file, opened for recording or replaying."""
+
+    def __init__(self, path: str, mode: str, latency_scale: float = 1.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Cassette mode must be '{RECORD}' or '{REPLAY}', got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._entries: dict[str, deque] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._file = None
+
+        if mode == REPLAY:
+            if not self.path.exists():
+                raise FileNotFoundError(f"Cassette not found: {self.path}")
+            with _open(self.path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], deque()).append(entry)
+        else:
+            # A recording session starts a fresh cassette
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = _open(self.path, "w")
+            atexit.register(self.close)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def record(self, key: str, response, task_type: str = "unknown"):
+        """Append one fresh response (an LLMResponse) under its cache key."""
+        entry = {
+            "key": key,
+            "task_type": task_type,
+            "model": response.model,
+            "content": response.content,
+            "input_tokens": response.input_tokens,
+            "output_tokens": response.output_tokens,
+            "cache_read_tokens": response.cache_read_tokens,
+            "cache_write_tokens": response.cache_write_tokens,
+            "latency_ms": round(response.latency_ms, 1),
+            "batched": response.batched,
+            "stop_reason": response.stop_reason,
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            # Flush per entry so an interrupted run still leaves a readable cassette
+            self._file.flush()
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Next recorded entry for key (the last one repeats), or None on a miss."""
+        with self._lock:
+            queue = self._entries.get(key)
+            if not queue:
+                self.misses += 1
+                return None
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+            self.replayed += 1
+            return entry
+
+    def replay_delay_s(self, entry: dict) -> float:
+        return max(entry.get("latency_ms", 0.0), 0.0) * self.latency_scale / 1000
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": str(self.path),
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+                "keys": len(self._entries),
+            }
@@ -0,0 +1,172 @@
+"""
+Atlantis Circuit Breakers
+==========================
+Process-wide circuit breaker per model tier, shared by every LLMProvider.
+
+Without a breaker, an overloaded tier (529s, timeouts) makes every caller
+retry on its own schedule with long sleeps, and worker threads pile up.
+Each breaker tracks the outcomes of recent API attempts:
+
+- closed:    calls flow; once the overload/5xx/timeout error rate over
+             the last `window_seconds` (rate limits don't count) reaches `error_rate` (with at least
+             `min_requests` attempts), the breaker opens
+- open:      calls are refused immediately (LLMOverloadedException) for
+             `open_seconds`; ModelRouter reroutes eligible task types to
+             their fallback tier (MODEL_FALLBACK_ALLOCATION) and answers the
+             rest with the usual [LLM ERROR] placeholder
+- half_open: one probe call at a time is let through; a success closes
+             the breaker, a failure re-opens it
+
+Settings live in API_CONFIG["circuit_*"] (config/settings.py).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from config.settings import API_CONFIG, MODEL_IDS
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Error-rate breaker for one model tier."""
+
+    def __init__(self, error_rate: float = 0.5, min_requests: int = 10,
+                 window_seconds: float = 60.0, open_seconds: float = 30.0):
+        self.error_rate = error_rate
+        self.min_requests = min_requests
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool]] = deque()  # (monotonic time, failed)
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self.trips = 0
+        self.rejected = 0
+
+    def _prune(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._probe_started = None
+        self._outcomes.clear()
+        self.trips += 1
+
+    def allow(self) -> bool:
+        """May a call go out now? In half-open state only one probe at a time is admitted."""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN and now - self._opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probe_started = None
+            if self.state == HALF_OPEN:
+                # A probe that never reported back (e.g. a 400) must not wedge the breaker
+                if self._probe_started is None or now - self._probe_started >= self.open_seconds:
+                    self._probe_started = now
+                    return True
+            if self.state == CLOSED:
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        now = time.monotonic()
+        with self._lock:
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self._outcomes.clear()
+                self._probe_started = None
+            self._outcomes.append((now, False))
+            self._prune(now)
+
+    def record_failure(self):
+        """Record a transient (overload / timeout) failure; may trip the breaker."""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open(now)
+                return
+            if self.state == OPEN:
+                return
+            self._outcomes.append((now, True))
+            self._prune(now)
+            failures = sum(1 for _, failed in self._outcomes if failed)
+            if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.error_rate:
+                self._open(now)
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self._opened_at < self.open_seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "trips": self.trips, "rejected": self.rejected}
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per model tier, created on first use."""
+
+    def __init__(self, enabled: Optional[bool] = None, **breaker_kwargs):
+        self.enabled = API_CONFIG.get("circuit_breaker_enabled", True) if enabled is None else enabled
+        self._kwargs = breaker_kwargs or {
+            "error_rate": API_CONFIG.get("circuit_error_rate", 0.5),
+            "min_requests": API_CONFIG.get("circuit_min_requests", 10),
+            "window_seconds": API_CONFIG.get("circuit_window_seconds", 60.0),
+            "open_seconds": API_CONFIG.get("circuit_open_seconds", 30.0),
+        }
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._tier_by_model = {model_id: tier for tier, model_id in MODEL_IDS.items()}
+
+    def get(self, model: str) -> CircuitBreaker:
+        tier = self._tier_by_model.get(model, model)
+        with self._lock:
+            breaker = self._breakers.get(tier)
+            if breaker is None:
+                breaker = self._breakers[tier] = CircuitBreaker(**self._kwargs)
+            return breaker
+
+    def allow(self, model: str) -> bool:
+        return not self.enabled or self.get(model).allow()
+
+    def record_success(self, model: str):
+        if self.enabled:
+            self.get(model).record_success()
+
+    def record_failure(self, model: str):
+        if self.enabled:
+            self.get(model).record_failure()
+
+    def is_open(self, model: str) -> bool:
+        return self.enabled and self.get(model).is_open()
+
+    def stats(self) -> dict:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {tier: breaker.stats() for tier, breaker in breakers.items()}
+
+
+_breakers: Optional[CircuitBreakers] = None
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakers:
+    global _breakers
+    if _breakers is None:
+        with _breakers_lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers()
+    return _breakers
+
+
+def reset_circuit_breakers():
+    global _breakers
+    _breakers = None
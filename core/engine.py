@@ -31,7 +31,9 @@ from config.settings import (
     V1_DATA_PATHS, OUTPUT_DIRS,
     MODEL_ALLOCATION,
     SENATE_PAIR_SUPERMAJORITY,
+    API_CONFIG,
 )
+from core.llm import PromptSegment
 from core.models import ModelRouter
 from core.persistence import PersistenceLayer
 from agents.base import AgentConfig, FounderProfile, get_all_founder_profiles
@@ -61,6 +63,9 @@ class AtlantisEngine:
         demo_electrical: bool = False,
         demo_10_domains: bool = False,
         with_founding: bool = False,
+        batch: bool = False,
+        cassette_mode: Optional[str] = None,
+        cassette_path: Optional[str] = None,
     ):
         self._check_v1_data(force_clean)
         self.constitution_text = self._load_constitution()
@@ -72,6 +77,8 @@ class AtlantisEngine:
         self.demo_electrical = demo_electrical
         self.demo_10_domains = demo_10_domains
         self.with_founding = with_founding
+        self.batch = batch
+        self.cassette_mode = cassette_mode
         self.output_dir = Path("output")
         self._initialize_run_folder()
         self._prepare_output_workspace()
@@ -81,6 +88,9 @@ class AtlantisEngine:
             api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
             mock_mode=mock,
             dry_run=dry_run,
+            batch_mode=batch,
+            cassette_mode=cassette_mode,
+            cassette_path=cassette_path,
         )
         self.content_gen = ContentGenerator(
             output_dir=str(self.output_dir / "content"),
@@ -96,6 +106,8 @@ class AtlantisEngine:
         print(f"{'='*60}")
         print(f"\n  Constitution: {len(self.constitution_text)} chars")
         mode = "MOCK" if self.mock else ("DRY-RUN" if self.dry_run else "PRODUCTION")
+        if self.cassette_mode:
+            mode += f" ({self.cassette_mode.upper()} CASSETTE)"
         print(f"  Config: {mode}")
         print(f"  Target pairs: {self.config['founding_era_target_pairs']}")
         print(f"  Governance cycles: {self.config['governance_cycles'] or 'indefinite'}")
@@ -586,14 +598,22 @@ class AtlantisEngine:
         return content.startswith("YES")
 
 
-    def _phase1_system_prompt(self, fc: AgentConfig) -> str:
-        """Compact Phase 1 system prompt with only pair-formation constitutional rules."""
-        return (
-            f"You are {fc.name}, serving in the Founding Senate of Atlantis.\n"
-            f"Mandate: {fc.mandate}\n\n"
-            "Constitution extract (pair formation only):\n"
-            f"{self.phase1_constitution_extract}"
-        )
+    def _phase1_system_prompt(self, fc: AgentConfig) -> List[PromptSegment]:
+        """
+        Compact Phase 1 system prompt with only pair-formation constitutional rules.
+        The extract is identical for every founder, so it leads as a cacheable prefix.
+        """
+        return [
+            PromptSegment(
+                "Constitution extract (pair formation only):\n"
+                f"{self.phase1_constitution_extract}",
+                cache=True,
+            ),
+            PromptSegment(
+                f"You are {fc.name}, serving in the Founding Senate of Atlantis.\n"
+                f"Mandate: {fc.mandate}"
+            ),
+        ]
 
     @staticmethod
     def _build_phase1_constitution_extract() -> str:
@@ -776,12 +796,21 @@ class AtlantisEngine:
         cost_summary_path = self.output_dir / "cost_summary.json"
         cost_summary_path.write_text(json.dumps(stats, indent=2), encoding="utf-8")
 
+        latency_summary = {
+            "by_task_type": stats.get("latency_by_task_type", {}),
+            "by_model_tier": stats.get("latency_by_model_tier", {}),
+        }
+        latency_summary_path = self.output_dir / "latency_summary.json"
+        latency_summary_path.write_text(json.dumps(latency_summary, indent=2), encoding="utf-8")
+
         run_config = {
             "system": SYSTEM_NAME,
             "version": VERSION,
             "mode": "MOCK" if self.mock else ("DRY-RUN" if self.dry_run else "PRODUCTION"),
             "mock": self.mock,
             "dry_run": self.dry_run,
+            "batch": self.batch,
+            "cassette": self.cassette_mode,
             "config": self.config,
         }
         run_config_path = self.output_dir / "run_config.json"
@@ -794,6 +823,7 @@ class AtlantisEngine:
             "content",
             "logs",
             "cost_summary.json",
+            "latency_summary.json",
             "run_config.json",
             "executive_summary.md",
         ]
@@ -1017,6 +1047,19 @@ def main(argv=None):
         "--with-founding", action="store_true",
         help="Include Phase 0 (Founding Period with 100 founding claims). Skipped by default to save ~30-40%% cost."
     )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Send independent offline calls (abstraction pass) through the Message Batches API at 50%% cost"
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record-cassette", nargs="?", const=API_CONFIG["cassette_path"], metavar="PATH",
+        help="Call the API and record every LLM request/response to a cassette (default: %(const)s)"
+    )
+    cassette.add_argument(
+        "--replay-cassette", nargs="?", const=API_CONFIG["cassette_path"], metavar="PATH",
+        help="Replay a recorded cassette offline instead of calling the API (default: %(const)s)"
+    )
     args = parser.parse_args(argv)
 
     if args.mock:
@@ -1037,5 +1080,8 @@ def main(argv=None):
         demo_electrical=args.demo_electrical,
         demo_10_domains=args.demo_10_domains,
         with_founding=args.with_founding,
+        batch=args.batch,
+        cassette_mode="record" if args.record_cassette else ("replay" if args.replay_cassette else None),
+        cassette_path=args.record_cassette or args.replay_cassette,
     )
     engine.run()
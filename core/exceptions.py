@@ -20,6 +20,11 @@ class LLMRateLimitException(AtlantisException):
     pass
 
 
+class LLMOverloadedException(AtlantisException):
+    """Raised when a model tier's circuit breaker is open and refuses the call."""
+    pass
+
+
 class ConstitutionalViolationException(AtlantisException):
     """Raised when State/City/Town constitution violates parent constitution."""
     pass
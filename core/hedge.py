@@ -0,0 +1,135 @@
+"""
+Atlantis Hedged Requests
+=========================
+Tail-latency control for single LLM calls.
+
+A hedged call starts the request and, if it has not returned after
+`hedge_after_s` (ModelRouter uses the task type's observed p95), fires
+one duplicate. The first successful response wins; the loser is
+cancelled. Async losers are cancelled outright. A sync loser's HTTP
+request cannot be aborted from another thread, so it is abandoned and
+its tokens are counted as wasted when it lands.
+
+Only the API path is hedged. Errors fall through to the caller's retry
+loop once both attempts have failed.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Optional
+
+
+def _tokens(result: Any) -> int:
+    return getattr(result, "total_tokens", 0) or 0
+
+
+class Hedger:
+    """Runs calls with an optional duplicate after a delay; first success wins."""
+
+    def __init__(self, max_workers: int = 32):
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.losers_cancelled = 0
+        self.wasted_tokens = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="llm-hedge")
+            return self._pool
+
+    def _count(self, hedged: bool = False, hedge_won: bool = False, cancelled: int = 0, wasted: int = 0):
+        with self._lock:
+            self.hedged += int(hedged)
+            self.hedge_wins += int(hedge_won)
+            self.losers_cancelled += cancelled
+            self.wasted_tokens += wasted
+
+    def _count_abandoned(self, future: Future):
+        """Done-callback for a sync loser: its tokens were billed for nothing."""
+        if not future.cancelled() and future.exception() is None:
+            self._count(wasted=_tokens(future.result()))
+
+    def call(self, fn: Callable[[], Any], hedge_after_s: float,
+             before_hedge: Optional[Callable[[], Any]] = None) -> Any:
+        """Run fn(); after hedge_after_s without a result, race a second fn()."""
+        with self._lock:
+            self.calls += 1
+        pool = self._get_pool()
+        primary = pool.submit(fn)
+        if wait([primary], timeout=hedge_after_s).done:
+            return primary.result()
+        if before_hedge:
+            before_hedge()
+        if primary.done():
+            return primary.result()
+
+        hedge = pool.submit(fn)
+        self._count(hedged=True)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is None:
+                error = next(iter(done)).exception()
+                continue
+            for loser in pending:
+                if not loser.cancel():
+                    loser.add_done_callback(self._count_abandoned)
+            self._count(hedge_won=winner is hedge, cancelled=len(pending))
+            return winner.result()
+        raise error
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], hedge_after_s: float,
+                    before_hedge: Optional[Callable[[], Awaitable[Any]]] = None,
+                    cancelled_cost: int = 0) -> Any:
+        """Async call(): the loser task is cancelled and charged `cancelled_cost` tokens."""
+        with self._lock:
+            self.calls += 1
+        primary = asyncio.ensure_future(fn())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after_s)
+            if done:
+                return primary.result()
+            if before_hedge:
+                await before_hedge()
+            if primary.done():
+                return primary.result()
+
+            hedge = asyncio.ensure_future(fn())
+            tasks.add(hedge)
+            self._count(hedged=True)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is None:
+                    error = next(iter(done)).exception()
+                    continue
+                self._count(hedge_won=winner is hedge, cancelled=len(pending),
+                            wasted=cancelled_cost * len(pending))
+                return winner.result()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_rate": round(self.hedged / max(self.calls, 1), 3),
+                "hedge_wins": self.hedge_wins,
+                "losers_cancelled": self.losers_cancelled,
+                "wasted_tokens": self.wasted_tokens,
+            }
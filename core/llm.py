@@ -4,19 +4,26 @@ Atlantis LLM Integration
 Abstracted LLM layer with:
 - Real API calls (Anthropic Claude) when API key is available
 - Local simulation mode for testing without API access
-- 1-SECOND RATE LIMITING between API calls
+- Per-tier token-bucket rate limiting (RPM + TPM, shared across threads)
 - Token counting and cost tracking
-- Response caching
+- Response caching (pluggable, size-bounded backends in core/cache.py)
+- Single-flight de-duplication of concurrent identical requests
+- Anthropic prompt caching for static system-prompt prefixes (PromptSegment)
+- Streaming completions (stream() yields token deltas, then the full response)
 
 All agent thinking goes through this layer.
 """
 
 import os
+import re
 import json
 import time
+import asyncio
 import hashlib
+import dataclasses
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 from dataclasses import dataclass
 
 try:
@@ -26,7 +33,14 @@ except ImportError:
     HAS_ANTHROPIC = False
 
 from config.settings import API_CONFIG
-from core.exceptions import LLMTimeoutException, LLMRateLimitException
+from core.batch import BatchRequest, LocalBatchServer, run_batch
+from core.cache import ResponseCache, create_response_cache
+from core.cassette import RECORD, REPLAY, Cassette
+from core.circuit import CircuitBreakers, get_circuit_breakers
+from core.exceptions import LLMOverloadedException, LLMTimeoutException, LLMRateLimitException
+from core.hedge import Hedger
+from core.ratelimit import RateLimiter, get_rate_limiter
+from core.singleflight import SingleFlight
 
 
 def _safe_retry_after_seconds(error: Exception) -> float:
@@ -51,6 +65,49 @@ def _safe_retry_after_seconds(error: Exception) -> float:
     return 0.0
 
 
+@dataclass(frozen=True)
+class PromptSegment:
+    """
+    One block of a structured system prompt.
+
+    cache=True marks the end of a static prefix (constitution extract, role
+    prompt) that the API may cache; everything up to and including the block
+    is reused on later calls with the same prefix. Put static segments first.
+    """
+    text: str
+    cache: bool = False
+
+
+SystemPrompt = Union[str, list[PromptSegment]]
+
+# Anthropic allows at most four cache_control breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+
+def prompt_text(system_prompt: SystemPrompt) -> str:
+    """Flatten a structured system prompt to plain text (cache keys, local sim, logs)."""
+    if isinstance(system_prompt, str):
+        return system_prompt
+    return "\n".join(segment.text for segment in system_prompt)
+
+
+def system_param(system_prompt: SystemPrompt, caching: Optional[bool] = None):
+    """Build the Messages API `system` argument, marking cacheable segments."""
+    if isinstance(system_prompt, str):
+        return system_prompt
+    if caching is None:
+        caching = API_CONFIG.get("prompt_caching", True)
+    cached_indexes = [i for i, segment in enumerate(system_prompt) if segment.cache] if caching else []
+    breakpoints = set(cached_indexes[-MAX_CACHE_BREAKPOINTS:])
+    blocks = []
+    for i, segment in enumerate(system_prompt):
+        block = {"type": "text", "text": segment.text}
+        if i in breakpoints:
+            block["cache_control"] = {"type": "ephemeral"}
+        blocks.append(block)
+    return blocks
+
+
 @dataclass
 class LLMResponse:
     """Standardized response from any LLM provider."""
@@ -61,6 +118,24 @@ class LLMResponse:
     model: str
     latency_ms: float
     cached: bool = False
+    batched: bool = False  # Served through the Message Batches API (discounted)
+    cache_read_tokens: int = 0   # Prompt-cache hits (billed at a fraction of input)
+    cache_write_tokens: int = 0  # Prompt-cache writes (billed at a premium)
+    rate_limit_wait_ms: float = 0.0  # Time blocked on the rate limiter for this call
+    retry_backoff_ms: float = 0.0    # Time slept between retries (included in latency_ms)
+    retries: int = 0
+    fallback_from: str = ""  # Model originally routed to when a circuit breaker forced a fallback
+    stop_reason: str = ""    # "end_turn", "max_tokens", ... ("" for simulated responses)
+
+
+@dataclass
+class StreamChunk:
+    """
+    One item from LLMProvider.stream(): a token delta, or — on the final
+    chunk only — the complete LLMResponse with usage.
+    """
+    text: str = ""
+    response: Optional[LLMResponse] = None
 
 
 class LLMProvider:
@@ -69,11 +144,27 @@ class LLMProvider:
     Handles API calls, token counting, rate limiting, caching, and cost tracking.
     """
 
-    def __init__(self, api_key: Optional[str] = None, mode: str = "auto"):
+    def __init__(self, api_key: Optional[str] = None, mode: str = "auto",
+                 cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 circuit_breakers: Optional[CircuitBreakers] = None,
+                 cassette: Optional[Cassette] = None,
+                 base_url: Optional[str] = None):
         # Simplified: only check os.environ, let main entry point handle load_dotenv()
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY", "")
         self.client = None
         self.mode = mode
+        self.base_url = base_url or API_CONFIG.get("base_url")
+
+        # Cassettes: "record" is API mode plus a cassette writer; "replay" never
+        # touches the network and serves recorded responses by cache key.
+        self.cassette = cassette
+        if mode in (RECORD, REPLAY):
+            self.cassette = cassette or Cassette(
+                API_CONFIG.get("cassette_path", "output/llm_cassette.jsonl.gz"), mode,
+                latency_scale=API_CONFIG.get("cassette_replay_latency_scale", 1.0),
+            )
+            self.mode = "api" if mode == RECORD else REPLAY
 
         if mode == "auto":
             if self.api_key and HAS_ANTHROPIC:
@@ -88,7 +179,10 @@ class LLMProvider:
             )
 
         if self.mode == "api" and HAS_ANTHROPIC and self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = anthropic.Anthropic(api_key=self.api_key, base_url=self.base_url)
+        # AsyncAnthropic for acomplete(), created lazily on first use
+        self._async_client = None
+        self._async_client_loop = None
 
         self._error_log_path = Path("output/logs/api_errors.log")
 
@@ -99,125 +193,573 @@ class LLMProvider:
             "claude-opus-4-6": {"input": 15.00, "output": 75.00},
         }
 
-        # Stats
+        # Stats (guarded by _stats_lock — providers are shared across threads)
+        self._stats_lock = threading.Lock()
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_cache_read_tokens = 0
+        self.total_cache_write_tokens = 0
         self.total_cost_usd = 0.0
         self.call_count = 0
 
-        # Response cache
-        self._cache: dict[str, LLMResponse] = {}
+        # Response cache — backend from API_CONFIG["cache_backend"] unless injected
+        self._cache: ResponseCache = cache if cache is not None else create_response_cache()
         self.cache_hits = 0
+        # In-flight table keyed like the cache: concurrent identical calls share one API call
+        self._inflight = SingleFlight()
 
         # ═══ RATE LIMITING ═══
-        # 1-second minimum between API calls
-        self._last_call_time = 0.0
-        self._rate_limit_seconds = API_CONFIG.get("rate_limit_seconds", 1.0)
+        # Token buckets per model tier, shared by every provider in the process
+        self._rate_limiter = rate_limiter or get_rate_limiter()
         self._rate_limit_enabled = API_CONFIG.get("rate_limit_enabled", True)
         self._rate_limit_waits = 0  # Track how often we had to wait
-
-    def _enforce_rate_limit(self):
-        """Enforce 1-second minimum between API calls."""
+        self._rate_limit_wait_s = 0.0
+        # Circuit breakers per model tier, shared process-wide like the limiter
+        self._breakers = circuit_breakers or get_circuit_breakers()
+
+        # Message Batches (complete_batch); batch_api overrides client.messages.batches
+        self.batch_api = None
+        self.batches_submitted = 0
+        self.batched_calls = 0
+        self.streamed_calls = 0
+
+        # Hedged requests (hedge_after_s) and caller deadlines (deadline_s)
+        self._hedger = Hedger()
+        self.deadline_exceeded = 0
+
+    def _enforce_rate_limit(self, model: str, estimated_tokens: int = 0) -> float:
+        """Reserve RPM/TPM capacity for this model tier, sleeping only for our own deficit.
+        Returns the seconds slept."""
         if not self._rate_limit_enabled:
-            return
+            return 0.0
         if self.mode != "api":
-            return  # No rate limiting for local sim
+            return 0.0  # No rate limiting for local sim
 
-        now = time.time()
-        elapsed = now - self._last_call_time
-        if elapsed < self._rate_limit_seconds:
-            wait_time = self._rate_limit_seconds - elapsed
-            self._rate_limit_waits += 1
-            time.sleep(wait_time)
+        waited = self._rate_limiter.acquire(model, estimated_tokens)
+        if waited > 0:
+            with self._stats_lock:
+                self._rate_limit_waits += 1
+                self._rate_limit_wait_s += waited
+        return waited
 
-        self._last_call_time = time.time()
+    @staticmethod
+    def _estimate_tokens(system_prompt: str, user_prompt: str, max_tokens: int) -> int:
+        """Pre-call TPM reservation: ~4 chars per input token plus the full output budget."""
+        return (len(system_prompt) + len(user_prompt)) // 4 + max_tokens
 
-    def complete(self, system_prompt: str, user_prompt: str,
-                 max_tokens: int = None, temperature: float = None,
-                 model: str = None, task_type: str = "unknown") -> LLMResponse:
-        """
-        Send a completion request to the LLM.
-        This is the ONLY way agents communicate with the LLM.
-        """
+    # Retry policy shared by complete() and acomplete()
+    MAX_RETRIES = 3
+    BACKOFF_SCHEDULE = [5.0, 15.0, 45.0]
+
+    def _resolve_params(self, max_tokens: Optional[int], temperature: Optional[float],
+                        model: Optional[str]) -> tuple[str, int, float]:
         model = model or API_CONFIG["model"]
         max_tokens = max_tokens or API_CONFIG["max_tokens"]
         temperature = temperature if temperature is not None else API_CONFIG["temperature"]
+        return model, max_tokens, temperature
 
-        # Check cache first (before rate limiting)
-        cache_key = self._cache_key(system_prompt, user_prompt, model)
-        if cache_key in self._cache:
+    def _cached_response(self, cache_key: str, model: str) -> Optional[LLMResponse]:
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            return None
+        with self._stats_lock:
             self.cache_hits += 1
-            cached = self._cache[cache_key]
+        return LLMResponse(
+            content=cached["content"],
+            input_tokens=0,
+            output_tokens=0,
+            total_tokens=0,
+            model=model,
+            latency_ms=0,
+            cached=True
+        )
+
+    @staticmethod
+    def _record_timings(response: LLMResponse, waited_s: float, backoff_s: float, retries: int):
+        response.rate_limit_wait_ms = waited_s * 1000
+        response.retry_backoff_ms = backoff_s * 1000
+        response.retries = retries
+
+    @staticmethod
+    def _joined_response(response: LLMResponse) -> LLMResponse:
+        """Follower's copy of the leader's response: same content, no tokens billed."""
+        return dataclasses.replace(
+            response,
+            input_tokens=0, output_tokens=0, total_tokens=0,
+            cache_read_tokens=0, cache_write_tokens=0,
+            cached=True,
+        )
+
+    def _print_dry_run(self, system_prompt: str, user_prompt: str, max_tokens: int, model: str):
+        print("\n[DRY RUN] LLM Call")
+        print(f"model: {model}")
+        print(f"max_tokens: {max_tokens}")
+        print("system_prompt:")
+        print(system_prompt)
+        print("user_prompt:")
+        print(user_prompt)
+
+    def _retry_wait(self, error: Exception, attempt: int, model: str, task_type: str,
+                    deadline: Optional[float] = None) -> Optional[float]:
+        """Seconds to back off before retrying `error`, or None if it must not be retried."""
+        transient = self._should_retry_transient_error(error)
+        if transient and self.mode == "api" and self._is_overload_error(error):
+            # Overloads trip the tier's breaker; once open, stop retrying so the
+            # router can fall back instead of every caller sleeping on its own.
+            self._breakers.record_failure(model)
+            if self._breakers.is_open(model):
+                self._log_error("circuit_open", model, error, 0.0)
+                raise LLMOverloadedException(f"Circuit open for {model} after {error}")
+        if not (transient and attempt < self.MAX_RETRIES):
+            return None
+        # Server-provided retry-after wins over the fixed schedule and
+        # pauses every other caller of this tier, not just this thread.
+        retry_after = _safe_retry_after_seconds(error)
+        wait = retry_after or self.BACKOFF_SCHEDULE[attempt]
+        if deadline is not None and time.time() + wait >= deadline:
+            # The caller's budget runs out before the retry could start
+            self._deadline_exceeded(model, task_type, error)
+        self._rate_limiter.penalize(model, retry_after)
+        self._log_error("transient_retry", model, error, wait)
+        print(f"Retry {attempt + 1}/3 for {task_type} after {error}")
+        return wait
+
+    def _attempt_timeout(self, task_type: str, model: str, deadline: Optional[float]) -> float:
+        """
+        HTTP timeout for one attempt: the task default, capped by the caller's
+        remaining budget. Also the gate for the model's circuit breaker.
+        """
+        if not self._breakers.allow(model):
+            raise LLMOverloadedException(f"Circuit open for {model}; refusing {task_type} call")
+        timeout = self._timeout_for(task_type)
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            self._deadline_exceeded(model, task_type, TimeoutError("caller deadline exceeded"))
+        return min(timeout, remaining)
+
+    def _deadline_exceeded(self, model: str, task_type: str, error: Exception):
+        with self._stats_lock:
+            self.deadline_exceeded += 1
+        self._log_error("deadline", model, error, 0.0)
+        raise LLMTimeoutException(f"Deadline exceeded for {task_type}: {error}")
+
+    def _error_response(self, error: Exception, model: str) -> LLMResponse:
+        """Terminal failure: raise on timeout, otherwise return an error placeholder."""
+        if self._is_timeout_error(error):
+            self._log_error("timeout", model, error, 0.0)
+            raise LLMTimeoutException(f"API timeout after {self.MAX_RETRIES} retries")
+
+        self._log_error("unhandled", model, error, 0.0)
+        # Last resort - return error response
+        return LLMResponse(
+            content=f"[LLM ERROR: {str(error)}]",
+            input_tokens=0, output_tokens=0, total_tokens=0,
+            model=model, latency_ms=0
+        )
+
+    def _finalize(self, response: LLMResponse, start: float, cache_key: str,
+                  model: str, estimated_tokens: int, task_type: str = "unknown") -> LLMResponse:
+        """Latency, limiter reconciliation, stats, cost, cache and cassette write for a fresh response."""
+        response.latency_ms = (time.time() - start) * 1000
+        if self.mode == "api" and self._rate_limit_enabled and not response.batched:
+            self._rate_limiter.record_usage(model, estimated_tokens, response.total_tokens)
+
+        # Track stats
+        with self._stats_lock:
+            self.total_input_tokens += response.input_tokens
+            self.total_output_tokens += response.output_tokens
+            self.total_cache_read_tokens += response.cache_read_tokens
+            self.total_cache_write_tokens += response.cache_write_tokens
+            self.call_count += 1
+            self._track_cost(response)
+
+        # Cache the response (never persist error placeholders). A truncated
+        # response is not cached, so a re-run with a larger budget reaches the
+        # API; the cassette keeps it so replay repeats the same re-run.
+        if not response.content.startswith("[LLM ERROR"):
+            if response.stop_reason != "max_tokens":
+                self._cache.set(cache_key, {"content": response.content, "model": response.model})
+            if self.cassette is not None and self.cassette.recording:
+                self.cassette.record(cache_key, response, task_type)
+
+        return response
+
+    def _replay(self, cache_key: str, model: str) -> tuple[LLMResponse, float]:
+        """Recorded response for cache_key plus the latency to emulate (replay mode)."""
+        entry = self.cassette.lookup(cache_key)
+        if entry is None:
+            self._log_error("cassette_miss", model, KeyError(cache_key), 0.0)
             return LLMResponse(
-                content=cached.content,
-                input_tokens=0,
-                output_tokens=0,
-                total_tokens=0,
-                model=model,
-                latency_ms=0,
-                cached=True
-            )
+                content=f"[LLM ERROR: no cassette entry for {cache_key}]",
+                input_tokens=0, output_tokens=0, total_tokens=0,
+                model=model, latency_ms=0
+            ), 0.0
+        return LLMResponse(
+            content=entry["content"],
+            input_tokens=entry["input_tokens"],
+            output_tokens=entry["output_tokens"],
+            total_tokens=entry["input_tokens"] + entry["output_tokens"],
+            model=entry["model"],
+            latency_ms=0,
+            cache_read_tokens=entry.get("cache_read_tokens", 0),
+            cache_write_tokens=entry.get("cache_write_tokens", 0),
+            stop_reason=entry.get("stop_reason", ""),
+        ), self.cassette.replay_delay_s(entry)
+
+    def complete(self, system_prompt: SystemPrompt, user_prompt: str,
+                 max_tokens: int = None, temperature: float = None,
+                 model: str = None, task_type: str = "unknown",
+                 deadline_s: Optional[float] = None,
+                 hedge_after_s: Optional[float] = None) -> LLMResponse:
+        """
+        Send a completion request to the LLM.
+        This is the ONLY way agents communicate with the LLM.
+
+        system_prompt may be a plain string or a list of PromptSegments;
+        segments with cache=True are sent with cache_control.
 
+        deadline_s caps the whole call (waits, attempts and backoff) to the
+        caller's remaining budget; LLMTimeoutException is raised once it is
+        spent. hedge_after_s fires one duplicate request if an attempt has
+        not returned after that many seconds; the first response wins.
+        """
+        deadline = time.time() + deadline_s if deadline_s is not None else None
+        model, max_tokens, temperature = self._resolve_params(max_tokens, temperature, model)
+        system_text = prompt_text(system_prompt)
+
+        # Check cache first (before rate limiting)
+        cache_key = self._cache_key(system_text, user_prompt, model, temperature)
+        cached = self._cached_response(cache_key, model)
+        if cached is not None:
+            return cached
+
+        # ═══ SINGLE-FLIGHT ═══ followers wait for an identical in-flight call
+        response, joined = self._inflight.do(cache_key, lambda: self._complete_uncached(
+            system_prompt, system_text, user_prompt, max_tokens, temperature, model, task_type, cache_key,
+            deadline, hedge_after_s,
+        ))
+        return self._joined_response(response) if joined else response
+
+    def _complete_uncached(self, system_prompt: SystemPrompt, system_text: str, user_prompt: str,
+                           max_tokens: int, temperature: float, model: str, task_type: str,
+                           cache_key: str, deadline: Optional[float] = None,
+                           hedge_after_s: Optional[float] = None) -> LLMResponse:
+        """complete() after a cache miss: rate limit, call with retries, finalize."""
         # ═══ RATE LIMIT ═══
-        self._enforce_rate_limit()
+        estimated_tokens = self._estimate_tokens(system_text, user_prompt, max_tokens)
+        waited = self._enforce_rate_limit(model, estimated_tokens)
+        backoff = 0.0
+        attempt = 0
 
         # Route to appropriate backend with retry logic
         start = time.time()
 
         if self.mode == "dry-run":
-            print("\n[DRY RUN] LLM Call")
-            print(f"model: {model}")
-            print(f"max_tokens: {max_tokens}")
-            print("system_prompt:")
-            print(system_prompt)
-            print("user_prompt:")
-            print(user_prompt)
-            response = self._simulate_local(system_prompt, user_prompt, max_tokens, model)
+            self._print_dry_run(system_text, user_prompt, max_tokens, model)
+            response = self._simulate_local(system_text, user_prompt, max_tokens, model)
         else:
-            max_retries = 3
-            backoff_schedule = [5.0, 15.0, 45.0]
-            attempt = 0
             while True:
                 try:
                     if self.mode == "api" and self.client:
-                        response = self._call_api(system_prompt, user_prompt, max_tokens, temperature, model, task_type)
+                        timeout = self._attempt_timeout(task_type, model, deadline)
+                        call = lambda: self._call_api(
+                            system_prompt, user_prompt, max_tokens, temperature, model, task_type, timeout
+                        )
+                        if hedge_after_s is not None and hedge_after_s < timeout:
+                            response = self._hedger.call(
+                                call, hedge_after_s,
+                                before_hedge=lambda: self._enforce_rate_limit(model, estimated_tokens),
+                            )
+                        else:
+                            response = call()
+                    elif self.mode == REPLAY:
+                        response, delay = self._replay(cache_key, model)
+                        time.sleep(delay)
                     else:
-                        response = self._simulate_local(system_prompt, user_prompt, max_tokens, model)
+                        response = self._simulate_local(system_text, user_prompt, max_tokens, model)
                     break
+                except (LLMTimeoutException, LLMOverloadedException):
+                    raise
                 except Exception as e:
-                    if self._should_retry_transient_error(e) and attempt < max_retries:
-                        wait = backoff_schedule[attempt]
-                        attempt += 1
-                        self._log_error("transient_retry", model, e, wait)
-                        print(f"Retry {attempt}/3 for {task_type} after {e}")
-                        time.sleep(wait)
-                        continue
-
-                    if self._is_timeout_error(e):
-                        self._log_error("timeout", model, e, 0.0)
-                        raise LLMTimeoutException(f"API timeout after {max_retries} retries")
-
-                    self._log_error("unhandled", model, e, 0.0)
-                    # Last resort - return error response
-                    response = LLMResponse(
-                        content=f"[LLM ERROR: {str(e)}]",
-                        input_tokens=0, output_tokens=0, total_tokens=0,
-                        model=model, latency_ms=0
-                    )
+                    wait = self._retry_wait(e, attempt, model, task_type, deadline)
+                    if wait is None:
+                        response = self._error_response(e, model)
+                        break
+                    attempt += 1
+                    backoff += wait
+                    time.sleep(wait)
+                    waited += self._enforce_rate_limit(model, estimated_tokens)
+
+        self._record_timings(response, waited, backoff, attempt)
+        return self._finalize(response, start, cache_key, model, estimated_tokens, task_type)
+
+    async def acomplete(self, system_prompt: SystemPrompt, user_prompt: str,
+                        max_tokens: int = None, temperature: float = None,
+                        model: str = None, task_type: str = "unknown",
+                        deadline_s: Optional[float] = None,
+                        hedge_after_s: Optional[float] = None) -> LLMResponse:
+        """
+        Async twin of complete(): same caching, retry, rate limiting, deadline,
+        hedging and cost tracking, but awaits the AsyncAnthropic client so many
+        calls can share one event loop instead of one OS thread each. A losing
+        hedge is cancelled.
+        """
+        deadline = time.time() + deadline_s if deadline_s is not None else None
+        model, max_tokens, temperature = self._resolve_params(max_tokens, temperature, model)
+        system_text = prompt_text(system_prompt)
+
+        cache_key = self._cache_key(system_text, user_prompt, model, temperature)
+        cached = self._cached_response(cache_key, model)
+        if cached is not None:
+            return cached
+
+        response, joined = await self._inflight.ado(cache_key, lambda: self._acomplete_uncached(
+            system_prompt, system_text, user_prompt, max_tokens, temperature, model, task_type, cache_key,
+            deadline, hedge_after_s,
+        ))
+        return self._joined_response(response) if joined else response
+
+    async def _acomplete_uncached(self, system_prompt: SystemPrompt, system_text: str, user_prompt: str,
+                                  max_tokens: int, temperature: float, model: str, task_type: str,
+                                  cache_key: str, deadline: Optional[float] = None,
+                                  hedge_after_s: Optional[float] = None) -> LLMResponse:
+        """acomplete() after a cache miss: rate limit, call with retries, finalize."""
+        estimated_tokens = self._estimate_tokens(system_text, user_prompt, max_tokens)
+        waited = await self._aenforce_rate_limit(model, estimated_tokens)
+        backoff = 0.0
+        attempt = 0
+
+        start = time.time()
+
+        if self.mode == "dry-run":
+            self._print_dry_run(system_text, user_prompt, max_tokens, model)
+            response = self._simulate_local(system_text, user_prompt, max_tokens, model)
+        else:
+            while True:
+                try:
+                    if self.mode == "api" and self.client:
+                        timeout = self._attempt_timeout(task_type, model, deadline)
+                        call = lambda: self._acall_api(
+                            system_prompt, user_prompt, max_tokens, temperature, model, task_type, timeout
+                        )
+                        if hedge_after_s is not None and hedge_after_s < timeout:
+                            response = await self._hedger.acall(
+                                call, hedge_after_s,
+                                before_hedge=lambda: self._aenforce_rate_limit(model, estimated_tokens),
+                                cancelled_cost=(len(system_text) + len(user_prompt)) // 4,
+                            )
+                        else:
+                            response = await call()
+                    elif self.mode == REPLAY:
+                        response, delay = self._replay(cache_key, model)
+                        await asyncio.sleep(delay)
+                    else:
+                        response = self._simulate_local(system_text, user_prompt, max_tokens, model)
                     break
+                except (LLMTimeoutException, LLMOverloadedException):
+                    raise
+                except Exception as e:
+                    wait = self._retry_wait(e, attempt, model, task_type, deadline)
+                    if wait is None:
+                        response = self._error_response(e, model)
+                        break
+                    attempt += 1
+                    backoff += wait
+                    await asyncio.sleep(wait)
+                    waited += await self._aenforce_rate_limit(model, estimated_tokens)
+
+        self._record_timings(response, waited, backoff, attempt)
+        return self._finalize(response, start, cache_key, model, estimated_tokens, task_type)
+
+    async def _aenforce_rate_limit(self, model: str, estimated_tokens: int = 0) -> float:
+        """Non-blocking rate limit: reserve capacity, then yield to the loop for the deficit."""
+        if not self._rate_limit_enabled or self.mode != "api":
+            return 0.0
+        wait = self._rate_limiter.reserve(model, estimated_tokens)
+        if wait > 0:
+            with self._stats_lock:
+                self._rate_limit_waits += 1
+                self._rate_limit_wait_s += wait
+            await asyncio.sleep(wait)
+        return wait
+
+    def _get_async_client(self):
+        """Lazily build the AsyncAnthropic client (one connection pool per event loop)."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, base_url=self.base_url)
+            self._async_client_loop = loop
+        return self._async_client
+
+    # ─── STREAMING ───────────────────────────────────────────────
+
+    def stream(self, system_prompt: SystemPrompt, user_prompt: str,
+               max_tokens: int = None, temperature: float = None,
+               model: str = None, task_type: str = "unknown",
+               deadline_s: Optional[float] = None) -> Iterator[StreamChunk]:
+        """
+        Streaming variant of complete(): yields StreamChunk(text=delta) as
+        tokens arrive, then a final StreamChunk(response=LLMResponse) carrying
+        the full content and usage. Caching, rate limiting, stats and cost
+        tracking match complete(). Transient errors are retried only until
+        the first delta has been yielded; after that they end the stream
+        with an error response. deadline_s works as in complete(); streams
+        are never hedged.
+        """
+        deadline = time.time() + deadline_s if deadline_s is not None else None
+        model, max_tokens, temperature = self._resolve_params(max_tokens, temperature, model)
+        system_text = prompt_text(system_prompt)
+
+        cache_key = self._cache_key(system_text, user_prompt, model, temperature)
+        cached = self._cached_response(cache_key, model)
+        if cached is not None:
+            yield StreamChunk(text=cached.content)
+            yield StreamChunk(response=cached)
+            return
 
-        response.latency_ms = (time.time() - start) * 1000
+        estimated_tokens = self._estimate_tokens(system_text, user_prompt, max_tokens)
+        waited = self._enforce_rate_limit(model, estimated_tokens)
+        backoff = 0.0
+        attempt = 0
+        start = time.time()
 
-        # Track stats
-        self.total_input_tokens += response.input_tokens
-        self.total_output_tokens += response.output_tokens
-        self.call_count += 1
-        self._track_cost(response)
+        if self.mode == "dry-run" or not (self.mode == "api" and self.client):
+            if self.mode == "dry-run":
+                self._print_dry_run(system_text, user_prompt, max_tokens, model)
+            if self.mode == REPLAY:
+                response, delay = self._replay(cache_key, model)
+                time.sleep(delay)
+            else:
+                response = self._simulate_local(system_text, user_prompt, max_tokens, model)
+            for piece in re.split(r"(\s+)", response.content):
+                if piece:
+                    yield StreamChunk(text=piece)
+        else:
+            while True:
+                emitted = False
+                try:
+                    with self.client.messages.stream(
+                        model=model,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        system=system_param(system_prompt),
+                        messages=[{"role": "user", "content": user_prompt}],
+                        timeout=self._attempt_timeout(task_type, model, deadline),
+                    ) as message_stream:
+                        for text in message_stream.text_stream:
+                            emitted = True
+                            yield StreamChunk(text=text)
+                        message = message_stream.get_final_message()
+                    self._breakers.record_success(model)
+                    response = self._response_from_message(message, model)
+                    break
+                except (LLMTimeoutException, LLMOverloadedException):
+                    raise
+                except Exception as e:
+                    wait = None if emitted else self._retry_wait(e, attempt, model, task_type, deadline)
+                    if wait is None:
+                        response = self._error_response(e, model)
+                        break
+                    attempt += 1
+                    backoff += wait
+                    time.sleep(wait)
+                    waited += self._enforce_rate_limit(model, estimated_tokens)
+
+        with self._stats_lock:
+            self.streamed_calls += 1
+        self._record_timings(response, waited, backoff, attempt)
+        yield StreamChunk(response=self._finalize(response, start, cache_key, model, estimated_tokens, task_type))
+
+    # ─── MESSAGE BATCHES ─────────────────────────────────────────
+
+    def complete_batch(self, requests: list[dict]) -> list[LLMResponse]:
+        """
+        Run independent calls as one Message Batch and block until results arrive.
 
-        # Cache the response
-        self._cache[cache_key] = response
+        Each request dict takes the complete() keyword arguments
+        (system_prompt, user_prompt, max_tokens, temperature, model, task_type).
+        Cache hits are served immediately; only misses are submitted. Responses
+        come back in request order with batched=True and the batch discount
+        applied to cost. Local / dry-run mode uses LocalBatchServer.
+        """
+        responses: list[Optional[LLMResponse]] = [None] * len(requests)
+        pending: list[tuple[int, BatchRequest, str]] = []
+        for i, req in enumerate(requests):
+            model, max_tokens, temperature = self._resolve_params(
+                req.get("max_tokens"), req.get("temperature"), req.get("model")
+            )
+            system_text = prompt_text(req["system_prompt"])
+            cache_key = self._cache_key(system_text, req["user_prompt"], model, temperature)
+            cached = self._cached_response(cache_key, model)
+            if cached is not None:
+                responses[i] = cached
+                continue
+            if self.mode == "dry-run":
+                self._print_dry_run(system_text, req["user_prompt"], max_tokens, model)
+            pending.append((i, BatchRequest(
+                custom_id=f"req-{i}",
+                system_prompt=system_param(req["system_prompt"]),
+                user_prompt=req["user_prompt"],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                model=model,
+                task_type=req.get("task_type", "unknown"),
+            ), cache_key))
 
-        return response
+        if not pending:
+            return responses
+
+        start = time.time()
+        poll_interval = API_CONFIG.get("batch_poll_interval_seconds", 30.0) if self.mode == "api" else 0.0
+        results = run_batch(
+            self._get_batch_api(),
+            [batch_request for _, batch_request, _ in pending],
+            poll_interval_s=poll_interval,
+            timeout_s=API_CONFIG.get("batch_timeout_seconds", 24 * 3600),
+        )
+        with self._stats_lock:
+            self.batches_submitted += 1
+            self.batched_calls += len(pending)
+
+        for i, batch_request, cache_key in pending:
+            result = results[batch_request.custom_id]
+            if result.message is not None:
+                response = self._response_from_message(result.message, batch_request.model)
+            else:
+                self._log_error("batch_errored", batch_request.model, RuntimeError(result.error), 0.0)
+                response = LLMResponse(
+                    content=f"[LLM ERROR: {result.error}]",
+                    input_tokens=0, output_tokens=0, total_tokens=0,
+                    model=batch_request.model, latency_ms=0
+                )
+            response.batched = True
+            responses[i] = self._finalize(response, start, cache_key, batch_request.model, 0, batch_request.task_type)
+        return responses
+
+    def _get_batch_api(self):
+        if self.batch_api is not None:
+            return self.batch_api
+        if self.mode == "api" and self.client:
+            return self.client.messages.batches
+
+        def _respond(params: dict) -> tuple[str, int, int]:
+            system = params["system"]
+            if not isinstance(system, str):
+                system = "\n".join(block["text"] for block in system)
+            if self.mode == REPLAY:
+                key = self._cache_key(system, params["messages"][0]["content"], params["model"], params["temperature"])
+                replayed, _ = self._replay(key, params["model"])
+                if replayed.content.startswith("[LLM ERROR"):
+                    raise KeyError(f"no cassette entry for {key}")
+                return replayed.content, replayed.input_tokens, replayed.output_tokens
+            sim = self._simulate_local(
+                system, params["messages"][0]["content"], params["max_tokens"], params["model"]
+            )
+            return sim.content, sim.input_tokens, sim.output_tokens
+
+        return LocalBatchServer(_respond)
 
     def _log_error(self, error_type: str, model: str, error: Exception, retry_in_s: float):
         self._error_log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -235,6 +777,28 @@ class LLMProvider:
     def _is_timeout_error(error: Exception) -> bool:
         return error.__class__.__name__ == "APITimeoutError"
 
+    @staticmethod
+    def _is_overload_error(error: Exception) -> bool:
+        """Errors that count toward a model's circuit breaker: overloads, 5xx and timeouts.
+
+        Rate limits (429) only mean this account is sending too fast, and are
+        handled by backing off the token bucket instead.
+        """
+        status_code = getattr(error, "status_code", None)
+        if isinstance(status_code, int) and status_code >= 500:
+            return True
+        if error.__class__.__name__ in {"APITimeoutError", "InternalServerError"}:
+            return True
+        body = getattr(error, "body", None)
+        error_type = ""
+        if isinstance(body, dict):
+            err = body.get("error")
+            error_type = str((err if isinstance(err, dict) else body).get("type", "")).lower()
+        if error_type in {"overloaded_error", "timeout_error", "api_error"}:
+            return True
+        message = str(error).lower()
+        return "overloaded" in message or "timeout" in message or "timed out" in message
+
     @classmethod
     def _should_retry_transient_error(cls, error: Exception) -> bool:
         status_code = getattr(error, "status_code", None)
@@ -265,36 +829,58 @@ class LLMProvider:
             return True
         return False
 
-    def _call_api(self, system_prompt: str, user_prompt: str,
-                  max_tokens: int, temperature: float, model: str, task_type: str = "unknown") -> LLMResponse:
-        """Make a real API call to Anthropic with configurable timeout.
-
-        Sydyn tasks use 30s timeout for real-time responsiveness.
-        Other tasks use 120s timeout for complex reasoning.
-        """
-        # Determine timeout based on task type
+    @staticmethod
+    def _timeout_for(task_type: str) -> float:
+        """Sydyn tasks use 30s timeout for real-time responsiveness.
+        Other tasks use 120s timeout for complex reasoning."""
         if task_type.startswith("sydyn_"):
-            timeout = 30.0  # 30s for real-time Sydyn agents
-        else:
-            timeout = 120.0  # 120s for Atlantis governance (research claims can take >30s)
+            return 30.0  # 30s for real-time Sydyn agents
+        return 120.0  # 120s for Atlantis governance (research claims can take >30s)
+
+    @staticmethod
+    def _response_from_message(message, model: str) -> LLMResponse:
+        usage = message.usage
+        return LLMResponse(
+            content=message.content[0].text,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            total_tokens=usage.input_tokens + usage.output_tokens,
+            model=model,
+            latency_ms=0,
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            stop_reason=getattr(message, "stop_reason", "") or "",
+        )
 
+    def _call_api(self, system_prompt: SystemPrompt, user_prompt: str,
+                  max_tokens: int, temperature: float, model: str, task_type: str = "unknown",
+                  timeout: Optional[float] = None) -> LLMResponse:
+        """Make a real API call to Anthropic with configurable timeout."""
         message = self.client.messages.create(
             model=model,
             max_tokens=max_tokens,
             temperature=temperature,
-            system=system_prompt,
+            system=system_param(system_prompt),
             messages=[{"role": "user", "content": user_prompt}],
-            timeout=timeout
+            timeout=timeout or self._timeout_for(task_type)
         )
-
-        return LLMResponse(
-            content=message.content[0].text,
-            input_tokens=message.usage.input_tokens,
-            output_tokens=message.usage.output_tokens,
-            total_tokens=message.usage.input_tokens + message.usage.output_tokens,
+        self._breakers.record_success(model)
+        return self._response_from_message(message, model)
+
+    async def _acall_api(self, system_prompt: SystemPrompt, user_prompt: str,
+                         max_tokens: int, temperature: float, model: str, task_type: str = "unknown",
+                         timeout: Optional[float] = None) -> LLMResponse:
+        """Async variant of _call_api() on the shared AsyncAnthropic client."""
+        message = await self._get_async_client().messages.create(
             model=model,
-            latency_ms=0
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_param(system_prompt),
+            messages=[{"role": "user", "content": user_prompt}],
+            timeout=timeout or self._timeout_for(task_type)
         )
+        self._breakers.record_success(model)
+        return self._response_from_message(message, model)
 
     def _simulate_local(self, system_prompt: str, user_prompt: str,
                         max_tokens: int, model: str) -> LLMResponse:
@@ -588,11 +1174,14 @@ Each governance cycle follows these steps in order:
             f"tensions and proposes a framework that addresses the most critical concerns first."
         )
 
-    def _cache_key(self, system: str, user: str, model: str) -> str:
+    def _cache_key(self, system: str, user: str, model: str, temperature: Optional[float] = None) -> str:
         # Hash full system prompt to avoid collisions
         system_hash = hashlib.md5(system.encode()).hexdigest()
         user_hash = hashlib.md5(user.encode()).hexdigest()
-        combined = f"{model}:{system_hash}:{user_hash}"
+        # Temperature is part of the key: a 0.0 extraction and a 0.8 content call
+        # with the same prompt must not share a cached answer.
+        temp = "default" if temperature is None else f"{float(temperature):g}"
+        combined = f"{model}:{temp}:{system_hash}:{user_hash}"
         return combined  # Already hashed components
 
     def _track_cost(self, response: LLMResponse):
@@ -600,7 +1189,12 @@ Each governance cycle follows these steps in order:
         if rates:
             input_cost = (response.input_tokens / 1_000_000) * rates["input"]
             output_cost = (response.output_tokens / 1_000_000) * rates["output"]
-            self.total_cost_usd += input_cost + output_cost
+            cache_cost = (
+                response.cache_write_tokens * API_CONFIG.get("prompt_cache_write_multiplier", 1.25)
+                + response.cache_read_tokens * API_CONFIG.get("prompt_cache_read_multiplier", 0.1)
+            ) / 1_000_000 * rates["input"]
+            multiplier = API_CONFIG.get("batch_discount", 0.5) if response.batched else 1.0
+            self.total_cost_usd += (input_cost + output_cost + cache_cost) * multiplier
 
     def get_stats(self) -> dict:
         return {
@@ -610,9 +1204,27 @@ Each governance cycle follows these steps in order:
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
             "total_tokens": self.total_input_tokens + self.total_output_tokens,
+            "cache_read_input_tokens": self.total_cache_read_tokens,
+            "cache_creation_input_tokens": self.total_cache_write_tokens,
+            "prompt_cache_read_ratio": round(
+                self.total_cache_read_tokens
+                / max(self.total_input_tokens + self.total_cache_read_tokens + self.total_cache_write_tokens, 1),
+                3,
+            ),
             "estimated_cost_usd": round(self.total_cost_usd, 4),
             "cache_hit_rate": round(self.cache_hits / max(self.call_count + self.cache_hits, 1), 2),
             "rate_limit_waits": self._rate_limit_waits,
+            "rate_limit_wait_s": round(self._rate_limit_wait_s, 3),
+            "rate_limiter": self._rate_limiter.stats(),
+            "cache": self._cache.stats(),
+            "inflight_joined": self._inflight.joined,
+            "batches_submitted": self.batches_submitted,
+            "batched_calls": self.batched_calls,
+            "streamed_calls": self.streamed_calls,
+            "hedging": self._hedger.stats(),
+            "deadline_exceeded": self.deadline_exceeded,
+            "circuit_breakers": self._breakers.stats(),
+            "cassette": self.cassette.stats() if self.cassette is not None else None,
         }
 
 
@@ -0,0 +1,85 @@
+"""
+Atlantis Latency Metrics
+=========================
+Streaming latency histograms for ModelRouter.
+
+LatencyHistogram keeps counts in fixed log-spaced buckets (four per
+doubling, ~19% relative width) from 1 ms to ~19 minutes, so memory is
+constant no matter how many calls are recorded and percentiles are
+accurate to within one bucket. CallTimings pairs a histogram with the
+wall-clock time an agent step spent outside the model: waiting on the
+rate limiter and sleeping in retry backoff.
+"""
+
+import bisect
+import math
+
+# Bucket upper bounds in ms: 1 ms * 2^(i/4)
+_BUCKETS_PER_DOUBLING = 4
+_BUCKET_BOUNDS_MS = [2 ** (i / _BUCKETS_PER_DOUBLING) for i in range(0, 20 * _BUCKETS_PER_DOUBLING + 1)]
+
+
+class LatencyHistogram:
+    """Fixed log-bucket histogram; not thread-safe (callers hold their own lock)."""
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS_MS) + 1)  # last bucket = overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        value_ms = max(float(value_ms), 0.0)
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0 < q <= 100)."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = _BUCKET_BOUNDS_MS[i] if i < len(_BUCKET_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 1),
+            "p90_ms": round(self.percentile(90), 1),
+            "p99_ms": round(self.percentile(99), 1),
+            "max_ms": round(self.max_ms, 1),
+            "total_ms": round(self.total_ms, 1),
+        }
+
+
+class CallTimings:
+    """Latency histogram plus rate-limit wait and retry backoff totals for one key."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.rate_limit_wait_ms = 0.0
+        self.retry_backoff_ms = 0.0
+        self.retries = 0
+
+    def record(self, latency_ms: float, rate_limit_wait_ms: float = 0.0,
+               retry_backoff_ms: float = 0.0, retries: int = 0):
+        self.latency.record(latency_ms)
+        self.rate_limit_wait_ms += rate_limit_wait_ms
+        self.retry_backoff_ms += retry_backoff_ms
+        self.retries += retries
+
+    def summary(self) -> dict:
+        return {
+            **self.latency.summary(),
+            "rate_limit_wait_ms": round(self.rate_limit_wait_ms, 1),
+            "retry_backoff_ms": round(self.retry_backoff_ms, 1),
+            "retries": self.retries,
+        }
@@ -0,0 +1,245 @@
+"""
+Atlantis Mock LLM Server
+=========================
+Local HTTP stand-in for the Anthropic Messages API, for load-testing the
+sydyn and takeoff FastAPI services without spending money.
+
+POST /v1/messages answers like the real API (including SSE when
+"stream": true) with content from the existing simulators:
+
+- requests carrying an image block: takeoff.extraction._simulate_vision_response
+  (fixture schedule / RCP counts / plan notes / panel schedule JSON)
+- text requests: LLMProvider._generate_local_response (governance and
+  sydyn agent shapes)
+
+Each response is delayed by a configurable latency distribution
+(lognormal around a median, plus an optional per-output-token cost), and
+a configurable fraction of requests fail with 429 rate_limit_error (with
+retry-after), 529 overloaded_error or 500 api_error. Responses longer
+than max_tokens are truncated with stop_reason "max_tokens".
+
+Point clients at it with LLM_BASE_URL (core and takeoff) or the
+ANTHROPIC_BASE_URL variable the SDK reads itself:
+
+    python -m core.mockserver --port 8765 --latency-ms 800 --overload-rate 0.02
+    LLM_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=mock python -m sydyn "..."
+
+GET /mock/stats reports request and injected-error counts.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import threading
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider
+
+
+@dataclass
+class MockServerConfig:
+    """Latency distribution and fault injection for the mock server."""
+    latency_ms: float = 800.0           # Median time to a complete response
+    latency_sigma: float = 0.5          # Lognormal shape; 0 = fixed latency
+    ms_per_output_token: float = 0.0    # Extra latency per generated token
+    rate_limit_rate: float = 0.0        # Fraction of requests answered 429
+    overload_rate: float = 0.0          # Fraction answered 529
+    error_rate: float = 0.0             # Fraction answered 500
+    retry_after_s: float = 1.0          # retry-after header on 429s
+    seed: Optional[int] = None
+
+
+_ERRORS = {
+    429: ("rate_limit_error", "Number of request tokens has exceeded your per-minute rate limit"),
+    529: ("overloaded_error", "Overloaded"),
+    500: ("api_error", "Internal server error"),
+}
+
+
+def _text_of(content) -> str:
+    if isinstance(content, str):
+        return content
+    return "\n".join(block.get("text", "") for block in content if block.get("type") == "text")
+
+
+def _has_image(messages: list) -> bool:
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list) and any(block.get("type") == "image" for block in content):
+            return True
+    return False
+
+
+class MockResponder:
+    """Decides status, body and delay for one Messages request (no HTTP involved)."""
+
+    def __init__(self, config: Optional[MockServerConfig] = None):
+        self.config = config or MockServerConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._local = LLMProvider(mode="local", cache=MemoryResponseCache())
+        self.stats = {"requests": 0, "ok": 0, "streamed": 0, "truncated": 0, 429: 0, 529: 0, 500: 0}
+
+    def _roll(self) -> tuple[Optional[int], float]:
+        """(injected error status or None, latency sample in ms)."""
+        cfg = self.config
+        with self._lock:
+            draw = self._rng.random()
+            noise = self._rng.gauss(0.0, 1.0)
+        status = None
+        for code, rate in ((429, cfg.rate_limit_rate), (529, cfg.overload_rate), (500, cfg.error_rate)):
+            if draw < rate:
+                status = code
+                break
+            draw -= rate
+        latency = cfg.latency_ms * math.exp(cfg.latency_sigma * noise) if cfg.latency_sigma > 0 else cfg.latency_ms
+        return status, max(latency, 0.0)
+
+    def _content(self, body: dict) -> str:
+        system = _text_of(body.get("system") or "")
+        messages = body.get("messages") or []
+        user = _text_of(messages[-1].get("content", "")) if messages else ""
+        if _has_image(messages):
+            # Deferred import: takeoff is optional for core users of the mock server
+            from takeoff.extraction import _simulate_vision_response
+            return _simulate_vision_response(system, user)
+        return self._local._simulate_local(system, user, body.get("max_tokens", 1024), body.get("model", "")).content
+
+    def respond(self, body: dict) -> tuple[int, dict, dict, float]:
+        """Returns (status, payload, headers, delay_s)."""
+        status, latency_ms = self._roll()
+        with self._lock:
+            self.stats["requests"] += 1
+            if status:
+                self.stats[status] += 1
+        if status:
+            error_type, message = _ERRORS[status]
+            headers = {"retry-after": f"{self.config.retry_after_s:g}"} if status == 429 else {}
+            payload = {"type": "error", "error": {"type": error_type, "message": message}}
+            # Failures come back fast, like the real API
+            return status, payload, headers, min(latency_ms, self.config.latency_ms) / 1000 / 4
+
+        text = self._content(body)
+        max_tokens = int(body.get("max_tokens", 1024))
+        stop_reason = "end_turn"
+        if len(text) // 4 > max_tokens:
+            text = text[: max_tokens * 4]
+            stop_reason = "max_tokens"
+        system = _text_of(body.get("system") or "")
+        messages = body.get("messages") or []
+        input_tokens = (len(system) + sum(len(_text_of(m.get("content", ""))) for m in messages)) // 4 + 1
+        output_tokens = max(len(text) // 4, 1)
+        with self._lock:
+            self.stats["ok"] += 1
+            self.stats["truncated"] += stop_reason == "max_tokens"
+            message_id = f"msg_mock_{next(self._ids):08d}"
+        payload = {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "mock"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cache_creation_input_tokens": 0,
+                "cache_read_input_tokens": 0,
+            },
+        }
+        delay_s = (latency_ms + output_tokens * self.config.ms_per_output_token) / 1000
+        return 200, payload, {}, delay_s
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_events(message: dict, delay_s: float, chunk_chars: int = 40):
+    """Replay a finished message as Messages API stream events, spreading delay_s over the deltas."""
+    text = message["content"][0]["text"]
+    chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+    start = dict(message, content=[], stop_reason=None,
+                 usage=dict(message["usage"], output_tokens=0))
+    yield _sse("message_start", {"type": "message_start", "message": start})
+    yield _sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                       "content_block": {"type": "text", "text": ""}})
+    for chunk in chunks:
+        await asyncio.sleep(delay_s / len(chunks))
+        yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                           "delta": {"type": "text_delta", "text": chunk}})
+    yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+    yield _sse("message_delta", {"type": "message_delta",
+                                 "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                                 "usage": {"output_tokens": message["usage"]["output_tokens"]}})
+    yield _sse("message_stop", {"type": "message_stop"})
+
+
+def create_app(config: Optional[MockServerConfig] = None) -> FastAPI:
+    """FastAPI app serving the mock Messages API."""
+    responder = MockResponder(config)
+    app = FastAPI(title="Atlantis mock Anthropic API")
+    app.state.responder = responder
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        status, payload, headers, delay_s = responder.respond(body)
+        if status == 200 and body.get("stream"):
+            with responder._lock:
+                responder.stats["streamed"] += 1
+            return StreamingResponse(_stream_events(payload, delay_s), media_type="text/event-stream")
+        await asyncio.sleep(delay_s)
+        return JSONResponse(payload, status_code=status, headers=headers)
+
+    @app.get("/mock/stats")
+    async def stats():
+        with responder._lock:
+            counts = {str(k): v for k, v in responder.stats.items()}
+        return {"config": asdict(responder.config), "stats": counts}
+
+    return app
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Mock Anthropic Messages API with synthetic latency and faults")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal spread (0 = fixed)")
+    parser.add_argument("--ms-per-output-token", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--overload-rate", type=float, default=0.0, help="Fraction of 529 responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds on 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    config = MockServerConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        ms_per_output_token=args.ms_per_output_token,
+        rate_limit_rate=args.rate_limit_rate,
+        overload_rate=args.overload_rate,
+        error_rate=args.error_rate,
+        retry_after_s=args.retry_after,
+        seed=args.seed,
+    )
+    print(f"[MOCK] Anthropic Messages API on http://{args.host}:{args.port} — {config}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,29 @@ Atlantis V2 — Model Router
 Maps task types to appropriate model IDs and temperatures.
 Single config point: change MODEL_ALLOCATION in settings.py to swap models.
 
-All model calls go through ModelRouter.complete() so model selection
-is centralized and swappable without touching agent code.
+All model calls go through ModelRouter.complete() (or acomplete() for
+asyncio callers, stream() for token deltas, complete_batch() for offline
+fan-out) so model selection is centralized and swappable without
+touching agent code.
 """
 
-from typing import Optional
-from core.llm import LLMProvider, LLMResponse
-from config.settings import MODEL_ALLOCATION, MODEL_IDS, API_CONFIG
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+from core.budget import TokenBudgets
+from core.cassette import Cassette
+from core.exceptions import LLMOverloadedException
+from core.llm import LLMProvider, LLMResponse, StreamChunk, SystemPrompt
+from core.metrics import CallTimings
+from config.settings import MODEL_ALLOCATION, MODEL_FALLBACK_ALLOCATION, MODEL_IDS, API_CONFIG
+
+# Absolute time.time() deadline for calls made in the current context (ModelRouter.deadline)
+_call_deadline: ContextVar[Optional[float]] = ContextVar("atlantis_call_deadline", default=None)
+# Fallback events for the current context (ModelRouter.track_fallbacks)
+_fallback_log: ContextVar[Optional[list]] = ContextVar("atlantis_fallback_log", default=None)
 
 
 class ModelRouter:
@@ -65,15 +81,45 @@ class ModelRouter:
         "opus": {"input": 15.00, "output": 75.00},
     }
 
-    def __init__(self, api_key: Optional[str] = None, mock_mode: bool = False, dry_run: bool = False):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        mock_mode: bool = False,
+        dry_run: bool = False,
+        batch_mode: bool = False,
+        hedge: Optional[bool] = None,
+        cassette_mode: Optional[str] = None,
+        cassette_path: Optional[str] = None,
+    ):
         mode = "local" if mock_mode else ("dry-run" if dry_run else "auto")
-        self._provider = LLMProvider(api_key=api_key, mode=mode)
+        cassette = None
+        if cassette_mode:
+            # "record" runs against the API and saves traffic; "replay" serves it back offline
+            mode = cassette_mode
+            cassette = Cassette(
+                cassette_path or API_CONFIG.get("cassette_path", "output/llm_cassette.jsonl.gz"),
+                cassette_mode,
+                latency_scale=API_CONFIG.get("cassette_replay_latency_scale", 1.0),
+            )
+        self._provider = LLMProvider(api_key=api_key, mode=mode, cassette=cassette)
         self._mock_mode = mock_mode
+        self.batch_mode = batch_mode
+        self.hedge = API_CONFIG.get("hedge_requests", False) if hedge is None else hedge
         self._cost_by_model_tier = {
             tier: {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
             for tier in self.MODEL_PRICING
         }
         self._cost_by_task_type = {}
+        self._cost_lock = threading.Lock()
+        # Latency histograms (fresh calls only; cache hits and joined calls are free)
+        self._timings_by_task_type: dict[str, CallTimings] = {}
+        self._timings_by_model_tier: dict[str, CallTimings] = {}
+        # Circuit-breaker fallbacks (task_type -> count)
+        self._fallbacks_by_task_type: dict[str, int] = {}
+        # Learned max_tokens per task type; only real API traffic is persisted
+        self._budgets = TokenBudgets(
+            path=API_CONFIG.get("token_budget_path") if self._provider.mode == "api" else None
+        )
 
     @classmethod
     def validate_model_allocation(cls) -> list[dict]:
@@ -93,35 +139,335 @@ class ModelRouter:
             )
         return validation
 
+    def _route(self, task_type: str) -> tuple[str, str, float]:
+        """Resolve (model_tier, model_id, temperature) for a task type."""
+        model_tier = MODEL_ALLOCATION.get(task_type, "sonnet")
+        model_id = MODEL_IDS.get(model_tier, MODEL_IDS["sonnet"])
+        temperature = self.TASK_TEMPERATURES.get(task_type, API_CONFIG["temperature_research"])
+        return model_tier, model_id, temperature
+
+    @contextmanager
+    def deadline(self, seconds: float):
+        """
+        Cap every call made inside the block (in this thread / task) to a shared
+        budget of `seconds`. Nested blocks keep the tighter deadline. Calls that
+        cannot finish in time raise LLMTimeoutException.
+        """
+        current = _call_deadline.get()
+        target = time.time() + max(seconds, 0.0)
+        token = _call_deadline.set(target if current is None else min(current, target))
+        try:
+            yield
+        finally:
+            _call_deadline.reset(token)
+
+    @contextmanager
+    def track_fallbacks(self):
+        """
+        Collect the circuit-breaker fallbacks taken by calls inside the block.
+        Yields a list that fills with {"task_type", "from_model", "to_model"}
+        dicts, so callers can label degraded results.
+        """
+        events: list[dict] = []
+        token = _fallback_log.set(events)
+        try:
+            yield events
+        finally:
+            _fallback_log.reset(token)
+
+    def _fallback_route(self, task_type: str, model_tier: str) -> Optional[tuple[str, str]]:
+        """(tier, model_id) to use while model_tier's breaker is open, if the task is eligible."""
+        fallback_tier = MODEL_FALLBACK_ALLOCATION.get(task_type)
+        if not fallback_tier or fallback_tier == model_tier or fallback_tier not in MODEL_IDS:
+            return None
+        return fallback_tier, MODEL_IDS[fallback_tier]
+
+    @staticmethod
+    def _circuit_open_response(model_id: str, error: LLMOverloadedException) -> LLMResponse:
+        """
+        Error placeholder for a call refused by an open circuit with no fallback
+        left. Same shape as the provider's response after exhausted retries, so
+        callers degrade as before, just without the backoff sleeps.
+        """
+        print(f"[ModelRouter] {error} — no fallback, returning error placeholder")
+        return LLMResponse(
+            content=f"[LLM ERROR: {error}]",
+            input_tokens=0, output_tokens=0, total_tokens=0,
+            model=model_id, latency_ms=0
+        )
+
+    def _mark_fallback(self, task_type: str, model_id: str, response: LLMResponse):
+        response.fallback_from = model_id
+        with self._cost_lock:
+            self._fallbacks_by_task_type[task_type] = self._fallbacks_by_task_type.get(task_type, 0) + 1
+        events = _fallback_log.get()
+        if events is not None:
+            events.append({"task_type": task_type, "from_model": model_id, "to_model": response.model})
+        print(f"[ModelRouter] {task_type}: {model_id} circuit open, answered by {response.model}")
+
+    @staticmethod
+    def _remaining_budget() -> Optional[float]:
+        deadline = _call_deadline.get()
+        return None if deadline is None else max(deadline - time.time(), 0.0)
+
+    def _hedge_after(self, task_type: str) -> Optional[float]:
+        """Hedge delay for a task type: its observed p95, once enough calls have been seen."""
+        if not self.hedge:
+            return None
+        with self._cost_lock:
+            timings = self._timings_by_task_type.get(task_type)
+            if timings is None or timings.latency.count < API_CONFIG.get("hedge_min_samples", 20):
+                return None
+            p95_s = timings.latency.percentile(API_CONFIG.get("hedge_percentile", 95)) / 1000
+        return max(p95_s, API_CONFIG.get("hedge_min_delay_seconds", 2.0))
+
+    def _truncation_retry(self, task_type: str, response: LLMResponse, max_tokens: int,
+                          retries: int) -> Optional[int]:
+        """Larger max_tokens to re-run a response that stopped on max_tokens, or None."""
+        if response.stop_reason != "max_tokens" or retries >= API_CONFIG.get("max_tokens_truncation_retries", 1):
+            return None
+        larger = self._budgets.retry_budget(max_tokens)
+        if larger is not None:
+            self._budgets.record_retry(task_type)
+            print(f"[ModelRouter] {task_type}: truncated at max_tokens={max_tokens}, retrying with {larger}")
+        return larger
+
     def complete(
         self,
         task_type: str,
-        system_prompt: str,
+        system_prompt: SystemPrompt,
         user_prompt: str,
         max_tokens: int = 1000,
+        on_delta: Optional[Callable[[str], None]] = None,
     ) -> LLMResponse:
         """
         Make an LLM call for the given task type.
         Automatically selects the right model and temperature.
+        With on_delta, the call is streamed and each token delta is passed
+        to on_delta as it arrives; the return value is unchanged.
+        Inside a deadline() block the call is capped to the remaining budget;
+        with hedging on, a call slower than the task's p95 is duplicated.
+        While the routed tier's circuit breaker is open, eligible task types
+        (MODEL_FALLBACK_ALLOCATION) are answered by their fallback tier and
+        the response is labelled with fallback_from.
+        Once the task type has enough history, max_tokens is replaced by the
+        learned budget; a response cut off at max_tokens is re-run with a
+        larger one.
         """
-        model_tier = MODEL_ALLOCATION.get(task_type, "sonnet")
-        model_id = MODEL_IDS.get(model_tier, MODEL_IDS["sonnet"])
-        temperature = self.TASK_TEMPERATURES.get(task_type, API_CONFIG["temperature_research"])
+        if on_delta is not None:
+            response = None
+            for chunk in self.stream(task_type, system_prompt, user_prompt, max_tokens):
+                if chunk.text:
+                    on_delta(chunk.text)
+                if chunk.response is not None:
+                    response = chunk.response
+            return response
 
-        response = self._provider.complete(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            model=model_id,
-            task_type=task_type,
-        )
+        model_tier, model_id, temperature = self._route(task_type)
+        max_tokens = self._budgets.max_tokens(task_type, max_tokens)
+
+        def call(model: str, budget: int) -> LLMResponse:
+            return self._provider.complete(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=budget,
+                temperature=temperature,
+                model=model,
+                task_type=task_type,
+                deadline_s=self._remaining_budget(),
+                hedge_after_s=self._hedge_after(task_type),
+            )
+
+        def routed(budget: int) -> tuple[str, LLMResponse]:
+            try:
+                return model_tier, call(model_id, budget)
+            except LLMOverloadedException as e:
+                fallback = self._fallback_route(task_type, model_tier)
+                if fallback is None:
+                    return model_tier, self._circuit_open_response(model_id, e)
+                fallback_tier, fallback_id = fallback
+                try:
+                    response = call(fallback_id, budget)
+                except LLMOverloadedException as fallback_error:
+                    return fallback_tier, self._circuit_open_response(fallback_id, fallback_error)
+                self._mark_fallback(task_type, model_id, response)
+                return fallback_tier, response
+
+        retries = 0
+        while True:
+            answered_by, response = routed(max_tokens)
+            self._record_call(task_type, answered_by, response)
+            larger = self._truncation_retry(task_type, response, max_tokens, retries)
+            if larger is None:
+                return response
+            max_tokens = larger
+            retries += 1
+
+    async def acomplete(
+        self,
+        task_type: str,
+        system_prompt: SystemPrompt,
+        user_prompt: str,
+        max_tokens: int = 1000,
+    ) -> LLMResponse:
+        """
+        Async twin of complete() — same routing, fallback, token budgets and
+        cost tracking. Lets pipelines fan out many calls on one event loop
+        (asyncio.gather).
+        """
+        model_tier, model_id, temperature = self._route(task_type)
+        max_tokens = self._budgets.max_tokens(task_type, max_tokens)
+
+        async def call(model: str, budget: int) -> LLMResponse:
+            return await self._provider.acomplete(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=budget,
+                temperature=temperature,
+                model=model,
+                task_type=task_type,
+                deadline_s=self._remaining_budget(),
+                hedge_after_s=self._hedge_after(task_type),
+            )
+
+        async def routed(budget: int) -> tuple[str, LLMResponse]:
+            try:
+                return model_tier, await call(model_id, budget)
+            except LLMOverloadedException as e:
+                fallback = self._fallback_route(task_type, model_tier)
+                if fallback is None:
+                    return model_tier, self._circuit_open_response(model_id, e)
+                fallback_tier, fallback_id = fallback
+                try:
+                    response = await call(fallback_id, budget)
+                except LLMOverloadedException as fallback_error:
+                    return fallback_tier, self._circuit_open_response(fallback_id, fallback_error)
+                self._mark_fallback(task_type, model_id, response)
+                return fallback_tier, response
+
+        retries = 0
+        while True:
+            answered_by, response = await routed(max_tokens)
+            self._record_call(task_type, answered_by, response)
+            larger = self._truncation_retry(task_type, response, max_tokens, retries)
+            if larger is None:
+                return response
+            max_tokens = larger
+            retries += 1
+
+    def stream(
+        self,
+        task_type: str,
+        system_prompt: SystemPrompt,
+        user_prompt: str,
+        max_tokens: int = 1000,
+    ) -> Iterator[StreamChunk]:
+        """
+        Streaming twin of complete(): yields token deltas, then a final chunk
+        with the full LLMResponse (cost is recorded when it arrives). The
+        provider only refuses a stream before its first delta, so a circuit
+        fallback never mixes output from two models. Streams use the learned
+        max_tokens but are not re-run when truncated (the deltas are out).
+        """
+        model_tier, model_id, temperature = self._route(task_type)
+        max_tokens = self._budgets.max_tokens(task_type, max_tokens)
+
+        def chunks(model: str) -> Iterator[StreamChunk]:
+            return self._provider.stream(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                model=model,
+                task_type=task_type,
+                deadline_s=self._remaining_budget(),
+            )
+
+        fallback_from = ""
+        try:
+            stream = chunks(model_id)
+            first = next(stream)
+        except LLMOverloadedException as e:
+            fallback = self._fallback_route(task_type, model_tier)
+            if fallback is None:
+                stream, first = iter(()), StreamChunk(response=self._circuit_open_response(model_id, e))
+            else:
+                model_tier, fallback_id = fallback
+                try:
+                    stream = chunks(fallback_id)
+                    first = next(stream)
+                    fallback_from = model_id
+                except LLMOverloadedException as fallback_error:
+                    stream = iter(())
+                    first = StreamChunk(response=self._circuit_open_response(fallback_id, fallback_error))
+
+        for chunk in itertools.chain([first], stream):
+            if chunk.response is not None:
+                if fallback_from:
+                    self._mark_fallback(task_type, fallback_from, chunk.response)
+                self._record_call(task_type, model_tier, chunk.response)
+            yield chunk
+
+    def complete_batch(self, calls: list[dict]) -> list[LLMResponse]:
+        """
+        Run independent calls together; responses come back in call order.
+
+        Each call dict takes complete()'s arguments (task_type, system_prompt,
+        user_prompt, max_tokens). With batch_mode on, they are submitted as one
+        Message Batch (half price, higher latency); otherwise this is just a
+        loop over complete(), so callers can batch unconditionally.
+        """
+        if not self.batch_mode:
+            return [self.complete(**call) for call in calls]
+
+        routed = []
+        requests = []
+        for call in calls:
+            model_tier, model_id, temperature = self._route(call["task_type"])
+            routed.append((call["task_type"], model_tier))
+            requests.append({
+                "system_prompt": call["system_prompt"],
+                "user_prompt": call["user_prompt"],
+                "max_tokens": self._budgets.max_tokens(call["task_type"], call.get("max_tokens", 1000)),
+                "temperature": temperature,
+                "model": model_id,
+                "task_type": call["task_type"],
+            })
+
+        responses = self._provider.complete_batch(requests)
+        for (task_type, model_tier), response in zip(routed, responses):
+            self._record_call(task_type, model_tier, response)
+        return responses
 
+    def _record_call(self, task_type: str, model_tier: str, response: LLMResponse):
+        if not response.cached:
+            if not response.content.startswith("[LLM ERROR"):
+                self._budgets.record(task_type, response.output_tokens, response.stop_reason)
+            with self._cost_lock:
+                for table, key in ((self._timings_by_task_type, task_type),
+                                   (self._timings_by_model_tier, model_tier)):
+                    table.setdefault(key, CallTimings()).record(
+                        response.latency_ms,
+                        response.rate_limit_wait_ms,
+                        response.retry_backoff_ms,
+                        response.retries,
+                    )
+        self._record_cost(task_type, model_tier, response)
+
+    def _record_cost(self, task_type: str, model_tier: str, response: LLMResponse):
         pricing = self.MODEL_PRICING.get(model_tier)
-        if pricing:
-            input_cost = (response.input_tokens / 1_000_000) * pricing["input"]
-            output_cost = (response.output_tokens / 1_000_000) * pricing["output"]
-            call_cost = input_cost + output_cost
+        if not pricing:
+            return
+        input_cost = (response.input_tokens / 1_000_000) * pricing["input"]
+        output_cost = (response.output_tokens / 1_000_000) * pricing["output"]
+        cache_cost = (
+            response.cache_write_tokens * API_CONFIG.get("prompt_cache_write_multiplier", 1.25)
+            + response.cache_read_tokens * API_CONFIG.get("prompt_cache_read_multiplier", 0.1)
+        ) / 1_000_000 * pricing["input"]
+        call_cost = input_cost + output_cost + cache_cost
+        if response.batched:
+            call_cost *= API_CONFIG.get("batch_discount", 0.5)
+        with self._cost_lock:
             bucket = self._cost_by_model_tier[model_tier]
             bucket["calls"] += 1
             bucket["input_tokens"] += response.input_tokens
@@ -137,8 +483,6 @@ class ModelRouter:
             task_bucket["output_tokens"] += response.output_tokens
             task_bucket["cost_usd"] += call_cost
 
-        return response
-
     def get_stats(self) -> dict:
         """Return LLM usage stats (tokens, cost, cache hits, etc.)."""
         stats = self._provider.get_stats()
@@ -159,6 +503,15 @@ class ModelRouter:
             }
             for task_type, values in self._cost_by_task_type.items()
         }
+        with self._cost_lock:
+            stats["fallbacks_by_task_type"] = dict(self._fallbacks_by_task_type)
+            stats["latency_by_task_type"] = {
+                task_type: timings.summary() for task_type, timings in self._timings_by_task_type.items()
+            }
+            stats["latency_by_model_tier"] = {
+                tier: timings.summary() for tier, timings in self._timings_by_model_tier.items()
+            }
+        stats["token_budgets"] = self._budgets.stats()
         return stats
 
     def print_cost_summary(self):
@@ -173,6 +526,57 @@ class ModelRouter:
                 f"cost=${values['cost_usd']:.6f}"
             )
         print(f"  TOTAL estimated cost: ${stats['model_router_cost_usd']:.6f}")
+        if stats.get("cache_read_input_tokens") or stats.get("cache_creation_input_tokens"):
+            print(
+                f"  Prompt cache: read={stats['cache_read_input_tokens']} "
+                f"write={stats['cache_creation_input_tokens']} "
+                f"read_ratio={stats['prompt_cache_read_ratio']:.0%}"
+            )
+        if stats.get("batches_submitted"):
+            print(
+                f"  Batches: {stats['batches_submitted']} submitted, "
+                f"{stats['batched_calls']} calls at batch pricing"
+            )
+        hedging = stats.get("hedging", {})
+        if hedging.get("hedged") or stats.get("deadline_exceeded"):
+            print(
+                f"  Hedging: {hedging.get('hedged', 0)}/{hedging.get('calls', 0)} calls hedged "
+                f"(rate={hedging.get('hedge_rate', 0.0):.0%}, hedge_wins={hedging.get('hedge_wins', 0)}, "
+                f"wasted_tokens={hedging.get('wasted_tokens', 0)}), "
+                f"deadline_exceeded={stats.get('deadline_exceeded', 0)}"
+            )
+        if stats.get("fallbacks_by_task_type"):
+            tripped = [tier for tier, b in stats.get("circuit_breakers", {}).items() if b.get("trips")]
+            print(
+                f"  Circuit fallbacks: {sum(stats['fallbacks_by_task_type'].values())} "
+                f"({', '.join(f'{task}={n}' for task, n in sorted(stats['fallbacks_by_task_type'].items()))}); "
+                f"tripped tiers: {', '.join(tripped) or 'none'}"
+            )
+        budgets = stats.get("token_budgets", {})
+        truncated = {task: row for task, row in budgets.items() if row["truncated"]}
+        if truncated:
+            rates = ", ".join(f"{task}={row['truncation_rate']:.0%}" for task, row in sorted(truncated.items()))
+            print(
+                f"  Truncated at max_tokens: {sum(row['truncated'] for row in truncated.values())} ({rates}); "
+                f"re-run with larger budget: {sum(row['retried'] for row in budgets.values())}"
+            )
+        cache = stats.get("cache", {})
+        print(
+            f"  Cache ({cache.get('backend', 'none')}): hits={cache.get('hits', 0)} "
+            f"misses={cache.get('misses', 0)} evictions={cache.get('evictions', 0)} "
+            f"entries={cache.get('entries', 0)} joined_in_flight={stats.get('inflight_joined', 0)}"
+        )
+        latency = stats.get("latency_by_task_type", {})
+        if latency:
+            print("  Latency by task (slowest total first)")
+            print(f"  {'task':<24} {'calls':>5} {'p50':>8} {'p90':>8} {'p99':>8} {'total':>9} {'rl_wait':>8} {'backoff':>8}")
+            for task_type, row in sorted(latency.items(), key=lambda item: -item[1]["total_ms"]):
+                print(
+                    f"  {task_type:<24} {row['count']:>5} "
+                    f"{row['p50_ms'] / 1000:>7.2f}s {row['p90_ms'] / 1000:>7.2f}s {row['p99_ms'] / 1000:>7.2f}s "
+                    f"{row['total_ms'] / 1000:>8.1f}s {row['rate_limit_wait_ms'] / 1000:>7.1f}s "
+                    f"{row['retry_backoff_ms'] / 1000:>7.1f}s"
+                )
         supreme = stats.get("cost_by_task_type", {}).get("supreme_court", {})
         print(
             f"  Opus calls: {supreme.get('calls', 0)} (Supreme Court) — ${supreme.get('cost_usd', 0.0):.2f}"
@@ -0,0 +1,169 @@
+"""
+Atlantis Rate Limiter
+======================
+Thread-safe token-bucket limiter shared by every LLMProvider in the process.
+
+Each model tier (haiku / sonnet / opus) gets two buckets that refill
+continuously: requests-per-minute and tokens-per-minute. Callers reserve
+capacity before an API call and sleep only for their own deficit, so
+parallel workers run at the account's real limits instead of one call
+at a time. A 429 / 529 with a retry-after hint pauses the whole tier.
+
+Limits live in API_CONFIG["rate_limits"] (config/settings.py).
+"""
+
+import threading
+import time
+from typing import Optional
+
+from config.settings import API_CONFIG, MODEL_IDS
+
+
+class TokenBucket:
+    """Continuous-refill bucket. Reservations may drive the level negative (debt)."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.capacity <= 0 or now <= self._updated:
+            return
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` from the bucket; return seconds until the debt is repaid."""
+        if self.capacity <= 0:
+            return 0.0  # Unlimited
+        self._refill(now)
+        # A single request larger than the whole bucket can never fit — cap it.
+        self.level -= min(float(amount), self.capacity)
+        if self.level >= 0:
+            return 0.0
+        return -self.level / self.rate
+
+    def adjust(self, delta: float, now: float):
+        """Credit (positive) or debit (negative) the bucket after the fact."""
+        if self.capacity <= 0:
+            return
+        self._refill(now)
+        self.level = min(self.capacity, self.level + delta)
+
+
+class RateLimiter:
+    """
+    Per-tier RPM + TPM limiter.
+
+    Usage:
+        wait_s = limiter.reserve(model, estimated_tokens)   # non-blocking
+        limiter.acquire(model, estimated_tokens)            # blocking helper
+        limiter.record_usage(model, estimated_tokens, actual_tokens)
+        limiter.penalize(model, retry_after_s)              # on 429 / 529
+    """
+
+    def __init__(self, limits: Optional[dict] = None, enabled: Optional[bool] = None):
+        config_limits = API_CONFIG.get("rate_limits", {})
+        self.limits = limits if limits is not None else config_limits
+        self.enabled = API_CONFIG.get("rate_limit_enabled", True) if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._buckets: dict[str, dict[str, TokenBucket]] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._tier_by_model = {model_id: tier for tier, model_id in MODEL_IDS.items()}
+        self._stats: dict[str, dict] = {}
+
+    def tier_for(self, model: str) -> str:
+        return self._tier_by_model.get(model, model)
+
+    def _tier_limits(self, tier: str) -> dict:
+        return self.limits.get(tier) or self.limits.get("default") or {}
+
+    def _get_buckets(self, tier: str) -> dict[str, TokenBucket]:
+        buckets = self._buckets.get(tier)
+        if buckets is None:
+            limits = self._tier_limits(tier)
+            buckets = {
+                "requests": TokenBucket(limits.get("requests_per_minute", 0)),
+                "tokens": TokenBucket(limits.get("tokens_per_minute", 0)),
+            }
+            self._buckets[tier] = buckets
+        return buckets
+
+    def _tier_stats(self, tier: str) -> dict:
+        return self._stats.setdefault(
+            tier, {"requests": 0, "waits": 0, "wait_seconds": 0.0, "penalties": 0}
+        )
+
+    def reserve(self, model: str, estimated_tokens: int = 0) -> float:
+        """Reserve one request + estimated tokens. Returns seconds the caller must wait."""
+        if not self.enabled:
+            return 0.0
+        tier = self.tier_for(model)
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._get_buckets(tier)
+            wait = max(
+                buckets["requests"].reserve(1, now),
+                buckets["tokens"].reserve(estimated_tokens, now),
+                self._blocked_until.get(tier, 0.0) - now,
+                0.0,
+            )
+            stats = self._tier_stats(tier)
+            stats["requests"] += 1
+            if wait > 0:
+                stats["waits"] += 1
+                stats["wait_seconds"] += wait
+        return wait
+
+    def acquire(self, model: str, estimated_tokens: int = 0) -> float:
+        """Blocking reserve(). Returns the seconds actually slept."""
+        wait = self.reserve(model, estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_usage(self, model: str, estimated_tokens: int, actual_tokens: int):
+        """Reconcile the token bucket once real usage is known."""
+        if not self.enabled:
+            return
+        tier = self.tier_for(model)
+        with self._lock:
+            self._get_buckets(tier)["tokens"].adjust(estimated_tokens - actual_tokens, time.monotonic())
+
+    def penalize(self, model: str, retry_after_s: float):
+        """Pause every caller of this tier for retry_after_s (server-provided backoff)."""
+        if not self.enabled or retry_after_s <= 0:
+            return
+        tier = self.tier_for(model)
+        with self._lock:
+            until = time.monotonic() + retry_after_s
+            self._blocked_until[tier] = max(self._blocked_until.get(tier, 0.0), until)
+            self._tier_stats(tier)["penalties"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                tier: {**values, "wait_seconds": round(values["wait_seconds"], 3)}
+                for tier, values in self._stats.items()
+            }
+
+
+# Process-wide limiter shared by all providers (limits are per account, not per object)
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
+
+
+def reset_rate_limiter():
+    global _limiter
+    _limiter = None
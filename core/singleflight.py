@@ -0,0 +1,87 @@
+"""
+Atlantis Single-Flight
+=======================
+Collapses concurrent identical requests into one call.
+
+The response cache is only written after a call returns, so parallel
+workers issuing the same prompt at the same moment would each pay for
+an API call. SingleFlight keeps an in-flight table keyed by the cache
+key: the first caller (leader) runs the call, everyone else arriving
+before it finishes (followers) waits on the leader's future and gets
+the same result — or the same exception.
+
+Works across threads (do) and on an event loop (ado). Do not make a
+blocking do() call on an event-loop thread while an ado() leader for
+the same key is running there; the follower would block its own leader.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """In-flight request table: one leader per key, followers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self.leaders = 0
+        self.joined = 0
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.joined += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _release(self, key: str, future: Future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Run fn() once per concurrent key. Returns (result, joined)."""
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._release(key, future)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Async do(): followers await the leader without blocking the loop."""
+        future, leader = self._claim(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._release(key, future)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"leaders": self.leaders, "joined": self.joined, "in_flight": len(self._calls)}
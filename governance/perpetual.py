@@ -32,9 +32,14 @@ from governance.states import (
     Town,
     validate_claim,
     validate_challenge,
-    normalize_claim,
+    normalize_claim_call,
+    parse_normalized_claim,
     decompose_premises,
+    decompose_premises_call,
+    parse_premises,
     check_rebuttal_newness,
+    rebuttal_newness_call,
+    parse_rebuttal_newness,
     check_anti_loop,
     check_reasoning_depth,
     determine_outcome,
@@ -236,13 +241,17 @@ class PerpetualEngine:
                 return {"pair": f"{sa.name} vs {sb.name}", "skipped": True, "reason": "loop_b"}
             _log(f"  {sb.name} anti-loop check passed")
 
-        # Step 5: Normalize both (Haiku)
-        a_norm = normalize_claim(a_raw, self.models)
-        b_norm = normalize_claim(b_raw, self.models)
-
-        # Step 6: Decompose both (Haiku)
-        a_premises = decompose_premises(a_raw, self.models)
-        b_premises = decompose_premises(b_raw, self.models)
+        # Steps 5-6: Normalize and decompose both (Haiku), submitted together
+        a_norm_resp, b_norm_resp, a_prem_resp, b_prem_resp = self.models.complete_batch([
+            normalize_claim_call(a_raw),
+            normalize_claim_call(b_raw),
+            decompose_premises_call(a_raw),
+            decompose_premises_call(b_raw),
+        ])
+        a_norm = parse_normalized_claim(a_raw, a_norm_resp.content)
+        b_norm = parse_normalized_claim(b_raw, b_norm_resp.content)
+        a_premises = parse_premises(a_prem_resp.content)
+        b_premises = parse_premises(b_prem_resp.content)
 
         # Step 7: Reasoning depth enforcement
         a_meets, a_min = check_reasoning_depth(a_norm.get("reasoning_chain", []), sa.tier)
@@ -297,9 +306,13 @@ class PerpetualEngine:
         b_rebuttal = sb.produce_rebuttal(a_challenge, b_raw) if a_challenge else "OPTION A: No challenge to rebut."
         a_rebuttal = sa.produce_rebuttal(b_challenge, a_raw) if b_challenge else "OPTION A: No challenge to rebut."
 
-        # Step 13: Rebuttal newness (Haiku)
-        a_newness = check_rebuttal_newness(a_raw, a_rebuttal, self.models)
-        b_newness = check_rebuttal_newness(b_raw, b_rebuttal, self.models)
+        # Step 13: Rebuttal newness (Haiku), both checks submitted together
+        a_newness_resp, b_newness_resp = self.models.complete_batch([
+            rebuttal_newness_call(a_raw, a_rebuttal),
+            rebuttal_newness_call(b_raw, b_rebuttal),
+        ])
+        a_newness = parse_rebuttal_newness(a_newness_resp.content)
+        b_newness = parse_rebuttal_newness(b_newness_resp.content)
 
         # Step 14: Judge determines outcomes (Sonnet)
         approaches = {sa.name: sa.approach, sb.name: sb.approach}
@@ -361,9 +374,9 @@ class PerpetualEngine:
         # Domain health
         self._compute_domain_health(pair.domain)
 
-        # Content evaluation
-        for entry, outcome in [(a_entry, a_outcome), (b_entry, b_outcome)]:
-            content_files = self.content_gen.evaluate_and_generate({
+        # Content evaluation: both exchanges' formats submitted together
+        content_batches = self.content_gen.evaluate_and_generate_batch([
+            {
                 "drama_score": outcome["scores"].get("drama", 0),
                 "novelty_score": outcome["scores"].get("novelty", 0),
                 "depth_score": outcome["scores"].get("depth", 0),
@@ -378,7 +391,10 @@ class PerpetualEngine:
                     "domain": pair.domain,
                 },
                 "outcome": outcome,
-            })
+            }
+            for entry, outcome in [(a_entry, a_outcome), (b_entry, b_outcome)]
+        ])
+        for content_files in content_batches:
             self.cycle_log_data["content"].extend(content_files)
 
         _log(f"  {sa.name}: {a_outcome['outcome']} | {sb.name}: {b_outcome['outcome']}")
@@ -481,7 +497,7 @@ class PerpetualEngine:
         # Federal Lab inverts one implicit assumption
         response = self.models.complete(
             task_type="federal_lab",
-            system_prompt=self.federal_lab_config.system_prompt,
+            system_prompt=self.federal_lab_config.system_segments,
             user_prompt=(
                 f"TARGET CLAIM (Archive entry {target['display_id']}):\n"
                 f"{target.get('raw_claim_text', '')}\n\n"
@@ -720,10 +736,13 @@ class PerpetualEngine:
         """
         Per domain: top 20 highest-impact surviving claims → Haiku call → principle.
         Principle deposited with entry_type='principle', challengeable next cycle.
+        Domains are independent, so all calls go out together via
+        complete_batch() (one Message Batch when the router runs in batch mode).
         """
         domains = self._get_all_domains()
         max_claims = self.config.get("abstraction_max_claims_per_domain", 20)
 
+        pending = []
         for domain in domains:
             top_claims = self.db.get_top_impact_claims(domain, limit=max_claims)
             if len(top_claims) < 5:
@@ -733,11 +752,10 @@ class PerpetualEngine:
                 f"{c['display_id']}: {c.get('raw_claim_text', '')[:300]}"
                 for c in top_claims
             )
-
-            response = self.models.complete(
-                task_type="bridge_extraction",
-                system_prompt="Extract the highest-level principles from these claims. Return principles only.",
-                user_prompt=(
+            pending.append((domain, top_claims, {
+                "task_type": "bridge_extraction",
+                "system_prompt": "Extract the highest-level principles from these claims. Return principles only.",
+                "user_prompt": (
                     f"Domain: {domain}\n\n"
                     f"TOP {len(top_claims)} SURVIVING CLAIMS:\n{claims_text}\n\n"
                     f"Identify 2-3 domain-level principles that emerge from these claims.\n"
@@ -746,9 +764,15 @@ class PerpetualEngine:
                     f"PRINCIPLE 2: [statement]\n"
                     f"PRINCIPLE 3: [statement] (optional)"
                 ),
-                max_tokens=500,
-            )
+                "max_tokens": 500,
+            }))
+
+        if not pending:
+            return
+
+        responses = self.models.complete_batch([call for _, _, call in pending])
 
+        for (domain, top_claims, _), response in zip(pending, responses):
             principles_text = response.content or ""
             display_id = self.db.next_display_id()
             principle_entry = ArchiveEntry(
@@ -979,28 +1003,29 @@ class PerpetualEngine:
         """Dissolve a State, generate ALL FOUR content formats, schedule replacement."""
         self.state_manager.dissolve_state(state.name)
 
-        # Generate all four content formats with drama=10
-        self.content_gen.evaluate_and_generate({
-            "drama_score": 10,
-            "novelty_score": 5,
-            "depth_score": 5,
-            "event_type": "dissolution",
-            "exchange": {
-                "state_name": state.name,
-                "domain": state.domain,
-                "surviving_claims": self.db.get_surviving_claims_count(state.name),
-                "final_budget": state.token_budget,
+        # All four content formats with drama=10, plus the Explorer's "ruins" visit,
+        # submitted together
+        self.content_gen.evaluate_and_generate_batch([
+            {
+                "drama_score": 10,
+                "novelty_score": 5,
+                "depth_score": 5,
+                "event_type": "dissolution",
+                "exchange": {
+                    "state_name": state.name,
+                    "domain": state.domain,
+                    "surviving_claims": self.db.get_surviving_claims_count(state.name),
+                    "final_budget": state.token_budget,
+                },
             },
-        })
-
-        # Explorer format explicitly gets "ruins" event
-        self.content_gen.evaluate_and_generate({
-            "drama_score": 0,
-            "novelty_score": 0,
-            "depth_score": 0,
-            "event_type": "ruins",
-            "exchange": {"state_name": state.name, "domain": state.domain},
-        })
+            {
+                "drama_score": 0,
+                "novelty_score": 0,
+                "depth_score": 0,
+                "event_type": "ruins",
+                "exchange": {"state_name": state.name, "domain": state.domain},
+            },
+        ])
 
     # ─── ARCHIVE ENTRY BUILDER ────────────────────────────────────
 
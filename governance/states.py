@@ -245,7 +245,7 @@ class State:
 # === RESEARCHER_PROMPT_END ===
         response = self.models.complete(
             task_type="researcher_claims",
-            system_prompt=self.researcher_config.system_prompt,
+            system_prompt=self.researcher_config.system_segments,
             user_prompt=base,
             max_tokens=2500,
         )
@@ -257,7 +257,7 @@ class State:
         """Lab Agent generates radical hypothesis — max 1 per cycle."""
         response = self.models.complete(
             task_type="federal_lab",
-            system_prompt=self.lab_config.system_prompt,
+            system_prompt=self.lab_config.system_segments,
             user_prompt=(
                 f"Open questions from your domain:\n{open_questions}\n\n"
                 f"Recently destroyed claims:\n{destroyed_claims}\n\n"
@@ -306,7 +306,7 @@ class State:
         # === CRITIC_PROMPT_START ===
         response = self.models.complete(
             task_type="critic_challenges",
-            system_prompt=self.critic_config.system_prompt,
+            system_prompt=self.critic_config.system_segments,
             user_prompt=(
                 f"{constitution_block}"
                 f"{critic_profile_block}"
@@ -342,7 +342,7 @@ class State:
         )
         response = self.models.complete(
             task_type="researcher_rebuttals",
-            system_prompt=self.researcher_config.system_prompt,
+            system_prompt=self.researcher_config.system_segments,
             user_prompt=(
                 f"{constitution_block}"
                 f"YOUR ORIGINAL CLAIM:\n{original_claim}\n\n"
@@ -374,7 +374,7 @@ class State:
 
         response = self.models.complete(
             task_type="researcher_claims",
-            system_prompt=self.senator_config.system_prompt,
+            system_prompt=self.senator_config.system_segments,
             user_prompt=(
                 f"State: {self.name} | Domain: {self.domain} | Tier: {self.tier}\n"
                 f"Token budget: {budget} | Surviving claims: {surviving}\n\n"
@@ -881,7 +881,12 @@ def normalize_claim(claim_text: str, models: ModelRouter) -> dict:
     Haiku call. Extracts structured fields from raw claim text.
     Returns: {claim_type, position, reasoning_chain, conclusion, citations, keywords}
     """
-    response = models.complete(
+    return parse_normalized_claim(claim_text, models.complete(**normalize_claim_call(claim_text)).content)
+
+
+def normalize_claim_call(claim_text: str) -> dict:
+    """complete() arguments for normalize_claim, for callers that batch it."""
+    return dict(
         task_type="normalization",
         system_prompt=(
             "Extract structured fields from this claim. "
@@ -904,7 +909,11 @@ def normalize_claim(claim_text: str, models: ModelRouter) -> dict:
         ),
         max_tokens=600,
     )
-    parsed = _parse_json_response(response.content, default={
+
+
+def parse_normalized_claim(claim_text: str, content: str) -> dict:
+    """normalize_claim's result from the model's reply, with regex fallbacks for free-form text."""
+    parsed = _parse_json_response(content, default={
         "claim_type": "discovery",
         "position": "",
         "hypothesis": "",
@@ -1019,7 +1028,12 @@ def decompose_premises(claim_text: str, models: ModelRouter) -> dict:
     Haiku call. Decomposes claim into explicit and implicit premises.
     Returns: {explicit_premises, implicit_assumptions, conclusion_depends_on}
     """
-    response = models.complete(
+    return parse_premises(models.complete(**decompose_premises_call(claim_text)).content)
+
+
+def decompose_premises_call(claim_text: str) -> dict:
+    """complete() arguments for decompose_premises, for callers that batch it."""
+    return dict(
         task_type="premise_decomposition",
         system_prompt=(
             "Decompose this claim into its logical premises. "
@@ -1034,7 +1048,11 @@ def decompose_premises(claim_text: str, models: ModelRouter) -> dict:
         ),
         max_tokens=500,
     )
-    return _parse_json_response(response.content, default={
+
+
+def parse_premises(content: str) -> dict:
+    """decompose_premises's result from the model's reply."""
+    return _parse_json_response(content, default={
         "explicit_premises": [],
         "implicit_assumptions": [],
         "conclusion_depends_on": [],
@@ -1048,7 +1066,12 @@ def check_rebuttal_newness(
     Haiku call. Does the rebuttal add new reasoning beyond restating the claim?
     Returns: {new_reasoning: bool, explanation: str}
     """
-    response = models.complete(
+    return parse_rebuttal_newness(models.complete(**rebuttal_newness_call(original_claim, rebuttal)).content)
+
+
+def rebuttal_newness_call(original_claim: str, rebuttal: str) -> dict:
+    """complete() arguments for check_rebuttal_newness, for callers that batch it."""
+    return dict(
         task_type="rebuttal_newness",
         system_prompt=(
             "Evaluate whether this rebuttal adds new reasoning. "
@@ -1063,7 +1086,11 @@ def check_rebuttal_newness(
         ),
         max_tokens=200,
     )
-    return _parse_json_response(response.content, default={
+
+
+def parse_rebuttal_newness(content: str) -> dict:
+    """check_rebuttal_newness's result from the model's reply."""
+    return _parse_json_response(content, default={
         "new_reasoning": True,
         "explanation": "Could not evaluate",
     })
@@ -1444,7 +1471,7 @@ class City:
 
         response = self.models.complete(
             task_type="researcher_claims",
-            system_prompt=self.analyst_config.system_prompt,
+            system_prompt=self.analyst_config.system_segments,
             user_prompt=(
                 f"Analyze this cluster of {len(cluster_claims)} surviving claims "
                 f"from {self.state_name} in domain '{self.domain}':\n\n"
@@ -1530,7 +1557,7 @@ class Town:
 
         response = self.models.complete(
             task_type="content_generation",
-            system_prompt=self.builder_config.system_prompt,
+            system_prompt=self.builder_config.system_segments,
             user_prompt=(
                 f"Build an applied proposal from these City analyses "
                 f"for {self.state_name} in domain '{self.domain}':\n\n"
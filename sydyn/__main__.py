@@ -82,53 +82,48 @@ Examples:
         help="Web search provider (default: tavily)"
     )
 
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record-cassette",
+        type=str,
+        metavar="PATH",
+        help="Record every LLM request/response of this query to a cassette"
+    )
+    cassette.add_argument(
+        "--replay-cassette",
+        type=str,
+        metavar="PATH",
+        help="Serve LLM responses from a recorded cassette instead of the API"
+    )
+
     args = parser.parse_args()
 
     # Verify API keys before running (prevents wasting search credits)
+    # (replay never calls the Anthropic API)
     anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-    if not anthropic_key:
-        print("[ERROR] ANTHROPIC_API_KEY not found in environment", file=sys.stderr)
-        print("[ERROR] Make sure you have a .env file with ANTHROPIC_API_KEY=sk-ant-...", file=sys.stderr)
-        sys.exit(1)
-
-    # Test API key with a minimal call
-    print("[SYDYN] Verifying Anthropic API key...")
-    try:
-        from core.llm import LLMProvider
-        test_provider = LLMProvider(api_key=anthropic_key, mode="api")
-        test_response = test_provider.complete(
-            system_prompt="You are a test assistant.",
-            user_prompt="Reply with just 'OK'",
-            max_tokens=10,
-            temperature=0.0,
-            model="claude-haiku-4-5-20251001",
-            task_type="sydyn_test"
-        )
-
-        # Check if response contains an error
-        if "[LLM ERROR" in test_response.content:
-            print(f"[ERROR] API call failed: {test_response.content}", file=sys.stderr)
-            print("[ERROR] Your ANTHROPIC_API_KEY may be invalid, expired, or lack access to Claude models", file=sys.stderr)
+    if not args.replay_cassette:
+        if not anthropic_key:
+            print("[ERROR] ANTHROPIC_API_KEY not found in environment", file=sys.stderr)
+            print("[ERROR] Make sure you have a .env file with ANTHROPIC_API_KEY=sk-ant-...", file=sys.stderr)
             sys.exit(1)
 
-        # Check for expected response
-        if "OK" not in test_response.content and "ok" not in test_response.content.lower():
-            print(f"[WARN] Unexpected test response: {test_response.content[:50]}", file=sys.stderr)
+        # Test API key with a minimal call
+        verify_anthropic_key(anthropic_key)
 
-        print("[SYDYN] ✓ API key verified\n")
-    except Exception as e:
-        print(f"[ERROR] Anthropic API key verification failed: {e}", file=sys.stderr)
-        print(f"[ERROR] Error type: {type(e).__name__}", file=sys.stderr)
-        if hasattr(e, 'status_code'):
-            print(f"[ERROR] Status code: {e.status_code}", file=sys.stderr)
-        print("[ERROR] Make sure your API key is valid and has access to Claude models", file=sys.stderr)
-        sys.exit(1)
+    model_router = None
+    if args.record_cassette or args.replay_cassette:
+        from core.models import ModelRouter
+        model_router = ModelRouter(
+            cassette_mode="record" if args.record_cassette else "replay",
+            cassette_path=args.record_cassette or args.replay_cassette,
+        )
 
     # Initialize engine
     try:
         engine = SydynEngine(
             db_path=args.db_path,
-            search_provider=args.search_provider
+            search_provider=args.search_provider,
+            model_router=model_router
         )
     except Exception as e:
         print(f"[ERROR] Failed to initialize Sydyn engine: {e}", file=sys.stderr)
@@ -156,6 +151,41 @@ Examples:
         format_text_output(result, verbose=args.verbose)
 
 
+def verify_anthropic_key(anthropic_key: str):
+    """Make a minimal API call; exit with a diagnostic if the key does not work."""
+    print("[SYDYN] Verifying Anthropic API key...")
+    try:
+        from core.llm import LLMProvider
+        test_provider = LLMProvider(api_key=anthropic_key, mode="api")
+        test_response = test_provider.complete(
+            system_prompt="You are a test assistant.",
+            user_prompt="Reply with just 'OK'",
+            max_tokens=10,
+            temperature=0.0,
+            model="claude-haiku-4-5-20251001",
+            task_type="sydyn_test"
+        )
+
+        # Check if response contains an error
+        if "[LLM ERROR" in test_response.content:
+            print(f"[ERROR] API call failed: {test_response.content}", file=sys.stderr)
+            print("[ERROR] Your ANTHROPIC_API_KEY may be invalid, expired, or lack access to Claude models", file=sys.stderr)
+            sys.exit(1)
+
+        # Check for expected response
+        if "OK" not in test_response.content and "ok" not in test_response.content.lower():
+            print(f"[WARN] Unexpected test response: {test_response.content[:50]}", file=sys.stderr)
+
+        print("[SYDYN] ✓ API key verified\n")
+    except Exception as e:
+        print(f"[ERROR] Anthropic API key verification failed: {e}", file=sys.stderr)
+        print(f"[ERROR] Error type: {type(e).__name__}", file=sys.stderr)
+        if hasattr(e, 'status_code'):
+            print(f"[ERROR] Status code: {e.status_code}", file=sys.stderr)
+        print("[ERROR] Make sure your API key is valid and has access to Claude models", file=sys.stderr)
+        sys.exit(1)
+
+
 def format_text_output(result: dict, verbose: bool = False):
     """Format result as human-readable text.
 
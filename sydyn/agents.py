@@ -2,7 +2,7 @@
 
 import json
 import re
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from dataclasses import dataclass
 
 from sydyn.evidence import EvidencePack, Source
@@ -87,13 +87,15 @@ class Researcher:
     def generate_answer(
         self,
         query: str,
-        evidence_pack: EvidencePack
+        evidence_pack: EvidencePack,
+        on_partial: Optional[Callable[[str], None]] = None
     ) -> AgentResponse:
         """Generate answer with claims and citations.
 
         Args:
             query: User query
             evidence_pack: Evidence Pack with sources
+            on_partial: Optional callback receiving token deltas (streams the call)
 
         Returns:
             AgentResponse with claims
@@ -147,7 +149,8 @@ Generate your answer as structured claims with citations."""
             task_type="sydyn_researcher",
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            max_tokens=2000
+            max_tokens=2000,
+            on_delta=on_partial
         )
 
         # Parse JSON response with fallback strategies
@@ -402,7 +405,8 @@ class Judge:
         all_claims: List[Claim],
         citation_grades: Dict,
         evidence_pack: EvidencePack,
-        mode: str = "fast"
+        mode: str = "fast",
+        on_partial: Optional[Callable[[str], None]] = None
     ) -> Dict:
         """Evaluate answer against constitution.
 
@@ -412,6 +416,7 @@ class Judge:
             citation_grades: Citation verification results
             evidence_pack: Evidence Pack
             mode: "fast" | "strict" | "liability"
+            on_partial: Optional callback receiving token deltas (streams the call)
 
         Returns:
             Dict with verdict and violations
@@ -478,7 +483,8 @@ Evaluate against constitutional rules."""
             task_type="sydyn_judge",
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            max_tokens=2000
+            max_tokens=2000,
+            on_delta=on_partial
         )
 
         # Parse JSON response with fallback strategies
@@ -130,14 +130,37 @@ async def generate_sse_stream(query: str) -> AsyncGenerator[str, None]:
         status_queue = queue.Queue()
         result_container = []
 
+        # Streamed Researcher/Judge tokens, coalesced per agent between polls
+        partial_lock = threading.Lock()
+        pending_partials: dict = {}
+
         def status_callback(message: str):
             """Callback to receive status updates from engine."""
             status_queue.put({"type": "status", "message": message})
 
+        def partial_callback(agent: str, delta: str):
+            """Callback to receive token deltas from streamed agent calls."""
+            with partial_lock:
+                pending_partials[agent] = pending_partials.get(agent, "") + delta
+
+        def drain_partials() -> list:
+            with partial_lock:
+                items = list(pending_partials.items())
+                pending_partials.clear()
+            return [
+                f"data: {json.dumps({'type': 'partial', 'agent': agent, 'delta': delta})}\n\n"
+                for agent, delta in items
+            ]
+
         def run_query():
             """Run query in thread and put result in container."""
             try:
-                result = engine.query(query, save_kb=True, status_callback=status_callback)
+                result = engine.query(
+                    query,
+                    save_kb=True,
+                    status_callback=status_callback,
+                    partial_callback=partial_callback,
+                )
                 result_container.append(result)
                 status_queue.put({"type": "done"})
             except Exception as e:
@@ -153,6 +176,9 @@ async def generate_sse_stream(query: str) -> AsyncGenerator[str, None]:
                 # Non-blocking check with timeout
                 msg = status_queue.get(timeout=0.1)
 
+                for event in drain_partials():
+                    yield event
+
                 if msg["type"] == "status":
                     yield f"data: {json.dumps(msg)}\n\n"
                 elif msg["type"] == "error":
@@ -161,7 +187,9 @@ async def generate_sse_stream(query: str) -> AsyncGenerator[str, None]:
                 elif msg["type"] == "done":
                     break
             except queue.Empty:
-                # No message yet, continue waiting
+                # No status yet — forward any streamed tokens, continue waiting
+                for event in drain_partials():
+                    yield event
                 await asyncio.sleep(0.05)
 
         # Get result from container
@@ -16,6 +16,13 @@ from sydyn.timeout import TimeoutManager, build_evidence_only_response
 from sydyn.kb import KnowledgeBase
 
 
+def _bind_partial(partial_callback: Optional[callable], agent: str) -> Optional[callable]:
+    """Bind a query's partial_callback to one agent, or None when nobody is listening."""
+    if not partial_callback:
+        return None
+    return lambda delta: partial_callback(agent, delta)
+
+
 class SydynEngine:
     """Main orchestrator for Sydyn queries."""
 
@@ -54,7 +61,8 @@ class SydynEngine:
         query_text: str,
         mode: Optional[str] = None,
         save_kb: bool = True,
-        status_callback: Optional[callable] = None
+        status_callback: Optional[callable] = None,
+        partial_callback: Optional[callable] = None
     ) -> Dict:
         """Execute Sydyn query with full pipeline.
 
@@ -63,11 +71,14 @@ class SydynEngine:
             mode: Optional mode override ("fast" | "strict" | "liability")
             save_kb: Whether to save validated answers to KB
             status_callback: Optional callback for status updates (for SSE streaming)
+            partial_callback: Optional callback(agent, delta) receiving streamed
+                Researcher/Judge output as it is generated
 
         Returns:
             Dict with answer, confidence, and metadata
         """
-        # Store callback for access by helper methods
+        # Status updates are read by helper methods; partial_callback is passed
+        # down per query because concurrent API requests share this engine
         self._status_callback = status_callback
 
         def emit_status(message: str):
@@ -135,14 +146,37 @@ class SydynEngine:
             }
 
         # Step 4: Run agent pipeline based on mode
-        if classified_mode == "fast":
-            result = self._run_fast_mode(query_id, query_text, evidence_pack, timeout_mgr)
-        elif classified_mode == "strict":
-            result = self._run_strict_mode(query_id, query_text, evidence_pack, timeout_mgr)
-        elif classified_mode == "liability":
-            result = self._run_liability_mode(query_id, query_text, evidence_pack, timeout_mgr)
-        else:
-            result = self._run_fast_mode(query_id, query_text, evidence_pack, timeout_mgr)
+        # Every LLM call shares what is left of the hard timeout, so one slow
+        # response cannot outlive the query.
+        # Circuit-breaker fallbacks are collected so degraded answers are labelled.
+        # A stage other than the Judge (which degrades on its own) that runs out
+        # of budget falls back to the evidence-only response.
+        model_fallbacks = []
+        try:
+            with self.model_router.deadline(timeout_mgr.remaining(TimeoutManager.HARD_TIMEOUT)), \
+                    self.model_router.track_fallbacks() as model_fallbacks:
+                if classified_mode == "fast":
+                    result = self._run_fast_mode(query_id, query_text, evidence_pack, timeout_mgr, partial_callback)
+                elif classified_mode == "strict":
+                    result = self._run_strict_mode(query_id, query_text, evidence_pack, timeout_mgr, partial_callback)
+                elif classified_mode == "liability":
+                    result = self._run_liability_mode(query_id, query_text, evidence_pack, timeout_mgr, partial_callback)
+                else:
+                    result = self._run_fast_mode(query_id, query_text, evidence_pack, timeout_mgr, partial_callback)
+        except LLMTimeoutException as e:
+            print(f"[SYDYN] WARNING: Hard timeout reached mid-pipeline ({e}) - evidence-only response")
+            emit_status("Hard timeout reached - returning evidence only")
+            timeout_mgr.degradation_level = "evidence_only"
+            result = {
+                "query_id": query_id,
+                "query": query_text,
+                "answer": build_evidence_only_response(evidence_pack),
+                "confidence": 0.2,
+                "confidence_band": "VERY_LOW",
+                "mode": classified_mode,
+                "timeout": True,
+                "degradation_level": "evidence_only"
+            }
 
         # Update query metrics
         elapsed_ms = int(timeout_mgr.elapsed() * 1000)
@@ -158,9 +192,11 @@ class SydynEngine:
 
         result["latency_ms"] = elapsed_ms
         result["cost_usd"] = cost_usd
+        if model_fallbacks:
+            result["model_fallbacks"] = model_fallbacks
 
-        # Store in KB if verdict is PASS and save_kb is True
-        if save_kb and result.get("verdict") == "PASS":
+        # Store in KB if verdict is PASS and save_kb is True (never fallback-model answers)
+        if save_kb and result.get("verdict") == "PASS" and not model_fallbacks:
             self.kb.store_answer(query_text, query_id)
 
         return result
@@ -170,7 +206,8 @@ class SydynEngine:
         query_id: str,
         query_text: str,
         evidence_pack,
-        timeout_mgr: TimeoutManager
+        timeout_mgr: TimeoutManager,
+        partial_callback: Optional[callable] = None
     ) -> Dict:
         """Run fast mode pipeline (Researcher + Adversary + Judge).
 
@@ -193,7 +230,9 @@ class SydynEngine:
         # Researcher
         print(f"[SYDYN] Researcher generating answer...")
         emit("Researcher analyzing evidence and drafting claims...")
-        researcher_response = self.researcher.generate_answer(query_text, evidence_pack)
+        researcher_response = self.researcher.generate_answer(
+            query_text, evidence_pack, on_partial=_bind_partial(partial_callback, "researcher")
+        )
         print(f"[SYDYN] Researcher produced {len(researcher_response.claims)} claims\n")
         emit(f"Researcher drafted {len(researcher_response.claims)} claims")
 
@@ -240,7 +279,8 @@ class SydynEngine:
                 all_claims,
                 citation_grades,
                 evidence_pack,
-                mode="fast"
+                mode="fast",
+                on_partial=_bind_partial(partial_callback, "judge")
             )
             emit(f"Judge verdict: {judge_result.get('verdict', 'UNKNOWN')}")
         except LLMTimeoutException as e:
@@ -334,7 +374,8 @@ class SydynEngine:
         query_id: str,
         query_text: str,
         evidence_pack,
-        timeout_mgr: TimeoutManager
+        timeout_mgr: TimeoutManager,
+        partial_callback: Optional[callable] = None
     ) -> Dict:
         """Run strict mode pipeline (Researcher + Adversary + Critic + Judge).
 
@@ -350,7 +391,9 @@ class SydynEngine:
         # Researcher
         print(f"[SYDYN] Researcher generating answer...")
         emit("Researcher analyzing evidence and drafting claims...")
-        researcher_response = self.researcher.generate_answer(query_text, evidence_pack)
+        researcher_response = self.researcher.generate_answer(
+            query_text, evidence_pack, on_partial=_bind_partial(partial_callback, "researcher")
+        )
         emit(f"Researcher drafted {len(researcher_response.claims)} claims")
 
         # Adversary
@@ -405,7 +448,8 @@ class SydynEngine:
                 all_claims,
                 citation_grades,
                 evidence_pack,
-                mode="strict"
+                mode="strict",
+                on_partial=_bind_partial(partial_callback, "judge")
             )
             emit(f"Judge verdict: {judge_result.get('verdict', 'UNKNOWN')}")
         except LLMTimeoutException as e:
@@ -496,11 +540,12 @@ class SydynEngine:
         query_id: str,
         query_text: str,
         evidence_pack,
-        timeout_mgr: TimeoutManager
+        timeout_mgr: TimeoutManager,
+        partial_callback: Optional[callable] = None
     ) -> Dict:
         """Run liability mode pipeline (same as strict but stricter thresholds)."""
         # Same as strict mode for now
-        result = self._run_strict_mode(query_id, query_text, evidence_pack, timeout_mgr)
+        result = self._run_strict_mode(query_id, query_text, evidence_pack, timeout_mgr, partial_callback)
         result["mode"] = "liability"
         return result
 
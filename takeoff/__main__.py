@@ -4,6 +4,7 @@ Usage:
     python -m takeoff sample_snippets.json --verbose
     python -m takeoff snippets/ --mode strict --format json
     python -m takeoff job.json --mode fast --save-db
+    python -m takeoff bids/ --batch --batch-workers 4
 """
 
 import argparse
@@ -15,6 +16,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
+from takeoff.batch import batch_id_for, discover_jobs, load_job_input, run_batch
 from takeoff.engine import TakeoffEngine
 from takeoff.models import verify_api_key
 
@@ -31,6 +33,8 @@ Examples:
   python -m takeoff snippets.json --mode strict --verbose # Strict mode with detailed output
   python -m takeoff snippets/ --format json               # Directory of snippets
   python -m takeoff snippets.json --save-db               # Save to database
+  python -m takeoff snippets.json --save-db --base-job-id 1a2b3c4d  # Reuse unchanged work from a saved job
+  python -m takeoff bids/ --batch                         # Every job in bids/ (or bids/batch.json), resumable
 
 Snippet JSON format (single file):
   {
@@ -53,13 +57,27 @@ Snippet JSON format (single file):
       }
     ]
   }
+
+PDF drawing sets (rendered locally; bbox in PDF points, page_number 1-based):
+  {
+    "documents": [{"id": "set", "pdf_path": "drawings.pdf"}],
+    "snippets": [
+      {"id": "s1", "label": "fixture_schedule", "document_id": "set", "page_number": 1,
+       "bbox": {"x": 100, "y": 200, "width": 800, "height": 600}},
+      {"id": "s2", "label": "rcp", "sub_label": "Floor 2", "document_id": "set", "page_number": 5}
+    ]
+  }
+  pdf_path is resolved relative to the JSON file (or the manifest's directory).
+
+Batch manifest (--batch; inputs relative to the manifest, see takeoff/batch.py):
+  {"jobs": [{"id": "tower-a", "input": "tower_a/"}, {"id": "tower-b", "input": "tower_b.json", "mode": "fast"}]}
         """
     )
 
     parser.add_argument(
         "input",
         type=str,
-        help="Path to snippet JSON file or directory with manifest.json"
+        help="Path to snippet JSON file or directory with manifest.json (with --batch: batch manifest or directory of jobs)"
     )
 
     parser.add_argument(
@@ -97,8 +115,39 @@ Snippet JSON format (single file):
         help="Path to SQLite database (default: takeoff.db)"
     )
 
+    parser.add_argument(
+        "--no-vision-cache",
+        action="store_true",
+        help="Re-run vision extraction even for snippet images seen before"
+    )
+
+    parser.add_argument(
+        "--base-job-id",
+        type=str,
+        default=None,
+        help="Incremental re-takeoff: reuse extractions and Checker verdicts of unchanged snippets from "
+             "this earlier job (requires --save-db)"
+    )
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run every job in a batch manifest or directory; progress is kept in --db-path and resumed on rerun"
+    )
+
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        default=3,
+        help="Jobs run concurrently in batch mode (default: 3)"
+    )
+
     args = parser.parse_args()
 
+    if args.base_job_id and not args.save_db:
+        print("[ERROR] --base-job-id needs --save-db (the base job must be in the persistent database)", file=sys.stderr)
+        sys.exit(1)
+
     # Verify API key and connectivity using the shared helper
     print("[TAKEOFF] Verifying Anthropic API key...")
     try:
@@ -108,41 +157,21 @@ Snippet JSON format (single file):
         print(f"[ERROR] API verification failed: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Load snippet data
     input_path = Path(args.input)
+    if args.batch:
+        _run_batch_cli(args, input_path)
+        return
 
-    if input_path.is_dir():
-        manifest_path = input_path / "manifest.json"
-        if not manifest_path.exists():
-            print(f"[ERROR] Directory mode requires a manifest.json in {input_path}", file=sys.stderr)
-            sys.exit(1)
-        with open(manifest_path) as f:
-            job_data = json.load(f)
-        # Load image data from files referenced in manifest
-        import base64
-        for snippet in job_data.get("snippets", []):
-            if "image_path" in snippet and not snippet.get("image_data"):
-                img_path = input_path / snippet["image_path"]
-                if not img_path.exists():
-                    print(f"[ERROR] Snippet '{snippet.get('id', '?')}' references missing image file: {img_path}", file=sys.stderr)
-                    sys.exit(1)
-                with open(img_path, "rb") as img_file:
-                    snippet["image_data"] = base64.b64encode(img_file.read()).decode()
-    elif input_path.is_file():
-        with open(input_path) as f:
-            job_data = json.load(f)
-    else:
-        print(f"[ERROR] Input path not found: {args.input}", file=sys.stderr)
-        sys.exit(1)
-
-    snippets = job_data.get("snippets", [])
-    drawing_name = job_data.get("drawing_name")
-
-    if not snippets:
-        print("[ERROR] No snippets found in input file", file=sys.stderr)
+    # Load snippet data (images from manifest files, PDF drawing sets by path)
+    try:
+        snippets, drawing_name, documents = load_job_input(input_path)
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
         sys.exit(1)
 
     print(f"[TAKEOFF] Loaded {len(snippets)} snippets")
+    if documents:
+        print(f"[TAKEOFF] Documents: {len(documents)} PDF drawing set(s)")
     if drawing_name:
         print(f"[TAKEOFF] Drawing: {drawing_name}")
     print(f"[TAKEOFF] Mode: {args.mode.upper()}\n")
@@ -169,7 +198,10 @@ Snippet JSON format (single file):
             snippets=snippets,
             mode=args.mode,
             drawing_name=drawing_name,
-            status_callback=_cli_status
+            status_callback=_cli_status,
+            use_vision_cache=not args.no_vision_cache,
+            documents=documents or None,
+            base_job_id=args.base_job_id
         )
     except Exception as e:
         print(f"[ERROR] Takeoff failed: {e}", file=sys.stderr)
@@ -185,6 +217,53 @@ Snippet JSON format (single file):
         _format_text_output(result, verbose=args.verbose)
 
 
+def _run_batch_cli(args, batch_path: Path):
+    """--batch: run every pending job on a shared engine and print the throughput summary."""
+    try:
+        jobs = discover_jobs(batch_path)
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
+    if not jobs:
+        print(f"[ERROR] No jobs found in {batch_path}", file=sys.stderr)
+        sys.exit(1)
+
+    batch_id = batch_id_for(batch_path)
+    print(f"[TAKEOFF] Batch {batch_id}: {len(jobs)} job(s), {args.batch_workers} worker(s), mode {args.mode.upper()}")
+    print(f"[TAKEOFF] Progress recorded in {args.db_path}\n")
+    try:
+        engine = TakeoffEngine(db_path=args.db_path)  # Batch progress must survive the process
+    except Exception as e:
+        print(f"[ERROR] Failed to initialize engine: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    summary = run_batch(
+        engine, jobs, batch_id,
+        mode=args.mode,
+        workers=args.batch_workers,
+        use_vision_cache=not args.no_vision_cache,
+        on_progress=lambda message: print(f"  {message}"),
+    )
+    engine.db.close()
+
+    if args.format == "json":
+        print(json.dumps(summary, indent=2))
+    else:
+        print()
+        print("=" * 70)
+        print(f"BATCH {summary['batch_id']}: {summary['completed']} complete, {summary['failed']} failed, "
+              f"{summary['skipped']} skipped (already complete)")
+        print("=" * 70)
+        print(f"Throughput:   {summary['jobs_per_hour']} jobs/hour over {summary['wall_s']:.0f}s")
+        print(f"Job latency:  p50 {summary['p50_latency_s']}s, p95 {summary['p95_latency_s']}s")
+        print(f"Vision calls: {summary['vision_calls_per_job']} per job")
+        print(f"Cost:         ${summary['cost_usd']:.4f} total, ${summary['cost_per_job_usd']:.4f} per job")
+        for entry_id, error in summary["failures"].items():
+            print(f"FAILED {entry_id}: {error}")
+    if summary["failed"]:
+        sys.exit(1)
+
+
 def _format_text_output(result: dict, verbose: bool = False):
     """Format result as human-readable text."""
     print()
@@ -283,6 +362,50 @@ def _format_text_output(result: dict, verbose: bool = False):
     ac = result.get("agent_counts", {})
     if ac:
         print(f"Pipeline: {ac.get('counter_types', 0)} type tags counted → {ac.get('checker_attacks', 0)} attacks → {ac.get('reconciler_responses', 0)} responses")
+    if result.get("reconciler_skipped"):
+        print(f"Reconciler skipped: {result['reconciler_skipped']['reason']}")
+
+    prep = result.get("image_prep", {})
+    if prep.get("images_sent"):
+        print(
+            f"Vision images: {prep['images_sent']} sent, ~{prep['tokens_saved']} image tokens and "
+            f"{prep['bytes_saved'] / 1024:.0f} KB upload saved by preprocessing ({prep['prep_ms']:.0f} ms)"
+        )
+    cache = result.get("vision_cache", {})
+    if cache.get("hits"):
+        print(f"Vision cache: {cache['hits']} hits, {cache['misses']} misses")
+    usage = result.get("usage", {})
+    if usage.get("total", {}).get("calls"):
+        vision, agent = usage["vision"], usage["agent"]
+        print(
+            f"Usage: {vision['calls']} vision calls ({vision['input_tokens'] + vision['output_tokens']} tokens, "
+            f"${vision['cost_usd']:.4f}), {agent['calls']} agent calls "
+            f"({agent['input_tokens'] + agent['output_tokens']} tokens, ${agent['cost_usd']:.4f})"
+        )
+    checker_timing = result.get("checker_timing", {})
+    if checker_timing.get("saved_ms"):
+        print(
+            f"Checker: text review {checker_timing['text_ms'] / 1000:.1f}s and vision checks "
+            f"{checker_timing['vision_ms'] / 1000:.1f}s overlapped in {checker_timing['wall_ms'] / 1000:.1f}s"
+        )
+    incremental = result.get("incremental")
+    if incremental:
+        diff = incremental["snippets"]
+        print(
+            f"Incremental (base {incremental['base_job_id']}): {len(diff['unchanged'])} unchanged, "
+            f"{len(diff['changed'])} changed, {len(diff['added'])} added, {len(diff['removed'])} removed snippets; "
+            f"reused {incremental['extractions']['reused']} extractions and "
+            f"{incremental['checker_areas']['reused']} Checker areas (~{incremental['time_saved_ms'] / 1000:.1f}s saved)"
+        )
+    pdf = result.get("pdf_rasterization", {})
+    if pdf.get("snippets_rendered"):
+        print(
+            f"PDF pages: {pdf['snippets_rendered']} snippets from {pdf['documents']} document(s), "
+            f"{pdf['page_renders']} page renders ({pdf['page_cache_hits']} cache hits)"
+        )
+    waits = result.get("vision_scheduler", {}).get("job", {})
+    if waits.get("max_wait_ms"):
+        print(f"Vision queue: {waits['calls']} calls, mean wait {waits['mean_wait_ms']:.0f} ms, max {waits['max_wait_ms']:.0f} ms")
 
     elapsed = result.get("latency_ms", 0)
     print(f"Completed in {elapsed / 1000:.1f}s")
@@ -4,19 +4,27 @@ Mirrors sydyn/agents.py exactly — same patterns, same JSON extraction helpers,
 same response dataclasses. Domain logic replaced with lighting takeoff specifics.
 """
 
+import copy
+import hashlib
 import json
 import logging
 import re
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import Callable, List, Dict, Optional
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
 from takeoff.extraction import (
     FixtureSchedule, AreaCount, PlanNote, PanelData, extract_json_from_response,
-    _call_vision_with_retry, _get_vision_client,
+    _call_vision_with_retry, _get_vision_client, _vision_model, count_rcp_tiled,
 )
+from takeoff.llm import PromptSegment
+from takeoff.scheduler import submit
+from takeoff.settings import API_CONFIG
+from takeoff.visioncache import image_digest
 
 
 @dataclass
@@ -27,6 +35,8 @@ class TakeoffResponse:
     raw_response: str
     reasoning: Optional[str] = None
     parse_error: bool = False  # True when JSON parsing of the LLM response failed
+    area_verdicts: Dict[str, Dict] = field(default_factory=dict)  # Checker: per-area vision verdicts by input key
+    timings: Dict[str, float] = field(default_factory=dict)        # Checker: text / vision / wall ms
 
 
 # ─── Counter Agent ────────────────────────────────────────────────────────────
@@ -168,6 +178,239 @@ Produce the complete fixture count. Aggregate all per-area counts, assign diffic
             return TakeoffResponse(agent_role="counter", data={}, raw_response=response.content, parse_error=True)
 
 
+    def generate_count_deterministic(
+        self,
+        fixture_schedule: FixtureSchedule,
+        area_counts: List[AreaCount],
+        plan_notes: List[PlanNote],
+        panel_data: Optional[PanelData] = None
+    ) -> TakeoffResponse:
+        """Build the fixture count in code; the model only reviews residual judgment items.
+
+        Totals, per-area breakdowns and the grand total come straight from the
+        extraction results (aggregate_area_counts), so they cannot be misadded.
+        Unscheduled/UNKNOWN tags, quantity plan notes (e.g. "TYP 4 PLACES") and
+        emergency-related notes go to one short model call that may add
+        quantities and flags; with no residual items there is no call at all.
+
+        Returns:
+            TakeoffResponse shaped like generate_count(), with "aggregation" and
+            "residual_items" keys added to data
+        """
+        data = aggregate_area_counts(fixture_schedule, area_counts)
+        residuals = counter_residual_items(fixture_schedule, area_counts, plan_notes)
+        data["aggregation"] = "deterministic"
+        data["residual_items"] = residuals
+        if not residuals:
+            print(f"[COUNTER] {len(data['fixture_counts'])} fixture types, {data['grand_total_fixtures']} total fixtures (no model call)")
+            return TakeoffResponse(agent_role="counter", data=data, raw_response=json.dumps(data), reasoning=data["reasoning"])
+
+        table = {
+            fc["type_tag"]: {"description": fc["description"], "counts_by_area": fc["counts_by_area"], "total": fc["total"]}
+            for fc in data["fixture_counts"]
+        }
+        panel_text = "No panel schedule provided."
+        if panel_data and panel_data.circuits:
+            panel_text = f"Panel '{panel_data.panel_name}': total load = {panel_data.total_load_va} VA across {len(panel_data.circuits)} circuits."
+
+        system_prompt = """You are the COUNTER agent in the Takeoff adversarial system — the electrical estimator performing the initial fixture count.
+
+The per-area extraction counts have already been summed in code. Do NOT recount or re-add them.
+Your role: resolve only the residual items listed, each of which needs an estimator's judgment:
+- Type tags not in the fixture schedule (including UNKNOWN): flag each with "UNSCHEDULED: <reason>" or "ASSUMPTION: <reason>"
+- Quantity plan notes (e.g. "TYP 4 PLACES", "(2) PER ROOM"): return the ADDITIONAL fixtures the note requires beyond what the RCP counts already show, per type tag and area. Return nothing if the RCP counts already include them.
+- Emergency notes (exit signs, EM battery packs, egress lighting): note which type tags provide emergency lighting, and flag any emergency requirement the counts do not cover
+
+CRITICAL: Respond with ONLY a valid JSON object. No markdown. No explanation before or after.
+
+Output format:
+{
+  "adjustments": [{"type_tag": "A", "area": "Floor 2 North Wing", "add": 4, "reason": "Note 3: TYP 4 PLACES"}],
+  "flags": {"X": ["UNSCHEDULED: tag X not in fixture schedule"]},
+  "notes": {"EX": "Exit signs — emergency circuit"},
+  "reasoning": "..."
+}"""
+
+        user_prompt = f"""COMPUTED FIXTURE COUNTS (authoritative sums):
+{json.dumps(table, indent=2)}
+
+RESIDUAL ITEMS TO RESOLVE:
+{chr(10).join(f"  - {item}" for item in residuals)}
+
+PANEL LOAD DATA:
+{panel_text}"""
+
+        try:
+            response = self.model_router.complete(
+                task_type="takeoff_counter",
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=1500
+            )
+            review = extract_json_from_response(response.content, "COUNTER")
+        except Exception as e:
+            # The computed table stands; the residual items are left flagged for manual review
+            logger.warning("[COUNTER] Residual review failed: %s — keeping computed counts with flags", e)
+            _flag_unresolved_residuals(data, fixture_schedule, plan_notes)
+            data["reasoning"] += f" Residual review unavailable ({e}); {len(residuals)} item(s) flagged for manual review."
+            return TakeoffResponse(agent_role="counter", data=data, raw_response=json.dumps(data), reasoning=data["reasoning"])
+
+        _apply_residual_review(data, review, fixture_schedule)
+        if review.get("reasoning"):
+            data["reasoning"] += f" Residual review: {review['reasoning']}"
+        print(f"[COUNTER] {len(data['fixture_counts'])} fixture types, {data['grand_total_fixtures']} total fixtures "
+              f"({len(residuals)} residual item(s) reviewed)")
+        return TakeoffResponse(agent_role="counter", data=data, raw_response=response.content, reasoning=data["reasoning"])
+
+
+# Difficulty codes from the Counter prompt, by schedule description keyword (first match wins)
+_DIFFICULTY_KEYWORDS = [
+    ("E", ("custom", "architectural", "chandelier")),
+    ("D", ("high bay", "high-bay", "pendant", "suspended", "pole", "cove", "track")),
+    ("M", ("recessed", "downlight", "can light", "wall pack", "wallpack", "sconce", "strip")),
+]
+_ASSUMPTION_TAGS = {"UNKNOWN", "TBD", "?"}
+# Plan-note wording that changes quantities rather than describing fixtures
+_QUANTITY_NOTE_RE = re.compile(
+    r"\bTYP(?:ICAL)?\.?\s*(?:OF\s*)?\(?\d+\)?\s*(?:PLACES|PLCS|LOCATIONS)\b"
+    r"|\(\d+\)\s*(?:PER|EACH|AT)\b|\b\d+\s*(?:PER|EA\.?|EACH)\s+(?:ROOM|OFFICE|STALL|BAY|FLOOR|UNIT|AREA)\b",
+    re.IGNORECASE,
+)
+
+
+def _difficulty_for(description: str) -> str:
+    desc = (description or "").lower()
+    for code, keywords in _DIFFICULTY_KEYWORDS:
+        if any(k in desc for k in keywords):
+            return code
+    return "S"
+
+
+def aggregate_area_counts(fixture_schedule: FixtureSchedule, area_counts: List[AreaCount]) -> dict:
+    """Counter output (fixture_counts, areas_covered, grand_total_fixtures) summed from extraction results.
+
+    Every schedule tag appears, even at 0. Area tags match schedule tags
+    case-insensitively; tags missing from the schedule are kept and flagged.
+    Areas whose extraction failed are left out of areas_covered, so the
+    coverage rule still reports them.
+    """
+    schedule_tags = {tag.upper(): tag for tag in fixture_schedule.fixtures}
+    by_tag: Dict[str, Dict[str, int]] = {tag: {} for tag in fixture_schedule.fixtures}
+    areas_covered: List[str] = []
+    for ac in area_counts:
+        if any(str(w).startswith("Extraction failed") for w in ac.warnings) and not ac.counts_by_type:
+            continue
+        if ac.area_label not in areas_covered:
+            areas_covered.append(ac.area_label)
+        for raw_tag, count in ac.counts_by_type.items():
+            tag = schedule_tags.get(str(raw_tag).upper(), str(raw_tag))
+            if not isinstance(count, (int, float)) or isinstance(count, bool):
+                continue
+            area_totals = by_tag.setdefault(tag, {})
+            area_totals[ac.area_label] = area_totals.get(ac.area_label, 0) + int(count)
+
+    fixture_counts = []
+    for tag, counts_by_area in by_tag.items():
+        info = fixture_schedule.fixtures.get(tag)
+        description = (info.get("description") if isinstance(info, dict) else info) or ""
+        flags = []
+        if tag.upper() in _ASSUMPTION_TAGS:
+            flags.append("ASSUMPTION: fixture type not identified in schedule")
+        elif info is None:
+            flags.append(f"UNSCHEDULED: type {tag} counted on RCP but not in fixture schedule")
+        fixture_counts.append({
+            "type_tag": tag,
+            "description": str(description),
+            "counts_by_area": counts_by_area,
+            "total": sum(counts_by_area.values()),
+            "difficulty": _difficulty_for(str(description)),
+            "notes": "Summed from RCP extraction counts",
+            "accessories": [],
+            "flags": flags,
+        })
+    grand_total = sum(fc["total"] for fc in fixture_counts)
+    return {
+        "fixture_counts": fixture_counts,
+        "areas_covered": areas_covered,
+        "grand_total_fixtures": grand_total,
+        "reasoning": f"Summed {len(area_counts)} RCP area extraction(s) in code: {grand_total} fixtures across {len(fixture_counts)} type(s).",
+    }
+
+
+def counter_residual_items(fixture_schedule: FixtureSchedule, area_counts: List[AreaCount],
+                           plan_notes: List[PlanNote]) -> List[str]:
+    """Items the deterministic Counter cannot settle: unscheduled tags, quantity notes, emergency notes."""
+    from takeoff.constitution import EMERGENCY_KEYWORDS
+
+    def mentions_emergency(text: str) -> bool:
+        return any(re.search(r"\b" + re.escape(kw) + r"\b", text, re.IGNORECASE) for kw in EMERGENCY_KEYWORDS)
+
+    items = []
+    schedule_tags = {tag.upper() for tag in fixture_schedule.fixtures}
+    unscheduled = sorted({
+        str(tag) for ac in area_counts for tag in ac.counts_by_type if str(tag).upper() not in schedule_tags
+    })
+    for tag in unscheduled:
+        areas = [ac.area_label for ac in area_counts if tag in ac.counts_by_type]
+        items.append(f"Type tag '{tag}' is not in the fixture schedule (areas: {', '.join(areas)})")
+    for note in plan_notes:
+        if note.constraint_type == "quantity" or _QUANTITY_NOTE_RE.search(note.text):
+            target = f" (type {note.affects_fixture_type})" if note.affects_fixture_type else ""
+            items.append(f"Quantity plan note{target}: {note.text}")
+        elif mentions_emergency(note.text):
+            items.append(f"Emergency plan note: {note.text}")
+    for ac in area_counts:
+        for area_note in ac.notes:
+            if _QUANTITY_NOTE_RE.search(area_note) or mentions_emergency(area_note):
+                items.append(f"Area '{ac.area_label}' note: {area_note}")
+    return items
+
+
+def _apply_residual_review(data: dict, review: dict, fixture_schedule: FixtureSchedule) -> None:
+    """Fold the model's adjustments and flags into the computed table, re-summing in code."""
+    by_tag = {fc["type_tag"].upper(): fc for fc in data["fixture_counts"]}
+    for adj in review.get("adjustments") or []:
+        tag, area, add = str(adj.get("type_tag") or ""), str(adj.get("area") or ""), adj.get("add")
+        if not tag or not area or not isinstance(add, int) or isinstance(add, bool) or add == 0:
+            logger.warning("[COUNTER] Ignoring malformed residual adjustment: %s", adj)
+            continue
+        fc = by_tag.get(tag.upper())
+        if fc is None:
+            fc = by_tag[tag.upper()] = {
+                "type_tag": tag, "description": "", "counts_by_area": {}, "total": 0,
+                "difficulty": "S", "notes": "Added from plan notes", "accessories": [],
+                "flags": [] if tag.upper() in {t.upper() for t in fixture_schedule.fixtures}
+                else [f"UNSCHEDULED: type {tag} added from plan notes but not in fixture schedule"],
+            }
+            data["fixture_counts"].append(fc)
+        fc["counts_by_area"][area] = max(fc["counts_by_area"].get(area, 0) + add, 0)
+        fc["flags"].append(f"PLAN NOTE: {add:+d} in {area} — {adj.get('reason') or 'per plan notes'}")
+    for tag, flags in (review.get("flags") or {}).items():
+        fc = by_tag.get(str(tag).upper())
+        if fc is not None and isinstance(flags, list):
+            fc["flags"].extend(str(f) for f in flags if str(f) not in fc["flags"])
+    for tag, note in (review.get("notes") or {}).items():
+        fc = by_tag.get(str(tag).upper())
+        if fc is not None and note:
+            fc["notes"] = f"{fc['notes']}; {note}"
+    for fc in data["fixture_counts"]:
+        fc["total"] = sum(fc["counts_by_area"].values())
+    data["grand_total_fixtures"] = sum(fc["total"] for fc in data["fixture_counts"])
+
+
+def _flag_unresolved_residuals(data: dict, fixture_schedule: FixtureSchedule, plan_notes: List[PlanNote]) -> None:
+    """Without a residual review, mark note-affected types so nothing passes silently."""
+    by_tag = {fc["type_tag"].upper(): fc for fc in data["fixture_counts"]}
+    for note in plan_notes:
+        if not (note.constraint_type == "quantity" or _QUANTITY_NOTE_RE.search(note.text)):
+            continue
+        targets = [by_tag[note.affects_fixture_type.upper()]] if (
+            note.affects_fixture_type and note.affects_fixture_type.upper() in by_tag
+        ) else data["fixture_counts"]
+        for fc in targets:
+            fc["flags"].append(f"ASSUMPTION: plan note not applied — verify quantity: {note.text}")
+
+
 # ─── Checker Agent ────────────────────────────────────────────────────────────
 
 class Checker:
@@ -187,6 +430,7 @@ class Checker:
         plan_notes: List[PlanNote],
         panel_data: Optional[PanelData] = None,
         rcp_images: Optional[List[Dict]] = None,
+        prior_verdicts: Optional[Dict[str, Dict]] = None,
     ) -> TakeoffResponse:
         """Find errors, omissions, and inconsistencies in the Counter's count.
 
@@ -196,12 +440,16 @@ class Checker:
             area_counts: Original per-area extraction data
             plan_notes: Plan notes constraints
             panel_data: Panel schedule (optional)
-            rcp_images: Optional list of {"area_label": str, "image_data": str} dicts,
+            rcp_images: Optional list of {"area_label": str, "image_data": str | SnippetHandle} dicts,
                 one per RCP snippet. When provided, Checker independently counts each
                 area via vision and flags discrepancies with Counter's claimed counts.
+            prior_verdicts: Per-area vision verdicts from an earlier job (see
+                TakeoffResponse.area_verdicts). An area whose image, schedule and
+                claimed counts are unchanged reuses its verdict instead of a vision call.
 
         Returns:
-            TakeoffResponse with adversarial attacks
+            TakeoffResponse with adversarial attacks; area_verdicts holds every
+            per-area vision verdict of this run (fresh and reused), keyed by input
         """
         # Summarize counter output
         counter_counts = counter_output.get("fixture_counts", [])
@@ -298,11 +546,37 @@ Panel cross-reference:
 
 Check for: missed areas, double-counted overlapping views, wrong fixture type assignments, missing fixture types that likely exist, math errors, missing accessories, emergency fixture gaps, and plan note violations."""
 
+        # ── Text-based LLM review, dispatched first ─────────────────────────────
+        # Independent of the vision checks until the merge below, so it runs on
+        # its own thread while this thread drives the vision phase. Latency is
+        # the slower branch instead of the sum; timings records both.
+        phase_started = time.perf_counter()
+        text_timing: Dict[str, float] = {}
+
+        def _text_review():
+            started = time.perf_counter()
+            try:
+                return self.model_router.complete(
+                    task_type="takeoff_checker",
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    max_tokens=3000
+                )
+            finally:
+                text_timing["ms"] = (time.perf_counter() - started) * 1000
+
+        text_ex = ThreadPoolExecutor(max_workers=1)
+        text_future = submit(text_ex, _text_review)
+        text_ex.shutdown(wait=False)  # The worker exits after this one call; result() below joins it
+
         # ── Vision phase: independent per-area count verification ──────────────
         # For each RCP snippet, call Claude vision to independently count fixtures
-        # and compare with Counter's claimed counts. Discrepancies become attacks.
-        # Runs BEFORE the text-based LLM call so all attacks dedup together.
+        # and compare with Counter's claimed counts. Discrepancies become attacks
+        # and are merged with the text review's before one deduplication pass.
+        vision_started = time.perf_counter()
         vision_attacks = []
+        area_verdicts: Dict[str, Dict] = {}
+        verdicts_lock = threading.Lock()
         if rcp_images:
             try:
                 vision_client = _get_vision_client()
@@ -328,12 +602,48 @@ Check for: missed areas, double-counted overlapping views, wrong fixture type as
 
                     # Counter's claimed counts for this specific area
                     claimed_lines = []
+                    claimed_by_type: Dict[str, int] = {}
                     for fc in counter_output.get("fixture_counts", []):
                         area_count = fc.get("counts_by_area", {}).get(area_label, 0)
                         if area_count > 0:
                             claimed_lines.append(f"  Type {fc.get('type_tag', '?')}: {area_count}")
+                            claimed_by_type[fc.get("type_tag", "?")] = area_count
                     claimed_text = "\n".join(claimed_lines) or "  (Counter claimed 0 fixtures in this area)"
 
+                    # Same image, schedule and claim as an earlier job: its verdict still holds
+                    verdict_key = _area_verdict_key(area_label, image_data, schedule_context, claimed_by_type)
+                    prior = (prior_verdicts or {}).get(verdict_key)
+                    if prior is not None:
+                        logger.info("[CHECKER] Reusing vision verdict for unchanged area '%s'", area_label)
+                        with verdicts_lock:
+                            area_verdicts[verdict_key] = {**prior, "area_label": area_label, "reused": True}
+                        return [{**copy.deepcopy(a), "_area_label": area_label} for a in prior["attacks"]]
+                    started = time.perf_counter()
+
+                    def _record(attacks: List[Dict]) -> List[Dict]:
+                        with verdicts_lock:
+                            area_verdicts[verdict_key] = {
+                                "area_label": area_label,
+                                "attacks": [
+                                    {k: v for k, v in a.items() if k != "_area_label"} for a in copy.deepcopy(attacks)
+                                ],
+                                "latency_ms": int((time.perf_counter() - started) * 1000),
+                                "reused": False,
+                            }
+                        return attacks
+
+                    # Large sheets: count independently tile by tile and compare in code
+                    if API_CONFIG.get("rcp_tiling", False):
+                        try:
+                            tiled = count_rcp_tiled(
+                                vision_client, image_data, schedule_context, area_label, priority="checker"
+                            )
+                        except Exception as e:
+                            logger.warning("[CHECKER] Tiled vision check failed for area '%s': %s — skipping", area_label, e)
+                            return []
+                        if tiled is not None:
+                            return _record(_tiled_count_attacks(area_label, tiled.counts_by_type, claimed_by_type))
+
                     vision_system = f"""You are an independent verification agent for electrical fixture counting.
 
 Known fixture types from the schedule:
@@ -390,6 +700,7 @@ Return JSON ONLY — no explanatory text:
                             image_base64=image_data,
                             max_tokens=1500,
                             temperature=0.3,
+                            priority="checker",
                         )
                         vision_data = extract_json_from_response(vision_resp, "CHECKER_VISION")
                         area_attacks = []
@@ -417,7 +728,7 @@ Return JSON ONLY — no explanatory text:
                                 "suggested_correction": found,
                                 "evidence": f"Direct image analysis of RCP for '{area_label}' (confidence: {confidence})",
                             })
-                        return area_attacks
+                        return _record(area_attacks)
                     except Exception as e:
                         logger.warning("[CHECKER] Vision check failed for area '%s': %s — skipping", area_label, e)
                         return []
@@ -428,7 +739,7 @@ Return JSON ONLY — no explanatory text:
                 all_area_attacks: List[List[Dict]] = [[] for _ in valid_rcp]
                 if max_vis_workers > 0:
                     with ThreadPoolExecutor(max_workers=max_vis_workers) as _vis_ex:
-                        _vis_futures = {_vis_ex.submit(_check_one_area, r): i for i, r in enumerate(valid_rcp)}
+                        _vis_futures = {submit(_vis_ex, _check_one_area, r): i for i, r in enumerate(valid_rcp)}
                         for fut in as_completed(_vis_futures):
                             idx = _vis_futures[fut]
                             try:
@@ -445,15 +756,13 @@ Return JSON ONLY — no explanatory text:
                         _vision_attack_counter += 1
                         vision_attacks.append(atk)
 
-        # ── Text-based LLM attack phase ────────────────────────────────────────
+        vision_ms = (time.perf_counter() - vision_started) * 1000 if rcp_images else 0.0
+
+        # ── Merge: wait for the text review, then deduplicate all attacks once ──
         try:
-            response = self.model_router.complete(
-                task_type="takeoff_checker",
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                max_tokens=3000
-            )
+            response = text_future.result()
         except Exception as e:
+            timings = _checker_timings(text_timing.get("ms", 0.0), vision_ms, phase_started)
             print(f"[CHECKER] ERROR: Model router failed: {e}")
             # Still return any vision attacks even if text LLM fails
             if vision_attacks:
@@ -462,9 +771,13 @@ Return JSON ONLY — no explanatory text:
                     data={"attacks": vision_attacks, "total_attacks": len(vision_attacks),
                           "critical_count": sum(1 for a in vision_attacks if a.get("severity") == "critical"),
                           "_model_failure": True},
-                    raw_response=f"[MODEL ERROR: {e}]"
+                    raw_response=f"[MODEL ERROR: {e}]",
+                    area_verdicts=area_verdicts,
+                    timings=timings
                 )
-            return TakeoffResponse(agent_role="checker", data={"attacks": [], "_model_failure": True}, raw_response=f"[MODEL ERROR: {e}]")
+            return TakeoffResponse(agent_role="checker", data={"attacks": [], "_model_failure": True},
+                                   raw_response=f"[MODEL ERROR: {e}]", area_verdicts=area_verdicts, timings=timings)
+        timings = _checker_timings(text_timing.get("ms", 0.0), vision_ms, phase_started)
 
         try:
             data = extract_json_from_response(response.content, "CHECKER")
@@ -503,11 +816,71 @@ Return JSON ONLY — no explanatory text:
                 agent_role="checker",
                 data=data,
                 raw_response=response.content,
-                reasoning=data.get("summary")
+                reasoning=data.get("summary"),
+                area_verdicts=area_verdicts,
+                timings=timings
             )
         except (json.JSONDecodeError, ValueError) as e:
             print(f"[CHECKER] ERROR: Failed to parse JSON response: {e}")
-            return TakeoffResponse(agent_role="checker", data={"attacks": []}, raw_response=response.content, parse_error=True)
+            return TakeoffResponse(agent_role="checker", data={"attacks": []}, raw_response=response.content,
+                                   parse_error=True, area_verdicts=area_verdicts, timings=timings)
+
+
+def _checker_timings(text_ms: float, vision_ms: float, phase_started: float) -> Dict[str, float]:
+    """Checker phase timings: each branch, the overlapped wall time, and the time saved by overlapping."""
+    wall_ms = (time.perf_counter() - phase_started) * 1000
+    timings = {
+        "text_ms": round(text_ms, 1),
+        "vision_ms": round(vision_ms, 1),
+        "wall_ms": round(wall_ms, 1),
+        "saved_ms": round(max(text_ms + vision_ms - wall_ms, 0.0), 1),
+    }
+    logger.info("[CHECKER] Text %.0f ms and vision %.0f ms overlapped in %.0f ms (%.0f ms saved)",
+                text_ms, vision_ms, wall_ms, timings["saved_ms"])
+    return timings
+
+
+def _area_verdict_key(area_label: str, image_data, schedule_context: str,
+                      claimed_by_type: Dict[str, int]) -> str:
+    """Identity of one per-area vision verification's inputs (image, schedule, Counter's claim, model)."""
+    return hashlib.sha256(json.dumps([
+        area_label, image_digest(image_data), schedule_context, sorted(claimed_by_type.items()),
+        _vision_model(), bool(API_CONFIG.get("rcp_tiling", False)),
+    ]).encode()).hexdigest()
+
+
+def _tiled_count_attacks(area_label: str, found_by_type: Dict[str, int],
+                        claimed_by_type: Dict[str, int]) -> List[Dict]:
+    """Checker attacks for one area from an independent tiled count (same severity guide as the vision prompt)."""
+    attacks = []
+    for tag in sorted(set(found_by_type) | set(claimed_by_type)):
+        found = found_by_type.get(tag, 0)
+        claimed = claimed_by_type.get(tag, 0)
+        diff = abs(found - claimed)
+        if diff == 0:
+            continue
+        pct = diff / max(found, claimed)
+        if diff >= 3 or pct > 0.20:
+            severity = "critical"
+        elif diff == 2 or pct >= 0.10:
+            severity = "major"
+        else:
+            severity = "minor"
+        direction_label = "over-count" if claimed > found else "under-count"
+        attacks.append({
+            "_area_label": area_label,
+            "severity": severity,
+            "category": "missed_fixtures",
+            "affected_type_tag": tag,
+            "affected_area": area_label,
+            "description": (
+                f"[VISION CHECK] Independent tiled count for area '{area_label}' "
+                f"found {found} × Type {tag}, but Counter claimed {claimed} ({direction_label})."
+            ),
+            "suggested_correction": found,
+            "evidence": f"Tile-by-tile image analysis of RCP for '{area_label}' at full resolution",
+        })
+    return attacks
 
 
 # ─── Reconciler Agent ─────────────────────────────────────────────────────────
@@ -528,7 +901,8 @@ class Reconciler:
         checker_attacks: List[Dict],
         fixture_schedule: FixtureSchedule,
         area_counts: List[AreaCount],
-        plan_notes: Optional[List] = None
+        plan_notes: Optional[List] = None,
+        on_partial: Optional[Callable[[str], None]] = None
     ) -> TakeoffResponse:
         """Address each Checker attack — defend or concede.
 
@@ -538,6 +912,7 @@ class Reconciler:
             fixture_schedule: Fixture schedule for reference
             area_counts: Original RCP extraction data
             plan_notes: Plan notes constraints — Reconciler verifies these were applied
+            on_partial: Optional callback receiving token deltas (streams the call)
 
         Returns:
             TakeoffResponse with responses and revised counts
@@ -618,7 +993,8 @@ Address each attack and provide revised counts. For each plan note constraint, e
                 task_type="takeoff_reconciler",
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
-                max_tokens=3000
+                max_tokens=3000,
+                on_delta=on_partial
             )
         except Exception as e:
             print(f"[RECONCILER] ERROR: Model router failed: {e}")
@@ -652,6 +1028,48 @@ class Judge:
     def __init__(self, model_router, constitution: dict):
         self.model_router = model_router
         self.constitution = constitution
+        self._rules_prompt = self._build_rules_prompt()
+
+    def _build_rules_prompt(self) -> str:
+        """Static part of the Judge system prompt (role, hard rules, output format).
+
+        Identical for every job, so it is sent as a cacheable prefix.
+        """
+        hard_rules_text = "\n".join([
+            f"{i+1}. {rule['name']}: {rule['description']}"
+            for i, rule in enumerate(self.constitution["hard_rules"])
+        ])
+
+        return f"""You are the JUDGE agent in the Takeoff adversarial system — the final constitutional authority.
+
+Your role: Evaluate the takeoff against all 6 hard rules and issue a final ruling.
+
+HARD RULES (must enforce):
+{hard_rules_text}
+
+CRITICAL: Respond with ONLY a valid JSON object. No markdown. No explanation before or after.
+
+Output format:
+{{
+  "verdict": "PASS|WARN|BLOCK",
+  "violations": [
+    {{
+      "rule": "rule name",
+      "severity": "FATAL|MAJOR|MINOR",
+      "explanation": "specific reason for violation"
+    }}
+  ],
+  "approved_counts": {{
+    "A": 54,
+    "B": 18
+  }},
+  "flags": ["list of warnings or items to verify"],
+  "ruling_summary": "one paragraph ruling"
+}}
+
+PASS: No major violations — takeoff approved
+WARN: Minor violations — takeoff acceptable with noted caveats
+BLOCK: Fatal violations — takeoff must be redone"""
 
     def evaluate(
         self,
@@ -659,7 +1077,8 @@ class Judge:
         checker_attacks: List[Dict],
         reconciler_output: Optional[dict],
         fixture_schedule: FixtureSchedule,
-        mode: str = "fast"
+        mode: str = "fast",
+        on_partial: Optional[Callable[[str], None]] = None
     ) -> Dict:
         """Evaluate the complete takeoff against constitutional rules.
 
@@ -669,6 +1088,7 @@ class Judge:
             reconciler_output: Reconciler's responses (None in fast mode)
             fixture_schedule: Fixture schedule for traceability check
             mode: "fast" | "strict" | "liability"
+            on_partial: Optional callback receiving token deltas (streams the call)
 
         Returns:
             Dict with verdict, violations, flags, and ruling summary
@@ -676,12 +1096,6 @@ class Judge:
         if mode not in ("fast", "strict", "liability"):
             raise ValueError(f"[JUDGE] Unknown mode '{mode}'. Must be 'fast', 'strict', or 'liability'.")
 
-        # Build hard rules text
-        hard_rules_text = "\n".join([
-            f"{i+1}. {rule['name']}: {rule['description']}"
-            for i, rule in enumerate(self.constitution["hard_rules"])
-        ])
-
         # Final counts (reconciler's revised if available, else counter's)
         if reconciler_output and reconciler_output.get("revised_fixture_counts"):
             final_counts = reconciler_output["revised_fixture_counts"]
@@ -711,38 +1125,10 @@ class Judge:
             resolved_ids = {r.get("attack_id") for r in reconciler_output.get("responses", [])}
             unresolved = [a for a in checker_attacks if a.get("attack_id") not in resolved_ids]
 
-        system_prompt = f"""You are the JUDGE agent in the Takeoff adversarial system — the final constitutional authority.
-
-Your role: Evaluate the takeoff against all 6 hard rules and issue a final ruling.
-
-MODE: {mode.upper()}
-
-HARD RULES (must enforce):
-{hard_rules_text}
-
-CRITICAL: Respond with ONLY a valid JSON object. No markdown. No explanation before or after.
-
-Output format:
-{{
-  "verdict": "PASS|WARN|BLOCK",
-  "violations": [
-    {{
-      "rule": "rule name",
-      "severity": "FATAL|MAJOR|MINOR",
-      "explanation": "specific reason for violation"
-    }}
-  ],
-  "approved_counts": {{
-    "A": 54,
-    "B": 18
-  }},
-  "flags": ["list of warnings or items to verify"],
-  "ruling_summary": "one paragraph ruling"
-}}
-
-PASS: No major violations — takeoff approved
-WARN: Minor violations — takeoff acceptable with noted caveats
-BLOCK: Fatal violations — takeoff must be redone"""
+        system_prompt = [
+            PromptSegment(self._rules_prompt, cache=True),
+            PromptSegment(f"MODE: {mode.upper()}"),
+        ]
 
         user_prompt = f"""Final fixture counts (source: {source}):
 {json.dumps(final_counts, indent=2)}
@@ -760,7 +1146,8 @@ Evaluate against all 6 constitutional hard rules and issue your ruling."""
                 task_type="takeoff_judge",
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
-                max_tokens=2000
+                max_tokens=2000,
+                on_delta=on_partial
             )
         except Exception as e:
             # Model/network error — return WARN not BLOCK so users can distinguish
@@ -20,6 +20,10 @@ from dotenv import load_dotenv
 
 from takeoff.engine import TakeoffEngine
 from takeoff.models import verify_api_key
+from takeoff.pdfpages import decode_pdf
+from takeoff.scheduler import get_vision_scheduler
+from takeoff.settings import API_CONFIG
+from takeoff.snippetstore import SnippetStore
 
 # Load env vars
 load_dotenv(override=True)
@@ -32,16 +36,27 @@ class SnippetModel(BaseModel):
     id: str
     label: str                      # fixture_schedule | rcp | panel_schedule | plan_notes | detail | site_plan
     sub_label: Optional[str] = None # Area name for RCP snippets
-    page_number: Optional[int] = None
-    image_data: str                 # Base64-encoded PNG
-    bbox: Optional[dict] = None
+    page_number: Optional[int] = None  # 1-based page in document_id
+    image_data: str = ""            # Base64-encoded PNG; omit to render from document_id
+    bbox: Optional[dict] = None     # Region of the page in PDF points (takeoff/pdfpages.py)
+    document_id: Optional[str] = None
+    dpi: Optional[int] = None       # Render resolution override for document snippets
+
+
+class DocumentModel(BaseModel):
+    """Whole PDF drawing set that snippets reference by page and bbox."""
+    id: str
+    pdf_data: str                   # Base64-encoded PDF
 
 
 class TakeoffRequest(BaseModel):
     """Takeoff job request."""
     snippets: List[SnippetModel]
+    documents: List[DocumentModel] = []
     mode: Optional[str] = None      # fast | strict | liability (auto-selects strict if None)
     drawing_name: Optional[str] = None
+    bypass_vision_cache: bool = False  # Re-run vision extraction even for previously seen images
+    base_job_id: Optional[str] = None  # Reuse unchanged snippets' work from this earlier job
 
 
 class HealthResponse(BaseModel):
@@ -169,15 +184,51 @@ async def generate_takeoff_stream(request: TakeoffRequest) -> AsyncGenerator[str
         except queue.Full:
             print(f"[TAKEOFF API] WARNING: Status queue full, dropping message: {message[:80]}")
 
+    # Streamed Reconciler/Judge tokens, coalesced per agent between polls.
+    # Kept out of status_queue so token bursts can never crowd out status/result.
+    partial_lock = threading.Lock()
+    pending_partials: dict = {}
+
+    def partial_callback(agent: str, delta: str):
+        with partial_lock:
+            pending_partials[agent] = pending_partials.get(agent, "") + delta
+
+    def drain_partials() -> list:
+        with partial_lock:
+            items = list(pending_partials.items())
+            pending_partials.clear()
+        return [
+            f"data: {json.dumps({'type': 'partial', 'agent': agent, 'delta': delta})}\n\n"
+            for agent, delta in items
+        ]
+
     def run_job():
+        store = SnippetStore() if API_CONFIG.get("snippet_store_enabled", True) else None
         try:
-            snippets = [s.model_dump() for s in request.snippets]
+            snippets = []
+            for s in request.snippets:
+                snippet = s.model_dump(exclude={"image_data"})
+                snippet["image_data"] = store.spill(s.image_data) if store else s.image_data
+                if store:
+                    s.image_data = ""  # The store holds the bytes now; drop the request's base64
+                snippets.append(snippet)
+            # PDFs are rasterized by the engine; hand them over as raw bytes (or spilled handles)
+            documents = {}
+            for d in request.documents:
+                raw = decode_pdf(d.pdf_data)
+                documents[d.id] = store.put_bytes(raw, "application/pdf") if store else raw
+                d.pdf_data = ""
             mode = request.mode or "strict"
             result = engine.run_takeoff(
                 snippets=snippets,
                 mode=mode,
                 drawing_name=request.drawing_name,
-                status_callback=status_callback
+                status_callback=status_callback,
+                partial_callback=partial_callback,
+                use_vision_cache=not request.bypass_vision_cache,
+                snippet_store=store,
+                documents=documents or None,
+                base_job_id=request.base_job_id,
             )
             # Put result into the queue before setting done_event so the
             # SSE generator always sees it when it drains after done.
@@ -188,6 +239,8 @@ async def generate_takeoff_stream(request: TakeoffRequest) -> AsyncGenerator[str
             if not cancel_event.is_set():
                 status_queue.put({"type": "error", "message": str(e)})
         finally:
+            if store:
+                store.close()
             done_event.set()  # always signals completion even on exception
 
     # Run job in background thread (semaphore already acquired above)
@@ -203,6 +256,8 @@ async def generate_takeoff_stream(request: TakeoffRequest) -> AsyncGenerator[str
         while True:
             # Drain any queued messages before checking done_event
             # to avoid missing messages produced just before thread exit
+            for event in drain_partials():
+                yield event
             try:
                 msg = status_queue.get_nowait()
                 if msg["type"] == "status":
@@ -219,6 +274,8 @@ async def generate_takeoff_stream(request: TakeoffRequest) -> AsyncGenerator[str
 
             # Queue is empty — now check if the thread has finished
             if done_event.is_set():
+                for event in drain_partials():
+                    yield event
                 # Drain any final messages that arrived before event was checked
                 while True:
                     try:
@@ -320,6 +377,7 @@ async def run_takeoff(request: TakeoffRequest):
     MAX_SNIPPETS = 30
     MAX_IMAGE_B64_BYTES = 15 * 1024 * 1024  # 15 MB base64 ≈ 11 MB image
     MAX_TOTAL_B64_BYTES = 50 * 1024 * 1024  # 50 MB total across all snippets
+    MAX_DOCUMENT_B64_BYTES = 100 * 1024 * 1024  # 100 MB total across all PDF drawing sets
     if len(request.snippets) > MAX_SNIPPETS:
         raise HTTPException(status_code=400, detail=f"Too many snippets (max {MAX_SNIPPETS})")
     total_size = 0
@@ -333,6 +391,17 @@ async def run_takeoff(request: TakeoffRequest):
             status_code=400,
             detail=f"Total snippet payload {total_size // (1024 * 1024)} MB exceeds 50 MB limit"
         )
+    if sum(len(d.pdf_data) for d in request.documents) > MAX_DOCUMENT_B64_BYTES:
+        raise HTTPException(status_code=400, detail="Total document payload exceeds 100 MB limit")
+    document_ids = {d.id for d in request.documents}
+    for snip in request.snippets:
+        if snip.document_id and snip.document_id not in document_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Snippet '{snip.id}' references unknown document '{snip.document_id}'"
+            )
+        if not snip.image_data and not snip.document_id:
+            raise HTTPException(status_code=400, detail=f"Snippet '{snip.id}' needs image_data or document_id")
 
     _VALID_LABELS = {"fixture_schedule", "rcp", "panel_schedule", "plan_notes", "detail", "site_plan"}
     for snip in request.snippets:
@@ -352,6 +421,9 @@ async def run_takeoff(request: TakeoffRequest):
     if not rcp_snippets:
         raise HTTPException(status_code=400, detail="At least 1 rcp snippet is required")
 
+    if request.base_job_id and not engine.db.get_job(request.base_job_id):
+        raise HTTPException(status_code=404, detail=f"Base job {request.base_job_id} not found")
+
     if request.mode and request.mode not in ("fast", "strict", "liability"):
         raise HTTPException(
             status_code=400,
@@ -378,6 +450,12 @@ async def list_jobs(limit: int = 20):
     return {"jobs": jobs, "count": len(jobs)}
 
 
+@app.get("/takeoff/scheduler")
+async def scheduler_stats():
+    """Process-wide vision scheduler metrics: slots in flight, queue depth, wait times."""
+    return get_vision_scheduler().stats()
+
+
 @app.get("/takeoff/jobs/{job_id}")
 async def get_job(job_id: str):
     """Get results for a specific takeoff job."""
@@ -390,11 +468,13 @@ async def get_job(job_id: str):
 
     counts = engine.db.get_job_counts(job_id)
     adv_log = engine.db.get_job_adversarial_log(job_id)
+    usage = engine.db.get_job_usage(job_id)
 
     return {
         "job": job,
         "fixture_counts": counts,
-        "adversarial_log": adv_log
+        "adversarial_log": adv_log,
+        "usage": usage
     }
 
 
@@ -436,6 +516,7 @@ async def root():
             "run": "POST /takeoff/run",
             "jobs": "GET /takeoff/jobs",
             "job": "GET /takeoff/jobs/{job_id}",
-            "result": "GET /takeoff/result/{job_id}"
+            "result": "GET /takeoff/result/{job_id}",
+            "scheduler": "GET /takeoff/scheduler"
         }
     }
@@ -0,0 +1,199 @@
+"""Batch takeoff — many drawing sets through one process, resumable, with a throughput report.
+
+    python -m takeoff bids/ --batch                  # bids/batch.json, or every job found in bids/
+    python -m takeoff bids/batch.json --batch --batch-workers 4
+
+A batch manifest lists jobs, each pointing at a regular takeoff input (a
+snippet JSON file, or a directory with manifest.json) relative to the
+manifest:
+
+    {"jobs": [{"id": "tower-a", "input": "tower_a/"},
+              {"id": "tower-b", "input": "tower_b.json", "mode": "fast"}]}
+
+Without batch.json, a directory's *.json files and subdirectories holding
+a manifest.json are the jobs (id = file or directory name).
+
+Jobs run concurrently on a bounded pool sharing one TakeoffEngine, so
+their vision calls queue in the process-wide VisionScheduler and the agent
+calls share the rate limiter. Each entry's outcome is recorded in TakeoffDB
+(batch_jobs) under a batch id derived from the manifest path; rerunning the
+same batch skips entries that already completed.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def load_job_input(input_path: Path) -> Tuple[List[Dict], Optional[str], Dict[str, str]]:
+    """(snippets, drawing_name, documents) from a snippet JSON file or a directory with manifest.json.
+
+    Raises ValueError with a user-facing message when the input is incomplete.
+    """
+    if input_path.is_dir():
+        manifest_path = input_path / "manifest.json"
+        if not manifest_path.exists():
+            raise ValueError(f"Directory mode requires a manifest.json in {input_path}")
+        with open(manifest_path) as f:
+            job_data = json.load(f)
+        # Load image data from files referenced in manifest
+        for snippet in job_data.get("snippets", []):
+            if "image_path" in snippet and not snippet.get("image_data"):
+                img_path = input_path / snippet["image_path"]
+                if not img_path.exists():
+                    raise ValueError(f"Snippet '{snippet.get('id', '?')}' references missing image file: {img_path}")
+                with open(img_path, "rb") as img_file:
+                    snippet["image_data"] = base64.b64encode(img_file.read()).decode()
+    elif input_path.is_file():
+        with open(input_path) as f:
+            job_data = json.load(f)
+    else:
+        raise ValueError(f"Input path not found: {input_path}")
+
+    # PDF drawing sets are passed by path; the engine renders the referenced pages
+    base_dir = input_path if input_path.is_dir() else input_path.parent
+    documents = {}
+    for doc in job_data.get("documents", []):
+        pdf_path = base_dir / doc.get("pdf_path", "")
+        if not doc.get("id") or not pdf_path.is_file():
+            raise ValueError(f"Document '{doc.get('id', '?')}' references missing PDF file: {pdf_path}")
+        documents[doc["id"]] = str(pdf_path)
+
+    snippets = job_data.get("snippets", [])
+    if not snippets:
+        raise ValueError(f"No snippets found in {input_path}")
+    return snippets, job_data.get("drawing_name"), documents
+
+
+def discover_jobs(batch_path: Path) -> List[Dict]:
+    """Batch entries ({"id", "input", "mode"?}) from a batch manifest or a directory of job inputs."""
+    if batch_path.is_dir() and (batch_path / "batch.json").is_file():
+        batch_path = batch_path / "batch.json"
+    if batch_path.is_file():
+        with open(batch_path) as f:
+            entries = json.load(f).get("jobs", [])
+        base_dir = batch_path.parent
+        jobs = []
+        for i, entry in enumerate(entries):
+            if not entry.get("input"):
+                raise ValueError(f"Batch entry {i + 1} has no 'input'")
+            jobs.append({**entry, "id": str(entry.get("id") or entry["input"]), "input": str(base_dir / entry["input"])})
+    elif batch_path.is_dir():
+        jobs = [
+            {"id": p.stem if p.is_file() else p.name, "input": str(p)}
+            for p in sorted(batch_path.iterdir())
+            if (p.is_file() and p.suffix == ".json") or (p.is_dir() and (p / "manifest.json").is_file())
+        ]
+    else:
+        raise ValueError(f"Batch input not found: {batch_path}")
+    ids = [j["id"] for j in jobs]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate batch job ids: {', '.join(duplicates)}")
+    return jobs
+
+
+def batch_id_for(batch_path: Path) -> str:
+    """Stable id for a batch source, so a rerun resumes the same batch."""
+    return hashlib.sha256(str(batch_path.resolve()).encode()).hexdigest()[:12]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)] if ordered else 0.0
+
+
+def run_batch(
+    engine,
+    jobs: List[Dict],
+    batch_id: str,
+    mode: str = "strict",
+    workers: int = 3,
+    use_vision_cache: bool = True,
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> Dict:
+    """Run every pending batch entry; returns the throughput and cost summary.
+
+    Entries already recorded as complete for batch_id are skipped. Failed
+    entries (exceptions or error results) are retried on the next run.
+    """
+    db = engine.db
+    progress = on_progress or (lambda message: None)
+    done = db.get_batch_jobs(batch_id)
+    pending = [j for j in jobs if done.get(j["id"], {}).get("status") != "complete"]
+    skipped = len(jobs) - len(pending)
+    if skipped:
+        progress(f"Resuming batch {batch_id}: {skipped} of {len(jobs)} job(s) already complete")
+
+    def run_one(entry: Dict) -> Dict:
+        started = time.perf_counter()
+        db.record_batch_job(batch_id, entry["id"], "running")
+        job_id, error = None, None
+        try:
+            snippets, drawing_name, documents = load_job_input(Path(entry["input"]))
+            result = engine.run_takeoff(
+                snippets=snippets,
+                mode=entry.get("mode") or mode,
+                drawing_name=drawing_name or entry["id"],
+                use_vision_cache=use_vision_cache,
+                documents=documents or None,
+            )
+            job_id = result.get("job_id")
+            if result.get("error"):
+                error = result.get("message") or result["error"]
+        except Exception as e:
+            logger.exception("[BATCH] Job '%s' raised", entry["id"])
+            error = str(e)
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        usage = db.get_job_usage(job_id) if job_id else []
+        outcome = {
+            "status": "failed" if error else "complete",
+            "job_id": job_id,
+            "latency_ms": latency_ms,
+            "cost_usd": round(sum(r["cost_usd"] for r in usage), 6),
+            "vision_calls": sum(r["calls"] for r in usage if r["kind"] == "vision"),
+            "error": error,
+        }
+        db.record_batch_job(batch_id, entry["id"], **outcome)
+        return outcome
+
+    outcomes: Dict[str, Dict] = {}
+    wall_start = time.perf_counter()
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(pending)), 1)) as ex:
+            futures = {ex.submit(run_one, entry): entry["id"] for entry in pending}
+            for fut in as_completed(futures):
+                entry_id = futures[fut]
+                outcomes[entry_id] = outcome = fut.result()
+                if outcome["status"] == "complete":
+                    progress(f"[{len(outcomes)}/{len(pending)}] {entry_id}: done in {outcome['latency_ms'] / 1000:.1f}s "
+                             f"(job {outcome['job_id']}, ${outcome['cost_usd']:.4f})")
+                else:
+                    progress(f"[{len(outcomes)}/{len(pending)}] {entry_id}: FAILED — {outcome['error']}")
+    wall_s = time.perf_counter() - wall_start
+
+    completed = [o for o in outcomes.values() if o["status"] == "complete"]
+    latencies = [o["latency_ms"] for o in completed]
+    ran = list(outcomes.values())
+    return {
+        "batch_id": batch_id,
+        "jobs": len(jobs),
+        "completed": len(completed),
+        "failed": len(ran) - len(completed),
+        "skipped": skipped,
+        "wall_s": round(wall_s, 1),
+        "jobs_per_hour": round(len(completed) / wall_s * 3600, 1) if wall_s else 0.0,
+        "p50_latency_s": round(_percentile(latencies, 0.50) / 1000, 1),
+        "p95_latency_s": round(_percentile(latencies, 0.95) / 1000, 1),
+        "vision_calls_per_job": round(sum(o["vision_calls"] for o in ran) / len(ran), 1) if ran else 0.0,
+        "cost_usd": round(sum(o["cost_usd"] for o in ran), 4),
+        "cost_per_job_usd": round(sum(o["cost_usd"] for o in ran) / len(ran), 4) if ran else 0.0,
+        "failures": {entry_id: o["error"] for entry_id, o in outcomes.items() if o["status"] != "complete"},
+    }
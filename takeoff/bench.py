@@ -0,0 +1,191 @@
+"""Takeoff memory / throughput benchmark against the mock Messages API.
+
+Runs several takeoff jobs concurrently, the way the API server does, with
+large synthetic snippet images, and reports wall time and peak resident
+memory. Compare the disk-spilled snippet store with in-memory base64:
+
+    python -m takeoff.bench --jobs 3 --snippets 6 --snippet-mb 4
+    python -m takeoff.bench --jobs 3 --snippets 6 --snippet-mb 4 --no-snippet-store
+
+Without --base-url a mock server (python -m core.mockserver) is started on a
+free port for the duration of the run. No real API calls are made.
+"""
+
+import argparse
+import base64
+import io
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from takeoff.settings import API_CONFIG
+
+
+class PeakRSS:
+    """Samples resident set size in a background thread; reports baseline and peak."""
+
+    def __init__(self, interval_s: float = 0.01):
+        self.interval_s = interval_s
+        self.baseline = self.peak = current_rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def __enter__(self) -> "PeakRSS":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+
+def current_rss_bytes() -> int:
+    """Current RSS from /proc (Linux), else the process's lifetime peak from getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024  # macOS reports bytes, Linux KiB
+
+
+def _snippet_png(megabytes: float, seed: int) -> str:
+    """Noise PNG of roughly the given size (noise does not compress), as base64."""
+    from PIL import Image
+    side = max(int((megabytes * 1_000_000 / 3) ** 0.5), 16)
+    img = Image.frombytes("RGB", (side, side), random.Random(seed).randbytes(side * side * 3))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=1)
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+def _snippet_set(count: int, megabytes: float, job: int) -> List[dict]:
+    labels = ["fixture_schedule"] + ["rcp"] * max(count - 1, 1)
+    return [
+        {
+            "id": f"job{job}-s{i}",
+            "label": label,
+            "sub_label": f"Area {i}" if label == "rcp" else None,
+            "image_data": _snippet_png(megabytes, job * 100 + i),
+        }
+        for i, label in enumerate(labels)
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_mock_server(latency_ms: float) -> "tuple[subprocess.Popen, str]":
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "core.mockserver", "--port", str(port),
+         "--latency-ms", str(latency_ms), "--latency-sigma", "0"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("mock server did not start")
+
+
+def run_benchmark(jobs: int, snippets: int, snippet_mb: float, mode: str = "fast",
+                  use_store: bool = True, base_url: Optional[str] = None, latency_ms: float = 50.0) -> dict:
+    """Run `jobs` concurrent takeoffs; returns timing and memory figures."""
+    from takeoff.engine import TakeoffEngine
+    from takeoff.snippetstore import SnippetStore
+
+    server = None
+    if base_url is None:
+        server, base_url = _start_mock_server(latency_ms)
+    saved = {k: API_CONFIG.get(k) for k in ("base_url", "snippet_store_enabled", "vision_cache_enabled")}
+    API_CONFIG.update(base_url=base_url, snippet_store_enabled=use_store, vision_cache_enabled=False)
+    os.environ.setdefault("ANTHROPIC_API_KEY", "mock")
+    try:
+        engine = TakeoffEngine(db_path=":memory:")
+        errors: List[str] = []
+
+        def job(index: int):
+            # Mirrors takeoff/api.py: spill once, then drop the request's base64
+            payload = _snippet_set(snippets, snippet_mb, index)
+            store = SnippetStore() if use_store else None
+            try:
+                if store:
+                    payload = store.spill_snippets(payload)
+                result = engine.run_takeoff(payload, mode=mode, snippet_store=store)
+                if result.get("error"):
+                    errors.append(result["error"])
+            except Exception as e:
+                errors.append(str(e))
+            finally:
+                if store:
+                    store.close()
+
+        with PeakRSS() as rss:
+            start = time.perf_counter()
+            threads = [threading.Thread(target=job, args=(i,)) for i in range(jobs)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            wall_s = time.perf_counter() - start
+        engine.db.close()
+    finally:
+        API_CONFIG.update(saved)
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=5)
+
+    return {
+        "jobs": jobs,
+        "snippets_per_job": snippets,
+        "snippet_mb": snippet_mb,
+        "snippet_store": use_store,
+        "wall_s": round(wall_s, 2),
+        "jobs_per_min": round(jobs / wall_s * 60, 1) if wall_s else 0.0,
+        "baseline_rss_mb": round(rss.baseline / 1e6, 1),
+        "peak_rss_mb": round(rss.peak / 1e6, 1),
+        "peak_rss_delta_mb": round((rss.peak - rss.baseline) / 1e6, 1),
+        "errors": errors,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Takeoff concurrent-job memory benchmark (mock API)")
+    parser.add_argument("--jobs", type=int, default=3, help="Concurrent takeoff jobs")
+    parser.add_argument("--snippets", type=int, default=6, help="Snippets per job (1 schedule + RCPs)")
+    parser.add_argument("--snippet-mb", type=float, default=4.0, help="Approximate PNG size per snippet")
+    parser.add_argument("--mode", default="fast", choices=["fast", "strict", "liability"])
+    parser.add_argument("--no-snippet-store", action="store_true", help="Keep snippets as in-memory base64")
+    parser.add_argument("--base-url", default=None, help="Running mock server; default starts one")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mock server latency when started here")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        args.jobs, args.snippets, args.snippet_mb, mode=args.mode,
+        use_store=not args.no_snippet_store, base_url=args.base_url, latency_ms=args.latency_ms,
+    )
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ FEATURE_WEIGHTS = {
     "constitutional_clean": 0.15,       # No violations = boost
     "cross_reference_match": 0.10,      # Panel schedule alignment
     "note_compliance": 0.10,            # Plan notes addressed
-    "reconciler_coverage": 0.05         # Reconciler ran (strict/liability mode) = full credit; fast mode = 0
+    "reconciler_coverage": 0.05         # Reconciler ran = full credit; skipped on a clean Checker = half; fast mode = 0
 }
 
 # Validate at module load time to catch weight editing mistakes immediately
@@ -38,7 +38,8 @@ def calculate_confidence(
     has_panel_schedule: bool = False,
     has_plan_notes: bool = False,
     notes_addressed: bool = False,
-    total_corrected: bool = False
+    total_corrected: bool = False,
+    reconciler_skipped: bool = False
 ) -> Dict:
     """Calculate feature-based confidence score for a lighting takeoff.
 
@@ -54,6 +55,8 @@ def calculate_confidence(
         has_panel_schedule: Whether a panel schedule snippet was provided
         has_plan_notes: Whether plan notes snippet was provided
         notes_addressed: Whether plan notes were addressed in the takeoff
+        reconciler_skipped: Strict-mode fast path — the Checker came back clean and
+            the Reconciler was replaced by the deterministic constitution pre-check
 
     Returns:
         Dict with confidence score and features
@@ -103,7 +106,10 @@ def calculate_confidence(
     # Feature 3: Adversarial resolved
     # What % of Checker attacks were explicitly addressed by Reconciler
     if checker_attacks:
-        if reconciler_responses:
+        if reconciler_skipped:
+            # Only low-severity attacks remain and none were argued — partial credit
+            features["adversarial_resolved"] = 0.5
+        elif reconciler_responses:
             resolved_attack_ids = {r.get("attack_id") for r in reconciler_responses}
             checker_attack_ids = {a.get("attack_id") for a in checker_attacks}
             resolved_ratio = len(resolved_attack_ids & checker_attack_ids) / len(checker_attack_ids)
@@ -142,8 +148,12 @@ def calculate_confidence(
     else:
         features["note_compliance"] = 0.5  # Neutral — no notes provided
 
-    # Feature 7: Reconciler coverage — 1.0 when Reconciler ran (strict/liability), 0.0 for fast mode
-    features["reconciler_coverage"] = 0.0 if mode == "fast" else 1.0
+    # Feature 7: Reconciler coverage — 1.0 when Reconciler ran (strict/liability), 0.5 when the
+    # fast path skipped it on a clean Checker review, 0.0 for fast mode
+    if mode == "fast":
+        features["reconciler_coverage"] = 0.0
+    else:
+        features["reconciler_coverage"] = 0.5 if reconciler_skipped else 1.0
 
     # Calculate weighted confidence
     # Base starts at 0.20 so worst-case (all features 0.0) resolves to VERY_LOW,
@@ -274,8 +284,10 @@ def format_confidence_explanation(confidence_result: Dict) -> str:
 
     # Reconciler coverage
     reconciler_cov = features.get("reconciler_coverage", 1.0)
-    if reconciler_cov < 1.0:
+    if reconciler_cov <= 0.0:
         lines.append("- Fast mode: Reconciler review skipped (no credit for reconciler_coverage)")
+    elif reconciler_cov < 1.0:
+        lines.append("- Reconciler skipped on a clean Checker review (constitution pre-check instead; partial credit)")
 
     # Feature breakdown table
     lines.append("\nFeature Breakdown:")
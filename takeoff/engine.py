@@ -11,7 +11,7 @@ import json
 import logging
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import Optional, List, Dict
 
 logger = logging.getLogger(__name__)
@@ -22,10 +22,32 @@ from takeoff.constitution import get_constitution, enforce_constitution
 from takeoff.confidence import calculate_confidence, format_confidence_explanation
 from takeoff.extraction import (
     FixtureSchedule, AreaCount, PlanNote, PanelData,
-    extract_fixture_schedule, extract_rcp_counts, extract_plan_notes, extract_panel_schedule
+    extract_fixture_schedule, extract_rcp_counts, extract_plan_notes, extract_panel_schedule,
+    extraction_input_key, rcp_fingerprint
 )
 from takeoff.agents import Counter, Checker, Reconciler, Judge, validate_grand_total
-from takeoff.extraction import reset_vision_cost, get_vision_cost_usd
+from takeoff.extraction import get_vision_cache_stats
+from takeoff.incremental import IncrementalPlan, extraction_payload, extraction_result
+from takeoff.pdfpages import PdfSource, rasterize_snippets
+from takeoff.scheduler import get_vision_scheduler, submit, vision_job
+from takeoff.settings import API_CONFIG
+from takeoff.snippetstore import SnippetStore, has_image
+from takeoff.usage import UsageLedger, current_ledger, usage_ledger
+from takeoff.visioncache import image_digest
+
+def _bind_partial(partial_callback, agent: str):
+    """Bind a job's partial_callback to one agent, or None when nobody is listening.
+
+    The callback is passed down per job, never kept on the engine: the API
+    shares one TakeoffEngine across concurrent requests.
+    """
+    if not partial_callback:
+        return None
+    return lambda delta: partial_callback(agent, delta)
+
+
+# Checker attack severities, for the Reconciler skip threshold ("none" = no attacks tolerated)
+_SEVERITY_RANK = {"none": 0, "minor": 1, "major": 2, "critical": 3}
 
 
 def _scale_area_counts(original_areas: dict, target_total: int) -> dict:
@@ -89,19 +111,84 @@ class TakeoffEngine:
         snippets: List[Dict],
         mode: Optional[str] = "strict",
         drawing_name: Optional[str] = None,
-        status_callback=None
+        status_callback=None,
+        partial_callback=None,
+        use_vision_cache: bool = True,
+        snippet_store: Optional[SnippetStore] = None,
+        documents: Optional[Dict[str, PdfSource]] = None,
+        base_job_id: Optional[str] = None
     ) -> Dict:
         """Execute the full adversarial takeoff pipeline.
 
         Args:
-            snippets: List of snippet dicts with id, label, sub_label, image_data (base64), page_number
+            snippets: List of snippet dicts with id, label, sub_label, image_data
+                (base64 or SnippetHandle), page_number
             mode: "fast" | "strict" | "liability"
             drawing_name: Optional display name for the drawing set
             status_callback: Optional callback for SSE status updates
+            partial_callback: Optional callback(agent, delta) receiving streamed
+                Reconciler/Judge output as it is generated
+            use_vision_cache: False re-runs every vision extraction instead of
+                reusing cached results for identical snippet images
+            snippet_store: Store the caller already spilled the snippets into
+                (closed by the caller). Without one, base64 snippets are spilled
+                into a store owned by this job when snippet_store_enabled is set.
+            documents: PDF drawing sets by id (path, raw bytes or SnippetHandle).
+                Snippets with a document_id and no image_data are rendered from
+                their page_number / bbox (takeoff/pdfpages.py) before extraction.
+            base_job_id: Earlier job on the same drawing set. Extractions and
+                Checker area verdicts whose inputs are unchanged are reused from
+                it (takeoff/incremental.py); result["incremental"] reports the diff.
 
         Returns:
             Dict with fixture counts, confidence, adversarial log, and metadata
         """
+        # Generate job ID; every vision call made for this job (including from
+        # worker threads) queues under it in the process-wide vision scheduler
+        # and is metered, with the agent calls, in the job's own usage ledger
+        job_id = str(uuid.uuid4())[:8]
+        scheduler = get_vision_scheduler()
+        ledger = UsageLedger(job_id)
+        # Decode each snippet to disk once; the pipeline passes handles, not base64
+        own_store = None
+        if snippet_store is None and API_CONFIG.get("snippet_store_enabled", True):
+            snippet_store = own_store = SnippetStore()
+        try:
+            if snippet_store is not None:
+                snippets = snippet_store.spill_snippets(snippets)
+            pdf_stats = None
+            if documents:
+                # Rendered once per page and DPI; crops land in the store like uploaded snippets
+                snippets, pdf_stats = rasterize_snippets(snippets, documents, snippet_store)
+            with vision_job(job_id), usage_ledger(ledger):
+                result = self._run_takeoff(
+                    job_id, snippets, mode, drawing_name, status_callback, partial_callback, use_vision_cache,
+                    base_job_id
+                )
+            if "latency_ms" in result:
+                result["vision_scheduler"] = {"job": scheduler.job_stats(job_id), **scheduler.stats()}
+                if pdf_stats:
+                    result["pdf_rasterization"] = pdf_stats
+            return result
+        finally:
+            scheduler.forget_job(job_id)
+            if ledger.calls:
+                self.db.store_job_usage(job_id, ledger.rows())
+            if own_store is not None:
+                own_store.close()
+
+    def _run_takeoff(
+        self,
+        job_id: str,
+        snippets: List[Dict],
+        mode: Optional[str],
+        drawing_name: Optional[str],
+        status_callback,
+        partial_callback,
+        use_vision_cache: bool,
+        base_job_id: Optional[str] = None
+    ) -> Dict:
+        """Pipeline body of run_takeoff(), run inside the job's vision scheduler context."""
         self._status_callback = status_callback
 
         def emit(message: str):
@@ -112,18 +199,15 @@ class TakeoffEngine:
                     print(f"[TAKEOFF] WARNING: status_callback raised: {_cb_err}")
             print(f"[TAKEOFF] {message}")
 
-        # Generate job ID
-        job_id = str(uuid.uuid4())[:8]
         start_time = time.time()
 
         # Validate mode immediately — before any expensive extraction calls
         if mode not in ("fast", "strict", "liability"):
             raise ValueError(f"Unknown mode '{mode}'. Must be 'fast', 'strict', or 'liability'.")
 
-        emit(f"Starting takeoff job {job_id}...")
+        plan = IncrementalPlan.load(self.db, base_job_id) if base_job_id else None
 
-        # Reset vision token cost accumulator for this job
-        reset_vision_cost()
+        emit(f"Starting takeoff job {job_id}..." + (f" (incremental from {base_job_id})" if plan else ""))
 
         # ─── Step 1: Validate snippets ───────────────────────────────────────
         emit("Validating snippet set...")
@@ -134,7 +218,7 @@ class TakeoffEngine:
             lbl = s.get("label", "")
             if lbl and lbl not in valid_labels:
                 emit(f"WARNING: Snippet '{s.get('id', '?')}' has unrecognized label '{lbl}' — expected one of: {', '.join(sorted(valid_labels))}")
-            if not s.get("image_data", "").strip():
+            if not has_image(s.get("image_data", "")):
                 emit(f"WARNING: Snippet '{s.get('id', '?')}' (label: '{lbl}') has empty or missing 'image_data' — will be skipped during extraction")
 
         fixture_snippets = [s for s in snippets if s.get("label") == "fixture_schedule"]
@@ -168,6 +252,20 @@ class TakeoffEngine:
         # Strip base64 image data before persisting — images can be multi-MB each
         snippets_meta = [{k: v for k, v in s.items() if k != "image_data"} for s in snippets]
         self.db.store_snippets(job_id, snippets_meta)
+        # One row per snippet; extraction outputs are filled in below so later jobs can reuse them
+        extraction_rows = {
+            id(s): {
+                "snippet_id": s.get("id", ""), "label": s.get("label"),
+                "image_digest": image_digest(s["image_data"]) if has_image(s.get("image_data", "")) else None,
+            }
+            for s in snippets if s.get("id")
+        }
+
+        def extract(executor, function: str, fn, snippet: Dict, *args, fingerprint: str = "", **kwargs) -> Future:
+            return self._submit_extraction(
+                executor, plan, extraction_rows.get(id(snippet), {}), function, fn, snippet.get("image_data", ""),
+                *args, fingerprint=fingerprint, **kwargs
+            )
 
         # ─── Step 2: Extract fixture schedule (parallel if multiple snippets) ────
         emit("Extracting fixture schedule...")
@@ -176,7 +274,10 @@ class TakeoffEngine:
         fs_images = [(s, s.get("image_data", "")) for s in fixture_snippets if s.get("image_data", "")]
         if fs_images:
             with ThreadPoolExecutor(max_workers=min(len(fs_images), 6)) as _ex:
-                fs_futures = {_ex.submit(extract_fixture_schedule, img): s for s, img in fs_images}
+                fs_futures = {
+                    extract(_ex, "fixture_schedule", extract_fixture_schedule, s, use_cache=use_vision_cache): s
+                    for s, img in fs_images
+                }
                 for fut in as_completed(fs_futures):
                     try:
                         extracted = fut.result()
@@ -237,17 +338,17 @@ class TakeoffEngine:
 
         for area_label, rcp_snippet in rcp_jobs:
             _rcp_indices.append(len(_parallel_work))
-            _parallel_work.append(("rcp", area_label, rcp_snippet.get("image_data", "")))
+            _parallel_work.append(("rcp", area_label, rcp_snippet))
 
         for notes_snippet in notes_snippets:
             if notes_snippet.get("image_data", ""):
                 _notes_indices.append(len(_parallel_work))
-                _parallel_work.append(("notes", None, notes_snippet.get("image_data", "")))
+                _parallel_work.append(("notes", None, notes_snippet))
 
         for panel_snippet in panel_snippets:
             if panel_snippet.get("image_data", ""):
                 _panel_indices.append(len(_parallel_work))
-                _parallel_work.append(("panel", None, panel_snippet.get("image_data", "")))
+                _parallel_work.append(("panel", None, panel_snippet))
 
         _results: List = [None] * len(_parallel_work)
 
@@ -255,13 +356,18 @@ class TakeoffEngine:
             max_workers = min(len(_parallel_work), 8)
             with ThreadPoolExecutor(max_workers=max_workers) as _ex:
                 idx_futures = {}
-                for i, (kind, label, img) in enumerate(_parallel_work):
+                for i, (kind, label, snippet) in enumerate(_parallel_work):
                     if kind == "rcp":
-                        idx_futures[_ex.submit(extract_rcp_counts, img, fixture_schedule, label)] = i
+                        idx_futures[extract(
+                            _ex, "rcp_counts", extract_rcp_counts, snippet, fixture_schedule, label,
+                            fingerprint=rcp_fingerprint(fixture_schedule, label), use_cache=use_vision_cache
+                        )] = i
                     elif kind == "notes":
-                        idx_futures[_ex.submit(extract_plan_notes, img)] = i
+                        idx_futures[extract(_ex, "plan_notes", extract_plan_notes, snippet, use_cache=use_vision_cache)] = i
                     else:
-                        idx_futures[_ex.submit(extract_panel_schedule, img)] = i
+                        idx_futures[extract(
+                            _ex, "panel_schedule", extract_panel_schedule, snippet, use_cache=use_vision_cache
+                        )] = i
                 for fut in as_completed(idx_futures):
                     idx = idx_futures[fut]
                     try:
@@ -315,29 +421,104 @@ class TakeoffEngine:
                     panel_data.total_load_va = panel_data.total_load_va + extracted.total_load_va
                 panel_data.warnings.extend(extracted.warnings)
 
+        self.db.store_snippet_extractions(job_id, list(extraction_rows.values()))
+        if plan:
+            emit(
+                f"Incremental: reused {plan.reused_extractions} extraction(s) from job {plan.base_job_id}, "
+                f"recomputed {plan.recomputed_extractions}"
+            )
+
         # ─── Step 6: Run agent pipeline ───────────────────────────────────────
         if mode == "fast":
             result = self._run_fast_mode(
                 job_id, fixture_schedule, area_counts, plan_notes, panel_data,
-                rcp_snippets, emit, start_time
+                rcp_snippets, emit, start_time, plan=plan, partial_callback=partial_callback
             )
         else:  # strict | liability
             result = self._run_strict_mode(
                 job_id, fixture_schedule, area_counts, plan_notes, panel_data,
-                rcp_snippets, emit, start_time, mode
+                rcp_snippets, emit, start_time, mode, plan=plan, partial_callback=partial_callback
             )
 
-        # Update job status — combine agent LLM costs and vision extraction costs
+        # Update job status — agent LLM and vision extraction costs from this job's ledger
         elapsed_ms = int((time.time() - start_time) * 1000)
-        agent_cost_usd = self.model_router.get_stats().get("model_router_cost_usd") or 0.0
-        vision_cost_usd = get_vision_cost_usd()
-        cost_usd = round(agent_cost_usd + vision_cost_usd, 6)
+        usage = current_ledger().summary()
+        cost_usd = usage["total"]["cost_usd"]
         self.db.update_job_status(job_id, "complete", latency_ms=elapsed_ms, cost_usd=cost_usd)
         result["latency_ms"] = elapsed_ms
         result["cost_usd"] = cost_usd
+        result["usage"] = usage
+        result["vision_cache"] = get_vision_cache_stats()
+        result["image_prep"] = usage["image_prep"]
+        if plan:
+            result["incremental"] = plan.report(snippets, plan.checker_verdicts)
+            emit(f"Incremental: ~{result['incremental']['time_saved_ms'] / 1000:.1f}s of vision work reused")
 
         return result
 
+    def _submit_extraction(self, executor, plan: Optional[IncrementalPlan], row: Dict, function: str, fn,
+                           image, *args, fingerprint: str = "", **kwargs) -> Future:
+        """Run one extraction in executor, or reuse the base job's output when its inputs are unchanged.
+
+        Fills row (the snippet's snippet_extractions entry) with the input key,
+        the output and its latency either way.
+        """
+        row["input_key"] = extraction_input_key(function, image, fingerprint)
+        reused = plan.reuse_extraction(row["input_key"]) if plan else None
+        if reused is not None:
+            row.update(output=reused["output"], latency_ms=reused.get("latency_ms", 0))
+            done: Future = Future()
+            done.set_result(extraction_result(function, reused["output"]))
+            return done
+
+        def run():
+            started = time.perf_counter()
+            result = fn(image, *args, **kwargs)
+            row.update(output=extraction_payload(function, result), latency_ms=int((time.perf_counter() - started) * 1000))
+            return result
+
+        return submit(executor, run)
+
+    def _record_checker_run(self, job_id: str, checker_response, plan: Optional[IncrementalPlan]) -> Dict:
+        """Persist the Checker's per-area vision verdicts for later incremental runs; returns its timings."""
+        verdicts = getattr(checker_response, "area_verdicts", None)
+        if isinstance(verdicts, dict):
+            self.db.store_checker_verdicts(job_id, verdicts)
+            if plan:
+                plan.checker_verdicts = verdicts
+        timings = getattr(checker_response, "timings", None)
+        return dict(timings) if isinstance(timings, dict) else {}
+
+    def _reconciler_skip_reason(
+        self, mode: str, checker_response, rcp_images: List[Dict], plan_notes: List[PlanNote]
+    ) -> Optional[str]:
+        """Why the Reconciler can be skipped for this Checker review, or None to run it.
+
+        The fast path needs a mode listed in reconciler_skip_modes (never
+        liability), a Checker that ran cleanly with a vision verdict for every
+        RCP area, no attack above reconciler_skip_max_severity, and no plan
+        notes (only the Reconciler checks notes compliance).
+        """
+        if mode == "liability" or mode not in API_CONFIG.get("reconciler_skip_modes", []):
+            return None
+        data = checker_response.data or {}
+        if checker_response.parse_error or not data or data.get("_model_failure"):
+            return None
+        if plan_notes or not rcp_images:
+            return None
+        verified = {v.get("area_label") for v in (getattr(checker_response, "area_verdicts", None) or {}).values()}
+        if any(r["area_label"] not in verified for r in rcp_images):
+            return None
+        attacks = data.get("attacks", [])
+        max_severity = API_CONFIG.get("reconciler_skip_max_severity", "minor")
+        max_rank = _SEVERITY_RANK.get(max_severity, 0)
+        if any(_SEVERITY_RANK.get(a.get("severity") or "critical", 3) > max_rank for a in attacks):
+            return None
+        if attacks:
+            return (f"Checker raised {len(attacks)} issue(s), none above {max_severity}, "
+                    f"and vision verified all {len(rcp_images)} area(s)")
+        return f"Checker raised no issues and vision verified all {len(rcp_images)} area(s)"
+
     def _run_counter_phase(
         self,
         fixture_schedule: FixtureSchedule,
@@ -346,9 +527,21 @@ class TakeoffEngine:
         panel_data: Optional[PanelData],
         emit
     ):
-        """Run Counter agent + grand total validation. Returns (counter_output, total_corrected, counter_response)."""
-        emit("Counter analyzing drawings and building fixture count...")
-        counter_response = self.counter.generate_count(fixture_schedule, area_counts, plan_notes, panel_data)
+        """Run Counter agent (or its deterministic aggregation) + grand total validation.
+
+        Returns (counter_output, total_corrected, counter_response).
+        """
+        if API_CONFIG.get("counter_deterministic", False):
+            emit("Counter summing extraction counts...")
+            counter_response = self.counter.generate_count_deterministic(
+                fixture_schedule, area_counts, plan_notes, panel_data
+            )
+            residuals = counter_response.data.get("residual_items", [])
+            if residuals:
+                emit(f"Counter reviewed {len(residuals)} residual item(s) (unscheduled tags, quantity or emergency notes)")
+        else:
+            emit("Counter analyzing drawings and building fixture count...")
+            counter_response = self.counter.generate_count(fixture_schedule, area_counts, plan_notes, panel_data)
         _gtr = validate_grand_total(counter_response.data, "COUNTER")
         counter_output, total_corrected = _gtr.counts, _gtr.was_corrected
         emit(f"Counter produced count: {counter_output.get('grand_total_fixtures', 0)} total fixtures")
@@ -386,7 +579,9 @@ class TakeoffEngine:
         panel_data: Optional[PanelData],
         rcp_snippets: List[Dict],
         emit,
-        start_time: float
+        start_time: float,
+        plan: Optional[IncrementalPlan] = None,
+        partial_callback=None
     ) -> Dict:
         """Run fast mode: Counter + Checker + Judge (no Reconciler)."""
         emit("Running FAST mode pipeline (Counter + Checker + Judge)")
@@ -431,12 +626,16 @@ class TakeoffEngine:
             emit(f"Checker independently reviewing {_rcp['area_label']}...")
         checker_response = self.checker.generate_attacks(
             counter_output, fixture_schedule, area_counts, plan_notes, panel_data,
-            rcp_images=_rcp_images,
+            rcp_images=_rcp_images, prior_verdicts=plan.area_verdicts if plan else None,
         )
+        checker_timing = self._record_checker_run(job_id, checker_response, plan)
         checker_attacks = checker_response.data.get("attacks", [])
         if not checker_response.data and checker_response.raw_response:
             emit("WARNING: Checker agent returned empty output — attacks may be missing")
         emit(f"Checker found {len(checker_attacks)} issues ({checker_response.data.get('critical_count', 0)} critical)")
+        if checker_timing.get("saved_ms"):
+            emit(f"Checker text review overlapped vision checks: {checker_timing['wall_ms'] / 1000:.1f}s "
+                 f"instead of {(checker_timing['text_ms'] + checker_timing['vision_ms']) / 1000:.1f}s")
 
         # No Reconciler in fast mode
         reconciler_output = None
@@ -444,7 +643,8 @@ class TakeoffEngine:
         # Judge
         emit("Judge evaluating against constitutional rules...")
         judge_result = self.judge.evaluate(
-            counter_output, checker_attacks, reconciler_output, fixture_schedule, mode="fast"
+            counter_output, checker_attacks, reconciler_output, fixture_schedule, mode="fast",
+            on_partial=_bind_partial(partial_callback, "judge"),
         )
         emit(f"Judge verdict: {judge_result.get('verdict')}")
 
@@ -475,6 +675,7 @@ class TakeoffEngine:
             job_id, counter_output, checker_attacks, reconciler_output,
             judge_result, confidence_result, fixture_schedule, "fast"
         )
+        result["checker_timing"] = checker_timing
         self.db.store_job_results_atomic(
             job_id=job_id,
             fixture_counts=fixture_counts_list,
@@ -501,7 +702,9 @@ class TakeoffEngine:
         rcp_snippets: List[Dict],
         emit,
         start_time: float,
-        mode: str
+        mode: str,
+        plan: Optional[IncrementalPlan] = None,
+        partial_callback=None
     ) -> Dict:
         """Run strict/liability mode: Counter + Checker + Reconciler + Judge."""
         emit(f"Running {mode.upper()} mode pipeline (Counter + Checker + Reconciler + Judge)")
@@ -546,46 +749,79 @@ class TakeoffEngine:
             emit(f"Checker independently reviewing {_rcp['area_label']}...")
         checker_response = self.checker.generate_attacks(
             counter_output, fixture_schedule, area_counts, plan_notes, panel_data,
-            rcp_images=_rcp_images,
+            rcp_images=_rcp_images, prior_verdicts=plan.area_verdicts if plan else None,
         )
+        checker_timing = self._record_checker_run(job_id, checker_response, plan)
         checker_attacks = checker_response.data.get("attacks", [])
         if not checker_response.data and checker_response.raw_response:
             emit("WARNING: Checker agent returned empty output — attacks may be missing")
         emit(f"Checker found {len(checker_attacks)} issues ({checker_response.data.get('critical_count', 0)} critical)")
-
-        # Reconciler
-        emit(f"Reconciler addressing {len(checker_attacks)} attacks...")
-        reconciler_response = self.reconciler.address_attacks(
-            counter_output, checker_attacks, fixture_schedule, area_counts, plan_notes
-        )
-        reconciler_output = reconciler_response.data
-        if not reconciler_output and reconciler_response.raw_response:
-            emit("WARNING: Reconciler agent returned empty output — using Counter counts as final")
+        if checker_timing.get("saved_ms"):
+            emit(f"Checker text review overlapped vision checks: {checker_timing['wall_ms'] / 1000:.1f}s "
+                 f"instead of {(checker_timing['text_ms'] + checker_timing['vision_ms']) / 1000:.1f}s")
+
+        # Fast path: a clean Checker review skips the Reconciler, provided the
+        # deterministic constitution rules also pass on the Counter's numbers
+        skip_reason = self._reconciler_skip_reason(mode, checker_response, _rcp_images, plan_notes)
+        constitution_precheck = None
+        if skip_reason:
+            constitution_precheck = enforce_constitution(
+                counter_output.get("fixture_counts", []), counter_output.get("areas_covered", []),
+                rcp_snippets, {"fixtures": fixture_schedule.fixtures},
+            )
+            if constitution_precheck["verdict"] != "PASS":
+                emit(f"Constitution pre-check {constitution_precheck['verdict']} "
+                     f"({len(constitution_precheck['violations'])} violation(s)) — running Reconciler")
+                skip_reason = None
+        reconciler_log = []
+        if skip_reason:
+            emit(f"Reconciler skipped: {skip_reason}; constitution pre-check PASS")
             reconciler_output = {}
-        if reconciler_output and "revised_fixture_counts" not in reconciler_output:
-            logger.warning("[ENGINE] WARNING: Reconciler output missing 'revised_fixture_counts' — falling back to Counter counts")
-        if reconciler_output and "revised_grand_total" not in reconciler_output:
-            logger.warning("[ENGINE] WARNING: Reconciler output missing 'revised_grand_total' — falling back to Counter total")
-        reconciler_responses_list = reconciler_output.get("responses", [])
-        original_total = counter_output.get("grand_total_fixtures", 0)
-        revised_total = reconciler_output.get("revised_grand_total", original_total)
-        emit(f"Reconciler: revised total = {revised_total}")
-
-        # I6: Guardrail — flag if Reconciler's revised total deviates >20% from Counter's original
-        if original_total > 0 and revised_total > 0:
-            deviation = abs(revised_total - original_total) / original_total
-            if deviation > 0.20:
-                emit(f"WARNING: Reconciler revised total {revised_total} deviates {deviation*100:.0f}% from Counter's {original_total} — flagging as suspicious")
-                if isinstance(reconciler_output, dict):
-                    reconciler_output = dict(reconciler_output)
-                    reconciler_output.setdefault("flags", []).append(
-                        f"Reconciler total {revised_total} deviates {deviation*100:.0f}% from Counter ({original_total}) — verify manually"
-                    )
+            reconciler_responses_list = []
+            reconciler_log = [{
+                "agent": "engine",
+                "category": "reconciler_skipped",
+                "description": skip_reason,
+                "resolution": f"Reconciler skipped — constitution pre-check PASS "
+                              f"({len(constitution_precheck['violations'])} minor violation(s)); Counter counts are final",
+                "final_verdict": "SKIPPED",
+            }]
+        else:
+            # Reconciler
+            emit(f"Reconciler addressing {len(checker_attacks)} attacks...")
+            reconciler_response = self.reconciler.address_attacks(
+                counter_output, checker_attacks, fixture_schedule, area_counts, plan_notes,
+                on_partial=_bind_partial(partial_callback, "reconciler"),
+            )
+            reconciler_output = reconciler_response.data
+            if not reconciler_output and reconciler_response.raw_response:
+                emit("WARNING: Reconciler agent returned empty output — using Counter counts as final")
+                reconciler_output = {}
+            if reconciler_output and "revised_fixture_counts" not in reconciler_output:
+                logger.warning("[ENGINE] WARNING: Reconciler output missing 'revised_fixture_counts' — falling back to Counter counts")
+            if reconciler_output and "revised_grand_total" not in reconciler_output:
+                logger.warning("[ENGINE] WARNING: Reconciler output missing 'revised_grand_total' — falling back to Counter total")
+            reconciler_responses_list = reconciler_output.get("responses", [])
+            original_total = counter_output.get("grand_total_fixtures", 0)
+            revised_total = reconciler_output.get("revised_grand_total", original_total)
+            emit(f"Reconciler: revised total = {revised_total}")
+
+            # I6: Guardrail — flag if Reconciler's revised total deviates >20% from Counter's original
+            if original_total > 0 and revised_total > 0:
+                deviation = abs(revised_total - original_total) / original_total
+                if deviation > 0.20:
+                    emit(f"WARNING: Reconciler revised total {revised_total} deviates {deviation*100:.0f}% from Counter's {original_total} — flagging as suspicious")
+                    if isinstance(reconciler_output, dict):
+                        reconciler_output = dict(reconciler_output)
+                        reconciler_output.setdefault("flags", []).append(
+                            f"Reconciler total {revised_total} deviates {deviation*100:.0f}% from Counter ({original_total}) — verify manually"
+                        )
 
         # Judge
         emit("Judge evaluating final takeoff against constitutional rules...")
         judge_result = self.judge.evaluate(
-            counter_output, checker_attacks, reconciler_output, fixture_schedule, mode=mode
+            counter_output, checker_attacks, reconciler_output, fixture_schedule, mode=mode,
+            on_partial=_bind_partial(partial_callback, "judge"),
         )
         emit(f"Judge verdict: {judge_result.get('verdict')}")
 
@@ -628,7 +864,8 @@ class TakeoffEngine:
             has_panel_schedule=panel_data is not None,
             has_plan_notes=len(plan_notes) > 0,
             notes_addressed=notes_addressed,
-            total_corrected=total_corrected
+            total_corrected=total_corrected,
+            reconciler_skipped=bool(skip_reason)
         )
 
         # Persist all writes atomically — if any fails, all roll back
@@ -637,6 +874,11 @@ class TakeoffEngine:
             job_id, counter_output, checker_attacks, reconciler_output,
             judge_result, confidence_result, fixture_schedule, mode
         )
+        result["checker_timing"] = checker_timing
+        result["reconciler_skipped"] = {
+            "reason": skip_reason,
+            "constitution_precheck": constitution_precheck,
+        } if skip_reason else None
         self.db.store_job_results_atomic(
             job_id=job_id,
             fixture_counts=fixture_counts_list,
@@ -649,7 +891,8 @@ class TakeoffEngine:
             violations=judge_result.get("violations", []),
             flags=judge_result.get("flags", []),
             judge_verdict=judge_result.get("verdict", "WARN"),
-            full_result=result
+            full_result=result,
+            log_entries=reconciler_log
         )
         return result
 
@@ -7,15 +7,27 @@ Vision calls use the Anthropic SDK directly since ModelRouter.complete() handles
 text-only prompts. All extraction functions send base64 images to Claude Sonnet.
 """
 
+import hashlib
 import json
 import logging
 import os
 import random
 import re
+import sqlite3
 import threading
 import time
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Dict, Tuple
+
+from takeoff.imageprep import encode_image, fit_to_model, load_image, prepare_image, reset_image_prep_stats
+from takeoff.scheduler import DEFAULT_PRIORITY, get_vision_scheduler, submit
+from takeoff.settings import API_CONFIG
+from takeoff.singleflight import SingleFlight
+from takeoff.snippetstore import ImageSource, image_identity, image_payload
+from takeoff.tiling import TiledCount, merge_tile_detections, plan_tiles, should_tile
+from takeoff.usage import record_usage
+from takeoff.visioncache import VisionCache, extraction_key
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +44,9 @@ except ImportError:
 
 # ─── Vision Cost Tracking ─────────────────────────────────────────────────────
 
-# Accumulated token counts across all vision calls in the current process.
-# Thread-safe via _cost_lock; reset per-job by calling reset_vision_cost().
+# Process-wide token counts across all vision calls (thread-safe via
+# _vision_cost_lock). Per-job figures come from the job's UsageLedger
+# (takeoff/usage.py), which concurrent jobs cannot disturb.
 _vision_cost_lock = threading.Lock()
 _vision_input_tokens: int = 0
 _vision_output_tokens: int = 0
@@ -58,20 +71,22 @@ _VISION_OUTPUT_COST_PER_TOKEN = _parse_cost_per_million("TAKEOFF_VISION_OUTPUT_C
 
 
 def reset_vision_cost() -> None:
-    """Reset accumulated vision token counts. Call at the start of each job."""
+    """Reset the process-wide vision token counts and image preprocessing savings."""
     global _vision_input_tokens, _vision_output_tokens
     with _vision_cost_lock:
         _vision_input_tokens = 0
         _vision_output_tokens = 0
+    reset_image_prep_stats()
 
 
 def get_vision_cost_usd() -> float:
-    """Return accumulated vision extraction cost in USD since last reset."""
+    """Return process-wide vision extraction cost in USD since last reset."""
     with _vision_cost_lock:
-        return (
-            _vision_input_tokens * _VISION_INPUT_COST_PER_TOKEN
-            + _vision_output_tokens * _VISION_OUTPUT_COST_PER_TOKEN
-        )
+        return _vision_cost_usd(_vision_input_tokens, _vision_output_tokens)
+
+
+def _vision_cost_usd(input_tokens: int, output_tokens: int) -> float:
+    return input_tokens * _VISION_INPUT_COST_PER_TOKEN + output_tokens * _VISION_OUTPUT_COST_PER_TOKEN
 
 
 # ─── Data Classes ───────────────────────────────────────────────────────────
@@ -198,18 +213,27 @@ def _get_vision_client() -> 'anthropic.Anthropic':
                 except (ValueError, TypeError):
                     logger.warning("[EXTRACTION] Invalid TAKEOFF_VISION_TIMEOUT — using 180s default")
                     timeout = 180.0
-                _vision_client = anthropic.Anthropic(api_key=api_key, timeout=timeout)
+                _vision_client = anthropic.Anthropic(
+                    api_key=api_key, timeout=timeout, base_url=API_CONFIG.get("base_url")
+                )
     return _vision_client
 
 
+def _vision_model() -> str:
+    """Vision model for extraction calls (TAKEOFF_VISION_MODEL)."""
+    return os.getenv("TAKEOFF_VISION_MODEL", "claude-sonnet-4-6")
+
+
 def _call_vision(
     client,
     system_prompt: str,
     user_text: str,
-    image_base64: str,
+    image_base64: ImageSource,
     max_tokens: int = 3000,
     temperature: float = 0.0,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    preprocess: bool = True,
+    task: str = "vision"
 ) -> str:
     """Send a vision request to Claude Sonnet.
 
@@ -217,32 +241,32 @@ def _call_vision(
         client: Anthropic client
         system_prompt: System-level instructions
         user_text: User text prompt
-        image_base64: Base64-encoded PNG image
+        image_base64: Base64-encoded PNG image or SnippetHandle
         max_tokens: Max output tokens
         temperature: Sampling temperature
         model: Model to use (must support vision)
+        preprocess: False sends the image exactly as given (e.g. RCP tiles,
+            whose detections are mapped back by pixel position)
+        task: Label the call is metered under in the job's usage ledger
 
     Returns:
         Response text content
     """
     if model is None:
-        model = os.getenv("TAKEOFF_VISION_MODEL", "claude-sonnet-4-6")
-
-    # Detect media type and strip data URI prefix if present
-    detected_media_type = "image/png"
-    if image_base64.startswith("data:"):
-        header, image_base64 = image_base64.split(",", 1)
-        # header looks like "data:image/jpeg;base64" — extract the exact MIME type
-        # between "data:" and ";" (or end of string) to avoid partial-match false positives
-        _mime = header.split(":")[1].split(";")[0].strip().lower() if ":" in header else ""
-        if _mime in ("image/jpeg", "image/jpg"):
-            detected_media_type = "image/jpeg"
-        elif _mime == "image/webp":
-            detected_media_type = "image/webp"
-        elif _mime == "image/gif":
-            detected_media_type = "image/gif"
-        # else: falls through to default "image/png"
+        model = _vision_model()
+
+    # Cropped, downsampled, re-encoded snippet when preprocessing helps (cached per snippet)
+    prepared = prepare_image(image_base64) if preprocess else None
+
+    # Materialize the bytes to send: the prepared image, or the original with any
+    # data URI prefix stripped (spilled snippets are read from disk only here)
+    if prepared is not None:
+        image_data, detected_media_type = prepared.data, prepared.media_type
+    else:
+        image_data, detected_media_type = image_payload(image_base64)
+        detected_media_type = detected_media_type or "image/png"
 
+    start = time.perf_counter()
     response = client.messages.create(
         model=model,
         max_tokens=max_tokens,
@@ -256,7 +280,7 @@ def _call_vision(
                     "source": {
                         "type": "base64",
                         "media_type": detected_media_type,
-                        "data": image_base64
+                        "data": image_data
                     }
                 },
                 {
@@ -267,43 +291,174 @@ def _call_vision(
         }]
     )
 
-    # Accumulate token usage for cost tracking
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    # Accumulate token usage for cost tracking: process-wide and in the job's ledger
     global _vision_input_tokens, _vision_output_tokens
+    input_tokens = output_tokens = 0
     if hasattr(response, "usage") and response.usage:
+        input_tokens = getattr(response.usage, "input_tokens", 0) or 0
+        output_tokens = getattr(response.usage, "output_tokens", 0) or 0
         with _vision_cost_lock:
-            _vision_input_tokens += getattr(response.usage, "input_tokens", 0)
-            _vision_output_tokens += getattr(response.usage, "output_tokens", 0)
+            _vision_input_tokens += input_tokens
+            _vision_output_tokens += output_tokens
+    record_usage(
+        "vision", task, model=model, input_tokens=input_tokens, output_tokens=output_tokens,
+        cost_usd=_vision_cost_usd(input_tokens, output_tokens), latency_ms=latency_ms,
+    )
 
     if not response.content:
         raise RuntimeError("[EXTRACTION] Vision API returned empty content array")
     return response.content[0].text
 
 
+# Concurrent identical vision requests (same image, prompt and params) share one call
+_vision_inflight = SingleFlight()
+
+
+def get_vision_inflight_stats() -> Dict[str, int]:
+    """Return single-flight counters for vision calls (leaders / joined / in_flight)."""
+    return _vision_inflight.stats()
+
+
 def _call_vision_with_retry(
     client,
     system_prompt: str,
     user_text: str,
-    image_base64: str,
+    image_base64: ImageSource,
     max_tokens: int = 3000,
     temperature: float = 0.0,
     model: Optional[str] = None,
-    max_retries: int = 2
+    max_retries: int = 2,
+    preprocess: bool = True,
+    priority: str = DEFAULT_PRIORITY
 ) -> str:
-    """Call vision API with exponential backoff retry on transient failures."""
-    last_error = None
-    for attempt in range(max_retries + 1):
-        try:
-            return _call_vision(client, system_prompt, user_text, image_base64, max_tokens, temperature, model)
-        except Exception as e:
-            last_error = e
-            if attempt < max_retries:
-                delay = (2 ** (attempt + 1)) + random.uniform(0, 1)
-                logger.warning("[EXTRACTION] Vision call failed (attempt %d/%d): %s. Retrying in %.1fs...",
-                               attempt + 1, max_retries + 1, e, delay)
-                time.sleep(delay)
-            else:
-                logger.error("[EXTRACTION] Vision call failed after %d attempts: %s", max_retries + 1, e)
-    raise last_error
+    """Call vision API with exponential backoff retry on transient failures.
+
+    Identical requests already in flight on another thread are joined rather
+    than re-sent; the follower receives the leader's text (or exception).
+    Each attempt waits for a slot from the process-wide vision scheduler at
+    the given priority (see takeoff/scheduler.py); backoff sleeps hold none.
+    """
+    scheduler = get_vision_scheduler()
+
+    def call_with_retry() -> str:
+        last_error = None
+        for attempt in range(max_retries + 1):
+            try:
+                with scheduler.slot(priority):
+                    return _call_vision(client, system_prompt, user_text, image_base64, max_tokens, temperature,
+                                        model, preprocess, task=priority)
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries:
+                    delay = (2 ** (attempt + 1)) + random.uniform(0, 1)
+                    logger.warning("[EXTRACTION] Vision call failed (attempt %d/%d): %s. Retrying in %.1fs...",
+                                   attempt + 1, max_retries + 1, e, delay)
+                    time.sleep(delay)
+                else:
+                    logger.error("[EXTRACTION] Vision call failed after %d attempts: %s", max_retries + 1, e)
+        raise last_error
+
+    resolved_model = model or _vision_model()
+    key = hashlib.sha256("\x00".join([
+        resolved_model, f"{temperature:g}", str(max_tokens), str(preprocess), system_prompt, user_text,
+        image_identity(image_base64),
+    ]).encode()).hexdigest()
+    text, _joined = _vision_inflight.do(key, call_with_retry)
+    return text
+
+
+# ─── Extraction Result Cache ──────────────────────────────────────────────────
+
+# Bump a version when its prompt or response parsing changes — results cached
+# under the old version are then never served again.
+PROMPT_VERSIONS = {
+    "fixture_schedule": 1,
+    "rcp_counts": 1,
+    "plan_notes": 1,
+    "panel_schedule": 1,
+}
+
+_vision_cache: Optional[VisionCache] = None
+_vision_cache_lock = threading.Lock()
+
+
+def get_vision_cache() -> Optional[VisionCache]:
+    """Return the shared extraction cache, or None when disabled (TAKEOFF_VISION_CACHE=false)."""
+    global _vision_cache
+    if not API_CONFIG.get("vision_cache_enabled", True):
+        return None
+    if _vision_cache is None:
+        with _vision_cache_lock:
+            if _vision_cache is None:
+                _vision_cache = VisionCache(
+                    API_CONFIG.get("vision_cache_path", "takeoff_vision_cache.db"),
+                    max_entries=API_CONFIG.get("vision_cache_max_entries", 5000),
+                    max_bytes=API_CONFIG.get("vision_cache_max_bytes", 64 * 1024 * 1024),
+                )
+    return _vision_cache
+
+
+def get_vision_cache_stats() -> Dict:
+    """Return extraction cache counters (hits / misses / hit_rate / evictions / size)."""
+    cache = _vision_cache if API_CONFIG.get("vision_cache_enabled", True) else None
+    if cache is None:
+        return {"enabled": API_CONFIG.get("vision_cache_enabled", True), "hits": 0, "misses": 0}
+    return {"enabled": True, **cache.stats()}
+
+
+def _cache_lookup(
+    function: str, snippet_image: ImageSource, use_cache: bool, fingerprint: str = ""
+) -> Tuple[Optional[str], Optional[dict]]:
+    """Return (cache key, cached payload or None). The key is None when caching is off.
+
+    With use_cache=False the lookup is skipped but the key is still returned,
+    so the fresh result replaces the cached one.
+    """
+    cache = get_vision_cache()
+    if cache is None:
+        return None, None
+    key = extraction_input_key(function, snippet_image, fingerprint)
+    if not use_cache:
+        cache.record_bypass()
+        return key, None
+    try:
+        return key, cache.get(key, function)
+    except sqlite3.Error as e:
+        logger.warning("[EXTRACTION] Vision cache read failed (%s) — calling the vision API", e)
+        return key, None
+
+
+def _cache_store(key: Optional[str], function: str, payload: dict) -> None:
+    """Store a successful extraction result (never a failure placeholder)."""
+    if key is None:
+        return
+    try:
+        get_vision_cache().set(key, function, payload)
+    except sqlite3.Error as e:
+        logger.warning("[EXTRACTION] Vision cache write failed: %s", e)
+
+
+def extraction_input_key(function: str, snippet_image: ImageSource, fingerprint: str = "") -> str:
+    """Identity of one extraction's inputs: image, prompt version, vision model and fingerprint.
+
+    Used as the vision cache key and by incremental re-takeoffs (takeoff/incremental.py).
+    """
+    return extraction_key(function, PROMPT_VERSIONS[function], _vision_model(), snippet_image, fingerprint)
+
+
+def _schedule_fingerprint(fixture_schedule: "FixtureSchedule", area_label: str) -> str:
+    """RCP prompt inputs besides the image: the known fixture types and the area label."""
+    schedule_json = json.dumps(fixture_schedule.fixtures, sort_keys=True, default=str)
+    return hashlib.sha256(f"{schedule_json}\x00{area_label}".encode()).hexdigest()
+
+
+def rcp_fingerprint(fixture_schedule: "FixtureSchedule", area_label: str, tiled: Optional[bool] = None) -> str:
+    """Fingerprint for extract_rcp_counts(); tiled None follows the rcp_tiling setting."""
+    if tiled is None:
+        tiled = API_CONFIG.get("rcp_tiling", False)
+    return _schedule_fingerprint(fixture_schedule, area_label) + (":tiled" if tiled else "")
 
 
 def _simulate_vision_response(system_prompt: str, user_text: str) -> str:
@@ -392,15 +547,21 @@ def _simulate_vision_response(system_prompt: str, user_text: str) -> str:
 
 # ─── Extraction Functions ─────────────────────────────────────────────────────
 
-def extract_fixture_schedule(snippet_image: str) -> FixtureSchedule:
+def extract_fixture_schedule(snippet_image: ImageSource, use_cache: bool = True) -> FixtureSchedule:
     """Extract structured fixture schedule from a snippet image.
 
     Args:
-        snippet_image: Base64-encoded PNG of the fixture schedule table
+        snippet_image: Base64-encoded PNG (or SnippetHandle) of the fixture schedule table
+        use_cache: False skips the extraction cache lookup (the result is still stored)
 
     Returns:
         FixtureSchedule with all type tags and descriptions
     """
+    cache_key, cached = _cache_lookup("fixture_schedule", snippet_image, use_cache)
+    if cached is not None:
+        logger.info("[EXTRACTION] Fixture schedule: cache hit (%d types)", len(cached.get("fixtures", {})))
+        return FixtureSchedule(**cached)
+
     client = _get_vision_client()
 
     system_prompt = """You are an expert electrical estimator reading a fixture schedule from construction drawings.
@@ -448,7 +609,8 @@ Return ONLY valid JSON (no markdown fences):
     user_text = "Extract the complete fixture schedule from this drawing. Return all fixture types in the JSON format specified."
 
     try:
-        response_text = _call_vision_with_retry(client, system_prompt, user_text, snippet_image, max_tokens=3000)
+        response_text = _call_vision_with_retry(client, system_prompt, user_text, snippet_image, max_tokens=3000,
+                                                priority="fixture_schedule")
         data = extract_json_from_response(response_text, "FIXTURE_SCHEDULE")
 
         fixtures_raw = data.get("fixtures", {})
@@ -459,6 +621,8 @@ Return ONLY valid JSON (no markdown fences):
             warnings=data.get("warnings", [])
         )
         logger.info("[EXTRACTION] Fixture schedule: %d types extracted", len(fixtures_raw))
+        if fixtures_raw:  # An empty schedule fails the job; a resubmit should re-extract
+            _cache_store(cache_key, "fixture_schedule", asdict(fixture_schedule))
         return fixture_schedule
 
     except Exception as e:
@@ -466,21 +630,108 @@ Return ONLY valid JSON (no markdown fences):
         return FixtureSchedule(warnings=[f"Extraction failed: {str(e)}"])
 
 
+def count_rcp_tiled(
+    client, snippet_image: ImageSource, schedule_context: str, area_label: str, priority: str = "rcp_counts"
+) -> Optional[TiledCount]:
+    """Count fixtures on a large RCP sheet tile by tile, in parallel.
+
+    Returns None when the sheet is small enough for one call (or is not an
+    image Pillow can open) — the caller then counts it the usual way. Each
+    tile is sent at the resolution the model reads it at, and detections are
+    merged with seam de-duplication (takeoff/tiling.py). priority is the
+    vision scheduler class the tile calls queue under.
+    """
+    img = load_image(snippet_image)
+    if img is None or not should_tile(*img.size):
+        return None
+    tiles = plan_tiles(*img.size)
+
+    system_prompt = f"""You are an expert electrical estimator locating lighting fixtures on one tile of a Reflected Ceiling Plan (RCP).
+
+{schedule_context}
+
+Your task: Find every lighting fixture symbol in this image and report where it is.
+
+CRITICAL rules:
+1. Report EVERY fixture symbol, including symbols cut off at the image edges
+2. Match each symbol to its type tag using the fixture schedule above; use "UNKNOWN" if you cannot tell
+3. x and y are the pixel coordinates of the symbol's centre, measured from the image's top-left corner
+4. Do NOT report HVAC diffusers, sprinkler heads, or smoke detectors
+5. List any notes visible in this tile that affect fixture counts (e.g. "TYP 4 PLACES")
+
+Return ONLY valid JSON:
+{{
+  "fixtures": [{{"type_tag": "A", "x": 120, "y": 340}}],
+  "notes": ["list of relevant RCP notes that affect counts"],
+  "warnings": ["any ambiguities, illegible symbols, or assumptions made"]
+}}"""
+
+    def count_tile(tile) -> Tuple[List[dict], float, dict]:
+        region = img.crop(tile.box)
+        width = region.width
+        region = fit_to_model(region)
+        scale = region.width / width
+        data, media_type = encode_image(region)
+        user_text = (
+            f"Locate all lighting fixture symbols in tile {tile.index + 1} of {len(tiles)} of RCP area "
+            f"'{area_label}'. The image is {region.width}x{region.height} pixels."
+        )
+        response_text = _call_vision_with_retry(
+            client, system_prompt, user_text, f"data:{media_type};base64,{data}",
+            max_tokens=3000, preprocess=False, priority=priority,
+        )
+        parsed = extract_json_from_response(response_text, "RCP_TILE")
+        fixtures = [f for f in parsed.get("fixtures", []) if isinstance(f, dict)]
+        return fixtures, scale, parsed
+
+    workers = max(min(len(tiles), API_CONFIG.get("rcp_tile_workers", 6)), 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = [f.result() for f in [submit(pool, count_tile, tile) for tile in tiles]]
+
+    merged = merge_tile_detections(tiles, [r[0] for r in results], [r[1] for r in results])
+    for _, _, parsed in results:
+        for note in parsed.get("notes", []):
+            if note not in merged.notes:
+                merged.notes.append(note)
+        for warning in parsed.get("warnings", []):
+            if warning not in merged.warnings:
+                merged.warnings.append(warning)
+    logger.info(
+        "[EXTRACTION] RCP '%s': %d fixtures from %d tiles (%d seam duplicates dropped)",
+        area_label, sum(merged.counts_by_type.values()), merged.tiles, merged.seam_duplicates,
+    )
+    return merged
+
+
 def extract_rcp_counts(
-    snippet_image: str,
+    snippet_image: ImageSource,
     fixture_schedule: FixtureSchedule,
-    area_label: str
+    area_label: str,
+    use_cache: bool = True,
+    tiled: Optional[bool] = None
 ) -> AreaCount:
     """Extract fixture counts from an RCP snippet image.
 
     Args:
-        snippet_image: Base64-encoded PNG of the RCP area
+        snippet_image: Base64-encoded PNG (or SnippetHandle) of the RCP area
         fixture_schedule: Previously extracted fixture schedule for context
         area_label: Human-readable label for this area (e.g. "Floor 2 North Wing")
+        use_cache: False skips the extraction cache lookup (the result is still stored)
+        tiled: Count large sheets tile by tile (see takeoff/tiling.py).
+            None follows the rcp_tiling setting.
 
     Returns:
         AreaCount with per-type counts for this area
     """
+    if tiled is None:
+        tiled = API_CONFIG.get("rcp_tiling", False)
+    cache_key, cached = _cache_lookup(
+        "rcp_counts", snippet_image, use_cache, rcp_fingerprint(fixture_schedule, area_label, tiled)
+    )
+    if cached is not None:
+        logger.info("[EXTRACTION] RCP '%s': cache hit", area_label)
+        return AreaCount(**cached)
+
     client = _get_vision_client()
 
     # Build schedule context for the prompt
@@ -494,6 +745,22 @@ def extract_rcp_counts(
             lines.append(f"  Type {tag}: {desc}")
         schedule_context = "\n".join(lines)
 
+    if tiled:
+        try:
+            merged = count_rcp_tiled(client, snippet_image, schedule_context, area_label)
+        except Exception as e:
+            logger.error("[EXTRACTION] ERROR counting RCP tiles for '%s': %s", area_label, e)
+            return AreaCount(area_label=area_label, warnings=[f"Extraction failed: {str(e)}"])
+        if merged is not None:
+            area_count = AreaCount(
+                area_label=area_label,
+                counts_by_type=merged.counts_by_type,
+                notes=merged.notes,
+                warnings=merged.warnings,
+            )
+            _cache_store(cache_key, "rcp_counts", asdict(area_count))
+            return area_count
+
     system_prompt = f"""You are an expert electrical estimator counting lighting fixtures on a Reflected Ceiling Plan (RCP).
 
 {schedule_context}
@@ -536,6 +803,7 @@ Return ONLY valid JSON:
 
         total = sum(area_count.counts_by_type.values())
         logger.info("[EXTRACTION] RCP '%s': %d fixtures across %d types", area_label, total, len(area_count.counts_by_type))
+        _cache_store(cache_key, "rcp_counts", asdict(area_count))
         return area_count
 
     except Exception as e:
@@ -543,15 +811,21 @@ Return ONLY valid JSON:
         return AreaCount(area_label=area_label, warnings=[f"Extraction failed: {str(e)}"])
 
 
-def extract_plan_notes(snippet_image: str) -> List[PlanNote]:
+def extract_plan_notes(snippet_image: ImageSource, use_cache: bool = True) -> List[PlanNote]:
     """Extract relevant constraints from plan notes snippet.
 
     Args:
-        snippet_image: Base64-encoded PNG of plan notes or specifications
+        snippet_image: Base64-encoded PNG (or SnippetHandle) of plan notes or specifications
+        use_cache: False skips the extraction cache lookup (the result is still stored)
 
     Returns:
         List of PlanNote constraint objects
     """
+    cache_key, cached = _cache_lookup("plan_notes", snippet_image, use_cache)
+    if cached is not None:
+        logger.info("[EXTRACTION] Plan notes: cache hit (%d constraints)", len(cached.get("notes", [])))
+        return [PlanNote(**n) for n in cached.get("notes", [])]
+
     client = _get_vision_client()
 
     system_prompt = """You are an expert electrical estimator reading plan notes and specifications from construction drawings.
@@ -581,7 +855,8 @@ Return ONLY valid JSON:
     user_text = "Extract all notes from this drawing that affect lighting fixture counts or installation requirements."
 
     try:
-        response_text = _call_vision_with_retry(client, system_prompt, user_text, snippet_image, max_tokens=2000)
+        response_text = _call_vision_with_retry(client, system_prompt, user_text, snippet_image, max_tokens=2000,
+                                                priority="plan_notes")
         data = extract_json_from_response(response_text, "PLAN_NOTES")
 
         notes = []
@@ -593,6 +868,7 @@ Return ONLY valid JSON:
             ))
 
         logger.info("[EXTRACTION] Plan notes: %d constraints extracted", len(notes))
+        _cache_store(cache_key, "plan_notes", {"notes": [asdict(n) for n in notes]})
         return notes
 
     except Exception as e:
@@ -600,15 +876,21 @@ Return ONLY valid JSON:
         return []
 
 
-def extract_panel_schedule(snippet_image: str) -> PanelData:
+def extract_panel_schedule(snippet_image: ImageSource, use_cache: bool = True) -> PanelData:
     """Extract panel schedule data for cross-reference wattage verification.
 
     Args:
-        snippet_image: Base64-encoded PNG of the panel schedule
+        snippet_image: Base64-encoded PNG (or SnippetHandle) of the panel schedule
+        use_cache: False skips the extraction cache lookup (the result is still stored)
 
     Returns:
         PanelData with circuit loads and totals
     """
+    cache_key, cached = _cache_lookup("panel_schedule", snippet_image, use_cache)
+    if cached is not None:
+        logger.info("[EXTRACTION] Panel '%s': cache hit", cached.get("panel_name"))
+        return PanelData(**cached)
+
     client = _get_vision_client()
 
     system_prompt = """You are an expert electrical estimator reading a panel schedule from construction drawings.
@@ -641,7 +923,8 @@ Return ONLY valid JSON:
     user_text = "Extract all circuit data from this panel schedule. Focus on lighting circuits for load cross-reference."
 
     try:
-        response_text = _call_vision_with_retry(client, system_prompt, user_text, snippet_image, max_tokens=2000)
+        response_text = _call_vision_with_retry(client, system_prompt, user_text, snippet_image, max_tokens=2000,
+                                                priority="panel_schedule")
         data = extract_json_from_response(response_text, "PANEL_SCHEDULE")
 
         panel = PanelData(
@@ -652,6 +935,7 @@ Return ONLY valid JSON:
         )
 
         logger.info("[EXTRACTION] Panel '%s': %d circuits, %s VA total", panel.panel_name, len(panel.circuits), panel.total_load_va)
+        _cache_store(cache_key, "panel_schedule", asdict(panel))
         return panel
 
     except Exception as e:
@@ -0,0 +1,273 @@
+"""Snippet image preprocessing — shrinks vision payloads before they are sent.
+
+Clients upload snippets as base64 PNG/JPEG (up to 15 MB each), and every
+extraction and Checker vision call used to forward them verbatim. The API
+downsamples anything larger than its effective resolution anyway, so the
+extra pixels only cost upload time, and empty sheet margins cost image
+tokens. prepare_image() decodes a snippet once and:
+
+1. flattens transparency onto white
+2. crops empty (near-white) margins, keeping a small pad
+3. converts to grayscale when the colour channels agree (line drawings),
+   and to bilevel when the image holds only pure black and white
+4. downsamples to the model's effective resolution (long edge and total
+   pixel caps, LANCZOS)
+5. re-encodes as optimized PNG or lossless WebP, whichever is smaller
+
+Results are cached per snippet (by content hash) so the Checker's vision
+pass reuses the extraction's work. Bytes and estimated image tokens before
+and after are counted into the current job's UsageLedger (per job, safe
+under concurrent jobs) and into process-wide totals since the last
+reset_image_prep_stats().
+
+Image tokens are estimated the way Anthropic documents them:
+width * height / 750 at the resolution the model actually sees.
+"""
+
+import base64
+import io
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from takeoff.settings import API_CONFIG
+from takeoff.snippetstore import ImageSource, image_bytes, image_identity
+from takeoff.usage import image_prep_summary, record_image_prep
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageChops, ImageOps
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+    logger.warning("'Pillow' package not installed. Snippet images will be sent unprocessed.")
+
+# Pixels lighter than this count as empty paper when cropping margins
+_BLANK_THRESHOLD = 245
+_CROP_PAD_PX = 8
+# Max per-pixel difference between colour channels still treated as grayscale
+_GRAY_TOLERANCE = 8
+
+
+@dataclass
+class PreparedImage:
+    """A snippet image ready for the Messages API, plus what preprocessing saved."""
+    data: str               # base64, no data-URI prefix
+    media_type: str
+    bytes_before: int
+    bytes_after: int
+    size_before: Tuple[int, int]
+    size_after: Tuple[int, int]
+    tokens_before: int      # Estimated image tokens for the original upload
+    tokens_after: int
+    prep_ms: float
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Image tokens at the resolution the model sees (after the API's own downsampling)."""
+    w, h = effective_size(width, height)
+    return max(math.ceil(w * h / 750), 1)
+
+
+def effective_size(width: int, height: int) -> Tuple[int, int]:
+    """Size the model sees an image at: the API downsamples past a long-edge and a total-pixel cap."""
+    max_edge = API_CONFIG.get("vision_max_edge_px", 1568)
+    max_pixels = API_CONFIG.get("vision_max_pixels", 1_150_000)
+    scale = min(1.0, max_edge / max(width, height, 1), math.sqrt(max_pixels / max(width * height, 1)))
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+def _flatten(img: "Image.Image") -> "Image.Image":
+    """RGB or L image, with any transparency composited onto white paper."""
+    if img.mode in ("L", "RGB"):
+        return img
+    if img.mode == "1":
+        return img.convert("L")
+    if img.mode in ("LA", "RGBA", "P", "PA"):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+        return Image.alpha_composite(background, rgba).convert("RGB")
+    return img.convert("RGB")
+
+
+def _crop_margins(img: "Image.Image") -> "Image.Image":
+    gray = img if img.mode == "L" else img.convert("L")
+    ink = ImageOps.invert(gray).point(lambda p: 255 if p > 255 - _BLANK_THRESHOLD else 0)
+    bbox = ink.getbbox()
+    if bbox is None:
+        return img  # Blank snippet: nothing to anchor a crop on
+    left, top, right, bottom = bbox
+    bbox = (
+        max(left - _CROP_PAD_PX, 0), max(top - _CROP_PAD_PX, 0),
+        min(right + _CROP_PAD_PX, img.width), min(bottom + _CROP_PAD_PX, img.height),
+    )
+    return img.crop(bbox) if bbox != (0, 0, img.width, img.height) else img
+
+
+def _to_grayscale_if_lossless(img: "Image.Image") -> "Image.Image":
+    if img.mode != "RGB":
+        return img
+    r, g, b = img.split()
+    spread = max(ImageChops.difference(r, g).getextrema()[1], ImageChops.difference(g, b).getextrema()[1])
+    return img.convert("L") if spread <= _GRAY_TOLERANCE else img
+
+
+def _to_bilevel_if_lossless(img: "Image.Image") -> "Image.Image":
+    colors = img.getcolors(2) if img.mode == "L" else None  # None when more than two levels
+    if colors and {value for _, value in colors} <= {0, 255}:
+        return img.convert("1", dither=Image.Dither.NONE)
+    return img
+
+
+def _encode(img: "Image.Image") -> Tuple[bytes, str]:
+    """Smallest lossless encoding: optimized PNG or lossless WebP."""
+    png = io.BytesIO()
+    img.save(png, format="PNG", optimize=True)
+    best = (png.getvalue(), "image/png")
+    if img.mode != "1":  # WebP has no bilevel mode; PNG 1-bit is already tiny
+        webp = io.BytesIO()
+        img.save(webp, format="WEBP", lossless=True, method=6)
+        if webp.tell() < len(best[0]):
+            best = (webp.getvalue(), "image/webp")
+    return best
+
+
+def _open(raw: bytes) -> Optional["Image.Image"]:
+    try:
+        img = Image.open(io.BytesIO(raw))
+        img.load()
+    except Exception:
+        return None  # Not an image Pillow understands
+    return img
+
+
+def load_image(image: ImageSource) -> Optional["Image.Image"]:
+    """Decode a snippet into an RGB or L image on white, or None if it is not an image."""
+    if not HAS_PIL:
+        return None
+    raw = image_bytes(image)
+    img = _open(raw) if raw is not None else None
+    return _flatten(img) if img is not None else None
+
+
+def fit_to_model(img: "Image.Image") -> "Image.Image":
+    """Downsample to the resolution the model sees (LANCZOS); smaller images are returned as-is."""
+    target = effective_size(*img.size)
+    return img.resize(target, Image.Resampling.LANCZOS) if target != img.size else img
+
+
+def encode_image(img: "Image.Image") -> Tuple[str, str]:
+    """(base64, media_type) for an already-sized region: lossless grayscale/bilevel, smallest encoding."""
+    img = _to_bilevel_if_lossless(_to_grayscale_if_lossless(img))
+    encoded, media_type = _encode(img)
+    return base64.b64encode(encoded).decode(), media_type
+
+
+def _prepare(image: ImageSource) -> Optional[PreparedImage]:
+    start = time.perf_counter()
+    raw = image_bytes(image)
+    img = _open(raw) if raw is not None else None
+    if img is None:
+        return None  # Send as-is
+    size_before = img.size
+
+    img = _flatten(img)
+    img = _crop_margins(img)
+    img = _to_grayscale_if_lossless(img)
+    resized = fit_to_model(img)
+    img = resized if resized is not img else _to_bilevel_if_lossless(img)
+
+    encoded, media_type = _encode(img)
+    if len(encoded) >= len(raw) and img.size == size_before:
+        return None  # Nothing gained; keep the client's bytes
+    return PreparedImage(
+        data=base64.b64encode(encoded).decode(),
+        media_type=media_type,
+        bytes_before=len(raw),
+        bytes_after=len(encoded),
+        size_before=size_before,
+        size_after=img.size,
+        tokens_before=estimate_image_tokens(*size_before),
+        tokens_after=estimate_image_tokens(*img.size),
+        prep_ms=(time.perf_counter() - start) * 1000,
+    )
+
+
+class _PrepCache:
+    """Bounded LRU of prepared images keyed by snippet content (hash of the base64, or the handle digest)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Optional[PreparedImage]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_prepare(self, image: ImageSource) -> Tuple[Optional[PreparedImage], bool]:
+        key = image_identity(image)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key], True
+            self.misses += 1
+        prepared = _prepare(image)
+        with self._lock:
+            self._entries[key] = prepared
+            while len(self._entries) > max(API_CONFIG.get("vision_prep_cache_entries", 256), 1):
+                self._entries.popitem(last=False)
+        return prepared, False
+
+
+_prep_cache = _PrepCache()
+
+# Process-wide savings since the last reset_image_prep_stats() / reset_vision_cost();
+# per-job figures live in the job's UsageLedger
+_stats_lock = threading.Lock()
+_stats: Dict[str, float] = {}
+
+
+def reset_image_prep_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+        _stats.update({
+            "images_sent": 0, "images_prepared": 0, "cache_hits": 0, "prep_ms": 0.0,
+            "bytes_before": 0, "bytes_after": 0, "tokens_before": 0, "tokens_after": 0,
+        })
+
+
+reset_image_prep_stats()
+
+
+def prepare_image(image: ImageSource) -> Optional[PreparedImage]:
+    """Preprocessed version of a snippet image, or None to send the original unchanged."""
+    if not HAS_PIL or not API_CONFIG.get("vision_preprocess", True):
+        return None
+    prepared, cached = _prep_cache.get_or_prepare(image)
+    counts = {"images_sent": 1}
+    if prepared is not None:
+        counts.update(
+            cache_hits=int(cached),
+            images_prepared=int(not cached),
+            prep_ms=0.0 if cached else prepared.prep_ms,
+            bytes_before=prepared.bytes_before,
+            bytes_after=prepared.bytes_after,
+            tokens_before=prepared.tokens_before,
+            tokens_after=prepared.tokens_after,
+        )
+    with _stats_lock:
+        for k, v in counts.items():
+            _stats[k] += v
+    record_image_prep(**counts)
+    return prepared
+
+
+def get_image_prep_stats() -> Dict:
+    """Process-wide savings from preprocessing since the last reset (bytes uploaded, estimated image tokens)."""
+    with _stats_lock:
+        stats = dict(_stats)
+    return image_prep_summary(stats)
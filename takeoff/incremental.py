@@ -0,0 +1,118 @@
+"""Incremental re-takeoff — reuse a prior job's work for unchanged snippets.
+
+Estimators rerun the same drawing set with one RCP swapped or a note added,
+and every run used to repeat each extraction and every Checker vision check.
+run_takeoff(base_job_id=...) loads an IncrementalPlan from the base job's
+persisted per-snippet extraction outputs and per-area Checker verdicts:
+
+- an extraction is reused when its input key matches the base job's:
+  same image bytes, prompt version and vision model, and for RCPs the same
+  fixture schedule and area label (so a changed schedule re-counts every
+  area)
+- a Checker area verdict is reused when the area's image, the schedule and
+  the Counter's claimed counts for that area are unchanged
+
+Counter, the Checker's text review, Reconciler and Judge always re-run:
+they read every area, so any change reaches them. The plan also diffs the
+snippet sets by image hash and reports what was reused and the vision time
+saved (the reused calls' latency as measured in the base job).
+"""
+
+import threading
+from dataclasses import asdict, is_dataclass
+from typing import Dict, List, Optional
+
+from takeoff.extraction import AreaCount, FixtureSchedule, PanelData, PlanNote
+from takeoff.visioncache import image_digest
+
+
+def extraction_payload(function: str, result) -> Optional[dict]:
+    """JSON-safe form of a successful extraction result; None for failures and empty results."""
+    if function == "plan_notes":
+        return {"notes": [asdict(n) for n in result]} if result and all(map(is_dataclass, result)) else None
+    if not is_dataclass(result) or (function == "fixture_schedule" and not result.fixtures):
+        return None
+    if any(str(w).startswith("Extraction failed") for w in getattr(result, "warnings", [])):
+        return None
+    return asdict(result)
+
+
+def extraction_result(function: str, payload: dict):
+    """Inverse of extraction_payload()."""
+    if function == "fixture_schedule":
+        return FixtureSchedule(**payload)
+    if function == "rcp_counts":
+        return AreaCount(**payload)
+    if function == "plan_notes":
+        return [PlanNote(**n) for n in payload.get("notes", [])]
+    return PanelData(**payload)
+
+
+class IncrementalPlan:
+    """Reusable extraction outputs and Checker verdicts from one base job."""
+
+    def __init__(self, base_job_id: str, extractions: List[Dict], area_verdicts: Dict[str, Dict]):
+        self.base_job_id = base_job_id
+        self.base_snippets = extractions
+        self._outputs = {r["input_key"]: r for r in extractions if r.get("input_key") and r.get("output")}
+        self.area_verdicts = area_verdicts
+        self.checker_verdicts: Dict[str, Dict] = {}  # This run's verdicts, set once the Checker has run
+        self._lock = threading.Lock()
+        self.reused_extractions = 0
+        self.recomputed_extractions = 0
+        self.extraction_ms_saved = 0
+
+    @classmethod
+    def load(cls, db, base_job_id: str) -> "IncrementalPlan":
+        if not db.get_job(base_job_id):
+            raise ValueError(f"Unknown base_job_id '{base_job_id}'")
+        return cls(base_job_id, db.get_snippet_extractions(base_job_id), db.get_checker_verdicts(base_job_id))
+
+    def reuse_extraction(self, input_key: str) -> Optional[Dict]:
+        """The base job's row for this extraction input, or None (counted as recomputed)."""
+        row = self._outputs.get(input_key)
+        with self._lock:
+            if row is None:
+                self.recomputed_extractions += 1
+            else:
+                self.reused_extractions += 1
+                self.extraction_ms_saved += row.get("latency_ms", 0)
+        return row
+
+    def diff(self, snippets: List[Dict]) -> Dict[str, List[str]]:
+        """Snippet ids unchanged (same label and image bytes as some base snippet), changed, added, removed."""
+        base_by_id = {r["snippet_id"]: r for r in self.base_snippets}
+        base_images = {(r.get("label"), r.get("image_digest")) for r in self.base_snippets}
+        current_images = set()
+        diff: Dict[str, List[str]] = {"unchanged": [], "changed": [], "added": [], "removed": []}
+        for s in snippets:
+            digest = image_digest(s["image_data"]) if s.get("image_data") else None
+            current_images.add((s.get("label"), digest))
+            if digest and (s.get("label"), digest) in base_images:
+                diff["unchanged"].append(s.get("id", "?"))
+            elif s.get("id") in base_by_id:
+                diff["changed"].append(s.get("id", "?"))
+            else:
+                diff["added"].append(s.get("id", "?"))
+        current_ids = {s.get("id") for s in snippets}
+        diff["removed"] = [
+            r["snippet_id"] for r in self.base_snippets
+            if r["snippet_id"] not in current_ids and (r.get("label"), r.get("image_digest")) not in current_images
+        ]
+        return diff
+
+    def report(self, snippets: List[Dict], area_verdicts: Dict[str, Dict]) -> Dict:
+        """result["incremental"]: snippet diff, reused vs recomputed work, and vision time saved."""
+        reused_verdicts = [v for v in area_verdicts.values() if v.get("reused")]
+        checker_ms_saved = sum(v.get("latency_ms", 0) for v in reused_verdicts)
+        return {
+            "base_job_id": self.base_job_id,
+            "snippets": self.diff(snippets),
+            "extractions": {"reused": self.reused_extractions, "recomputed": self.recomputed_extractions},
+            "checker_areas": {
+                "reused": len(reused_verdicts),
+                "recomputed": len(area_verdicts) - len(reused_verdicts),
+                "reused_areas": sorted(v.get("area_label", "") for v in reused_verdicts),
+            },
+            "time_saved_ms": self.extraction_ms_saved + checker_ms_saved,  # Summed call latency, not wall time
+        }
@@ -4,17 +4,22 @@ Slim extraction from core/llm.py with only the API-mode code paths
 needed for takeoff operations.
 """
 
+import asyncio
+import dataclasses
 import hashlib
 import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional, Union
 
 import anthropic
 
+from takeoff.ratelimit import RateLimiter, get_rate_limiter
 from takeoff.settings import API_CONFIG
+from takeoff.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +31,56 @@ class LLMTimeoutException(Exception):
     pass
 
 
+def _safe_retry_after_seconds(error: Exception) -> float:
+    """Best-effort extraction of retry-after seconds from Anthropic exceptions."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        headers = getattr(response, "headers", {}) or {}
+        retry_after = headers.get("retry-after") or headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except (ValueError, TypeError):
+                pass
+    return 0.0
+
+
+# ─── Prompt Segments ─────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class PromptSegment:
+    """One block of a structured system prompt; cache=True ends a cacheable prefix."""
+    text: str
+    cache: bool = False
+
+
+SystemPrompt = Union[str, list]  # str or list[PromptSegment]
+
+MAX_CACHE_BREAKPOINTS = 4
+
+
+def prompt_text(system_prompt: SystemPrompt) -> str:
+    """Flatten a structured system prompt to plain text (cache keys, estimates)."""
+    if isinstance(system_prompt, str):
+        return system_prompt
+    return "\n".join(segment.text for segment in system_prompt)
+
+
+def system_param(system_prompt: SystemPrompt):
+    """Build the Messages API `system` argument, marking cacheable segments."""
+    if isinstance(system_prompt, str):
+        return system_prompt
+    cached = [i for i, seg in enumerate(system_prompt) if seg.cache] if API_CONFIG.get("prompt_caching", True) else []
+    breakpoints = set(cached[-MAX_CACHE_BREAKPOINTS:])
+    blocks = []
+    for i, segment in enumerate(system_prompt):
+        block = {"type": "text", "text": segment.text}
+        if i in breakpoints:
+            block["cache_control"] = {"type": "ephemeral"}
+        blocks.append(block)
+    return blocks
+
+
 # ─── Response Dataclass ──────────────────────────────────────────────────────
 
 @dataclass
@@ -39,6 +94,15 @@ class LLMResponse:
     cached: bool = False
     latency_ms: int = 0
     metadata: dict = field(default_factory=dict)
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+@dataclass
+class StreamChunk:
+    """One item from LLMProvider.stream(): a token delta, or the final response."""
+    text: str = ""
+    response: Optional[LLMResponse] = None
 
 
 # ─── Cost Constants ───────────────────────────────────────────────────────────
@@ -59,53 +123,161 @@ class LLMProvider:
         api_key: Optional[str] = None,
         mode: str = "api",
         cache_enabled: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY", "")
         self.mode = mode
         self.cache_enabled = cache_enabled
 
-        # Response cache
+        # Response cache + in-flight table (concurrent identical calls share one API call)
         self._cache: dict = {}
+        self._inflight = SingleFlight()
 
-        # Rate limiting
-        self._last_call_time = 0.0
-        self._rate_limit_seconds = API_CONFIG.get("rate_limit_seconds", 1.0)
+        # Rate limiting — per-tier token buckets shared process-wide
+        self._rate_limiter = rate_limiter or get_rate_limiter()
         self._rate_limit_enabled = API_CONFIG.get("rate_limit_enabled", True)
 
-        # Cost tracking
+        # Cost tracking (guarded by _stats_lock — providers are shared across threads)
+        self._stats_lock = threading.Lock()
         self.total_cost_usd = 0.0
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_cache_read_tokens = 0
+        self.total_cache_write_tokens = 0
         self.call_count = 0
 
         # Initialize Anthropic client
         if self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = anthropic.Anthropic(api_key=self.api_key, base_url=API_CONFIG.get("base_url"))
         else:
             self.client = None
+        # AsyncAnthropic for acomplete(), created lazily on first use
+        self._async_client = None
+        self._async_client_loop = None
 
     def _get_cache_key(self, system_prompt: str, user_prompt: str, model: str, temperature: float) -> str:
         """Generate a cache key for the request."""
         raw = f"{model}:{temperature}:{system_prompt}:{user_prompt}"
         return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
-    def _enforce_rate_limit(self):
-        """Enforce rate limiting between API calls."""
+    def _enforce_rate_limit(self, model: str, estimated_tokens: int = 0):
+        """Reserve RPM/TPM capacity for this model, sleeping only for our own deficit."""
         if not self._rate_limit_enabled:
             return
-        elapsed = time.time() - self._last_call_time
-        if elapsed < self._rate_limit_seconds:
-            time.sleep(self._rate_limit_seconds - elapsed)
-        self._last_call_time = time.time()
+        self._rate_limiter.acquire(model, estimated_tokens)
 
-    def _calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
-        """Calculate cost for the API call."""
+    def _calculate_cost(
+        self, model: str, input_tokens: int, output_tokens: int,
+        cache_read_tokens: int = 0, cache_write_tokens: int = 0,
+    ) -> float:
+        """Calculate cost for the API call (cache reads/writes priced off the input rate)."""
         costs = COST_PER_1K.get(model, {"input": 0.003, "output": 0.015})
-        return (input_tokens / 1000 * costs["input"]) + (output_tokens / 1000 * costs["output"])
+        cached_input = (
+            cache_write_tokens * API_CONFIG.get("prompt_cache_write_multiplier", 1.25)
+            + cache_read_tokens * API_CONFIG.get("prompt_cache_read_multiplier", 0.1)
+        )
+        return ((input_tokens + cached_input) / 1000 * costs["input"]) + (output_tokens / 1000 * costs["output"])
+
+    def _cached_response(self, cache_key: str, model: str, task_type: str) -> Optional[LLMResponse]:
+        cached = self._cache.get(cache_key) if self.cache_enabled else None
+        if cached is None:
+            return None
+        return LLMResponse(
+            content=cached["content"],
+            model=model,
+            cached=True,
+            metadata={"task_type": task_type},
+        )
+
+    @staticmethod
+    def _joined_response(response: LLMResponse) -> LLMResponse:
+        """Follower's copy of the leader's response: same content, nothing billed."""
+        return dataclasses.replace(
+            response, input_tokens=0, output_tokens=0, cost_usd=0.0,
+            cache_read_tokens=0, cache_write_tokens=0, cached=True,
+        )
+
+    def _record_success(
+        self,
+        message,
+        model: str,
+        task_type: str,
+        start_time: float,
+        estimated_tokens: int,
+        cache_key: str,
+    ) -> LLMResponse:
+        """Turn an API message into an LLMResponse and update limiter, cost and cache."""
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        content = message.content[0].text if message.content else ""
+        input_tokens = message.usage.input_tokens
+        output_tokens = message.usage.output_tokens
+        cache_read = getattr(message.usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(message.usage, "cache_creation_input_tokens", 0) or 0
+        cost = self._calculate_cost(model, input_tokens, output_tokens, cache_read, cache_write)
+
+        # Update tracking
+        if self._rate_limit_enabled:
+            self._rate_limiter.record_usage(model, estimated_tokens, input_tokens + output_tokens)
+        with self._stats_lock:
+            self.total_cost_usd += cost
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.total_cache_read_tokens += cache_read
+            self.total_cache_write_tokens += cache_write
+            self.call_count += 1
+
+        # Cache the response
+        if self.cache_enabled:
+            self._cache[cache_key] = {"content": content}
+
+        return LLMResponse(
+            content=content,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=cost,
+            latency_ms=latency_ms,
+            metadata={"task_type": task_type},
+            cache_read_tokens=cache_read,
+            cache_write_tokens=cache_write,
+        )
+
+    def _handle_error(self, e: Exception, attempt: int, max_retries: int, model: str, task_type: str):
+        """Decide what to do after a failed attempt.
+
+        Returns:
+            (delay_s, None) to retry after delay_s, or (None, LLMResponse) to give up.
+
+        Raises:
+            LLMTimeoutException: When the final attempt timed out.
+        """
+        if isinstance(e, anthropic.RateLimitError):
+            # Honour the server's retry-after and pause every caller of this tier
+            retry_after = _safe_retry_after_seconds(e)
+            wait_time = retry_after or 2 ** attempt
+            self._rate_limiter.penalize(model, retry_after)
+            logger.warning("[LLM] Rate limited, waiting %.1fs (attempt %d/%d)", wait_time, attempt + 1, max_retries)
+            return wait_time, None
+
+        if isinstance(e, anthropic.APITimeoutError):
+            if attempt < max_retries - 1:
+                logger.warning("[LLM] Timeout, retrying (attempt %d/%d)", attempt + 1, max_retries)
+                return 0.0, None
+            raise LLMTimeoutException(f"API timeout after {max_retries} retries")
+
+        if attempt < max_retries - 1:
+            logger.warning("[LLM] Error: %s, retrying (attempt %d/%d)", e, attempt + 1, max_retries)
+            return 1.0, None
+        return None, LLMResponse(
+            content=f"[LLM ERROR: {e}]",
+            model=model,
+            metadata={"task_type": task_type, "error": str(e)},
+        )
 
     def complete(
         self,
-        system_prompt: str,
+        system_prompt: SystemPrompt,
         user_prompt: str,
         max_tokens: int = 4096,
         temperature: float = 0.4,
@@ -115,7 +287,7 @@ class LLMProvider:
         """Send a completion request to the Anthropic API.
 
         Args:
-            system_prompt: System message
+            system_prompt: System message (str or list of PromptSegment)
             user_prompt: User message
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
@@ -128,17 +300,22 @@ class LLMProvider:
         model = model or API_CONFIG.get("model", "claude-sonnet-4-20250514")
 
         # Check cache
-        if self.cache_enabled:
-            cache_key = self._get_cache_key(system_prompt, user_prompt, model, temperature)
-            if cache_key in self._cache:
-                cached = self._cache[cache_key]
-                return LLMResponse(
-                    content=cached["content"],
-                    model=model,
-                    cached=True,
-                    metadata={"task_type": task_type},
-                )
-
+        system_text = prompt_text(system_prompt)
+        cache_key = self._get_cache_key(system_text, user_prompt, model, temperature)
+        cached = self._cached_response(cache_key, model, task_type)
+        if cached is not None:
+            return cached
+
+        response, joined = self._inflight.do(cache_key, lambda: self._complete_uncached(
+            system_prompt, system_text, user_prompt, max_tokens, temperature, model, task_type, cache_key
+        ))
+        return self._joined_response(response) if joined else response
+
+    def _complete_uncached(
+        self, system_prompt: SystemPrompt, system_text: str, user_prompt: str,
+        max_tokens: int, temperature: float, model: str, task_type: str, cache_key: str,
+    ) -> LLMResponse:
+        """complete() after a cache miss: rate limit, call with retries, record."""
         if not self.client:
             return LLMResponse(
                 content="[LLM ERROR: No API key configured]",
@@ -146,8 +323,9 @@ class LLMProvider:
                 metadata={"task_type": task_type, "error": "no_api_key"},
             )
 
-        # Rate limit
-        self._enforce_rate_limit()
+        # Rate limit (~4 chars per input token + full output budget, reconciled after the call)
+        estimated_tokens = (len(system_text) + len(user_prompt)) // 4 + max_tokens
+        self._enforce_rate_limit(model, estimated_tokens)
 
         # API call with retry
         max_retries = 3
@@ -158,60 +336,200 @@ class LLMProvider:
                     model=model,
                     max_tokens=max_tokens,
                     temperature=temperature,
-                    system=system_prompt,
+                    system=system_param(system_prompt),
                     messages=[{"role": "user", "content": user_prompt}],
                 )
-                latency_ms = int((time.time() - start_time) * 1000)
+                return self._record_success(response, model, task_type, start_time, estimated_tokens, cache_key)
+            except Exception as e:
+                delay, final = self._handle_error(e, attempt, max_retries, model, task_type)
+                if final is not None:
+                    return final
+                if delay:
+                    time.sleep(delay)
+                    self._enforce_rate_limit(model, estimated_tokens)
 
-                content = response.content[0].text if response.content else ""
-                input_tokens = response.usage.input_tokens
-                output_tokens = response.usage.output_tokens
-                cost = self._calculate_cost(model, input_tokens, output_tokens)
+        return LLMResponse(
+            content="[LLM ERROR: Max retries exceeded]",
+            model=model,
+            metadata={"task_type": task_type, "error": "max_retries"},
+        )
 
-                # Update tracking
-                self.total_cost_usd += cost
-                self.total_input_tokens += input_tokens
-                self.total_output_tokens += output_tokens
-                self.call_count += 1
+    async def acomplete(
+        self,
+        system_prompt: SystemPrompt,
+        user_prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.4,
+        model: Optional[str] = None,
+        task_type: str = "general",
+    ) -> LLMResponse:
+        """Async twin of complete() on a shared AsyncAnthropic connection pool.
 
-                # Cache the response
-                if self.cache_enabled:
-                    self._cache[cache_key] = {"content": content}
+        Same caching, retry, rate limiting and cost tracking; backoff and rate
+        limit waits yield to the event loop instead of blocking a thread.
+        """
+        model = model or API_CONFIG.get("model", "claude-sonnet-4-20250514")
 
-                return LLMResponse(
-                    content=content,
-                    model=model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost_usd=cost,
-                    latency_ms=latency_ms,
-                    metadata={"task_type": task_type},
-                )
+        system_text = prompt_text(system_prompt)
+        cache_key = self._get_cache_key(system_text, user_prompt, model, temperature)
+        cached = self._cached_response(cache_key, model, task_type)
+        if cached is not None:
+            return cached
 
-            except anthropic.RateLimitError:
-                wait_time = 2 ** attempt
-                logger.warning("[LLM] Rate limited, waiting %ds (attempt %d/%d)", wait_time, attempt + 1, max_retries)
-                time.sleep(wait_time)
+        response, joined = await self._inflight.ado(cache_key, lambda: self._acomplete_uncached(
+            system_prompt, system_text, user_prompt, max_tokens, temperature, model, task_type, cache_key
+        ))
+        return self._joined_response(response) if joined else response
+
+    async def _acomplete_uncached(
+        self, system_prompt: SystemPrompt, system_text: str, user_prompt: str,
+        max_tokens: int, temperature: float, model: str, task_type: str, cache_key: str,
+    ) -> LLMResponse:
+        """acomplete() after a cache miss: rate limit, call with retries, record."""
+        if not self.api_key:
+            return LLMResponse(
+                content="[LLM ERROR: No API key configured]",
+                model=model,
+                metadata={"task_type": task_type, "error": "no_api_key"},
+            )
 
-            except anthropic.APITimeoutError:
-                if attempt < max_retries - 1:
-                    logger.warning("[LLM] Timeout, retrying (attempt %d/%d)", attempt + 1, max_retries)
-                    continue
-                raise LLMTimeoutException(f"API timeout after {max_retries} retries")
+        estimated_tokens = (len(system_text) + len(user_prompt)) // 4 + max_tokens
+        await self._aenforce_rate_limit(model, estimated_tokens)
 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning("[LLM] Error: %s, retrying (attempt %d/%d)", e, attempt + 1, max_retries)
-                    time.sleep(1)
-                    continue
-                return LLMResponse(
-                    content=f"[LLM ERROR: {e}]",
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                start_time = time.time()
+                response = await self._get_async_client().messages.create(
                     model=model,
-                    metadata={"task_type": task_type, "error": str(e)},
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system_param(system_prompt),
+                    messages=[{"role": "user", "content": user_prompt}],
                 )
+                return self._record_success(response, model, task_type, start_time, estimated_tokens, cache_key)
+            except Exception as e:
+                delay, final = self._handle_error(e, attempt, max_retries, model, task_type)
+                if final is not None:
+                    return final
+                if delay:
+                    await asyncio.sleep(delay)
+                    await self._aenforce_rate_limit(model, estimated_tokens)
 
         return LLMResponse(
             content="[LLM ERROR: Max retries exceeded]",
             model=model,
             metadata={"task_type": task_type, "error": "max_retries"},
         )
+
+    async def _aenforce_rate_limit(self, model: str, estimated_tokens: int = 0):
+        """Non-blocking rate limit: reserve capacity, then yield to the loop for the deficit."""
+        if not self._rate_limit_enabled:
+            return
+        wait = self._rate_limiter.reserve(model, estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def stream(
+        self,
+        system_prompt: SystemPrompt,
+        user_prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.4,
+        model: Optional[str] = None,
+        task_type: str = "general",
+    ) -> Iterator[StreamChunk]:
+        """Streaming variant of complete().
+
+        Yields StreamChunk(text=delta) as tokens arrive, then a final
+        StreamChunk(response=LLMResponse) with the full content, usage and cost.
+        Errors are retried only before the first delta has been yielded.
+        """
+        model = model or API_CONFIG.get("model", "claude-sonnet-4-20250514")
+
+        system_text = prompt_text(system_prompt)
+        cache_key = self._get_cache_key(system_text, user_prompt, model, temperature)
+        cached = self._cached_response(cache_key, model, task_type)
+        if cached is not None:
+            yield StreamChunk(text=cached.content)
+            yield StreamChunk(response=cached)
+            return
+
+        if not self.client:
+            yield StreamChunk(response=LLMResponse(
+                content="[LLM ERROR: No API key configured]",
+                model=model,
+                metadata={"task_type": task_type, "error": "no_api_key"},
+            ))
+            return
+
+        estimated_tokens = (len(system_text) + len(user_prompt)) // 4 + max_tokens
+        self._enforce_rate_limit(model, estimated_tokens)
+
+        max_retries = 3
+        for attempt in range(max_retries):
+            emitted = False
+            try:
+                start_time = time.time()
+                with self.client.messages.stream(
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system_param(system_prompt),
+                    messages=[{"role": "user", "content": user_prompt}],
+                ) as message_stream:
+                    for text in message_stream.text_stream:
+                        emitted = True
+                        yield StreamChunk(text=text)
+                    message = message_stream.get_final_message()
+                yield StreamChunk(response=self._record_success(
+                    message, model, task_type, start_time, estimated_tokens, cache_key
+                ))
+                return
+            except Exception as e:
+                if emitted:
+                    logger.warning("[LLM] Stream failed after partial output: %s", e)
+                    yield StreamChunk(response=LLMResponse(
+                        content=f"[LLM ERROR: {e}]",
+                        model=model,
+                        metadata={"task_type": task_type, "error": str(e)},
+                    ))
+                    return
+                delay, final = self._handle_error(e, attempt, max_retries, model, task_type)
+                if final is not None:
+                    yield StreamChunk(response=final)
+                    return
+                if delay:
+                    time.sleep(delay)
+                    self._enforce_rate_limit(model, estimated_tokens)
+
+        yield StreamChunk(response=LLMResponse(
+            content="[LLM ERROR: Max retries exceeded]",
+            model=model,
+            metadata={"task_type": task_type, "error": "max_retries"},
+        ))
+
+    def _get_async_client(self):
+        """Lazily build the AsyncAnthropic client (one connection pool per event loop)."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, base_url=API_CONFIG.get("base_url"))
+            self._async_client_loop = loop
+        return self._async_client
+
+    def get_stats(self) -> dict:
+        """Token, cost and prompt-cache accounting for this provider."""
+        with self._stats_lock:
+            cached_input = self.total_cache_read_tokens + self.total_cache_write_tokens
+            return {
+                "calls": self.call_count,
+                "input_tokens": self.total_input_tokens,
+                "output_tokens": self.total_output_tokens,
+                "cache_read_input_tokens": self.total_cache_read_tokens,
+                "cache_creation_input_tokens": self.total_cache_write_tokens,
+                "prompt_cache_read_ratio": round(
+                    self.total_cache_read_tokens / max(self.total_input_tokens + cached_input, 1), 3
+                ),
+                "cost_usd": round(self.total_cost_usd, 6),
+                "inflight_joined": self._inflight.joined,
+            }
@@ -6,10 +6,12 @@ and routing logic needed for the adversarial pipeline.
 
 import logging
 import os
-from typing import Optional
+import threading
+from typing import Callable, Iterator, Optional
 
-from takeoff.llm import LLMProvider, LLMResponse
+from takeoff.llm import LLMProvider, LLMResponse, StreamChunk, SystemPrompt
 from takeoff.settings import MODEL_ALLOCATION, MODEL_IDS, API_CONFIG
+from takeoff.usage import record_usage
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,16 @@ TASK_TEMPERATURES = {
 }
 
 
+def _record_agent_usage(task_type: str, response: LLMResponse) -> None:
+    """Meter one agent call in the current job's usage ledger."""
+    record_usage(
+        "agent", task_type, model=response.model,
+        input_tokens=response.input_tokens, output_tokens=response.output_tokens,
+        cost_usd=response.cost_usd, latency_ms=response.latency_ms, cached=response.cached,
+        cache_read_tokens=response.cache_read_tokens, cache_write_tokens=response.cache_write_tokens,
+    )
+
+
 class ModelRouter:
     """Routes takeoff tasks to the appropriate model and temperature."""
 
@@ -32,6 +44,7 @@ class ModelRouter:
         self._provider = LLMProvider(api_key=self.api_key, mode="api")
 
         # Stats
+        self._stats_lock = threading.Lock()
         self._total_calls = 0
         self._total_cost_usd = 0.0
 
@@ -47,10 +60,11 @@ class ModelRouter:
     def complete(
         self,
         task_type: str,
-        system_prompt: str,
+        system_prompt: SystemPrompt,
         user_prompt: str,
         max_tokens: int = 4096,
         temperature: Optional[float] = None,
+        on_delta: Optional[Callable[[str], None]] = None,
     ) -> LLMResponse:
         """Route a completion request to the appropriate model.
 
@@ -60,10 +74,21 @@ class ModelRouter:
             user_prompt: User message
             max_tokens: Maximum tokens to generate
             temperature: Override temperature (uses task default if None)
+            on_delta: Optional callback; when set the call is streamed and each
+                token delta is passed to it as it arrives
 
         Returns:
             LLMResponse with the completion
         """
+        if on_delta is not None:
+            response = None
+            for chunk in self.stream(task_type, system_prompt, user_prompt, max_tokens, temperature):
+                if chunk.text:
+                    on_delta(chunk.text)
+                if chunk.response is not None:
+                    response = chunk.response
+            return response
+
         model = self._get_model_for_task(task_type)
         temp = temperature if temperature is not None else self._get_temperature_for_task(task_type)
 
@@ -76,13 +101,75 @@ class ModelRouter:
             task_type=task_type,
         )
 
-        self._total_calls += 1
-        self._total_cost_usd += response.cost_usd
+        with self._stats_lock:
+            self._total_calls += 1
+            self._total_cost_usd += response.cost_usd
+        _record_agent_usage(task_type, response)
+
+        return response
+
+    def stream(
+        self,
+        task_type: str,
+        system_prompt: SystemPrompt,
+        user_prompt: str,
+        max_tokens: int = 4096,
+        temperature: Optional[float] = None,
+    ) -> Iterator[StreamChunk]:
+        """Streaming twin of complete(): token deltas, then the final response."""
+        model = self._get_model_for_task(task_type)
+        temp = temperature if temperature is not None else self._get_temperature_for_task(task_type)
+
+        for chunk in self._provider.stream(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=max_tokens,
+            temperature=temp,
+            model=model,
+            task_type=task_type,
+        ):
+            if chunk.response is not None:
+                with self._stats_lock:
+                    self._total_calls += 1
+                    self._total_cost_usd += chunk.response.cost_usd
+                _record_agent_usage(task_type, chunk.response)
+            yield chunk
+
+    async def acomplete(
+        self,
+        task_type: str,
+        system_prompt: SystemPrompt,
+        user_prompt: str,
+        max_tokens: int = 4096,
+        temperature: Optional[float] = None,
+    ) -> LLMResponse:
+        """Async twin of complete() — same routing and cost tracking.
+
+        Lets agents fan out independent calls on one event loop (asyncio.gather)
+        instead of one ThreadPoolExecutor worker per in-flight request.
+        """
+        model = self._get_model_for_task(task_type)
+        temp = temperature if temperature is not None else self._get_temperature_for_task(task_type)
+
+        response = await self._provider.acomplete(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=max_tokens,
+            temperature=temp,
+            model=model,
+            task_type=task_type,
+        )
+
+        with self._stats_lock:
+            self._total_calls += 1
+            self._total_cost_usd += response.cost_usd
+        _record_agent_usage(task_type, response)
 
         return response
 
     def get_stats(self) -> dict:
         """Return model router statistics."""
+        provider_stats = self._provider.get_stats()
         return {
             "model_router_calls": self._total_calls,
             "model_router_cost_usd": round(self._total_cost_usd, 6),
@@ -90,6 +177,10 @@ class ModelRouter:
             "provider_cost_usd": round(self._provider.total_cost_usd, 6),
             "provider_input_tokens": self._provider.total_input_tokens,
             "provider_output_tokens": self._provider.total_output_tokens,
+            "provider_cache_read_tokens": provider_stats["cache_read_input_tokens"],
+            "provider_cache_write_tokens": provider_stats["cache_creation_input_tokens"],
+            "provider_prompt_cache_read_ratio": provider_stats["prompt_cache_read_ratio"],
+            "provider_inflight_joined": provider_stats["inflight_joined"],
         }
 
     @property
@@ -0,0 +1,227 @@
+"""PDF drawing-set ingestion — rasterize page regions into snippet images locally.
+
+Clients used to pre-crop every snippet and upload it as base64 PNG, which
+turns one drawing set into tens of MB of request body. Instead a job can
+carry whole PDF documents plus snippets that reference them:
+
+    {"id": "rcp-2", "label": "rcp", "sub_label": "Level 2",
+     "document_id": "set", "page_number": 4,
+     "bbox": {"x0": 72, "y0": 90, "x1": 1540, "y1": 1100}}
+
+page_number is 1-based. bbox is in PDF points (1/72 in) from the page's
+top-left corner, as {"x", "y", "width", "height"} (the CLI manifest form),
+{"x0", "y0", "x1", "y1"} or [x0, y0, x1, y1]; without one the whole page
+is used. An optional "dpi" overrides the render resolution.
+
+Each region is rendered at the lowest DPI step that gives the model its
+full effective resolution (RCPs with tiling on get pdf_max_dpi, so tiles
+keep their detail). Pages are rendered once per (page, DPI) and kept in a
+small per-document LRU, so several snippets on one sheet share a single
+render. Crops go straight into the job's SnippetStore as PNG.
+
+Rendering uses pypdfium2 (pip install pypdfium2), imported lazily.
+"""
+
+import base64
+import io
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from takeoff.settings import API_CONFIG
+from takeoff.snippetstore import SnippetHandle, SnippetStore
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pypdfium2 as pdfium
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
+# Render resolutions; regions snap up to the next step so snippets on one page share renders
+DPI_STEPS = (72, 100, 150, 200, 300)
+POINTS_PER_INCH = 72.0
+
+# pdfium is not thread-safe: one render at a time per process
+_pdfium_lock = threading.Lock()
+
+PdfSource = Union[str, bytes, SnippetHandle]  # Filesystem path, raw PDF bytes, or a spilled upload
+Box = Tuple[float, float, float, float]
+
+
+def parse_bbox(bbox) -> Optional[Box]:
+    """(x0, y0, x1, y1) in points from a bbox dict or 4-item list, or None for the whole page."""
+    if bbox is None:
+        return None
+    if isinstance(bbox, dict):
+        try:
+            if "width" in bbox or "height" in bbox:
+                bbox = [bbox["x"], bbox["y"], bbox["x"] + bbox["width"], bbox["y"] + bbox["height"]]
+            else:
+                bbox = [bbox["x0"], bbox["y0"], bbox["x1"], bbox["y1"]]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"bbox {bbox!r} must be x/y/width/height or x0/y0/x1/y1 in PDF points") from e
+    if not isinstance(bbox, (list, tuple)) or len(bbox) != 4:
+        raise ValueError(f"bbox must be [x0, y0, x1, y1] in PDF points, got {bbox!r}")
+    x0, y0, x1, y1 = (float(v) for v in bbox)
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"bbox has no area: {bbox!r}")
+    return x0, y0, x1, y1
+
+
+def choose_dpi(width_pt: float, height_pt: float, label: str = "") -> int:
+    """Lowest DPI step at which a width x height (points) region reaches the model's effective resolution."""
+    max_dpi = API_CONFIG.get("pdf_max_dpi", 300)
+    if label == "rcp" and API_CONFIG.get("rcp_tiling", False):
+        return max_dpi  # Tiles are sent at full resolution; give them the pixels
+    max_edge = API_CONFIG.get("vision_max_edge_px", 1568)
+    max_pixels = API_CONFIG.get("vision_max_pixels", 1_150_000)
+    width_in, height_in = width_pt / POINTS_PER_INCH, height_pt / POINTS_PER_INCH
+    needed = min(max_edge / max(width_in, height_in), math.sqrt(max_pixels / (width_in * height_in)))
+    for step in DPI_STEPS:
+        if step >= needed and step <= max_dpi:
+            return step
+    return max_dpi
+
+
+class PdfDocument:
+    """One PDF with a bounded LRU of rendered pages (keyed by page index and DPI)."""
+
+    def __init__(self, document_id: str, source: PdfSource, cache_entries: Optional[int] = None):
+        if not HAS_PDFIUM:
+            raise RuntimeError("PDF ingestion requires the 'pypdfium2' package. Run: pip install pypdfium2")
+        self.document_id = document_id
+        if isinstance(source, SnippetHandle):
+            source = source.path  # pdfium reads the spilled upload from disk
+        with _pdfium_lock:
+            self._pdf = pdfium.PdfDocument(source)
+            self.page_count = len(self._pdf)
+        self._cache_entries = max(cache_entries or API_CONFIG.get("pdf_page_cache_entries", 4), 1)
+        self._pages: "OrderedDict[Tuple[int, int], object]" = OrderedDict()
+        self.renders = 0
+        self.cache_hits = 0
+
+    def page_size(self, page_number: int) -> Tuple[float, float]:
+        """(width, height) in points of a 1-based page."""
+        self._check_page(page_number)
+        with _pdfium_lock:
+            return tuple(self._pdf.get_page_size(page_number - 1))
+
+    def render_page(self, page_number: int, dpi: int):
+        """The page as a PIL image at dpi, rendered once and then served from the cache."""
+        self._check_page(page_number)
+        width_pt, height_pt = self.page_size(page_number)
+        max_pixels = API_CONFIG.get("pdf_max_render_pixels", 50_000_000)
+        page_pixels = (width_pt * dpi / POINTS_PER_INCH) * (height_pt * dpi / POINTS_PER_INCH)
+        if page_pixels > max_pixels:
+            dpi = int(dpi * math.sqrt(max_pixels / page_pixels))  # Huge sheet: stay within the memory budget
+        key = (page_number, dpi)
+        if key in self._pages:
+            self._pages.move_to_end(key)
+            self.cache_hits += 1
+            return self._pages[key], dpi
+        with _pdfium_lock:
+            page = self._pdf[page_number - 1]
+            try:
+                image = page.render(scale=dpi / POINTS_PER_INCH).to_pil()
+            finally:
+                page.close()
+        self.renders += 1
+        self._pages[key] = image
+        while len(self._pages) > self._cache_entries:
+            self._pages.popitem(last=False)
+        return image, dpi
+
+    def render_region(self, page_number: int, bbox: Optional[Box] = None,
+                      dpi: Optional[int] = None, label: str = ""):
+        """Crop of a page region (points, top-left origin) at the chosen or given DPI."""
+        width_pt, height_pt = self.page_size(page_number)
+        x0, y0, x1, y1 = bbox or (0.0, 0.0, width_pt, height_pt)
+        x0, y0 = max(x0, 0.0), max(y0, 0.0)
+        x1, y1 = min(x1, width_pt), min(y1, height_pt)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(f"bbox lies outside page {page_number} of document '{self.document_id}'")
+        image, dpi = self.render_page(page_number, dpi or choose_dpi(x1 - x0, y1 - y0, label))
+        scale = dpi / POINTS_PER_INCH
+        box = (int(x0 * scale), int(y0 * scale), math.ceil(x1 * scale), math.ceil(y1 * scale))
+        return image.crop(box) if box != (0, 0, image.width, image.height) else image
+
+    def _check_page(self, page_number: int) -> None:
+        if not 1 <= page_number <= self.page_count:
+            raise ValueError(
+                f"page_number {page_number} is out of range for document '{self.document_id}' "
+                f"({self.page_count} pages)"
+            )
+
+    def close(self) -> None:
+        self._pages.clear()
+        with _pdfium_lock:
+            self._pdf.close()
+
+
+def rasterize_snippets(
+    snippets: List[Dict],
+    documents: Dict[str, PdfSource],
+    store: Optional[SnippetStore] = None,
+) -> Tuple[List[Dict], Dict]:
+    """Render every snippet that references a document into image_data.
+
+    Snippets that already carry image_data, or no document_id, are returned
+    unchanged. Rendered crops are put in store (or base64-encoded without
+    one). Returns (snippets, stats).
+    """
+    if not HAS_PDFIUM and any(s.get("document_id") and not s.get("image_data") for s in snippets):
+        raise ValueError("Snippets reference a PDF document, which requires the 'pypdfium2' package. "
+                         "Run: pip install pypdfium2")
+    from takeoff.imageprep import encode_image  # Pillow-dependent; only needed once PDFs are in play
+
+    opened: Dict[str, PdfDocument] = {}
+    resolved = []
+    stats = {"documents": 0, "snippets_rendered": 0, "page_renders": 0, "page_cache_hits": 0}
+    try:
+        for snippet in snippets:
+            document_id = snippet.get("document_id")
+            if not document_id or snippet.get("image_data"):
+                resolved.append(snippet)
+                continue
+            if document_id not in documents:
+                raise ValueError(f"Snippet '{snippet.get('id', '?')}' references unknown document '{document_id}'")
+            if document_id not in opened:
+                opened[document_id] = PdfDocument(document_id, documents[document_id])
+            page_number = int(snippet.get("page_number") or 1)
+            region = opened[document_id].render_region(
+                page_number, parse_bbox(snippet.get("bbox")), snippet.get("dpi"), snippet.get("label", ""),
+            )
+            if store is not None:
+                buf = io.BytesIO()
+                region.save(buf, format="PNG", optimize=True)
+                image_data = store.put_bytes(buf.getvalue(), "image/png")
+            else:
+                data, media_type = encode_image(region)
+                image_data = f"data:{media_type};base64,{data}"
+            resolved.append({**snippet, "page_number": page_number, "image_data": image_data})
+            stats["snippets_rendered"] += 1
+    finally:
+        for doc in opened.values():
+            stats["page_renders"] += doc.renders
+            stats["page_cache_hits"] += doc.cache_hits
+            doc.close()
+    stats["documents"] = len(opened)
+    if stats["snippets_rendered"]:
+        logger.info(
+            "[PDF] Rendered %d snippets from %d document(s) with %d page renders (%d cache hits)",
+            stats["snippets_rendered"], stats["documents"], stats["page_renders"], stats["page_cache_hits"],
+        )
+    return resolved, stats
+
+
+def decode_pdf(pdf_base64: str) -> bytes:
+    """Raw PDF bytes from base64 (with or without a data-URI prefix)."""
+    data = pdf_base64.split(",", 1)[1] if pdf_base64.startswith("data:") else pdf_base64
+    raw = base64.b64decode(data, validate=False)
+    if not raw.startswith(b"%PDF"):
+        raise ValueError("document data is not a PDF")
+    return raw
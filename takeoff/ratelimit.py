@@ -0,0 +1,125 @@
+"""Takeoff-only rate limiter — self-contained, no core/ dependency.
+
+Slim extraction from core/ratelimit.py: thread-safe token buckets per model
+tier (requests-per-minute + tokens-per-minute) shared by every provider in
+the process, plus tier-wide pauses when the API returns a retry-after hint.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from takeoff.settings import API_CONFIG, MODEL_IDS
+
+
+class TokenBucket:
+    """Continuous-refill bucket. Reservations may drive the level negative (debt)."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if self.capacity <= 0 or now <= self._updated:
+            return
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` from the bucket; return seconds until the debt is repaid."""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill(now)
+        self.level -= min(float(amount), self.capacity)
+        if self.level >= 0:
+            return 0.0
+        return -self.level / self.rate
+
+    def adjust(self, delta: float, now: float) -> None:
+        if self.capacity <= 0:
+            return
+        self._refill(now)
+        self.level = min(self.capacity, self.level + delta)
+
+
+class RateLimiter:
+    """Per-tier RPM + TPM limiter for takeoff LLM calls."""
+
+    def __init__(self, limits: Optional[Dict] = None, enabled: Optional[bool] = None):
+        self.limits = limits if limits is not None else API_CONFIG.get("rate_limits", {})
+        self.enabled = API_CONFIG.get("rate_limit_enabled", True) if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Dict[str, TokenBucket]] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._tier_by_model = {model_id: tier for tier, model_id in MODEL_IDS.items()}
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _get_buckets(self, model: str) -> Dict[str, TokenBucket]:
+        tier = self._tier_by_model.get(model, model)
+        buckets = self._buckets.get(tier)
+        if buckets is None:
+            limits = self.limits.get(tier) or self.limits.get("default") or {}
+            buckets = {
+                "requests": TokenBucket(limits.get("requests_per_minute", 0)),
+                "tokens": TokenBucket(limits.get("tokens_per_minute", 0)),
+            }
+            self._buckets[tier] = buckets
+        return buckets
+
+    def reserve(self, model: str, estimated_tokens: int = 0) -> float:
+        """Reserve one request + estimated tokens. Returns seconds the caller must wait."""
+        if not self.enabled:
+            return 0.0
+        tier = self._tier_by_model.get(model, model)
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._get_buckets(model)
+            wait = max(
+                buckets["requests"].reserve(1, now),
+                buckets["tokens"].reserve(estimated_tokens, now),
+                self._blocked_until.get(tier, 0.0) - now,
+                0.0,
+            )
+            if wait > 0:
+                self.waits += 1
+                self.wait_seconds += wait
+        return wait
+
+    def acquire(self, model: str, estimated_tokens: int = 0) -> float:
+        """Blocking reserve(). Returns the seconds actually slept."""
+        wait = self.reserve(model, estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_usage(self, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._get_buckets(model)["tokens"].adjust(estimated_tokens - actual_tokens, time.monotonic())
+
+    def penalize(self, model: str, retry_after_s: float) -> None:
+        """Pause every caller of this tier for retry_after_s."""
+        if not self.enabled or retry_after_s <= 0:
+            return
+        tier = self._tier_by_model.get(model, model)
+        with self._lock:
+            until = time.monotonic() + retry_after_s
+            self._blocked_until[tier] = max(self._blocked_until.get(tier, 0.0), until)
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter (limits are per account, not per provider)."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
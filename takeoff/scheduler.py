@@ -0,0 +1,213 @@
+"""Process-wide vision call scheduler — self-contained, no core/ dependency.
+
+Every takeoff job fans its vision calls out over thread pools (schedule
+extraction, RCP/notes/panel extraction, RCP tiles, Checker verification),
+and the API runs several jobs at once. Without a shared bound that is dozens
+of simultaneous vision requests, 429s, and one large job starving the rest.
+
+All vision calls take a slot from one VisionScheduler first:
+
+- at most vision_max_concurrency calls are in flight across the process
+- waiting calls are granted by priority: fixture schedule, then RCP / notes /
+  panel extraction, then Checker verification (the critical path first)
+- within a priority, jobs take turns: the job with the fewest calls in
+  flight goes next, FIFO within a job
+
+The job a call belongs to travels in a contextvar. vision_job() sets it for
+the duration of a takeoff, and submit() carries it into pool threads.
+Queue depth and wait times are tracked globally and per job (stats()).
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+from takeoff.settings import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Lower value = granted first
+PRIORITIES = {
+    "fixture_schedule": 0,
+    "rcp_counts": 1,
+    "plan_notes": 1,
+    "panel_schedule": 1,
+    "checker": 2,
+}
+DEFAULT_PRIORITY = "rcp_counts"
+_LEVEL_NAMES = {0: "fixture_schedule", 1: "extraction", 2: "checker"}
+
+_current_job: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("takeoff_vision_job", default=None)
+
+
+def current_job() -> Optional[str]:
+    return _current_job.get()
+
+
+@contextmanager
+def vision_job(job_id: str) -> Iterator[None]:
+    """Attribute vision calls made in this context (and pools started via submit()) to job_id."""
+    token = _current_job.set(job_id)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+
+def submit(executor: Executor, fn, *args, **kwargs) -> Future:
+    """executor.submit() that runs fn in a copy of the caller's context, so the vision job carries over."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class _Waiter:
+    __slots__ = ("job", "priority", "enqueued", "granted")
+
+    def __init__(self, job: str, priority: int):
+        self.job = job
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.granted = threading.Event()
+
+
+class _WaitStats:
+    """Running wait-time summary (count, mean, max, recent p95)."""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def add(self, wait_ms: float) -> None:
+        self.count += 1
+        self.total_ms += wait_ms
+        self.max_ms = max(self.max_ms, wait_ms)
+        self._recent.append(wait_ms)
+
+    def as_dict(self) -> Dict:
+        recent = sorted(self._recent)
+        p95 = recent[min(int(len(recent) * 0.95), len(recent) - 1)] if recent else 0.0
+        return {
+            "calls": self.count,
+            "mean_wait_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p95_wait_ms": round(p95, 1),
+            "max_wait_ms": round(self.max_ms, 1),
+        }
+
+
+class VisionScheduler:
+    """Global concurrency cap with priority classes and per-job fair queuing."""
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max(int(max_concurrency or 0), 0)  # 0 = unbounded (metrics only)
+        self._lock = threading.Lock()
+        # priority -> job -> FIFO of waiters; job order rotates so ties go round-robin
+        self._queues: Dict[int, "OrderedDict[str, Deque[_Waiter]]"] = {}
+        self._in_flight_by_job: Dict[str, int] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self._waits = _WaitStats()
+        self._waits_by_task: Dict[str, _WaitStats] = {}
+        self._waits_by_job: Dict[str, _WaitStats] = {}
+
+    @contextmanager
+    def slot(self, priority: str = DEFAULT_PRIORITY, job_id: Optional[str] = None) -> Iterator[float]:
+        """Hold one vision slot for the duration of the block. Yields the wait in ms."""
+        job = job_id or current_job() or "-"
+        wait_ms = self._acquire(job, priority)
+        try:
+            yield wait_ms
+        finally:
+            self._release(job)
+
+    def _acquire(self, job: str, priority: str) -> float:
+        waiter = _Waiter(job, PRIORITIES.get(priority, PRIORITIES[DEFAULT_PRIORITY]))
+        with self._lock:
+            self._queues.setdefault(waiter.priority, OrderedDict()).setdefault(job, deque()).append(waiter)
+            self.queue_depth += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+            self._dispatch()
+        waiter.granted.wait()
+        wait_ms = (time.monotonic() - waiter.enqueued) * 1000
+        with self._lock:
+            self._waits.add(wait_ms)
+            self._waits_by_task.setdefault(priority, _WaitStats()).add(wait_ms)
+            self._waits_by_job.setdefault(job, _WaitStats()).add(wait_ms)
+        if wait_ms >= 1000:
+            logger.info("[SCHEDULER] %s call for job %s waited %.0f ms for a vision slot", priority, job, wait_ms)
+        return wait_ms
+
+    def _release(self, job: str) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._in_flight_by_job[job] -= 1
+            if not self._in_flight_by_job[job]:
+                del self._in_flight_by_job[job]
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant waiting calls while slots are free. Caller holds _lock."""
+        while self.queue_depth and (not self.max_concurrency or self.in_flight < self.max_concurrency):
+            jobs = self._queues[min(p for p, q in self._queues.items() if q)]
+            # Fewest calls in flight first; OrderedDict order breaks ties round-robin
+            job = min(jobs, key=lambda j: self._in_flight_by_job.get(j, 0))
+            waiter = jobs[job].popleft()
+            if jobs[job]:
+                jobs.move_to_end(job)
+            else:
+                del jobs[job]
+            self.queue_depth -= 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self._in_flight_by_job[job] = self._in_flight_by_job.get(job, 0) + 1
+            waiter.granted.set()
+
+    def job_stats(self, job_id: str) -> Dict:
+        """Wait-time summary for one job's vision calls."""
+        with self._lock:
+            waits = self._waits_by_job.get(job_id)
+            return waits.as_dict() if waits else _WaitStats().as_dict()
+
+    def forget_job(self, job_id: str) -> None:
+        with self._lock:
+            self._waits_by_job.pop(job_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            waiting_by_priority: Dict[str, int] = {}
+            for level, jobs in sorted(self._queues.items()):
+                queued = sum(len(q) for q in jobs.values())
+                if queued:
+                    waiting_by_priority[_LEVEL_NAMES.get(level, str(level))] = queued
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self.peak_queue_depth,
+                "waiting_by_priority": waiting_by_priority,
+                "active_jobs": len(self._in_flight_by_job),
+                "waits": self._waits.as_dict(),
+                "waits_by_task": {p: w.as_dict() for p, w in self._waits_by_task.items()},
+            }
+
+
+_scheduler: Optional[VisionScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_vision_scheduler() -> VisionScheduler:
+    """The process-wide scheduler (created on first use)."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = VisionScheduler(API_CONFIG.get("vision_max_concurrency", 8))
+    return _scheduler
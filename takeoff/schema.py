@@ -139,6 +139,76 @@ class TakeoffDB:
         except sqlite3.OperationalError as e:
             if "duplicate column name" not in str(e).lower():
                 raise
+        # Migrate: snippets rendered from an uploaded PDF record which document they came from
+        try:
+            self.conn.execute("ALTER TABLE snippets ADD COLUMN document_id TEXT")
+            self.conn.commit()
+        except sqlite3.OperationalError as e:
+            if "duplicate column name" not in str(e).lower():
+                raise
+
+        # Per-job token / cost / latency breakdown (takeoff/usage.py)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                task TEXT NOT NULL,
+                model TEXT,
+                calls INTEGER NOT NULL,
+                cached_calls INTEGER NOT NULL DEFAULT 0,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                cache_read_tokens INTEGER NOT NULL DEFAULT 0,
+                cache_write_tokens INTEGER NOT NULL DEFAULT 0,
+                cost_usd REAL NOT NULL DEFAULT 0,
+                latency_ms INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (job_id) REFERENCES takeoff_jobs(job_id)
+            )
+        """)
+
+        # Per-snippet extraction outputs and per-area Checker vision verdicts,
+        # reused by incremental re-takeoffs (takeoff/incremental.py)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS snippet_extractions (
+                job_id TEXT NOT NULL,
+                snippet_id TEXT NOT NULL,
+                label TEXT,
+                image_digest TEXT,
+                input_key TEXT,
+                output_json TEXT,
+                latency_ms INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (job_id, snippet_id),
+                FOREIGN KEY (job_id) REFERENCES takeoff_jobs(job_id)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS checker_area_verdicts (
+                job_id TEXT NOT NULL,
+                verdict_key TEXT NOT NULL,
+                area_label TEXT,
+                attacks_json TEXT NOT NULL,
+                latency_ms INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (job_id, verdict_key),
+                FOREIGN KEY (job_id) REFERENCES takeoff_jobs(job_id)
+            )
+        """)
+
+        # Batch runs (takeoff/batch.py): one row per batch entry, so a rerun skips completed entries
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                batch_id TEXT NOT NULL,
+                entry_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                job_id TEXT,
+                latency_ms INTEGER,
+                cost_usd REAL,
+                vision_calls INTEGER,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (batch_id, entry_id)
+            )
+        """)
 
         # Create indexes
         self.conn.execute("""
@@ -156,6 +226,11 @@ class TakeoffDB:
             ON adversarial_log(job_id)
         """)
 
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_usage_job
+            ON job_usage(job_id)
+        """)
+
         self.conn.commit()
 
     def create_job(
@@ -200,8 +275,8 @@ class TakeoffDB:
                     continue
                 self.conn.execute("""
                     INSERT OR REPLACE INTO snippets
-                    (snippet_id, job_id, page_number, label, sub_label, bbox_json, image_path)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    (snippet_id, job_id, page_number, label, sub_label, bbox_json, image_path, document_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     snippet_id,
                     job_id,
@@ -209,7 +284,8 @@ class TakeoffDB:
                     s.get("label", ""),
                     s.get("sub_label"),
                     json.dumps(s.get("bbox")) if s.get("bbox") else None,
-                    s.get("image_path")
+                    s.get("image_path"),
+                    s.get("document_id")
                 ))
             self.conn.commit()
 
@@ -344,12 +420,14 @@ class TakeoffDB:
         violations: List[Dict],
         flags: List[str],
         judge_verdict: str,
-        full_result: Optional[Dict] = None
+        full_result: Optional[Dict] = None,
+        log_entries: Optional[List[Dict]] = None
     ) -> None:
         """Store fixture counts, adversarial log, and result in one atomic transaction.
 
         All three writes commit together or roll back together — prevents the DB from
-        being left in a partial state if the process crashes mid-write.
+        being left in a partial state if the process crashes mid-write. log_entries are
+        extra adversarial_log rows that are not Checker attacks (e.g. a skipped Reconciler).
         """
         with self._lock:
             cur = self.conn.cursor()
@@ -397,6 +475,21 @@ class TakeoffDB:
                             "in adversarial_log for job '%s' — response data not persisted",
                             resp.get("attack_id"), job_id
                         )
+                for entry in log_entries or []:
+                    cur.execute("""
+                        INSERT INTO adversarial_log
+                        (job_id, agent, attack_id, severity, category, description, resolution, final_verdict)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        job_id,
+                        entry.get("agent", "engine"),
+                        entry.get("attack_id"),
+                        entry.get("severity"),
+                        entry.get("category"),
+                        entry.get("description"),
+                        entry.get("resolution"),
+                        entry.get("final_verdict")
+                    ))
 
                 # Result
                 cur.execute("""
@@ -425,6 +518,144 @@ class TakeoffDB:
                     pass  # Already rolled back or BEGIN never succeeded
                 raise
 
+    def store_job_usage(self, job_id: str, rows: List[Dict]) -> None:
+        """Replace the usage breakdown for a job (rows from UsageLedger.rows())."""
+        with self._lock:
+            self.conn.execute("DELETE FROM job_usage WHERE job_id = ?", (job_id,))
+            for row in rows:
+                self.conn.execute("""
+                    INSERT INTO job_usage
+                    (job_id, kind, task, model, calls, cached_calls, input_tokens, output_tokens,
+                     cache_read_tokens, cache_write_tokens, cost_usd, latency_ms)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    job_id,
+                    row.get("kind", ""),
+                    row.get("task", ""),
+                    row.get("model"),
+                    row.get("calls", 0),
+                    row.get("cached_calls", 0),
+                    row.get("input_tokens", 0),
+                    row.get("output_tokens", 0),
+                    row.get("cache_read_tokens", 0),
+                    row.get("cache_write_tokens", 0),
+                    row.get("cost_usd", 0.0),
+                    row.get("latency_ms", 0)
+                ))
+            self.conn.commit()
+
+    def get_job_usage(self, job_id: str) -> List[Dict]:
+        """Retrieve the usage breakdown for a job."""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT kind, task, model, calls, cached_calls, input_tokens, output_tokens,
+                       cache_read_tokens, cache_write_tokens, cost_usd, latency_ms
+                FROM job_usage
+                WHERE job_id = ?
+                ORDER BY kind, task, model
+            """, (job_id,)).fetchall()
+            return [dict(r) for r in rows]
+
+    def store_snippet_extractions(self, job_id: str, rows: List[Dict]) -> None:
+        """Store one row per snippet: image digest, extraction input key and parsed output (None on failure)."""
+        with self._lock:
+            for row in rows:
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO snippet_extractions
+                    (job_id, snippet_id, label, image_digest, input_key, output_json, latency_ms)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    job_id,
+                    row.get("snippet_id", ""),
+                    row.get("label"),
+                    row.get("image_digest"),
+                    row.get("input_key"),
+                    json.dumps(row["output"]) if row.get("output") is not None else None,
+                    row.get("latency_ms", 0)
+                ))
+            self.conn.commit()
+
+    def get_snippet_extractions(self, job_id: str) -> List[Dict]:
+        """Retrieve per-snippet extraction rows for a job (output parsed back from JSON)."""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT snippet_id, label, image_digest, input_key, output_json, latency_ms
+                FROM snippet_extractions
+                WHERE job_id = ?
+                ORDER BY snippet_id
+            """, (job_id,)).fetchall()
+        result = []
+        for r in rows:
+            row = dict(r)
+            output_json = row.pop("output_json")
+            row["output"] = json.loads(output_json) if output_json else None
+            result.append(row)
+        return result
+
+    def store_checker_verdicts(self, job_id: str, verdicts: Dict[str, Dict]) -> None:
+        """Store per-area Checker vision verdicts keyed by their input key."""
+        with self._lock:
+            for key, verdict in verdicts.items():
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO checker_area_verdicts
+                    (job_id, verdict_key, area_label, attacks_json, latency_ms)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    job_id,
+                    key,
+                    verdict.get("area_label"),
+                    json.dumps(verdict.get("attacks", [])),
+                    verdict.get("latency_ms", 0)
+                ))
+            self.conn.commit()
+
+    def get_checker_verdicts(self, job_id: str) -> Dict[str, Dict]:
+        """Retrieve per-area Checker vision verdicts for a job, keyed by verdict key."""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT verdict_key, area_label, attacks_json, latency_ms
+                FROM checker_area_verdicts
+                WHERE job_id = ?
+            """, (job_id,)).fetchall()
+        return {
+            r["verdict_key"]: {
+                "area_label": r["area_label"],
+                "attacks": json.loads(r["attacks_json"]),
+                "latency_ms": r["latency_ms"],
+            }
+            for r in rows
+        }
+
+    def record_batch_job(
+        self,
+        batch_id: str,
+        entry_id: str,
+        status: str,
+        job_id: Optional[str] = None,
+        latency_ms: Optional[int] = None,
+        cost_usd: Optional[float] = None,
+        vision_calls: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Record the latest status of one batch entry (running | complete | failed)."""
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO batch_jobs
+                (batch_id, entry_id, status, job_id, latency_ms, cost_usd, vision_calls, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (batch_id, entry_id, status, job_id, latency_ms, cost_usd, vision_calls, error, time.time()))
+            self.conn.commit()
+
+    def get_batch_jobs(self, batch_id: str) -> Dict[str, Dict]:
+        """Retrieve batch entries by entry id."""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT entry_id, status, job_id, latency_ms, cost_usd, vision_calls, error, updated_at
+                FROM batch_jobs
+                WHERE batch_id = ?
+            """, (batch_id,)).fetchall()
+            return {r["entry_id"]: dict(r) for r in rows}
+
     def get_full_result(self, job_id: str) -> Optional[Dict]:
         """Retrieve the full formatted result for a completed job."""
         with self._lock:
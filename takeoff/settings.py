@@ -9,12 +9,61 @@ import os
 # ─── API Configuration ────────────────────────────────────────────────────────
 
 API_CONFIG = {
+    # Alternate Messages API endpoint for the text and vision clients, e.g. the
+    # mock server (python -m core.mockserver). None = SDK default.
+    "base_url": os.getenv("LLM_BASE_URL") or None,
     "model": os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514"),
     "max_tokens": int(os.getenv("ANTHROPIC_MAX_TOKENS", "4096")),
     "temperature": float(os.getenv("ANTHROPIC_TEMPERATURE", "0.4")),
-    "rate_limit_seconds": float(os.getenv("RATE_LIMIT_SECONDS", "1.0")),
     "rate_limit_enabled": os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true",
+    # Token-bucket limits per model tier (takeoff/ratelimit.py); 0 disables a bucket
+    "rate_limits": {
+        "default": {
+            "requests_per_minute": int(os.getenv("RATE_LIMIT_RPM", "500")),
+            "tokens_per_minute": int(os.getenv("RATE_LIMIT_TPM", "200000")),
+        },
+    },
     "temperature_research": float(os.getenv("TEMPERATURE_RESEARCH", "0.3")),
+    # Prompt caching: PromptSegment(cache=True) blocks are sent with cache_control
+    "prompt_caching": os.getenv("PROMPT_CACHING", "true").lower() == "true",
+    "prompt_cache_write_multiplier": 1.25,
+    "prompt_cache_read_multiplier": 0.1,
+    # Persistent cache of parsed vision extraction results (takeoff/visioncache.py)
+    "vision_cache_enabled": os.getenv("TAKEOFF_VISION_CACHE", "true").lower() == "true",
+    "vision_cache_path": os.getenv("TAKEOFF_VISION_CACHE_PATH", "takeoff_vision_cache.db"),
+    "vision_cache_max_entries": int(os.getenv("TAKEOFF_VISION_CACHE_MAX_ENTRIES", "5000")),
+    "vision_cache_max_bytes": int(os.getenv("TAKEOFF_VISION_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    # Snippet image preprocessing before vision calls (takeoff/imageprep.py)
+    "vision_preprocess": os.getenv("TAKEOFF_VISION_PREPROCESS", "true").lower() == "true",
+    "vision_max_edge_px": int(os.getenv("TAKEOFF_VISION_MAX_EDGE_PX", "1568")),   # Model's effective long edge
+    "vision_max_pixels": int(os.getenv("TAKEOFF_VISION_MAX_PIXELS", "1150000")),  # ... and total pixels
+    "vision_prep_cache_entries": 256,     # Prepared snippets kept in memory
+    # Tiled RCP counting for large sheets (takeoff/tiling.py); off = one call per snippet
+    "rcp_tiling": os.getenv("TAKEOFF_RCP_TILING", "false").lower() == "true",
+    "rcp_tile_overlap_px": int(os.getenv("TAKEOFF_RCP_TILE_OVERLAP_PX", "96")),
+    "rcp_tile_min_downsample": float(os.getenv("TAKEOFF_RCP_TILE_MIN_DOWNSAMPLE", "1.5")),
+    "rcp_max_tiles": int(os.getenv("TAKEOFF_RCP_MAX_TILES", "16")),
+    "rcp_tile_workers": int(os.getenv("TAKEOFF_RCP_TILE_WORKERS", "6")),
+    # Vision calls in flight across all jobs in this process (takeoff/scheduler.py); 0 = unbounded
+    "vision_max_concurrency": int(os.getenv("TAKEOFF_VISION_MAX_CONCURRENCY", "8")),
+    # Snippet images spilled to a job-scoped temp dir and passed by handle (takeoff/snippetstore.py)
+    "snippet_store_enabled": os.getenv("TAKEOFF_SNIPPET_STORE", "true").lower() == "true",
+    "snippet_store_dir": os.getenv("TAKEOFF_SNIPPET_STORE_DIR") or None,  # None = system temp dir
+    # PDF drawing-set rasterization (takeoff/pdfpages.py)
+    "pdf_max_dpi": int(os.getenv("TAKEOFF_PDF_MAX_DPI", "300")),
+    "pdf_max_render_pixels": int(os.getenv("TAKEOFF_PDF_MAX_RENDER_PIXELS", "50000000")),  # Per page render
+    "pdf_page_cache_entries": int(os.getenv("TAKEOFF_PDF_PAGE_CACHE_ENTRIES", "4")),       # Per document
+    # Counter totals summed in code; the model only reviews unscheduled tags, quantity
+    # and emergency notes (Counter.generate_count_deterministic)
+    "counter_deterministic": os.getenv("TAKEOFF_COUNTER_DETERMINISTIC", "false").lower() == "true",
+    # Reconciler fast path on a clean Checker review (TakeoffEngine._reconciler_skip_reason).
+    # Opt-in (e.g. "strict"): off by default so upgrading does not change strict-mode output.
+    # Liability mode always runs the Reconciler, whatever this lists.
+    "reconciler_skip_modes": [
+        m.strip() for m in os.getenv("TAKEOFF_RECONCILER_SKIP_MODES", "").split(",") if m.strip()
+    ],
+    # Highest Checker attack severity the fast path tolerates; "none" = only with zero attacks
+    "reconciler_skip_max_severity": os.getenv("TAKEOFF_RECONCILER_SKIP_MAX_SEVERITY", "minor"),
 }
 
 # ─── Model IDs ────────────────────────────────────────────────────────────────
@@ -0,0 +1,184 @@
+"""Job-scoped, disk-spilled snippet image store — self-contained, no core/ dependency.
+
+A takeoff request carries every snippet as base64 text (up to 15 MB each),
+and that text used to stay referenced for the whole job from the request
+model, the snippet dicts, and the engine's per-phase lists. A few concurrent
+jobs could hold hundreds of MB of base64 for minutes.
+
+SnippetStore.spill() decodes each snippet once and writes the raw bytes to a
+temp directory owned by the job, one file per content hash (identical
+snippets share a file). The engine then passes SnippetHandles around in
+place of the base64. Bytes are read back (memory-mapped) only when a vision
+call is sent or an image is preprocessed. The directory is removed when the
+store is closed.
+
+Everything that reads images accepts an ImageSource (base64 text or a
+SnippetHandle), so callers outside a job can keep passing strings.
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+from takeoff.settings import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+@dataclass(frozen=True)
+class SnippetHandle:
+    """Reference to one spilled snippet image."""
+    digest: str        # sha256 of the raw image bytes
+    media_type: str
+    size: int          # Raw bytes on disk
+    path: str
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def base64(self) -> str:
+        """Base64 of the raw bytes, encoded straight from the memory-mapped file."""
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode()
+
+
+ImageSource = Union[str, SnippetHandle]
+
+
+_MEDIA_TYPES = {"image/png", "image/jpeg", "image/webp", "image/gif"}
+
+
+def _split_data_uri(image_base64: str) -> Tuple[str, Optional[str]]:
+    """(base64 payload, media type from a data-URI header, or None when absent or unsupported)."""
+    if not image_base64.startswith("data:"):
+        return image_base64, None
+    header, data = image_base64.split(",", 1)
+    # header looks like "data:image/jpeg;base64" — take the exact MIME type between ":" and ";"
+    mime = header.split(":")[1].split(";")[0].strip().lower() if ":" in header else ""
+    mime = "image/jpeg" if mime == "image/jpg" else mime
+    return data, (mime if mime in _MEDIA_TYPES else None)
+
+
+def _sniff_media_type(raw: bytes) -> str:
+    for magic, media_type in _MAGIC:
+        if raw.startswith(magic):
+            return media_type
+    if raw[:4] == b"RIFF" and raw[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def image_bytes(image: ImageSource) -> Optional[bytes]:
+    """Raw image bytes, or None when a base64 string does not decode."""
+    if isinstance(image, SnippetHandle):
+        return image.read()
+    data, _ = _split_data_uri(image)
+    try:
+        return base64.b64decode(data, validate=False)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def image_payload(image: ImageSource) -> Tuple[str, Optional[str]]:
+    """(base64 without data-URI prefix, media type if known) — materialized at send time."""
+    if isinstance(image, SnippetHandle):
+        return image.base64(), image.media_type
+    return _split_data_uri(image)
+
+
+def image_identity(image: ImageSource) -> str:
+    """Cheap stable key for in-process caches and in-flight de-duplication."""
+    if isinstance(image, SnippetHandle):
+        return image.digest
+    return hashlib.sha256(image.encode()).hexdigest()
+
+
+def has_image(image) -> bool:
+    """True for a non-empty handle or non-blank base64 string."""
+    if isinstance(image, str):
+        return bool(image.strip())
+    return bool(image)
+
+
+class SnippetStore:
+    """Temp directory of raw snippet images for one job (or one request)."""
+
+    def __init__(self, root_dir: Optional[str] = None):
+        root_dir = root_dir or API_CONFIG.get("snippet_store_dir") or None
+        if root_dir:
+            os.makedirs(root_dir, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix="takeoff-snippets-", dir=root_dir)
+        self._lock = threading.Lock()
+        self._handles: dict = {}
+        self.bytes_written = 0
+        self.deduplicated = 0
+
+    def spill(self, image: ImageSource) -> ImageSource:
+        """Handle for a base64 snippet. Handles, blank strings and undecodable text pass through."""
+        if not isinstance(image, str) or not image.strip():
+            return image
+        data, media_type = _split_data_uri(image)
+        try:
+            raw = base64.b64decode(data, validate=False)
+        except (binascii.Error, ValueError):
+            return image  # Sent as-is, as before the store existed
+        if not raw:
+            return image
+        return self.put_bytes(raw, media_type)
+
+    def put_bytes(self, raw: bytes, media_type: Optional[str] = None) -> SnippetHandle:
+        """Store raw image bytes (e.g. read straight from a file) and return their handle."""
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            handle = self._handles.get(digest)
+            if handle is not None:
+                self.deduplicated += 1
+                return handle
+            path = os.path.join(self.path, f"{digest}.bin")
+            with open(path, "wb") as f:
+                f.write(raw)
+            handle = SnippetHandle(
+                digest=digest, media_type=media_type or _sniff_media_type(raw), size=len(raw), path=path,
+            )
+            self._handles[digest] = handle
+            self.bytes_written += len(raw)
+            return handle
+
+    def spill_snippets(self, snippets: list) -> list:
+        """Copies of the snippet dicts with image_data replaced by handles."""
+        return [
+            {**s, "image_data": self.spill(s["image_data"])} if "image_data" in s else s
+            for s in snippets
+        ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"files": len(self._handles), "bytes": self.bytes_written, "deduplicated": self.deduplicated}
+
+    def close(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self) -> "SnippetStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
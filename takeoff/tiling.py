@@ -0,0 +1,131 @@
+"""Tiled fixture counting for large RCP sheets.
+
+A dense reflected ceiling plan sent as one image is downsampled by the API
+to ~1.15 MP, so small fixture symbols blur together and get missed, and the
+single call is slow. In tiling mode the sheet is split into overlapping
+tiles at the model's full resolution, each tile is counted concurrently, and
+the per-tile detections are merged.
+
+Seam de-duplication uses ownership instead of matching: every tile owns a
+core region that ends at the middle of each overlap band, and the cores
+partition the sheet. Each tile reports fixture positions, and a detection
+is kept only by the tile whose core contains it. A symbol sitting in an
+overlap band is therefore counted exactly once, however many tiles see it.
+
+Tile counts follow the image dimensions: the tile edge is the largest
+square the API sends without downsampling, grown only when the sheet
+would need more than rcp_max_tiles tiles.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from takeoff.imageprep import effective_size
+from takeoff.settings import API_CONFIG
+
+Box = Tuple[int, int, int, int]  # left, top, right, bottom (right/bottom exclusive)
+
+
+@dataclass(frozen=True)
+class Tile:
+    """One region of the sheet sent to the model."""
+    index: int
+    box: Box    # Pixels sent to the model
+    core: Box   # Pixels this tile owns when de-duplicating seams
+
+    def owns(self, x: float, y: float) -> bool:
+        left, top, right, bottom = self.core
+        return left <= x < right and top <= y < bottom
+
+
+@dataclass
+class TiledCount:
+    """Merged per-type counts for one sheet plus the overlap bookkeeping."""
+    counts_by_type: Dict[str, int] = field(default_factory=dict)
+    tiles: int = 0
+    detections: int = 0
+    seam_duplicates: int = 0   # Detections dropped because a neighbouring tile owns the spot
+    unplaced: int = 0          # Detections without usable coordinates (counted, not de-duplicated)
+    notes: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+def _full_resolution_tile_px() -> int:
+    """Largest square tile the API will not downsample."""
+    max_edge = API_CONFIG.get("vision_max_edge_px", 1568)
+    max_pixels = API_CONFIG.get("vision_max_pixels", 1_150_000)
+    return min(max_edge, int(math.sqrt(max_pixels)))
+
+
+def should_tile(width: int, height: int) -> bool:
+    """Tile when the API would otherwise shrink the sheet by at least rcp_tile_min_downsample."""
+    eff_w, _ = effective_size(width, height)
+    return width / max(eff_w, 1) >= API_CONFIG.get("rcp_tile_min_downsample", 1.5)
+
+
+def _spans(length: int, tile: int, overlap: int) -> List[Tuple[int, int]]:
+    """Evenly spaced [start, end) spans of at most `tile` px covering `length` with >= overlap."""
+    if length <= tile:
+        return [(0, length)]
+    count = math.ceil((length - overlap) / (tile - overlap))
+    stride = (length - tile) / (count - 1)
+    return [(round(i * stride), round(i * stride) + tile) for i in range(count)]
+
+
+def _cores(spans: List[Tuple[int, int]], length: int) -> List[Tuple[int, int]]:
+    """Split each overlap at its midpoint so the cores partition [0, length)."""
+    cuts = [0] + [(spans[i][1] + spans[i + 1][0]) // 2 for i in range(len(spans) - 1)] + [length]
+    return [(cuts[i], cuts[i + 1]) for i in range(len(spans))]
+
+
+def plan_tiles(width: int, height: int, tile_px: Optional[int] = None,
+               overlap_px: Optional[int] = None, max_tiles: Optional[int] = None) -> List[Tile]:
+    """Overlapping tile grid for a width x height sheet."""
+    tile = tile_px or _full_resolution_tile_px()
+    overlap = API_CONFIG.get("rcp_tile_overlap_px", 96) if overlap_px is None else overlap_px
+    limit = max_tiles or API_CONFIG.get("rcp_max_tiles", 16)
+    overlap = min(overlap, tile // 4)
+    while True:
+        cols, rows = _spans(width, tile, overlap), _spans(height, tile, overlap)
+        if len(cols) * len(rows) <= limit:
+            break
+        tile = int(tile * 1.25)  # Fewer, larger tiles; the API will downsample them a little
+
+    col_cores, row_cores = _cores(cols, width), _cores(rows, height)
+    tiles = []
+    for r, ((top, bottom), (core_top, core_bottom)) in enumerate(zip(rows, row_cores)):
+        for c, ((left, right), (core_left, core_right)) in enumerate(zip(cols, col_cores)):
+            tiles.append(Tile(
+                index=r * len(cols) + c,
+                box=(left, top, right, bottom),
+                core=(core_left, core_top, core_right, core_bottom),
+            ))
+    return tiles
+
+
+def merge_tile_detections(tiles: List[Tile], detections: List[List[dict]],
+                          scales: Optional[List[float]] = None) -> TiledCount:
+    """
+    Merge per-tile detections ({"type_tag", "x", "y"} in the pixel space of
+    the image the model saw) into sheet-level counts. scales[i] is the factor
+    tile i was resized by before sending (1.0 = full resolution).
+    """
+    merged = TiledCount(tiles=len(tiles))
+    for i, (tile, found) in enumerate(zip(tiles, detections)):
+        scale = scales[i] if scales else 1.0
+        for det in found:
+            tag = str(det.get("type_tag") or "UNKNOWN")
+            merged.detections += 1
+            try:
+                x = tile.box[0] + float(det["x"]) / scale
+                y = tile.box[1] + float(det["y"]) / scale
+            except (KeyError, TypeError, ValueError):
+                merged.unplaced += 1
+                merged.counts_by_type[tag] = merged.counts_by_type.get(tag, 0) + 1
+                continue
+            if not tile.owns(x, y):
+                merged.seam_duplicates += 1
+                continue
+            merged.counts_by_type[tag] = merged.counts_by_type.get(tag, 0) + 1
+    return merged
@@ -0,0 +1,153 @@
+"""Per-job usage metering — self-contained, no core/ dependency.
+
+Vision token counts used to accumulate in module globals that every job
+reset at its start, so concurrent API jobs overwrote each other's cost
+figures. A UsageLedger instead belongs to one job: usage_ledger() makes it
+current for the job's context, pool workers started with
+takeoff.scheduler.submit() inherit it, and every vision call and
+ModelRouter agent call records into whichever ledger is current.
+
+Rows are aggregated per (kind, task, model): kind is "vision" or "agent",
+task is the extraction function / Checker verification or the agent task
+type. The engine stores the rows in TakeoffDB (job_usage table). The
+ledger also totals the job's image preprocessing savings
+(takeoff/imageprep.py), reported as result["image_prep"].
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_current_ledger: contextvars.ContextVar[Optional["UsageLedger"]] = contextvars.ContextVar(
+    "takeoff_usage_ledger", default=None
+)
+
+_FIELDS = (
+    "calls", "cached_calls", "input_tokens", "output_tokens",
+    "cache_read_tokens", "cache_write_tokens", "cost_usd", "latency_ms",
+)
+_IMAGE_PREP_FIELDS = (
+    "images_sent", "images_prepared", "cache_hits", "prep_ms",
+    "bytes_before", "bytes_after", "tokens_before", "tokens_after",
+)
+
+
+def image_prep_summary(counts: Dict[str, float]) -> Dict:
+    """Image preprocessing counters plus the derived savings (bytes, tokens, ratio)."""
+    stats = dict(counts)
+    stats["prep_ms"] = round(stats["prep_ms"], 1)
+    stats["bytes_saved"] = stats["bytes_before"] - stats["bytes_after"]
+    stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+    stats["bytes_ratio"] = round(stats["bytes_after"] / stats["bytes_before"], 3) if stats["bytes_before"] else 1.0
+    return stats
+
+
+class UsageLedger:
+    """Token, cost and latency totals for one job, broken down by call kind and task."""
+
+    def __init__(self, job_id: str = ""):
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        self._rows: Dict[Tuple[str, str, str], Dict[str, float]] = {}
+        self._image_prep: Dict[str, float] = dict.fromkeys(_IMAGE_PREP_FIELDS, 0)
+
+    def record(
+        self,
+        kind: str,
+        task: str,
+        model: str = "",
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cost_usd: float = 0.0,
+        latency_ms: float = 0.0,
+        cached: bool = False,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> None:
+        with self._lock:
+            row = self._rows.setdefault((kind, task, model), dict.fromkeys(_FIELDS, 0))
+            row["calls"] += 1
+            row["cached_calls"] += int(cached)
+            row["input_tokens"] += input_tokens
+            row["output_tokens"] += output_tokens
+            row["cache_read_tokens"] += cache_read_tokens
+            row["cache_write_tokens"] += cache_write_tokens
+            row["cost_usd"] += cost_usd
+            row["latency_ms"] += latency_ms
+
+    def record_image_prep(self, **fields) -> None:
+        """Add one vision image's preprocessing counters (see imageprep.prepare_image)."""
+        with self._lock:
+            for k, v in fields.items():
+                self._image_prep[k] += v
+
+    def image_prep(self) -> Dict:
+        """This job's image preprocessing savings."""
+        with self._lock:
+            counts = dict(self._image_prep)
+        return image_prep_summary(counts)
+
+    @property
+    def calls(self) -> int:
+        with self._lock:
+            return sum(int(row["calls"]) for row in self._rows.values())
+
+    def rows(self) -> List[Dict]:
+        """One dict per (kind, task, model), sorted for stable output."""
+        with self._lock:
+            return [
+                {
+                    "kind": kind, "task": task, "model": model,
+                    **{k: (round(v, 6) if k == "cost_usd" else int(v)) for k, v in row.items()},
+                }
+                for (kind, task, model), row in sorted(self._rows.items())
+            ]
+
+    def totals(self, kind: Optional[str] = None) -> Dict:
+        """Summed fields across all rows (or only rows of one kind)."""
+        totals = dict.fromkeys(_FIELDS, 0)
+        for row in self.rows():
+            if kind is None or row["kind"] == kind:
+                for k in _FIELDS:
+                    totals[k] += row[k]
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        return totals
+
+    def summary(self) -> Dict:
+        """Totals overall and per kind plus the row breakdown (for result dicts)."""
+        return {
+            "total": self.totals(),
+            "vision": self.totals("vision"),
+            "agent": self.totals("agent"),
+            "breakdown": self.rows(),
+            "image_prep": self.image_prep(),
+        }
+
+
+def current_ledger() -> Optional[UsageLedger]:
+    return _current_ledger.get()
+
+
+@contextmanager
+def usage_ledger(ledger: UsageLedger) -> Iterator[UsageLedger]:
+    """Make ledger current for this context (and pools started via takeoff.scheduler.submit())."""
+    token = _current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _current_ledger.reset(token)
+
+
+def record_usage(kind: str, task: str, **fields) -> None:
+    """Record one call into the current ledger; a no-op outside any job."""
+    ledger = _current_ledger.get()
+    if ledger is not None:
+        ledger.record(kind, task, **fields)
+
+
+def record_image_prep(**fields) -> None:
+    """Record one image's preprocessing counters into the current ledger; a no-op outside any job."""
+    ledger = _current_ledger.get()
+    if ledger is not None:
+        ledger.record_image_prep(**fields)
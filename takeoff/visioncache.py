@@ -0,0 +1,156 @@
+"""Persistent cache for parsed vision extraction results — self-contained, no core/ dependency.
+
+Estimators resubmit the same snippet images constantly while tweaking labels
+or mode, and every resubmission used to re-run the slowest, most expensive
+step (one vision call per snippet). Results are keyed by:
+
+- sha256 of the decoded image bytes (the data-URI prefix and base64 padding
+  do not matter)
+- the extraction function and its prompt version (bump the version in
+  takeoff/extraction.py PROMPT_VERSIONS when a prompt or its parsing changes)
+- the vision model
+- a fingerprint of any other prompt input (for RCP counts: the fixture
+  schedule and area label)
+
+Entries live in SQLite (WAL) so they survive restarts and are shared by the
+CLI and the API server. Least-recently-used entries are evicted past
+max_entries / max_bytes.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from takeoff.snippetstore import ImageSource, SnippetHandle
+
+logger = logging.getLogger(__name__)
+
+
+def image_digest(image: ImageSource) -> str:
+    """sha256 of the decoded image bytes (falls back to the raw string if it is not base64)."""
+    if isinstance(image, SnippetHandle):
+        return image.digest  # Already the digest of the raw bytes
+    data = image.split(",", 1)[1] if image.startswith("data:") else image
+    try:
+        raw = base64.b64decode(data, validate=False)
+    except (binascii.Error, ValueError):
+        raw = data.encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+def extraction_key(function: str, prompt_version, model: str, image: ImageSource, fingerprint: str = "") -> str:
+    """Cache key for one extraction call."""
+    return hashlib.sha256("\x00".join([
+        function, str(prompt_version), model, image_digest(image), fingerprint,
+    ]).encode()).hexdigest()
+
+
+class VisionCache:
+    """SQLite-backed LRU cache of extraction results (JSON payloads)."""
+
+    def __init__(self, db_path: str = "takeoff_vision_cache.db",
+                 max_entries: int = 5000, max_bytes: int = 64 * 1024 * 1024):
+        self.db_path = Path(db_path)
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(int(max_entries or 0), 0)
+        self.max_bytes = max(int(max_bytes or 0), 0)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS vision_cache (
+                key TEXT PRIMARY KEY,
+                function TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_vision_cache_used ON vision_cache(last_used)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self._hits_by_function: Dict[str, int] = {}
+
+    def get(self, key: str, function: str = "") -> Optional[dict]:
+        """Cached payload for key, or None on a miss."""
+        with self._lock:
+            row = self.conn.execute("SELECT payload FROM vision_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE vision_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            self.hits += 1
+            self._hits_by_function[function] = self._hits_by_function.get(function, 0) + 1
+        return json.loads(row[0])
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def set(self, key: str, function: str, payload: dict) -> None:
+        text = json.dumps(payload, default=str)
+        now = time.time()
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO vision_cache (key, function, payload, size_bytes, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, function, text, len(text.encode()), now, now))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until both limits hold. Caller holds _lock."""
+        entries, size_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM vision_cache"
+        ).fetchone()
+        while entries and (
+            (self.max_entries and entries > self.max_entries)
+            or (self.max_bytes and size_bytes > self.max_bytes)
+        ):
+            row = self.conn.execute(
+                "SELECT key, size_bytes FROM vision_cache ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            self.conn.execute("DELETE FROM vision_cache WHERE key = ?", (row[0],))
+            entries -= 1
+            size_bytes -= row[1]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM vision_cache")
+            self.conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM vision_cache"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "size_bytes": size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "hits_by_function": dict(self._hits_by_function),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,89 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+class FakeAsyncMessages:
+    def __init__(self, failures=0):
+        self.calls = 0
+        self.failures = failures
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("api overloaded")
+            return SimpleNamespace(
+                content=[SimpleNamespace(text=f"echo:{kwargs['messages'][0]['content']}")],
+                usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def _api_provider(messages, tmp_path):
+    provider = LLMProvider(
+        api_key="test-key",
+        mode="api",
+        cache=MemoryResponseCache(),
+        rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider._get_async_client = lambda: SimpleNamespace(messages=messages)
+    return provider
+
+
+def test_acomplete_fans_out_concurrently_and_tracks_cost(tmp_path):
+    messages = FakeAsyncMessages()
+    provider = _api_provider(messages, tmp_path)
+
+    async def run():
+        return await asyncio.gather(*[
+            provider.acomplete("sys", f"prompt {i}", max_tokens=50, temperature=0.0,
+                               model="claude-haiku-4-5-20251001")
+            for i in range(12)
+        ])
+
+    responses = asyncio.run(run())
+    assert [r.content for r in responses] == [f"echo:prompt {i}" for i in range(12)]
+    assert messages.max_in_flight == 12
+    stats = provider.get_stats()
+    assert stats["total_calls"] == 12
+    assert stats["total_input_tokens"] == 120
+    assert stats["estimated_cost_usd"] > 0
+
+
+def test_acomplete_retries_transient_errors_and_uses_shared_cache(tmp_path):
+    messages = FakeAsyncMessages(failures=1)
+    provider = _api_provider(messages, tmp_path)
+    provider.BACKOFF_SCHEDULE = [0.0, 0.0, 0.0]
+
+    first = asyncio.run(provider.acomplete("sys", "hi", temperature=0.0))
+    second = provider.complete("sys", "hi", temperature=0.0)
+
+    assert first.content == "echo:hi"
+    assert messages.calls == 2
+    assert second.cached
+
+
+def test_model_router_acomplete_routes_and_records_task_cost():
+    router = ModelRouter(mock_mode=True)
+    response = asyncio.run(router.acomplete("normalization", "You are Tester, a bot.", "hello"))
+    assert response.content
+    stats = router.get_stats()
+    assert stats["cost_by_task_type"]["normalization"]["calls"] == 1
+    assert stats["cost_by_model_tier"]["haiku"]["calls"] == 1
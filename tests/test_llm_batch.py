@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.batch import BatchRequest, LocalBatchServer, run_batch
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+def _echo(params):
+    prompt = params["messages"][0]["content"]
+    if prompt == "boom":
+        raise RuntimeError("invalid_request")
+    return f"echo:{prompt}", 100, 50
+
+
+def _request(i, prompt):
+    return BatchRequest(
+        custom_id=f"req-{i}", system_prompt="sys", user_prompt=prompt,
+        max_tokens=50, temperature=0.0, model="claude-haiku-4-5-20251001",
+    )
+
+
+def test_run_batch_polls_until_ended_and_reports_errors():
+    server = LocalBatchServer(_echo, polls_until_ended=2)
+    polls = []
+    results = run_batch(
+        server, [_request(0, "a"), _request(1, "boom")],
+        poll_interval_s=0.0, on_poll=polls.append,
+    )
+    assert [p.processing_status for p in polls] == ["in_progress", "ended"]
+    assert results["req-0"].message.content[0].text == "echo:a"
+    assert results["req-1"].message is None
+    assert "invalid_request" in results["req-1"].error
+
+
+def test_run_batch_times_out_and_cancels():
+    server = LocalBatchServer(_echo, polls_until_ended=1000)
+    with pytest.raises(TimeoutError):
+        run_batch(server, [_request(0, "a")], poll_interval_s=0.0, timeout_s=0.0)
+
+
+def test_provider_complete_batch_orders_results_caches_and_discounts(tmp_path):
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.batch_api = LocalBatchServer(_echo, polls_until_ended=1)
+    requests = [
+        {"system_prompt": "sys", "user_prompt": p, "max_tokens": 50,
+         "temperature": 0.0, "model": "claude-haiku-4-5-20251001"}
+        for p in ("one", "boom", "two")
+    ]
+
+    responses = provider.complete_batch(requests)
+    assert [r.content for r in responses[::2]] == ["echo:one", "echo:two"]
+    assert responses[1].content.startswith("[LLM ERROR:")
+    assert all(r.batched for r in responses)
+
+    stats = provider.get_stats()
+    assert stats["batches_submitted"] == 1
+    assert stats["batched_calls"] == 3
+    rates = provider.cost_rates["claude-haiku-4-5-20251001"]
+    full_price = 2 * (100 * rates["input"] + 50 * rates["output"]) / 1_000_000
+    assert stats["estimated_cost_usd"] == pytest.approx(full_price * 0.5, abs=1e-4)
+
+    # Successful results are cached; the errored one is resubmitted
+    again = provider.complete_batch(requests)
+    assert again[0].cached and again[2].cached
+    assert provider.get_stats()["batched_calls"] == 4
+
+
+def test_router_complete_batch_falls_back_to_sequential_without_batch_mode():
+    calls = [
+        {"task_type": "bridge_extraction", "system_prompt": "You are Tester, a bot.", "user_prompt": f"p{i}"}
+        for i in range(3)
+    ]
+    sequential = ModelRouter(mock_mode=True)
+    batched = ModelRouter(mock_mode=True, batch_mode=True)
+
+    seq_responses = sequential.complete_batch(calls)
+    batch_responses = batched.complete_batch(calls)
+
+    assert len(seq_responses) == len(batch_responses) == 3
+    assert not any(r.batched for r in seq_responses)
+    assert all(r.batched for r in batch_responses)
+    assert sequential.get_stats()["batches_submitted"] == 0
+    seq_cost = sequential.get_stats()["cost_by_task_type"]["bridge_extraction"]
+    batch_cost = batched.get_stats()["cost_by_task_type"]["bridge_extraction"]
+    assert batch_cost["calls"] == 3
+    assert batch_cost["cost_usd"] == pytest.approx(seq_cost["cost_usd"] * 0.5, rel=0.05)
+
+
+def test_content_generator_submits_every_event_format_in_one_batch(tmp_path):
+    from content.generator import ContentGenerator
+
+    router = ModelRouter(mock_mode=True, batch_mode=True)
+    generator = ContentGenerator(str(tmp_path), router)
+    events = [
+        {"drama_score": 8, "novelty_score": 5, "depth_score": 7, "event_type": "claim_exchange",
+         "exchange": {"domain": "physics", "claim": "A", "outcome": "survived"}},
+        {"drama_score": 7, "novelty_score": 5, "depth_score": 3, "event_type": "claim_exchange",
+         "exchange": {"domain": "physics", "claim": "B", "outcome": "destroyed"}},
+        {"drama_score": 0, "novelty_score": 0, "depth_score": 0, "event_type": "routine", "exchange": {}},
+    ]
+
+    outputs = generator.evaluate_and_generate_batch(events)
+
+    assert [len(paths) for paths in outputs] == [4, 3, 0]
+    assert len({p for paths in outputs for p in paths}) == 7  # Same-second saves do not overwrite
+    stats = router.get_stats()
+    assert stats["batches_submitted"] == 1
+    assert stats["cost_by_task_type"]["content_generation"]["calls"] == 7
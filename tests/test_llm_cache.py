@@ -0,0 +1,78 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache, SQLiteResponseCache, create_response_cache
+from core.llm import LLMProvider
+
+
+def test_memory_cache_lru_eviction_by_entry_count():
+    cache = MemoryResponseCache(max_entries=2)
+    cache.set("a", {"content": "A"})
+    cache.set("b", {"content": "B"})
+    assert cache.get("a") == {"content": "A"}  # touch "a" so "b" is least recent
+    cache.set("c", {"content": "C"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_memory_cache_byte_limit_and_ttl():
+    cache = MemoryResponseCache(max_bytes=60)
+    cache.set("a", {"content": "x" * 30})
+    cache.set("b", {"content": "y" * 30})
+    assert cache.stats()["size_bytes"] <= 60
+    assert cache.get("a") is None
+
+    ttl_cache = MemoryResponseCache(ttl_seconds=0.01)
+    ttl_cache.set("k", {"content": "v"})
+    time.sleep(0.02)
+    assert ttl_cache.get("k") is None
+    assert ttl_cache.stats()["expirations"] == 1
+
+
+def test_sqlite_cache_persists_across_instances_and_evicts_lru(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = SQLiteResponseCache(path=path, max_entries=2)
+    first.set("a", {"content": "A"})
+    first.set("b", {"content": "B"})
+
+    second = SQLiteResponseCache(path=path, max_entries=2)
+    assert second.get("a") == {"content": "A"}
+    time.sleep(0.01)
+    second.set("c", {"content": "C"})
+
+    assert len(second) == 2
+    assert second.get("b") is None
+    assert second.stats()["evictions"] == 1
+
+
+def test_create_response_cache_rejects_unknown_backend():
+    try:
+        create_response_cache({"cache_backend": "redis"})
+    except ValueError as e:
+        assert "redis" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_provider_cache_key_is_temperature_aware_and_stats_surface_counters():
+    provider = LLMProvider(mode="local", cache=MemoryResponseCache(max_entries=10))
+    first = provider.complete("You are Tester, a bot.", "hello", temperature=0.0)
+    second = provider.complete("You are Tester, a bot.", "hello", temperature=0.0)
+    third = provider.complete("You are Tester, a bot.", "hello", temperature=0.8)
+
+    assert not first.cached
+    assert second.cached
+    assert not third.cached
+    cache_stats = provider.get_stats()["cache"]
+    assert cache_stats["hits"] == 1
+    assert cache_stats["misses"] == 2
+    assert cache_stats["backend"] == "memory"
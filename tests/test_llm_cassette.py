@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache
+from core.cassette import Cassette
+from core.llm import LLMProvider
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+class CountingMessages:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        time.sleep(0.02)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=f"real:{kwargs['messages'][0]['content']}#{self.calls}")],
+            usage=SimpleNamespace(input_tokens=120, output_tokens=40),
+        )
+
+
+def _provider(mode, cassette):
+    provider = LLMProvider(
+        api_key="test-key", mode=mode, cache=MemoryResponseCache(),
+        rate_limiter=RateLimiter(limits={}, enabled=True), cassette=cassette,
+    )
+    provider._error_log_path = cassette.path.parent / "api_errors.log"
+    return provider
+
+
+@pytest.mark.parametrize("filename", ["run.jsonl", "run.jsonl.gz"])
+def test_record_then_replay_reproduces_content_usage_and_latency(tmp_path, filename):
+    path = tmp_path / filename
+    recorder = _provider("record", Cassette(str(path), "record"))
+    recorder.client = SimpleNamespace(messages=CountingMessages())
+    recorded = [recorder.complete("sys", p, temperature=0.0, task_type="judge") for p in ("a", "b")]
+    recorder.cassette.close()
+    assert recorder.mode == "api"
+    assert recorder.get_stats()["cassette"]["recorded"] == 2
+
+    replayer = _provider("replay", Cassette(str(path), "replay", latency_scale=1.0))
+    assert replayer.client is None
+    replayed = [replayer.complete("sys", p, temperature=0.0) for p in ("a", "b")]
+
+    assert [r.content for r in replayed] == [r.content for r in recorded]
+    assert replayed[0].input_tokens == 120 and replayed[0].output_tokens == 40
+    assert replayed[0].latency_ms >= 15  # recorded latency is emulated
+    assert replayer.get_stats()["estimated_cost_usd"] == recorder.get_stats()["estimated_cost_usd"]
+
+    miss = replayer.complete("sys", "never recorded", temperature=0.0)
+    assert miss.content.startswith("[LLM ERROR")
+    assert replayer.get_stats()["cassette"]["misses"] == 1
+
+
+def test_replay_repeats_in_order_and_serves_async_and_stream(tmp_path):
+    path = tmp_path / "run.jsonl"
+    recorder = _provider("record", Cassette(str(path), "record"))
+    recorder.client = SimpleNamespace(messages=CountingMessages())
+    first = recorder.complete("sys", "same", temperature=0.0)
+    recorder._cache.clear()
+    second = recorder.complete("sys", "same", temperature=0.0)
+    recorder.cassette.close()
+    assert first.content != second.content
+
+    cassette = Cassette(str(path), "replay", latency_scale=0.0)
+    replayer = _provider("replay", cassette)
+    assert replayer.complete("sys", "same", temperature=0.0).content == first.content
+    replayer._cache.clear()
+    assert asyncio.run(replayer.acomplete("sys", "same", temperature=0.0)).content == second.content
+    replayer._cache.clear()
+    chunks = list(replayer.stream("sys", "same", temperature=0.0))
+    assert chunks[-1].response.content == second.content  # last entry repeats
+    assert "".join(c.text for c in chunks[:-1]) == second.content
+
+
+def test_model_router_cassette_mode_builds_provider(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_text("", encoding="utf-8")
+    router = ModelRouter(cassette_mode="replay", cassette_path=str(path))
+    assert router.get_stats()["cassette"]["mode"] == "replay"
@@ -0,0 +1,121 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.settings import MODEL_IDS
+from core.cache import MemoryResponseCache
+from core.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers
+from core.llm import LLMProvider
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+class SonnetOverloadedMessages:
+    def __init__(self):
+        self.models = []
+
+    def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        if kwargs["model"] == MODEL_IDS["sonnet"]:
+            raise RuntimeError("api overloaded")
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="fallback answer")],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+
+
+def test_breaker_trips_probes_half_open_and_recovers():
+    breaker = CircuitBreaker(error_rate=0.5, min_requests=4, window_seconds=60, open_seconds=0.05)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()          # the probe
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()      # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.trips == 2
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_router_falls_back_to_configured_tier_and_labels_result(tmp_path):
+    messages = SonnetOverloadedMessages()
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+        circuit_breakers=CircuitBreakers(enabled=True, error_rate=0.5, min_requests=2,
+                                         window_seconds=60, open_seconds=60),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.BACKOFF_SCHEDULE = [0.0, 0.0, 0.0]
+    provider.client = SimpleNamespace(messages=messages)
+    router = ModelRouter(mock_mode=True)
+    router._provider = provider
+
+    with router.track_fallbacks() as fallbacks:
+        response = router.complete("sydyn_judge", "You are Judge, a bot.", "rule on this")
+
+    assert response.content == "fallback answer"
+    assert response.fallback_from == MODEL_IDS["sonnet"]
+    assert messages.models == [MODEL_IDS["sonnet"]] * 2 + [MODEL_IDS["haiku"]]
+    assert fallbacks == [{"task_type": "sydyn_judge", "from_model": MODEL_IDS["sonnet"],
+                          "to_model": MODEL_IDS["haiku"]}]
+
+    # Breaker is open: eligible tasks skip sonnet entirely; others get the
+    # error placeholder at once, with no call and no backoff
+    router.complete("sydyn_critic", "You are Critic, a bot.", "critique")
+    assert messages.models[-1] == MODEL_IDS["haiku"]
+    calls_before = len(messages.models)
+    started = time.time()
+    refused = router.complete("judge", "You are Judge, a bot.", "rule")
+    assert refused.content.startswith("[LLM ERROR:")
+    assert len(messages.models) == calls_before
+    assert time.time() - started < 0.5
+    streamed = list(router.stream("judge", "You are Judge, a bot.", "rule again"))
+    assert streamed[-1].response.content.startswith("[LLM ERROR:")
+    assert len(messages.models) == calls_before
+
+    stats = router.get_stats()
+    assert stats["fallbacks_by_task_type"] == {"sydyn_judge": 1, "sydyn_critic": 1}
+    assert stats["circuit_breakers"]["sonnet"]["state"] == OPEN
+    assert stats["cost_by_model_tier"]["haiku"]["calls"] == 2
+
+
+class RateLimitedMessages:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        raise RuntimeError("rate limit exceeded for this organization")
+
+
+def test_rate_limit_errors_do_not_trip_the_breaker(tmp_path):
+    breakers = CircuitBreakers(enabled=True, error_rate=0.5, min_requests=2, window_seconds=60, open_seconds=60)
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+        circuit_breakers=breakers,
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.BACKOFF_SCHEDULE = [0.0, 0.0, 0.0]
+    provider.client = SimpleNamespace(messages=RateLimitedMessages())
+
+    response = provider.complete("sys", "hi", temperature=0.0, model=MODEL_IDS["sonnet"])
+
+    assert response.content.startswith("[LLM ERROR:")
+    assert provider.client.messages.calls == provider.MAX_RETRIES + 1
+    assert provider.get_stats()["circuit_breakers"]["sonnet"]["state"] == CLOSED
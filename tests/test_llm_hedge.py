@@ -0,0 +1,167 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache
+from core.exceptions import LLMTimeoutException
+from core.hedge import Hedger
+from core.llm import LLMProvider
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+def _message(text):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+    )
+
+
+class SlowFirstMessages:
+    """First request stalls; later ones answer immediately."""
+
+    def __init__(self, stall_s=0.3):
+        self.stall_s = stall_s
+        self.calls = 0
+        self.timeouts = []
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        self.timeouts.append(kwargs["timeout"])
+        if n == 1:
+            time.sleep(self.stall_s)
+        return _message(f"call-{n}")
+
+
+class SlowFirstAsyncMessages(SlowFirstMessages):
+    async def create(self, **kwargs):
+        self.calls += 1
+        n = self.calls
+        if n == 1:
+            await asyncio.sleep(self.stall_s)
+        return _message(f"call-{n}")
+
+
+class OverloadedMessages:
+    def create(self, **kwargs):
+        raise RuntimeError("api overloaded")
+
+
+def _provider(tmp_path, messages=None, async_messages=None):
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.client = SimpleNamespace(messages=messages)
+    provider._get_async_client = lambda: SimpleNamespace(messages=async_messages)
+    return provider
+
+
+def test_hedger_returns_first_success_and_counts_abandoned_tokens():
+    hedger = Hedger()
+    messages = SlowFirstMessages(stall_s=0.2)
+    result = hedger.call(lambda: SimpleNamespace(total_tokens=15, text=messages.create(timeout=1).content[0].text), 0.02)
+    assert result.text == "call-2"
+    time.sleep(0.3)  # Let the abandoned primary land
+    stats = hedger.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    assert stats["wasted_tokens"] == 15
+
+
+def test_hedger_skips_duplicate_when_primary_is_fast():
+    hedger = Hedger()
+    assert hedger.call(lambda: "ok", 1.0) == "ok"
+    assert hedger.stats() == {"calls": 1, "hedged": 0, "hedge_rate": 0.0,
+                              "hedge_wins": 0, "losers_cancelled": 0, "wasted_tokens": 0}
+
+
+def test_provider_complete_hedges_slow_call(tmp_path):
+    messages = SlowFirstMessages(stall_s=0.3)
+    provider = _provider(tmp_path, messages=messages)
+
+    response = provider.complete("sys", "hi", temperature=0.0, hedge_after_s=0.02)
+    assert response.content == "call-2"
+    assert response.latency_ms < 300
+    assert provider.get_stats()["hedging"]["hedge_wins"] == 1
+
+
+def test_provider_acomplete_cancels_losing_hedge(tmp_path):
+    messages = SlowFirstAsyncMessages(stall_s=1.0)
+    provider = _provider(tmp_path, async_messages=messages)
+
+    response = asyncio.run(provider.acomplete("sys", "hi", temperature=0.0, hedge_after_s=0.02))
+    assert response.content == "call-2"
+    hedging = provider.get_stats()["hedging"]
+    assert hedging["losers_cancelled"] == 1
+    assert hedging["wasted_tokens"] > 0
+
+
+def test_deadline_caps_attempt_timeout_and_stops_retries(tmp_path):
+    messages = SlowFirstMessages(stall_s=0.0)
+    provider = _provider(tmp_path, messages=messages)
+    provider.complete("sys", "hi", temperature=0.0, task_type="sydyn_judge", deadline_s=5.0)
+    assert 0 < messages.timeouts[0] <= 5.0
+
+    provider.client = SimpleNamespace(messages=OverloadedMessages())
+    provider.BACKOFF_SCHEDULE = [10.0, 10.0, 10.0]
+    started = time.time()
+    with pytest.raises(LLMTimeoutException):
+        provider.complete("sys", "other", temperature=0.0, deadline_s=1.0)
+    assert time.time() - started < 1.0
+    assert provider.get_stats()["deadline_exceeded"] == 1
+
+
+def test_router_threads_deadline_and_waits_for_samples_before_hedging(monkeypatch):
+    router = ModelRouter(mock_mode=True, hedge=True)
+    seen = []
+    real_complete = router._provider.complete
+
+    def spy(**kwargs):
+        seen.append((kwargs["deadline_s"], kwargs["hedge_after_s"]))
+        return real_complete(**kwargs)
+
+    monkeypatch.setattr(router._provider, "complete", spy)
+    with router.deadline(30.0):
+        router.complete("normalization", "You are Tester, a bot.", "first")
+    router.complete("normalization", "You are Tester, a bot.", "second")
+
+    assert 0 < seen[0][0] <= 30.0
+    assert seen[1][0] is None
+    assert seen[0][1] is None  # Not enough latency samples yet
+
+    for i in range(18):  # 20 recorded calls in total
+        router.complete("normalization", "You are Tester, a bot.", f"warmup {i}")
+    assert seen[-1][1] is None
+    router.complete("normalization", "You are Tester, a bot.", "hedged")
+    assert seen[-1][1] >= 2.0
+
+
+def test_sydyn_query_degrades_when_deadline_expires_before_researcher(tmp_path, monkeypatch):
+    import sydyn.engine as sydyn_engine
+    from sydyn.timeout import TimeoutManager
+
+    router = ModelRouter(mock_mode=True)
+    router._provider = _provider(tmp_path, messages=SlowFirstMessages(stall_s=0.0))
+    engine = sydyn_engine.SydynEngine(db_path=str(tmp_path / "sydyn.db"), model_router=router)
+    pack = SimpleNamespace(query="q", sufficient_evidence=True, sources=[], total_searched=4)
+    monkeypatch.setattr(sydyn_engine, "classify_query", lambda *a, **kw: "fast")
+    monkeypatch.setattr(sydyn_engine, "build_evidence_pack", lambda *a, **kw: pack)
+    monkeypatch.setattr(TimeoutManager, "remaining", lambda self, target=None: 0.0)  # Search used the budget
+
+    result = engine.query("What is the NEC clearance for panels?", save_kb=False)
+
+    assert result["timeout"] is True
+    assert result["degradation_level"] == "evidence_only"
+    assert "EVIDENCE SUMMARY" in result["answer"]
+    assert router._provider.get_stats()["deadline_exceeded"] == 1
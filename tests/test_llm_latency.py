@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider
+from core.metrics import CallTimings, LatencyHistogram
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+class FlakyMessages:
+    def __init__(self, failures):
+        self.failures = failures
+
+    def create(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("api overloaded")
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="ok")],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+
+
+def test_histogram_percentiles_within_one_bucket():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):
+        hist.record(ms)
+    assert hist.count == 1000
+    assert hist.percentile(50) == pytest.approx(500, rel=0.2)
+    assert hist.percentile(90) == pytest.approx(900, rel=0.2)
+    assert hist.percentile(99) <= hist.max_ms == 1000
+    assert LatencyHistogram().percentile(50) == 0.0
+
+
+def test_call_timings_accumulates_wait_and_backoff():
+    timings = CallTimings()
+    timings.record(100, rate_limit_wait_ms=20, retry_backoff_ms=500, retries=1)
+    timings.record(300)
+    summary = timings.summary()
+    assert summary["count"] == 2
+    assert summary["total_ms"] == 400
+    assert summary["rate_limit_wait_ms"] == 20
+    assert summary["retry_backoff_ms"] == 500
+    assert summary["retries"] == 1
+
+
+def test_router_reports_latency_per_task_and_tier():
+    router = ModelRouter(mock_mode=True)
+    for i in range(3):
+        router.complete("normalization", "You are Tester, a bot.", f"hello {i}")
+    router.complete("normalization", "You are Tester, a bot.", "hello 0")  # cache hit
+
+    stats = router.get_stats()
+    row = stats["latency_by_task_type"]["normalization"]
+    assert row["count"] == 3
+    for key in ("p50_ms", "p90_ms", "p99_ms", "rate_limit_wait_ms", "retry_backoff_ms"):
+        assert key in row
+    assert stats["latency_by_model_tier"]["haiku"]["count"] == 3
+
+
+def test_provider_records_retry_backoff_on_response(tmp_path):
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.BACKOFF_SCHEDULE = [0.01, 0.01, 0.01]
+    provider.client = SimpleNamespace(messages=FlakyMessages(failures=2))
+
+    response = provider.complete("sys", "hi", temperature=0.0)
+    assert response.content == "ok"
+    assert response.retries == 2
+    assert response.retry_backoff_ms >= 20
+    assert response.latency_ms >= response.retry_backoff_ms
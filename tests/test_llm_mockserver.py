@@ -0,0 +1,99 @@
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider
+from core.mockserver import MockResponder, MockServerConfig, create_app
+from core.ratelimit import RateLimiter
+
+
+def _vision_body():
+    return {
+        "model": "claude-sonnet-4-6",
+        "max_tokens": 3000,
+        "system": "You are an expert electrical estimator reading a fixture schedule.",
+        "messages": [{"role": "user", "content": [
+            {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "AAAA"}},
+            {"type": "text", "text": "Extract every fixture type."},
+        ]}],
+    }
+
+
+def test_responder_serves_vision_json_and_truncates_at_max_tokens():
+    responder = MockResponder(MockServerConfig(latency_ms=5, latency_sigma=0, seed=1))
+    status, payload, _, delay_s = responder.respond(_vision_body())
+    assert status == 200 and delay_s == pytest.approx(0.005)
+    assert payload["type"] == "message" and payload["stop_reason"] == "end_turn"
+    assert "A" in json.loads(payload["content"][0]["text"])["fixtures"]
+
+    status, payload, _, _ = responder.respond(dict(_vision_body(), max_tokens=10))
+    assert payload["stop_reason"] == "max_tokens"
+    assert len(payload["content"][0]["text"]) == 40
+    assert responder.stats["truncated"] == 1
+
+
+def test_responder_injects_configured_errors():
+    responder = MockResponder(MockServerConfig(latency_ms=5, rate_limit_rate=1.0, retry_after_s=2, seed=1))
+    status, payload, headers, _ = responder.respond(_vision_body())
+    assert status == 429
+    assert payload["error"]["type"] == "rate_limit_error"
+    assert headers["retry-after"] == "2"
+
+    responder = MockResponder(MockServerConfig(latency_ms=5, overload_rate=1.0, seed=1))
+    assert responder.respond(_vision_body())[0] == 529
+
+
+@pytest.fixture
+def mock_server_url():
+    uvicorn = pytest.importorskip("uvicorn")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(MockServerConfig(latency_ms=20, latency_sigma=0, seed=1)),
+        host="127.0.0.1", port=port, log_level="error",
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while not server.started and time.time() < deadline:
+        time.sleep(0.02)
+    if not server.started:
+        pytest.skip("could not start local mock server")
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def test_sdk_parses_mock_server_messages_and_streams(mock_server_url):
+    anthropic = pytest.importorskip("anthropic")
+    client = anthropic.Anthropic(api_key="mock-key", base_url=mock_server_url, max_retries=0)
+
+    message = client.messages.create(**_vision_body())
+    assert message.stop_reason == "end_turn"
+    assert "fixtures" in json.loads(message.content[0].text)
+    assert message.usage.input_tokens > 0
+
+    with client.messages.stream(
+        model="claude-haiku-4-5-20251001", max_tokens=500, system="You are Tester, a bot.",
+        messages=[{"role": "user", "content": "stream please"}],
+    ) as stream:
+        text = "".join(stream.text_stream)
+        final = stream.get_final_message()
+    assert text and text == final.content[0].text
+
+
+def test_provider_clients_use_configured_base_url(tmp_path):
+    provider = LLMProvider(
+        api_key="mock-key", mode="api", base_url="http://127.0.0.1:8765",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    assert str(provider.client.base_url).rstrip("/") == "http://127.0.0.1:8765"
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agents.base import AgentConfig
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider, PromptSegment, prompt_text, system_param
+from core.ratelimit import RateLimiter
+
+
+class FakeMessages:
+    def __init__(self, usage):
+        self.usage = usage
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=[SimpleNamespace(text="ok")], usage=SimpleNamespace(**self.usage))
+
+
+def test_system_param_marks_cacheable_segments_only():
+    segments = [PromptSegment("static rules", cache=True), PromptSegment("per-call tail")]
+    assert system_param(segments) == [
+        {"type": "text", "text": "static rules", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "per-call tail"},
+    ]
+    assert system_param(segments, caching=False)[0] == {"type": "text", "text": "static rules"}
+    assert system_param("plain") == "plain"
+    assert prompt_text(segments) == "static rules\nper-call tail"
+
+    many = [PromptSegment(str(i), cache=True) for i in range(6)]
+    marked = [b["text"] for b in system_param(many) if "cache_control" in b]
+    assert marked == ["2", "3", "4", "5"]
+
+
+def test_complete_sends_cache_control_and_prices_cache_tokens(tmp_path):
+    messages = FakeMessages({
+        "input_tokens": 100, "output_tokens": 50,
+        "cache_read_input_tokens": 2000, "cache_creation_input_tokens": 1000,
+    })
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.client = SimpleNamespace(messages=messages)
+
+    model = "claude-sonnet-4-5-20250929"
+    response = provider.complete(
+        [PromptSegment("constitution", cache=True), PromptSegment("You are Tester, a bot.")],
+        "hello", max_tokens=50, temperature=0.0, model=model,
+    )
+
+    assert messages.calls[0]["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert response.cache_read_tokens == 2000
+    assert response.cache_write_tokens == 1000
+    stats = provider.get_stats()
+    assert stats["cache_read_input_tokens"] == 2000
+    assert stats["cache_creation_input_tokens"] == 1000
+    assert stats["prompt_cache_read_ratio"] == pytest.approx(2000 / 3100, abs=1e-3)
+    rates = provider.cost_rates[model]
+    expected = (100 + 1000 * 1.25 + 2000 * 0.1) * rates["input"] / 1e6 + 50 * rates["output"] / 1e6
+    assert stats["estimated_cost_usd"] == pytest.approx(expected, abs=1e-4)
+
+
+def test_agent_config_exposes_role_prompt_as_cacheable_segment():
+    config = AgentConfig(
+        id="t1", name="Tester", agent_type="state", role="Researcher",
+        mandate="Test things.", constraints=["Be brief"],
+    )
+    (segment,) = config.system_segments
+    assert segment.cache
+    assert segment.text == config.system_prompt
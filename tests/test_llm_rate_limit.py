@@ -0,0 +1,57 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.ratelimit import RateLimiter, TokenBucket
+from config.settings import MODEL_IDS
+
+
+def test_token_bucket_allows_burst_then_reports_deficit():
+    bucket = TokenBucket(per_minute=60)  # 1 per second
+    now = time.monotonic()
+    assert all(bucket.reserve(1, now) == 0.0 for _ in range(60))
+    wait = bucket.reserve(1, now)
+    assert 0.9 < wait <= 1.01
+
+
+def test_limits_are_per_tier_and_parallel_callers_do_not_serialize():
+    limiter = RateLimiter(
+        limits={
+            "haiku": {"requests_per_minute": 600, "tokens_per_minute": 0},
+            "sonnet": {"requests_per_minute": 1, "tokens_per_minute": 0},
+        },
+        enabled=True,
+    )
+    waits = []
+    lock = threading.Lock()
+
+    def call():
+        w = limiter.reserve(MODEL_IDS["haiku"], 100)
+        with lock:
+            waits.append(w)
+
+    threads = [threading.Thread(target=call) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert waits == [0.0] * 20
+
+    assert limiter.reserve(MODEL_IDS["sonnet"]) == 0.0
+    assert limiter.reserve(MODEL_IDS["sonnet"]) > 30  # sonnet bucket exhausted, haiku unaffected
+    assert limiter.stats()["sonnet"]["waits"] == 1
+
+
+def test_penalize_blocks_tier_for_retry_after_and_usage_reconciles_tokens():
+    limiter = RateLimiter(limits={"default": {"requests_per_minute": 0, "tokens_per_minute": 6000}}, enabled=True)
+    model = MODEL_IDS["sonnet"]
+    assert limiter.reserve(model, 6000) == 0.0
+    limiter.record_usage(model, estimated_tokens=6000, actual_tokens=1000)
+    assert limiter.reserve(model, 4000) == 0.0  # unused reservation was credited back
+
+    limiter.penalize(model, 5.0)
+    assert 4.5 < limiter.reserve(model) <= 5.0
+    assert limiter.stats()["sonnet"]["penalties"] == 1
@@ -0,0 +1,125 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache
+from core.exceptions import LLMTimeoutException
+from core.llm import LLMProvider
+from core.ratelimit import RateLimiter
+from core.singleflight import SingleFlight
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+class SlowMessages:
+    """Blocks every call until released so concurrent callers overlap."""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.release = threading.Event()
+        self.error = error
+
+    def create(self, **kwargs):
+        self.calls += 1
+        self.release.wait(timeout=5)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="shared answer")],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+
+
+def _api_provider(messages, tmp_path):
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.client = SimpleNamespace(messages=messages)
+    return provider
+
+
+def _run_concurrently(fn, n):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def _wait_for_followers(flight, n):
+    for _ in range(500):
+        if flight.joined >= n:
+            return
+        threading.Event().wait(0.01)
+
+
+def test_concurrent_identical_calls_share_one_api_call(tmp_path):
+    messages = SlowMessages()
+    provider = _api_provider(messages, tmp_path)
+    threads, results, errors = _run_concurrently(
+        lambda: provider.complete("sys", "same prompt", temperature=0.0), 5
+    )
+    _wait_for_followers(provider._inflight, 4)
+    messages.release.set()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert messages.calls == 1
+    assert [r.content for r in results] == ["shared answer"] * 5
+    stats = provider.get_stats()
+    assert stats["inflight_joined"] == 4
+    assert stats["total_calls"] == 1
+    assert stats["total_input_tokens"] == 10
+
+
+def test_followers_receive_leader_exception(tmp_path):
+    messages = SlowMessages(error=APITimeoutError("request timed out"))
+    provider = _api_provider(messages, tmp_path)
+    provider.MAX_RETRIES = 0
+    threads, results, errors = _run_concurrently(
+        lambda: provider.complete("sys", "doomed", temperature=0.0), 3
+    )
+    _wait_for_followers(provider._inflight, 2)
+    messages.release.set()
+    for t in threads:
+        t.join()
+
+    assert messages.calls == 1
+    assert len(errors) == 3
+    assert all(isinstance(e, LLMTimeoutException) for e in errors)
+    assert provider._inflight.in_flight() == 0
+
+
+def test_async_followers_join_without_blocking_the_loop():
+    flight = SingleFlight()
+    calls = []
+
+    async def leader_call():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*[flight.ado("k", leader_call) for _ in range(4)])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert [r for r, _ in results] == ["value"] * 4
+    assert sorted(joined for _, joined in results) == [False, True, True, True]
+    assert flight.stats() == {"leaders": 1, "joined": 3, "in_flight": 0}
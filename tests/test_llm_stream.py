@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+class FakeStream:
+    def __init__(self, deltas, fail_after=None):
+        self.deltas = deltas
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        for i, delta in enumerate(self.deltas):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("api overloaded")
+            yield delta
+
+    def get_final_message(self):
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="".join(self.deltas))],
+            usage=SimpleNamespace(input_tokens=20, output_tokens=len(self.deltas)),
+        )
+
+
+class FakeMessages:
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.calls = []
+
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.streams.pop(0)
+
+
+def _api_provider(messages, tmp_path):
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.client = SimpleNamespace(messages=messages)
+    provider.BACKOFF_SCHEDULE = [0.0, 0.0, 0.0]
+    return provider
+
+
+def test_stream_yields_deltas_then_final_response_and_caches(tmp_path):
+    messages = FakeMessages([FakeStream(['{"verdict"', ': "PASS"', "}"])])
+    provider = _api_provider(messages, tmp_path)
+
+    chunks = list(provider.stream("sys", "judge this", max_tokens=50, temperature=0.0))
+    assert [c.text for c in chunks[:-1]] == ['{"verdict"', ': "PASS"', "}"]
+    final = chunks[-1].response
+    assert final.content == '{"verdict": "PASS"}'
+    assert final.output_tokens == 3
+    assert provider.get_stats()["streamed_calls"] == 1
+
+    replay = list(provider.stream("sys", "judge this", max_tokens=50, temperature=0.0))
+    assert replay[0].text == final.content
+    assert replay[-1].response.cached
+    assert len(messages.calls) == 1
+
+
+def test_stream_retries_before_first_delta_but_not_after(tmp_path):
+    messages = FakeMessages([FakeStream(["a", "b"], fail_after=0), FakeStream(["a", "b"])])
+    provider = _api_provider(messages, tmp_path)
+    chunks = list(provider.stream("sys", "retry me", temperature=0.0))
+    assert chunks[-1].response.content == "ab"
+    assert len(messages.calls) == 2
+
+    messages = FakeMessages([FakeStream(["a", "b"], fail_after=1), FakeStream(["a", "b"])])
+    provider = _api_provider(messages, tmp_path)
+    chunks = list(provider.stream("sys", "no retry", temperature=0.0))
+    assert chunks[0].text == "a"
+    assert chunks[-1].response.content.startswith("[LLM ERROR")
+    assert len(messages.calls) == 1
+
+
+def test_router_complete_with_on_delta_streams_and_records_cost():
+    router = ModelRouter(mock_mode=True)
+    deltas = []
+    response = router.complete(
+        "sydyn_judge", "You are Tester, a bot.", "evaluate", on_delta=deltas.append
+    )
+    assert len(deltas) > 1
+    assert "".join(deltas) == response.content
+    assert router.get_stats()["cost_by_task_type"]["sydyn_judge"]["calls"] == 1
@@ -0,0 +1,130 @@
+import gc
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import budget
+from core.budget import TokenBudgets
+from core.cache import MemoryResponseCache
+from core.llm import LLMProvider
+from core.models import ModelRouter
+from core.ratelimit import RateLimiter
+
+
+class TruncatingMessages:
+    """Answers fit in `needed` output tokens; smaller budgets are cut off."""
+
+    def __init__(self, needed: int):
+        self.needed = needed
+        self.budgets = []
+
+    def create(self, **kwargs):
+        budget = kwargs["max_tokens"]
+        self.budgets.append(budget)
+        truncated = budget < self.needed
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="partial {" if truncated else '{"complete": true}')],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=min(budget, self.needed)),
+            stop_reason="max_tokens" if truncated else "end_turn",
+        )
+
+
+def _router(messages, tmp_path) -> ModelRouter:
+    provider = LLMProvider(
+        api_key="test-key", mode="api",
+        cache=MemoryResponseCache(), rate_limiter=RateLimiter(limits={}, enabled=True),
+    )
+    provider._error_log_path = tmp_path / "api_errors.log"
+    provider.client = SimpleNamespace(messages=messages)
+    router = ModelRouter(mock_mode=True)
+    router._provider = provider
+    return router
+
+
+def test_budget_is_high_percentile_plus_headroom_after_min_samples():
+    budgets = TokenBudgets(enabled=True, percentile=90, headroom=0.5, min_samples=10,
+                           floor=16, ceiling=4096, window=100)
+    for tokens in range(10, 100, 10):
+        budgets.record("judge", tokens)
+    assert budgets.max_tokens("judge", 1000) == 1000  # 9 samples: keep the caller's value
+
+    budgets.record("judge", 100)
+    assert budgets.max_tokens("judge", 1000) == 135   # p90 = 90, * 1.5
+    assert budgets.max_tokens("other", 700) == 700
+    assert budgets.retry_budget(135) == 270
+    assert budgets.retry_budget(4096) is None
+
+
+def test_samples_persist_across_instances(tmp_path):
+    path = tmp_path / "budgets.json"
+    first = TokenBudgets(path=str(path), enabled=True, percentile=100, headroom=0.0,
+                         min_samples=3, floor=1, ceiling=4096)
+    for tokens in (40, 50, 60):
+        first.record("sydyn_researcher", tokens)
+    first.save()
+
+    second = TokenBudgets(path=str(path), enabled=True, percentile=100, headroom=0.0,
+                          min_samples=3, floor=1, ceiling=4096)
+    assert second.max_tokens("sydyn_researcher", 2000) == 60
+
+
+def test_save_merges_samples_from_every_instance(tmp_path):
+    path = tmp_path / "budgets.json"
+    kwargs = dict(path=str(path), enabled=True, percentile=100, headroom=0.0, min_samples=2, floor=1, ceiling=4096)
+    first, second = TokenBudgets(**kwargs), TokenBudgets(**kwargs)  # Both start from the same (empty) file
+    first.record("sydyn_researcher", 70)
+    first.record("sydyn_researcher", 80)
+    second.record("sydyn_judge", 30)
+    second.record("sydyn_judge", 40)
+    first.save()
+    second.save()  # Saved last, but must not drop what the first instance learned
+
+    third = TokenBudgets(**kwargs)
+    assert third.max_tokens("sydyn_researcher", 2000) == 80
+    assert third.max_tokens("sydyn_judge", 2000) == 40
+
+
+def test_exit_hook_saves_live_instances_without_keeping_them_alive(tmp_path):
+    path = tmp_path / "budgets.json"
+    kwargs = dict(path=str(path), enabled=True, percentile=100, headroom=0.0, min_samples=1, floor=1, ceiling=4096)
+    kept, dropped = TokenBudgets(**kwargs), TokenBudgets(**kwargs)
+    kept.record("sydyn_critic", 90)
+    del dropped
+    gc.collect()
+    assert len([b for b in budget._persisted if b.path == path]) == 1
+
+    budget._save_all()
+    assert TokenBudgets(**kwargs).max_tokens("sydyn_critic", 2000) == 90
+
+
+def test_router_reruns_truncated_response_with_larger_budget(tmp_path):
+    messages = TruncatingMessages(needed=1500)
+    router = _router(messages, tmp_path)
+
+    response = router.complete("sydyn_judge", "You are Judge, a bot.", "rule on this", max_tokens=1000)
+
+    assert response.content == '{"complete": true}'
+    assert response.stop_reason == "end_turn"
+    assert messages.budgets == [1000, 2000]
+    row = router.get_stats()["token_budgets"]["sydyn_judge"]
+    assert (row["calls"], row["truncated"], row["retried"]) == (2, 1, 1)
+    assert row["truncation_rate"] == 0.5
+
+    # Only the complete answer was cached
+    again = router.complete("sydyn_judge", "You are Judge, a bot.", "rule on this", max_tokens=1000)
+    assert again.cached and again.content == '{"complete": true}'
+    assert messages.budgets == [1000, 2000]
+
+
+def test_router_replaces_hardcoded_budget_once_learned(tmp_path):
+    messages = TruncatingMessages(needed=200)
+    router = _router(messages, tmp_path)
+    router._budgets = TokenBudgets(enabled=True, percentile=99, headroom=0.25, min_samples=3,
+                                   floor=64, ceiling=8192)
+
+    for i in range(4):
+        router.complete("sydyn_researcher", "You are Researcher, a bot.", f"question {i}", max_tokens=2000)
+
+    assert messages.budgets == [2000, 2000, 2000, 250]
@@ -475,3 +475,49 @@ def test_state_researcher_prompt_includes_operational_def_hint():
     cfg = create_state_researcher("Axiom", "philosophy", "rationalist")
     # Check that mandate exists
     assert cfg.mandate is not None
+
+
+def test_rival_pipeline_batches_independent_haiku_calls(db, tmp_path, monkeypatch):
+    import governance.perpetual as perpetual
+    from config.settings import MOCK_CONFIG
+    from content.generator import ContentGenerator
+    from core.models import ModelRouter
+    from governance.states import RivalPair, State, StateManager
+
+    models = ModelRouter(mock_mode=True, batch_mode=True)
+    batches = []
+    complete_batch = models.complete_batch
+
+    def recording_batch(calls):
+        batches.append([c["task_type"] for c in calls])
+        return complete_batch(calls)
+
+    monkeypatch.setattr(models, "complete_batch", recording_batch)
+    monkeypatch.setattr(perpetual, "validate_claim", lambda *a, **k: (True, []))
+    judge = perpetual.determine_outcome  # Scores high enough for newsroom + debate on both exchanges
+    monkeypatch.setattr(perpetual, "determine_outcome", lambda *a, **k: {
+        **judge(*a, **k), "scores": {"drama": 7, "novelty": 5, "depth": 3},
+    })
+
+    states = [
+        State(name=name, domain="physics", approach="approach", budget=100, db=db, models=models, cycle_formed=1)
+        for name in ("Alpha", "Beta")
+    ]
+    manager = StateManager(db, models)
+    manager.add_pair(RivalPair(domain="physics", state_a=states[0], state_b=states[1],
+                               pair_id=str(uuid.uuid4()), cycle_formed=1, warmup_remaining=0))
+    engine = PerpetualEngine(
+        state_manager=manager, founder_profiles=[], constitution_text="", db=db, models=models,
+        content_gen=ContentGenerator(str(tmp_path / "content"), models), config=dict(MOCK_CONFIG),
+        output_dir=str(tmp_path),
+    )
+    engine.cycle = 1
+    engine.cycle_log_data = {"content": []}
+
+    result = engine._run_rival_pipeline(manager.pairs[0])
+
+    assert not result.get("skipped")
+    assert batches[0] == ["normalization", "normalization", "premise_decomposition", "premise_decomposition"]
+    assert batches[1] == ["rebuttal_newness", "rebuttal_newness"]
+    assert batches[2:] == [["content_generation"] * 6]
+    assert models.get_stats()["batches_submitted"] == 3
@@ -43,7 +43,7 @@ from takeoff.confidence import (
     format_confidence_explanation,
     FEATURE_WEIGHTS,
 )
-from takeoff.extraction import extract_json_from_response
+from takeoff.extraction import extract_json_from_response, _simulate_vision_response
 from takeoff.schema import TakeoffDB
 
 
@@ -3118,6 +3118,1132 @@ class TestCheckerVision(unittest.TestCase):
             self.assertEqual(attacks[0]["severity"], "major")
 
 
+class TestAsyncModelRouter(unittest.TestCase):
+    """ModelRouter.acomplete: async routing over a shared AsyncAnthropic client."""
+
+    def test_acomplete_routes_model_and_tracks_cost(self):
+        import asyncio
+        from types import SimpleNamespace
+        from takeoff.models import ModelRouter
+        from takeoff.settings import MODEL_IDS
+
+        seen = {}
+
+        async def fake_create(**kwargs):
+            seen.update(kwargs)
+            return SimpleNamespace(
+                content=[SimpleNamespace(text='{"ok": true}')],
+                usage=SimpleNamespace(input_tokens=100, output_tokens=20),
+            )
+
+        router = ModelRouter(api_key="test-key")
+        router._provider._get_async_client = lambda: SimpleNamespace(
+            messages=SimpleNamespace(create=fake_create)
+        )
+        response = asyncio.run(router.acomplete("takeoff_judge", "sys", "user", max_tokens=50))
+
+        self.assertEqual(response.content, '{"ok": true}')
+        self.assertEqual(seen["model"], MODEL_IDS["sonnet"])
+        self.assertEqual(seen["temperature"], 0.2)
+        stats = router.get_stats()
+        self.assertEqual(stats["model_router_calls"], 1)
+        self.assertGreater(stats["model_router_cost_usd"], 0)
+
+
+class TestPromptCaching(unittest.TestCase):
+    """Structured system prompts: cache_control on static segments, cache token accounting."""
+
+    def test_judge_sends_cacheable_rules_prefix_and_records_cache_tokens(self):
+        from types import SimpleNamespace
+        from takeoff.agents import Judge
+        from takeoff.constitution import get_constitution
+        from takeoff.extraction import FixtureSchedule
+        from takeoff.models import ModelRouter
+
+        seen = {}
+
+        def fake_create(**kwargs):
+            seen.update(kwargs)
+            return SimpleNamespace(
+                content=[SimpleNamespace(text='{"verdict": "PASS"}')],
+                usage=SimpleNamespace(
+                    input_tokens=40, output_tokens=10,
+                    cache_read_input_tokens=1500, cache_creation_input_tokens=0,
+                ),
+            )
+
+        router = ModelRouter(api_key="test-key")
+        router._provider.client = SimpleNamespace(messages=SimpleNamespace(create=fake_create))
+        result = Judge(router, get_constitution()).evaluate(
+            {"fixture_counts": [], "grand_total_fixtures": 0, "areas_covered": []},
+            [], None, FixtureSchedule(), mode="strict",
+        )
+
+        self.assertEqual(result["verdict"], "PASS")
+        rules_block, mode_block = seen["system"]
+        self.assertEqual(rules_block["cache_control"], {"type": "ephemeral"})
+        self.assertIn("HARD RULES", rules_block["text"])
+        self.assertEqual(mode_block, {"type": "text", "text": "MODE: STRICT"})
+        stats = router.get_stats()
+        self.assertEqual(stats["provider_cache_read_tokens"], 1500)
+        self.assertGreater(stats["provider_prompt_cache_read_ratio"], 0.9)
+
+
+class TestStreamingPartials(unittest.TestCase):
+    """ModelRouter.stream / on_delta: token deltas forwarded from Judge to a partial callback."""
+
+    def test_judge_forwards_partial_output_and_returns_full_ruling(self):
+        from types import SimpleNamespace
+        from takeoff.agents import Judge
+        from takeoff.constitution import get_constitution
+        from takeoff.extraction import FixtureSchedule
+        from takeoff.models import ModelRouter
+
+        deltas = ['{"verdict": ', '"PASS", ', '"flags": []}']
+
+        class FakeStream:
+            text_stream = iter(deltas)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def get_final_message(self):
+                return SimpleNamespace(
+                    content=[SimpleNamespace(text="".join(deltas))],
+                    usage=SimpleNamespace(input_tokens=50, output_tokens=12),
+                )
+
+        router = ModelRouter(api_key="test-key")
+        router._provider.client = SimpleNamespace(
+            messages=SimpleNamespace(stream=lambda **kwargs: FakeStream())
+        )
+        partials = []
+        result = Judge(router, get_constitution()).evaluate(
+            {"fixture_counts": [], "grand_total_fixtures": 0, "areas_covered": []},
+            [], None, FixtureSchedule(), mode="fast", on_partial=partials.append,
+        )
+
+        self.assertEqual(partials, deltas)
+        self.assertEqual(result["verdict"], "PASS")
+        self.assertEqual(router.get_stats()["model_router_calls"], 1)
+
+
+class TestVisionSingleFlight(unittest.TestCase):
+    """_call_vision_with_retry: concurrent identical vision requests share one API call."""
+
+    def test_identical_concurrent_vision_calls_are_joined(self):
+        import threading
+        from unittest.mock import patch
+        import takeoff.extraction as extraction
+
+        release = threading.Event()
+        calls = []
+
+        def slow_vision(*args, **kwargs):
+            calls.append(1)
+            release.wait(timeout=5)
+            return '{"fixtures": {}}'
+
+        results = []
+        before = extraction.get_vision_inflight_stats()["joined"]
+        with patch.object(extraction, "_call_vision", side_effect=slow_vision):
+            threads = [
+                threading.Thread(target=lambda: results.append(
+                    extraction._call_vision_with_retry(None, "sys", "count", "aW1n", max_retries=0)
+                ))
+                for _ in range(3)
+            ]
+            for t in threads:
+                t.start()
+            for _ in range(500):
+                if extraction.get_vision_inflight_stats()["joined"] - before >= 2:
+                    break
+                threading.Event().wait(0.01)
+            release.set()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['{"fixtures": {}}'] * 3)
+        self.assertEqual(extraction.get_vision_inflight_stats()["joined"] - before, 2)
+
+
+class TestVisionExtractionCache(unittest.TestCase):
+    """extract_*: identical snippet images are served from the persistent extraction cache."""
+
+    def setUp(self):
+        import tempfile
+        import takeoff.extraction as extraction
+        from takeoff.visioncache import VisionCache
+        self.extraction = extraction
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved = extraction._vision_cache
+        extraction._vision_cache = VisionCache(os.path.join(self._tmp.name, "vision.db"))
+
+    def tearDown(self):
+        self.extraction._vision_cache.close()
+        self.extraction._vision_cache = self._saved
+        self._tmp.cleanup()
+
+    def _patched(self, response_text):
+        from unittest.mock import patch
+        return patch.multiple(
+            self.extraction,
+            _get_vision_client=lambda: object(),
+            _call_vision_with_retry=lambda *a, **k: response_text,
+        )
+
+    def test_resubmitted_image_skips_vision_call(self):
+        from unittest.mock import patch
+        from takeoff.extraction import extract_fixture_schedule
+        schedule_json = _simulate_vision_response("fixture schedule", "")
+        with self._patched(schedule_json):
+            first = extract_fixture_schedule("aW1hZ2U=")
+        # Same bytes with a data-URI prefix: still a hit, and no client is needed
+        with patch.object(self.extraction, "_call_vision_with_retry", side_effect=AssertionError("API called")):
+            second = extract_fixture_schedule("data:image/png;base64,aW1hZ2U=")
+        self.assertEqual(second, first)
+        stats = self.extraction.get_vision_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hits_by_function"], {"fixture_schedule": 1})
+
+    def test_rcp_key_includes_schedule_and_bypass_refreshes(self):
+        from takeoff.extraction import FixtureSchedule, extract_rcp_counts
+        rcp_json = _simulate_vision_response("reflected ceiling plan", "")
+        schedule_a = FixtureSchedule(fixtures={"A": {"description": "troffer"}})
+        schedule_b = FixtureSchedule(fixtures={"B": {"description": "downlight"}})
+        with self._patched(rcp_json):
+            extract_rcp_counts("aW1n", schedule_a, "North")
+            extract_rcp_counts("aW1n", schedule_b, "North")
+            extract_rcp_counts("aW1n", schedule_a, "North", use_cache=False)
+            hit = extract_rcp_counts("aW1n", schedule_a, "North")
+        self.assertEqual(hit.counts_by_type, {"A": 18, "B": 6})
+        stats = self.extraction.get_vision_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bypassed"]), (1, 2, 1))
+        self.assertEqual(stats["entries"], 2)
+
+    def test_failed_extraction_is_not_cached_and_lru_evicts(self):
+        from takeoff.extraction import extract_panel_schedule
+        from takeoff.visioncache import VisionCache
+        with self._patched("not json"):
+            failed = extract_panel_schedule("aW1n")
+        self.assertTrue(failed.warnings)
+        self.assertEqual(self.extraction.get_vision_cache_stats()["entries"], 0)
+
+        cache = VisionCache(os.path.join(self._tmp.name, "small.db"), max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, "panel_schedule", {"key": key})
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), {"key": "c"})
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache.close()
+
+
+class TestImagePreprocessing(unittest.TestCase):
+    """takeoff/imageprep.py: snippets are cropped, downsampled and re-encoded before vision calls."""
+
+    @staticmethod
+    def _drawing_b64(size=(3000, 2200), ink=(0, 0, 0)):
+        import base64
+        import io
+        from PIL import Image, ImageDraw
+        img = Image.new("RGBA", size, (255, 255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for x in range(900, 2100, 150):  # fixture symbols in the middle of a wide white sheet
+            draw.rectangle([x, 800, x + 60, 830], outline=ink + (255,), width=3)
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+    def test_crop_grayscale_and_downsample_shrink_payload(self):
+        from takeoff.imageprep import prepare_image
+        prepared = prepare_image(self._drawing_b64())
+        self.assertIsNotNone(prepared)
+        width, height = prepared.size_after
+        self.assertLessEqual(max(width, height), 1568)
+        self.assertLess(width * height, 1300 * 100)  # margins cropped to the symbol band
+        self.assertLess(prepared.tokens_after, prepared.tokens_before)
+        self.assertLess(prepared.bytes_after, prepared.bytes_before)
+        self.assertIn(prepared.media_type, ("image/png", "image/webp"))
+
+    def test_call_vision_sends_prepared_image_and_reports_savings(self):
+        from unittest.mock import MagicMock
+        from takeoff.extraction import _call_vision, reset_vision_cost
+        from takeoff.imageprep import get_image_prep_stats
+        reset_vision_cost()
+        client = MagicMock()
+        client.messages.create.return_value = MagicMock(
+            content=[MagicMock(text="{}")], usage=MagicMock(input_tokens=10, output_tokens=5)
+        )
+        image = self._drawing_b64(size=(2400, 1800))
+        _call_vision(client, "sys", "count", image)
+        _call_vision(client, "sys", "verify", image)  # Checker-style second call: cached
+
+        source = client.messages.create.call_args.kwargs["messages"][0]["content"][0]["source"]
+        self.assertNotEqual(source["data"], image.split(",", 1)[1])
+        stats = get_image_prep_stats()
+        self.assertEqual((stats["images_sent"], stats["images_prepared"], stats["cache_hits"]), (2, 1, 1))
+        self.assertGreater(stats["tokens_saved"], 0)
+        self.assertGreater(stats["bytes_saved"], 0)
+
+    def test_non_image_payload_is_sent_unchanged(self):
+        from takeoff.imageprep import prepare_image
+        self.assertIsNone(prepare_image("dGVzdA=="))
+
+    def test_concurrent_jobs_report_their_own_image_prep(self):
+        import threading
+        from takeoff.imageprep import prepare_image
+        from takeoff.usage import UsageLedger, usage_ledger
+        images = {"a": [self._drawing_b64(size=(2300, 1701 + i)) for i in range(3)],
+                  "b": [self._drawing_b64(size=(2001, 1501))] * 2}
+        ledgers = {"a": UsageLedger("a"), "b": UsageLedger("b")}
+        barrier = threading.Barrier(2)
+
+        def job(name):
+            with usage_ledger(ledgers[name]):
+                barrier.wait()
+                for image in images[name]:
+                    prepare_image(image)
+
+        threads = [threading.Thread(target=job, args=(name,)) for name in ledgers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(30)
+
+        a, b = ledgers["a"].image_prep(), ledgers["b"].image_prep()
+        self.assertEqual((a["images_sent"], a["images_prepared"], a["cache_hits"]), (3, 3, 0))
+        self.assertEqual((b["images_sent"], b["images_prepared"], b["cache_hits"]), (2, 1, 1))
+        self.assertGreater(b["tokens_saved"], 0)
+        self.assertEqual(ledgers["b"].summary()["image_prep"], b)
+
+
+class TestTiledRcpCounting(unittest.TestCase):
+    """takeoff/tiling.py: large RCP sheets are counted tile by tile with seam de-duplication."""
+
+    def test_tile_cores_partition_the_sheet(self):
+        from takeoff.tiling import plan_tiles
+        tiles = plan_tiles(5000, 3500, tile_px=1000, overlap_px=100)
+        self.assertGreater(len(tiles), 1)
+        for x in range(0, 5000, 37):
+            for y in range(0, 3500, 41):
+                owners = [t for t in tiles if t.owns(x, y)]
+                self.assertEqual(len(owners), 1)
+                left, top, right, bottom = owners[0].box
+                self.assertTrue(left <= x < right and top <= y < bottom)
+
+    def test_tile_count_is_capped(self):
+        from takeoff.tiling import plan_tiles
+        self.assertLessEqual(len(plan_tiles(12000, 9000, max_tiles=16)), 16)
+        self.assertEqual(len(plan_tiles(800, 600)), 1)
+
+    def test_symbol_in_overlap_is_counted_once(self):
+        from takeoff.tiling import merge_tile_detections, plan_tiles
+        tiles = plan_tiles(1900, 1000, tile_px=1000, overlap_px=100)
+        self.assertEqual(len(tiles), 2)
+        seam_x = 950  # inside both tiles' boxes
+        merged = merge_tile_detections(tiles, [
+            [{"type_tag": "A", "x": seam_x - tiles[0].box[0], "y": 500}, {"type_tag": "B", "x": 10, "y": 10}],
+            [{"type_tag": "A", "x": seam_x - tiles[1].box[0], "y": 500}, {"type_tag": "B"}],
+        ])
+        self.assertEqual(merged.counts_by_type, {"A": 1, "B": 2})
+        self.assertEqual((merged.detections, merged.seam_duplicates, merged.unplaced), (4, 1, 1))
+
+    def test_extract_rcp_counts_merges_parallel_tiles(self):
+        import base64
+        import io
+        import re
+        from unittest.mock import patch
+        from PIL import Image
+        from takeoff.extraction import FixtureSchedule, extract_rcp_counts
+        from takeoff.tiling import plan_tiles
+
+        size = (4200, 3000)
+        buf = io.BytesIO()
+        Image.new("L", size, 255).save(buf, format="PNG")
+        sheet = "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+        tiles = plan_tiles(*size)
+        # One symbol per tile centre plus one on every vertical seam
+        symbols = [("A", (t.box[0] + t.box[2]) / 2, (t.box[1] + t.box[3]) / 2) for t in tiles]
+        symbols += [("B", t.core[2], (t.box[1] + t.box[3]) / 2) for t in tiles if t.core[2] < size[0]]
+
+        def fake_vision(client, system_prompt, user_text, image_base64, **kwargs):
+            self.assertFalse(kwargs.get("preprocess", True))
+            index = int(re.search(r"tile (\d+) of", user_text).group(1)) - 1
+            width = int(re.search(r"(\d+)x\d+ pixels", user_text).group(1))
+            tile = tiles[index]
+            scale = width / (tile.box[2] - tile.box[0])
+            found = [
+                {"type_tag": tag, "x": (x - tile.box[0]) * scale, "y": (y - tile.box[1]) * scale}
+                for tag, x, y in symbols
+                if tile.box[0] <= x < tile.box[2] and tile.box[1] <= y < tile.box[3]
+            ]
+            return json.dumps({"fixtures": found, "notes": ["TYP"], "warnings": []})
+
+        with patch("takeoff.extraction._get_vision_client", return_value=object()), \
+             patch("takeoff.extraction._call_vision_with_retry", side_effect=fake_vision) as call:
+            result = extract_rcp_counts(sheet, FixtureSchedule(), "Level 1", use_cache=False, tiled=True)
+
+        self.assertEqual(call.call_count, len(tiles))
+        seams = sum(1 for tag, _, _ in symbols if tag == "B")
+        self.assertEqual(result.counts_by_type, {"A": len(tiles), "B": seams})
+        self.assertEqual(result.notes, ["TYP"])
+
+    def test_checker_attacks_from_tiled_count(self):
+        from takeoff.agents import _tiled_count_attacks
+        attacks = _tiled_count_attacks("Level 1", {"A": 20, "B": 9}, {"A": 20, "B": 10, "C": 1})
+        by_tag = {a["affected_type_tag"]: a for a in attacks}
+        self.assertEqual(set(by_tag), {"B", "C"})
+        self.assertEqual(by_tag["B"]["severity"], "major")
+        self.assertEqual(by_tag["B"]["suggested_correction"], 9)
+        self.assertEqual(by_tag["C"]["severity"], "critical")
+
+
+class TestVisionScheduler(unittest.TestCase):
+    """takeoff/scheduler.py: one global cap on vision calls, granted by priority and fairly across jobs."""
+
+    @staticmethod
+    def _queue_behind_held_slot(scheduler, requests):
+        """Hold the only slot, queue (job, priority) requests in order, release; return grant order."""
+        import threading
+        import time as _time
+        granted = []
+        held = scheduler.slot("fixture_schedule", job_id="holder")
+        held.__enter__()
+        threads = []
+        for job, priority in requests:
+            def run(job=job, priority=priority):
+                with scheduler.slot(priority, job_id=job):
+                    granted.append((job, priority))
+            threads.append(threading.Thread(target=run))
+            threads[-1].start()
+            while scheduler.queue_depth < len(threads):
+                _time.sleep(0.001)
+        held.__exit__(None, None, None)
+        for t in threads:
+            t.join(5)
+        return granted
+
+    def test_critical_path_priorities_go_first(self):
+        from takeoff.scheduler import VisionScheduler
+        scheduler = VisionScheduler(max_concurrency=1)
+        order = self._queue_behind_held_slot(
+            scheduler, [("j1", "checker"), ("j1", "rcp_counts"), ("j1", "fixture_schedule")]
+        )
+        self.assertEqual([p for _, p in order], ["fixture_schedule", "rcp_counts", "checker"])
+        stats = scheduler.stats()
+        self.assertEqual((stats["in_flight"], stats["queue_depth"], stats["peak_queue_depth"]), (0, 0, 3))
+        self.assertEqual(stats["waits"]["calls"], 4)
+        self.assertIn("checker", stats["waits_by_task"])
+
+    def test_jobs_take_turns_within_a_priority(self):
+        from takeoff.scheduler import VisionScheduler
+        scheduler = VisionScheduler(max_concurrency=1)
+        order = self._queue_behind_held_slot(
+            scheduler, [("big", "rcp_counts")] * 3 + [("small", "rcp_counts")]
+        )
+        self.assertEqual([job for job, _ in order], ["big", "small", "big", "big"])
+        self.assertEqual(scheduler.job_stats("small")["calls"], 1)
+
+    def test_submit_carries_job_into_pool_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from takeoff.scheduler import current_job, submit, vision_job
+        with ThreadPoolExecutor(max_workers=1) as pool, vision_job("job-42"):
+            self.assertEqual(submit(pool, current_job).result(), "job-42")
+            self.assertIsNone(pool.submit(current_job).result())
+        self.assertIsNone(current_job())
+
+
+class TestPerJobUsageLedger(unittest.TestCase):
+    """takeoff/usage.py: concurrent jobs meter vision and agent usage into their own ledgers."""
+
+    @staticmethod
+    def _vision_client(input_tokens):
+        from unittest.mock import MagicMock
+        client = MagicMock()
+        client.messages.create.return_value = MagicMock(
+            content=[MagicMock(text="{}")],
+            usage=MagicMock(input_tokens=input_tokens, output_tokens=10),
+        )
+        return client
+
+    def test_concurrent_jobs_do_not_share_vision_usage(self):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from takeoff.extraction import _call_vision
+        from takeoff.scheduler import submit
+        from takeoff.usage import UsageLedger, usage_ledger
+
+        ledgers = {"a": UsageLedger("a"), "b": UsageLedger("b")}
+        barrier = threading.Barrier(2)
+
+        def job(name, input_tokens, calls):
+            client = self._vision_client(input_tokens)
+            with usage_ledger(ledgers[name]), ThreadPoolExecutor(max_workers=3) as pool:
+                barrier.wait()
+                futures = [submit(pool, _call_vision, client, "sys", f"{name}{i}", "dGVzdA==", task="rcp_counts")
+                           for i in range(calls)]
+                for f in futures:
+                    f.result()
+
+        threads = [threading.Thread(target=job, args=("a", 1000, 3)),
+                   threading.Thread(target=job, args=("b", 50, 2))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        a, b = ledgers["a"].totals("vision"), ledgers["b"].totals("vision")
+        self.assertEqual((a["calls"], a["input_tokens"], a["output_tokens"]), (3, 3000, 30))
+        self.assertEqual((b["calls"], b["input_tokens"], b["output_tokens"]), (2, 100, 20))
+        self.assertAlmostEqual(a["cost_usd"], 3000 * 3 / 1e6 + 30 * 15 / 1e6, places=6)
+        self.assertEqual(ledgers["a"].rows()[0]["task"], "rcp_counts")
+
+    def test_agent_calls_are_metered_and_persisted(self):
+        import tempfile
+        from types import SimpleNamespace
+        from takeoff.llm import LLMResponse
+        from takeoff.models import ModelRouter
+        from takeoff.schema import TakeoffDB
+        from takeoff.usage import UsageLedger, usage_ledger
+
+        router = ModelRouter(api_key="test-key")
+        router._provider = SimpleNamespace(complete=lambda **kw: LLMResponse(
+            content="{}", model=kw["model"], input_tokens=200, output_tokens=40,
+            cost_usd=0.0012, latency_ms=350,
+        ))
+        ledger = UsageLedger("job1")
+        router.complete("takeoff_judge", "sys", "outside any job")
+        with usage_ledger(ledger):
+            router.complete("takeoff_counter", "sys", "count")
+            router.complete("takeoff_counter", "sys", "count again")
+        self.assertEqual(ledger.totals("agent")["calls"], 2)
+        self.assertEqual(ledger.totals()["latency_ms"], 700)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = TakeoffDB(os.path.join(tmp, "t.db"))
+            db.create_job("job1", mode="fast")
+            db.store_job_usage("job1", ledger.rows())
+            rows = db.get_job_usage("job1")
+            db.close()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]["kind"], rows[0]["task"], rows[0]["input_tokens"]), ("agent", "takeoff_counter", 400))
+        self.assertAlmostEqual(rows[0]["cost_usd"], 0.0024)
+
+
+class TestSnippetStore(unittest.TestCase):
+    """takeoff/snippetstore.py: snippets are decoded to disk once and passed around by handle."""
+
+    def test_spill_dedups_and_round_trips(self):
+        import base64
+        from takeoff.snippetstore import SnippetHandle, SnippetStore
+        raw = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 40
+        b64 = base64.b64encode(raw).decode()
+        with SnippetStore() as store:
+            handle = store.spill("data:image/png;base64," + b64)
+            again = store.spill(b64)
+            self.assertIsInstance(handle, SnippetHandle)
+            self.assertIs(again, handle)
+            self.assertEqual((handle.media_type, handle.size), ("image/png", len(raw)))
+            self.assertEqual(handle.read(), raw)
+            self.assertEqual(handle.base64(), b64)
+            self.assertEqual(store.stats(), {"files": 1, "bytes": len(raw), "deduplicated": 1})
+            self.assertEqual(store.spill(""), "")
+            self.assertIs(store.spill(handle), handle)
+            path = store.path
+        self.assertFalse(os.path.exists(path))
+
+    def test_handle_is_sent_and_cached_like_its_base64(self):
+        import base64
+        from unittest.mock import MagicMock
+        from takeoff.extraction import _call_vision
+        from takeoff.snippetstore import SnippetStore
+        from takeoff.visioncache import extraction_key
+        raw = b"\xff\xd8\xff\xe0not-really-a-jpeg"
+        b64 = base64.b64encode(raw).decode()
+        client = MagicMock()
+        client.messages.create.return_value = MagicMock(
+            content=[MagicMock(text="{}")], usage=MagicMock(input_tokens=1, output_tokens=1)
+        )
+        with SnippetStore() as store:
+            handle = store.spill(b64)
+            self.assertEqual(extraction_key("rcp_counts", 1, "m", handle), extraction_key("rcp_counts", 1, "m", b64))
+            _call_vision(client, "sys", "count", handle)
+        source = client.messages.create.call_args.kwargs["messages"][0]["content"][0]["source"]
+        self.assertEqual((source["media_type"], source["data"]), ("image/jpeg", b64))
+
+    def test_engine_spills_snippets_and_removes_its_store(self):
+        import tempfile
+        from unittest.mock import patch
+        from takeoff.engine import TakeoffEngine
+        from takeoff.extraction import FixtureSchedule
+        from takeoff.settings import API_CONFIG
+        from takeoff.snippetstore import SnippetHandle
+
+        seen = []
+
+        def fake_schedule(image, use_cache=True):
+            seen.append(image)
+            return FixtureSchedule()  # Empty schedule ends the job early
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch.dict(API_CONFIG, {"snippet_store_dir": tmp, "snippet_store_enabled": True}), \
+             patch("takeoff.engine.extract_fixture_schedule", side_effect=fake_schedule):
+            engine = TakeoffEngine(db_path=":memory:")
+            result = engine.run_takeoff([
+                {"id": "fs", "label": "fixture_schedule", "image_data": "aGVsbG8gd29ybGQ="},
+                {"id": "r1", "label": "rcp", "image_data": "aGVsbG8gd29ybGQ="},
+            ], mode="fast")
+            self.assertEqual(os.listdir(tmp), [])
+        self.assertEqual(result["error"], "extraction_failed")
+        self.assertIsInstance(seen[0], SnippetHandle)
+
+    def test_failed_spill_still_removes_the_store(self):
+        import tempfile
+        from unittest.mock import patch
+        from takeoff.engine import TakeoffEngine
+        from takeoff.settings import API_CONFIG
+        from takeoff.snippetstore import SnippetStore
+
+        real_put = SnippetStore.put_bytes
+        calls = []
+
+        def put_then_fail(store, raw, media_type=None):
+            calls.append(raw)
+            if len(calls) > 1:
+                raise OSError("No space left on device")
+            return real_put(store, raw, media_type)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch.dict(API_CONFIG, {"snippet_store_dir": tmp, "snippet_store_enabled": True}), \
+             patch.object(SnippetStore, "put_bytes", put_then_fail):
+            engine = TakeoffEngine(db_path=":memory:")
+            with self.assertRaises(OSError):
+                engine.run_takeoff([
+                    {"id": "fs", "label": "fixture_schedule", "image_data": "aGVsbG8gd29ybGQ="},
+                    {"id": "r1", "label": "rcp", "image_data": "c2Vjb25kIHNuaXBwZXQ="},
+                ], mode="fast")
+            self.assertEqual(os.listdir(tmp), [])
+
+
+def _pdf_pages(*sizes):
+    """Raw PDF bytes, one page per (width, height) in points, each with a black square at the top-left."""
+    import io
+    from PIL import Image, ImageDraw
+    pages = []
+    for w, h in sizes:
+        page = Image.new("RGB", (w, h), "white")
+        ImageDraw.Draw(page).rectangle([0, 0, 99, 99], fill="black")
+        pages.append(page)
+    buf = io.BytesIO()
+    pages[0].save(buf, format="PDF", resolution=72, save_all=True, append_images=pages[1:])
+    return buf.getvalue()
+
+
+class TestPdfPageRasterization(unittest.TestCase):
+    """takeoff/pdfpages.py: snippets reference PDF pages by page_number / bbox and share page renders."""
+
+    def setUp(self):
+        from takeoff.pdfpages import HAS_PDFIUM
+        if not HAS_PDFIUM:
+            self.skipTest("pypdfium2 not installed")
+
+    def test_bbox_forms_and_dpi_choice(self):
+        from takeoff.pdfpages import choose_dpi, parse_bbox
+        self.assertEqual(parse_bbox({"x": 10, "y": 20, "width": 100, "height": 50}), (10, 20, 110, 70))
+        self.assertEqual(parse_bbox({"x0": 10, "y0": 20, "x1": 110, "y1": 70}), (10, 20, 110, 70))
+        self.assertEqual(parse_bbox([10, 20, 110, 70]), (10, 20, 110, 70))
+        self.assertIsNone(parse_bbox(None))
+        with self.assertRaises(ValueError):
+            parse_bbox([10, 20, 5, 70])
+        # A 36x24 in sheet needs few pixels per inch; a 4 in detail gets the top step
+        self.assertEqual(choose_dpi(36 * 72, 24 * 72), 72)
+        self.assertEqual(choose_dpi(4 * 72, 3 * 72), 300)
+
+    def test_snippets_on_one_page_share_a_render(self):
+        import io
+        from PIL import Image
+        from takeoff.pdfpages import rasterize_snippets
+        from takeoff.snippetstore import SnippetHandle, SnippetStore, image_bytes
+        pdf = _pdf_pages((600, 400), (300, 300))
+        snippets = [
+            {"id": "a", "label": "rcp", "document_id": "set", "page_number": 1,
+             "bbox": {"x": 0, "y": 0, "width": 200, "height": 100}, "dpi": 144},
+            {"id": "b", "label": "rcp", "document_id": "set", "page_number": 1,
+             "bbox": [300, 200, 600, 400], "dpi": 144},
+            {"id": "c", "label": "fixture_schedule", "document_id": "set", "page_number": 2},
+            {"id": "d", "label": "plan_notes", "image_data": "aGVsbG8="},
+        ]
+        with SnippetStore() as store:
+            resolved, stats = rasterize_snippets(snippets, {"set": pdf}, store)
+            self.assertEqual(stats, {"documents": 1, "snippets_rendered": 3, "page_renders": 2, "page_cache_hits": 1})
+            self.assertIsInstance(resolved[0]["image_data"], SnippetHandle)
+            self.assertEqual(resolved[3], snippets[3])
+            first = Image.open(io.BytesIO(image_bytes(resolved[0]["image_data"])))
+            self.assertEqual(first.size, (400, 200))  # 200x100 pt at 2 px/pt
+            self.assertLess(first.convert("L").getpixel((10, 10)), 50)        # Inside the black square
+            self.assertGreater(first.convert("L").getpixel((300, 100)), 200)  # Outside it
+
+    def test_bad_references_raise(self):
+        from takeoff.pdfpages import rasterize_snippets
+        pdf = _pdf_pages((200, 200))
+        with self.assertRaises(ValueError):
+            rasterize_snippets([{"id": "x", "document_id": "missing"}], {"set": pdf})
+        with self.assertRaises(ValueError):
+            rasterize_snippets([{"id": "x", "document_id": "set", "page_number": 3}], {"set": pdf})
+
+    def test_engine_renders_document_snippets_before_extraction(self):
+        import tempfile
+        from unittest.mock import patch
+        from takeoff.engine import TakeoffEngine
+        from takeoff.extraction import FixtureSchedule
+        from takeoff.settings import API_CONFIG
+        from takeoff.snippetstore import SnippetHandle
+
+        seen = []
+
+        def fake_schedule(image, use_cache=True):
+            seen.append(image)
+            return FixtureSchedule()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, "set.pdf")
+            with open(pdf_path, "wb") as f:
+                f.write(_pdf_pages((400, 300), (400, 300)))
+            with patch.dict(API_CONFIG, {"snippet_store_enabled": True}), \
+                 patch("takeoff.engine.extract_fixture_schedule", side_effect=fake_schedule):
+                engine = TakeoffEngine(db_path=":memory:")
+                result = engine.run_takeoff([
+                    {"id": "fs", "label": "fixture_schedule", "document_id": "set", "page_number": 1},
+                    {"id": "r1", "label": "rcp", "document_id": "set", "page_number": 2},
+                ], mode="fast", documents={"set": pdf_path})
+                stored = engine.db.conn.execute(
+                    "SELECT document_id, page_number FROM snippets WHERE snippet_id = 'r1'"
+                ).fetchone()
+        self.assertEqual(result["error"], "extraction_failed")
+        self.assertIsInstance(seen[0], SnippetHandle)
+        self.assertEqual(seen[0].media_type, "image/png")
+        self.assertEqual(tuple(stored), ("set", 2))
+
+
+class TestPdfWithoutPdfium(unittest.TestCase):
+    """takeoff/pdfpages.py: a missing pypdfium2 fails up front, and only when a snippet needs a render."""
+
+    def test_document_snippet_without_pdfium_raises_install_hint(self):
+        from unittest.mock import patch
+        from takeoff.pdfpages import rasterize_snippets
+        plain = [{"id": "fs", "label": "fixture_schedule", "image_data": "aGVsbG8="}]
+        with patch("takeoff.pdfpages.HAS_PDFIUM", False):
+            self.assertEqual(rasterize_snippets(plain, {})[0], plain)
+            with self.assertRaisesRegex(ValueError, "pip install pypdfium2"):
+                rasterize_snippets(plain + [{"id": "r1", "document_id": "set"}], {"set": b"%PDF-1.4"})
+
+
+class TestIncrementalRetakeoff(unittest.TestCase):
+    """takeoff/incremental.py: base_job_id reuses extractions and Checker verdicts for unchanged snippets."""
+
+    def _router(self):
+        from unittest.mock import MagicMock
+        counts = {
+            "fixture_counts": [
+                {"type_tag": "A", "total": 6, "counts_by_area": {"North": 4, "South": 2},
+                 "description": "Troffer", "difficulty": "S", "accessories": [], "flags": []},
+            ],
+            "areas_covered": ["North", "South"],
+            "grand_total_fixtures": 6,
+        }
+        replies = {
+            "takeoff_counter": counts,
+            "takeoff_checker": {"attacks": [], "total_attacks": 0, "critical_count": 0},
+            "takeoff_judge": {"verdict": "PASS", "violations": [], "flags": [], "ruling_summary": "ok"},
+        }
+        router = MagicMock()
+        router.get_stats.return_value = {"model_router_cost_usd": 0.0}
+        router.complete.side_effect = lambda task_type, **kw: MagicMock(content=json.dumps(replies[task_type]))
+        return router
+
+    def test_only_changed_areas_are_recomputed(self):
+        import base64
+        from unittest.mock import MagicMock, patch
+        from takeoff.engine import TakeoffEngine
+        from takeoff.extraction import AreaCount, FixtureSchedule
+        from takeoff.settings import API_CONFIG
+
+        def img(tag):
+            return base64.b64encode(tag.encode() * 50).decode()
+
+        schedule_calls, rcp_calls, vision_calls = [], [], []
+
+        def fake_schedule(image, use_cache=True):
+            schedule_calls.append(image)
+            return FixtureSchedule(fixtures={"A": {"description": "Troffer"}})
+
+        def fake_rcp(image, schedule, area_label, use_cache=True):
+            rcp_calls.append(area_label)
+            return AreaCount(area_label=area_label, counts_by_type={"A": 4 if area_label == "North" else 2})
+
+        def fake_vision(client, system_prompt, user_text, image_base64, **kw):
+            vision_calls.append(user_text)
+            return json.dumps({"discrepancies": []})
+
+        def snippets(south):
+            return [
+                {"id": "fs", "label": "fixture_schedule", "image_data": img("schedule")},
+                {"id": "n", "label": "rcp", "sub_label": "North", "image_data": img("north")},
+                {"id": "s", "label": "rcp", "sub_label": "South", "image_data": img(south)},
+            ]
+
+        with patch.dict(API_CONFIG, {"snippet_store_enabled": False, "rcp_tiling": False}), \
+             patch("takeoff.engine.extract_fixture_schedule", side_effect=fake_schedule), \
+             patch("takeoff.engine.extract_rcp_counts", side_effect=fake_rcp), \
+             patch("takeoff.agents._get_vision_client", return_value=MagicMock()), \
+             patch("takeoff.agents._call_vision_with_retry", side_effect=fake_vision):
+            engine = TakeoffEngine(db_path=":memory:", model_router=self._router())
+            first = engine.run_takeoff(snippets("south"), mode="fast")
+            self.assertEqual((len(schedule_calls), len(rcp_calls), len(vision_calls)), (1, 2, 2))
+            second = engine.run_takeoff(snippets("south-v2"), mode="fast", base_job_id=first["job_id"])
+
+        self.assertEqual(len(schedule_calls), 1)
+        self.assertEqual(rcp_calls[2:], ["South"])
+        self.assertEqual(len(vision_calls), 3)
+        report = second["incremental"]
+        self.assertEqual(report["base_job_id"], first["job_id"])
+        self.assertEqual(report["snippets"], {"unchanged": ["fs", "n"], "changed": ["s"], "added": [], "removed": []})
+        self.assertEqual(report["extractions"], {"reused": 2, "recomputed": 1})
+        self.assertEqual(report["checker_areas"]["reused_areas"], ["North"])
+        self.assertEqual(second["grand_total"], 6)
+
+    def test_failed_extractions_are_not_reused(self):
+        from takeoff.engine import TakeoffEngine
+        from takeoff.extraction import AreaCount, FixtureSchedule, PlanNote
+        from takeoff.incremental import extraction_payload, extraction_result
+        self.assertIsNone(extraction_payload("rcp_counts", AreaCount("X", warnings=["Extraction failed: timeout"])))
+        self.assertIsNone(extraction_payload("fixture_schedule", FixtureSchedule()))
+        self.assertIsNone(extraction_payload("plan_notes", []))
+        notes = [PlanNote(text="all type A on EM circuit")]
+        restored = extraction_result("plan_notes", extraction_payload("plan_notes", notes))
+        self.assertEqual([n.text for n in restored], ["all type A on EM circuit"])
+        engine = TakeoffEngine(db_path=":memory:")
+        with self.assertRaises(ValueError):
+            engine.run_takeoff([{"id": "fs", "label": "fixture_schedule", "image_data": "aGk="}],
+                               mode="fast", base_job_id="nope")
+
+
+class TestBatchTakeoff(unittest.TestCase):
+    """takeoff/batch.py: batch jobs share one engine, record progress in TakeoffDB and resume."""
+
+    def _write_jobs(self, tmp, names):
+        for name in names:
+            with open(os.path.join(tmp, f"{name}.json"), "w") as f:
+                json.dump({"drawing_name": name, "snippets": [
+                    {"id": "fs", "label": "fixture_schedule", "image_data": "aGk="},
+                    {"id": "r1", "label": "rcp", "image_data": "aGk="},
+                ]}, f)
+
+    def test_directory_batch_runs_records_and_resumes(self):
+        from unittest.mock import MagicMock
+        from pathlib import Path
+        from takeoff.batch import batch_id_for, discover_jobs, run_batch
+        from takeoff.schema import TakeoffDB
+
+        db = TakeoffDB(":memory:")
+        calls = []
+
+        def fake_run(snippets, mode, drawing_name, use_vision_cache, documents):
+            calls.append(drawing_name)
+            job_id = f"job-{drawing_name}-{len(calls)}"
+            db.create_job(job_id, mode)
+            db.store_job_usage(job_id, [
+                {"kind": "vision", "task": "rcp_counts", "calls": 3, "cost_usd": 0.02},
+                {"kind": "agent", "task": "takeoff_counter", "calls": 1, "cost_usd": 0.01},
+            ])
+            if drawing_name == "c":
+                return {"job_id": job_id, "error": "extraction_failed", "message": "no schedule"}
+            return {"job_id": job_id, "grand_total": 10}
+
+        engine = MagicMock(db=db)
+        engine.run_takeoff.side_effect = fake_run
+        with tempfile.TemporaryDirectory() as tmp:
+            self._write_jobs(tmp, ["a", "b", "c"])
+            os.mkdir(os.path.join(tmp, "not-a-job"))
+            jobs = discover_jobs(Path(tmp))
+            self.assertEqual([j["id"] for j in jobs], ["a", "b", "c"])
+            batch_id = batch_id_for(Path(tmp))
+
+            summary = run_batch(engine, jobs, batch_id, mode="fast", workers=2)
+            self.assertEqual((summary["completed"], summary["failed"], summary["skipped"]), (2, 1, 0))
+            self.assertEqual(summary["vision_calls_per_job"], 3.0)
+            self.assertAlmostEqual(summary["cost_usd"], 0.09)
+            self.assertEqual(summary["failures"], {"c": "no schedule"})
+            self.assertEqual(db.get_batch_jobs(batch_id)["a"]["status"], "complete")
+
+            # Rerun: completed entries are skipped, the failed one is retried
+            calls.clear()
+            summary = run_batch(engine, jobs, batch_id, mode="fast", workers=2)
+        self.assertEqual(calls, ["c"])
+        self.assertEqual(summary["skipped"], 2)
+        db.close()
+
+    def test_batch_manifest_and_bad_inputs(self):
+        from pathlib import Path
+        from takeoff.batch import discover_jobs, load_job_input
+        with tempfile.TemporaryDirectory() as tmp:
+            self._write_jobs(tmp, ["tower"])
+            with open(os.path.join(tmp, "batch.json"), "w") as f:
+                json.dump({"jobs": [{"id": "t", "input": "tower.json", "mode": "fast"},
+                                    {"id": "missing", "input": "gone.json"}]}, f)
+            jobs = discover_jobs(Path(tmp))
+            self.assertEqual([(j["id"], j.get("mode")) for j in jobs], [("t", "fast"), ("missing", None)])
+            snippets, drawing_name, documents = load_job_input(Path(jobs[0]["input"]))
+            self.assertEqual((len(snippets), drawing_name, documents), (2, "tower", {}))
+            with self.assertRaises(ValueError):
+                load_job_input(Path(jobs[1]["input"]))
+            with open(os.path.join(tmp, "batch.json"), "w") as f:
+                json.dump({"jobs": [{"id": "t", "input": "a.json"}, {"id": "t", "input": "b.json"}]}, f)
+            with self.assertRaises(ValueError):
+                discover_jobs(Path(tmp))
+
+
+class TestCheckerOverlap(unittest.TestCase):
+    """Checker.generate_attacks: the text review runs concurrently with the per-area vision checks."""
+
+    def test_text_review_overlaps_vision_and_attacks_merge(self):
+        import time as _time
+        from unittest.mock import MagicMock, patch
+        from takeoff.agents import Checker
+        from takeoff.extraction import FixtureSchedule
+        from takeoff.settings import API_CONFIG
+
+        text_attack = {"attack_id": "ATK001", "severity": "minor", "category": "missed_fixtures",
+                       "affected_type_tag": "A", "affected_area": "North", "description": "text"}
+
+        def slow_complete(**kw):
+            _time.sleep(0.3)
+            return MagicMock(content=json.dumps({"attacks": [text_attack], "critical_count": 0}))
+
+        def slow_vision(*args, **kw):
+            _time.sleep(0.3)
+            return json.dumps({"discrepancies": [{
+                "type_tag": "A", "counter_claimed": 4, "checker_found": 7,
+                "direction": "under_count", "severity": "critical",
+            }]})
+
+        router = MagicMock()
+        router.complete.side_effect = slow_complete
+        counter_output = {"fixture_counts": [{"type_tag": "A", "total": 4, "counts_by_area": {"North": 4}}]}
+        with patch.dict(API_CONFIG, {"rcp_tiling": False}), \
+             patch("takeoff.agents._get_vision_client", return_value=MagicMock()), \
+             patch("takeoff.agents._call_vision_with_retry", side_effect=slow_vision):
+            started = _time.perf_counter()
+            response = Checker(router).generate_attacks(
+                counter_output, FixtureSchedule(fixtures={"A": {"description": "Troffer"}}), [], [], None,
+                rcp_images=[{"area_label": "North", "image_data": "aGk="}],
+            )
+            elapsed = _time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.55)
+        timings = response.timings
+        self.assertGreaterEqual(timings["text_ms"], 290)
+        self.assertGreaterEqual(timings["vision_ms"], 290)
+        self.assertGreater(timings["saved_ms"], 150)
+        # Same (category, type, area) from both branches: deduplicated to the critical vision attack
+        self.assertEqual([a["severity"] for a in response.data["attacks"]], ["critical"])
+
+
+class TestReconcilerSkip(unittest.TestCase):
+    """Strict mode skips the Reconciler when the Checker comes back clean; liability never does."""
+
+    def _run(self, mode, severity="minor"):
+        import base64
+        from unittest.mock import MagicMock, patch
+        from takeoff.engine import TakeoffEngine
+        from takeoff.extraction import AreaCount, FixtureSchedule
+        from takeoff.settings import API_CONFIG
+
+        replies = {
+            "takeoff_counter": {
+                "fixture_counts": [
+                    {"type_tag": "A", "total": 6, "counts_by_area": {"North": 4, "South": 2},
+                     "description": "Troffer", "difficulty": "S", "accessories": [], "flags": []},
+                ],
+                "areas_covered": ["North", "South"],
+                "grand_total_fixtures": 6,
+            },
+            "takeoff_checker": {"attacks": [{"attack_id": "A1", "severity": severity, "category": "labeling",
+                                             "description": "Tag text partly obscured"}],
+                                "total_attacks": 1, "critical_count": 0},
+            "takeoff_reconciler": {"responses": [{"attack_id": "A1", "verdict": "DEFEND", "explanation": "Legible"}],
+                                   "revised_fixture_counts": {"A": {"total": 6}}, "revised_grand_total": 6},
+            "takeoff_judge": {"verdict": "PASS", "violations": [], "flags": [], "ruling_summary": "ok"},
+        }
+        router = MagicMock()
+        router.get_stats.return_value = {"model_router_cost_usd": 0.0}
+        router.complete.side_effect = lambda task_type, **kw: MagicMock(content=json.dumps(replies[task_type]))
+        snippets = [
+            {"id": "fs", "label": "fixture_schedule", "image_data": base64.b64encode(b"schedule" * 50).decode()},
+            {"id": "n", "label": "rcp", "sub_label": "North", "image_data": base64.b64encode(b"north" * 50).decode()},
+            {"id": "s", "label": "rcp", "sub_label": "South", "image_data": base64.b64encode(b"south" * 50).decode()},
+        ]
+        with patch.dict(API_CONFIG, {"snippet_store_enabled": False, "rcp_tiling": False,
+                                     "reconciler_skip_modes": ["strict", "liability"]}), \
+             patch("takeoff.engine.extract_fixture_schedule",
+                   return_value=FixtureSchedule(fixtures={"A": {"description": "Troffer"}})), \
+             patch("takeoff.engine.extract_rcp_counts",
+                   side_effect=lambda image, schedule, area_label, use_cache=True: AreaCount(
+                       area_label=area_label, counts_by_type={"A": 4 if area_label == "North" else 2})), \
+             patch("takeoff.agents._get_vision_client", return_value=MagicMock()), \
+             patch("takeoff.agents._call_vision_with_retry", return_value=json.dumps({"discrepancies": []})):
+            engine = TakeoffEngine(db_path=":memory:", model_router=router)
+            result = engine.run_takeoff(snippets, mode=mode)
+        task_types = [c.kwargs.get("task_type") for c in router.complete.call_args_list]
+        return engine, result, task_types
+
+    def test_clean_checker_skips_reconciler_in_strict_mode(self):
+        engine, result, task_types = self._run("strict")
+        self.assertNotIn("takeoff_reconciler", task_types)
+        self.assertIn("takeoff_judge", task_types)
+        self.assertEqual(result["grand_total"], 6)
+        self.assertEqual(result["reconciler_skipped"]["constitution_precheck"]["verdict"], "PASS")
+        self.assertIn("Reconciler skipped on a clean Checker review", result["confidence_explanation"])
+        log = engine.db.get_job_adversarial_log(result["job_id"])
+        skip_rows = [r for r in log if r["category"] == "reconciler_skipped"]
+        self.assertEqual(len(skip_rows), 1)
+        self.assertEqual(skip_rows[0]["final_verdict"], "SKIPPED")
+
+    def test_liability_mode_always_runs_reconciler(self):
+        engine, result, task_types = self._run("liability")
+        self.assertIn("takeoff_reconciler", task_types)
+        self.assertIsNone(result["reconciler_skipped"])
+        self.assertIn("reconciler_coverage: 1.00", result["confidence_explanation"])
+
+    def test_attack_without_severity_runs_reconciler(self):
+        _, result, task_types = self._run("strict", severity=None)
+        self.assertIn("takeoff_reconciler", task_types)
+        self.assertIsNone(result["reconciler_skipped"])
+
+
+class TestDeterministicCounter(unittest.TestCase):
+    """Counter.generate_count_deterministic: totals summed in code, model only for residual items."""
+
+    def _inputs(self):
+        from takeoff.extraction import AreaCount, FixtureSchedule
+        schedule = FixtureSchedule(fixtures={
+            "A": {"description": "2x4 LED Troffer"},
+            "B": {"description": "Recessed downlight"},
+            "EX": {"description": "Exit sign"},
+        })
+        areas = [
+            AreaCount("North", counts_by_type={"A": 4, "b": 2}),
+            AreaCount("South", counts_by_type={"A": 3}),
+            AreaCount("East", warnings=["Extraction failed: timeout"]),
+        ]
+        return schedule, areas
+
+    def test_clean_job_needs_no_model_call(self):
+        from unittest.mock import MagicMock
+        from takeoff.agents import Counter
+        schedule, areas = self._inputs()
+        router = MagicMock()
+        data = Counter(router).generate_count_deterministic(schedule, areas, []).data
+        router.complete.assert_not_called()
+        by_tag = {fc["type_tag"]: fc for fc in data["fixture_counts"]}
+        self.assertEqual(by_tag["A"]["counts_by_area"], {"North": 4, "South": 3})
+        self.assertEqual(by_tag["B"]["total"], 2)
+        self.assertEqual(by_tag["B"]["difficulty"], "M")
+        self.assertEqual(by_tag["EX"]["total"], 0)
+        self.assertEqual(data["grand_total_fixtures"], 9)
+        self.assertEqual(data["areas_covered"], ["North", "South"])
+        self.assertEqual(data["residual_items"], [])
+
+    def test_residual_items_go_to_model_and_are_resummed(self):
+        from unittest.mock import MagicMock
+        from takeoff.agents import Counter
+        from takeoff.extraction import PlanNote
+        schedule, areas = self._inputs()
+        areas[0].counts_by_type["UNKNOWN"] = 1
+        notes = [PlanNote("Type A pendant over desks TYP 4 PLACES", affects_fixture_type="A"),
+                 PlanNote("All fixtures 0-10V dimming")]
+        review = {"adjustments": [{"type_tag": "A", "area": "South", "add": 4, "reason": "TYP 4 PLACES"}],
+                  "flags": {"UNKNOWN": ["ASSUMPTION: illegible tag near stair"]},
+                  "grand_total_fixtures": 999}
+        router = MagicMock()
+        router.complete.return_value = MagicMock(content=json.dumps(review))
+        data = Counter(router).generate_count_deterministic(schedule, areas, notes).data
+        self.assertEqual(router.complete.call_count, 1)
+        self.assertEqual(len(data["residual_items"]), 2)
+        by_tag = {fc["type_tag"]: fc for fc in data["fixture_counts"]}
+        self.assertEqual(by_tag["A"]["total"], 11)
+        self.assertIn("ASSUMPTION: illegible tag near stair", by_tag["UNKNOWN"]["flags"])
+        self.assertEqual(data["grand_total_fixtures"], 14)
+
+        router.complete.side_effect = RuntimeError("overloaded")
+        data = Counter(router).generate_count_deterministic(schedule, areas, notes).data
+        by_tag = {fc["type_tag"]: fc for fc in data["fixture_counts"]}
+        self.assertEqual(by_tag["A"]["total"], 7)
+        self.assertTrue(any(f.startswith("ASSUMPTION: plan note not applied") for f in by_tag["A"]["flags"]))
+
+
+class TestPartialCallbackIsolation(unittest.TestCase):
+    """Concurrent jobs on one TakeoffEngine each stream only their own agent output."""
+
+    def test_interleaved_jobs_keep_their_own_partials(self):
+        import base64
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import MagicMock, patch
+        from takeoff.engine import TakeoffEngine
+        from takeoff.extraction import AreaCount, FixtureSchedule
+        from takeoff.settings import API_CONFIG
+
+        replies = {
+            "takeoff_counter": {
+                "fixture_counts": [{"type_tag": "A", "total": 4, "counts_by_area": {"North": 4},
+                                    "description": "Troffer", "difficulty": "S", "accessories": [], "flags": []}],
+                "areas_covered": ["North"], "grand_total_fixtures": 4,
+            },
+            "takeoff_checker": {"attacks": [], "total_attacks": 0, "critical_count": 0},
+            "takeoff_judge": {"verdict": "PASS", "violations": [], "flags": [], "ruling_summary": "ok"},
+        }
+        both_judging = threading.Barrier(2, timeout=10)
+
+        def complete(task_type, on_delta=None, **kw):
+            if task_type == "takeoff_judge":
+                both_judging.wait()  # Both jobs have started their Judge call before either streams
+                if on_delta:
+                    on_delta(str(threading.get_ident()))
+            return MagicMock(content=json.dumps(replies[task_type]))
+
+        router = MagicMock()
+        router.get_stats.return_value = {"model_router_cost_usd": 0.0}
+        router.complete.side_effect = complete
+        snippets = [
+            {"id": "fs", "label": "fixture_schedule", "image_data": base64.b64encode(b"schedule" * 50).decode()},
+            {"id": "n", "label": "rcp", "sub_label": "North", "image_data": base64.b64encode(b"north" * 50).decode()},
+        ]
+        received = {"a": [], "b": [], "a_thread": None, "b_thread": None}
+
+        def run(name):
+            received[f"{name}_thread"] = str(threading.get_ident())
+            return engine.run_takeoff(snippets, mode="fast",
+                                      partial_callback=lambda agent, delta: received[name].append((agent, delta)))
+
+        with patch.dict(API_CONFIG, {"snippet_store_enabled": False, "rcp_tiling": False}), \
+             patch("takeoff.engine.extract_fixture_schedule",
+                   return_value=FixtureSchedule(fixtures={"A": {"description": "Troffer"}})), \
+             patch("takeoff.engine.extract_rcp_counts",
+                   return_value=AreaCount(area_label="North", counts_by_type={"A": 4})):
+            engine = TakeoffEngine(db_path=":memory:", model_router=router)
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                for fut in [ex.submit(run, "a"), ex.submit(run, "b")]:
+                    fut.result()
+
+        self.assertEqual(received["a"], [("judge", received["a_thread"])])
+        self.assertEqual(received["b"], [("judge", received["b_thread"])])
+
+
 # ══════════════════════════════════════════════════════════════════════
 # Entry point
 # ══════════════════════════════════════════════════════════════════════